@@ -38,6 +38,8 @@ DATABASE_CONFIG = {
     "database": os.getenv("RELATION_DB_NAME", "media_crawler"),
     "charset": "utf8mb4",
     "autocommit": True,
+    # 设置后改为读写爬虫 SAVE_DATA_OPTION = "sqlite" 生成的 SQLite 数据库文件
+    "sqlite_path": os.getenv("SQLITE_DB_PATH", ""),
 }
 
 # 支持的平台表映射
@@ -4,11 +4,12 @@
 
 import logging
 from typing import List, Dict, Any, Optional
-from sqlalchemy import create_engine, Column, Integer, String, Text, BigInteger, text
+from sqlalchemy import create_engine, func, inspect, Column, Computed, Float, Integer, String, Text, BigInteger, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import deferred, sessionmaker, Session
 from sqlalchemy.dialects.mysql import LONGTEXT, JSON
 
+from tools.stats_rollup import ROLLUP_TABLES, STATS_ROLLUP_TABLE, find_days_sync, refresh_days_sync
 from .config import DATABASE_CONFIG, PLATFORM_TABLES
 from .models import ContentItem, AnalysisResult
 
@@ -16,6 +17,13 @@ logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
+def analysis_column(column_type, path: str):
+    """
+    从 analysis_info 生成的列（见 schema/analysis_columns.sql），由数据库维护，分析任务只写 analysis_info；
+    延迟加载，迁移之前的数据库中查询整个模型不会读取这些列
+    """
+    return deferred(Column(column_type, Computed(f"JSON_VALUE(analysis_info, '{path}')", persisted=True)))
+
 class XhsNote(Base):
     __tablename__ = 'xhs_note'
     
@@ -25,6 +33,9 @@ class XhsNote(Base):
     desc = Column(LONGTEXT)
     add_ts = Column(BigInteger)
     analysis_info = Column(JSON)
+    sentiment = analysis_column(String(16), '$.sentiment')
+    sentiment_score = analysis_column(Float, '$.sentiment_score')
+    relevance_score = analysis_column(Float, '$.relevance_score')
     source_keyword = Column(String(255), default='')
 
 class XhsNoteComment(Base):
@@ -45,6 +56,9 @@ class DouyinAweme(Base):
     desc = Column(LONGTEXT)
     add_ts = Column(BigInteger)
     analysis_info = Column(JSON)
+    sentiment = analysis_column(String(16), '$.sentiment')
+    sentiment_score = analysis_column(Float, '$.sentiment_score')
+    relevance_score = analysis_column(Float, '$.relevance_score')
     source_keyword = Column(String(255), default='')
 
 class DouyinAwemeComment(Base):
@@ -65,6 +79,9 @@ class BilibiliVideo(Base):
     desc = Column(LONGTEXT)
     add_ts = Column(BigInteger)
     analysis_info = Column(JSON)
+    sentiment = analysis_column(String(16), '$.sentiment')
+    sentiment_score = analysis_column(Float, '$.sentiment_score')
+    relevance_score = analysis_column(Float, '$.relevance_score')
     source_keyword = Column(String(255), default='')
 
 class BilibiliVideoComment(Base):
@@ -84,6 +101,9 @@ class WeiboNote(Base):
     content = Column(LONGTEXT)
     add_ts = Column(BigInteger)
     analysis_info = Column(JSON)
+    sentiment = analysis_column(String(16), '$.sentiment')
+    sentiment_score = analysis_column(Float, '$.sentiment_score')
+    relevance_score = analysis_column(Float, '$.relevance_score')
     source_keyword = Column(String(255), default='')
 
 class WeiboNoteComment(Base):
@@ -104,6 +124,9 @@ class KuaishouVideo(Base):
     desc = Column(LONGTEXT)
     add_ts = Column(BigInteger)
     analysis_info = Column(JSON)
+    sentiment = analysis_column(String(16), '$.sentiment')
+    sentiment_score = analysis_column(Float, '$.sentiment_score')
+    relevance_score = analysis_column(Float, '$.relevance_score')
     source_keyword = Column(String(255), default='')
 
 class KuaishouVideoComment(Base):
@@ -124,6 +147,9 @@ class TiebaNote(Base):
     desc = Column(LONGTEXT)
     add_ts = Column(BigInteger)
     analysis_info = Column(JSON)
+    sentiment = analysis_column(String(16), '$.sentiment')
+    sentiment_score = analysis_column(Float, '$.sentiment_score')
+    relevance_score = analysis_column(Float, '$.relevance_score')
     source_keyword = Column(String(255), default='')
 
 class TiebaComment(Base):
@@ -144,6 +170,9 @@ class ZhihuContent(Base):
     desc = Column(LONGTEXT)
     add_ts = Column(BigInteger)
     analysis_info = Column(JSON)
+    sentiment = analysis_column(String(16), '$.sentiment')
+    sentiment_score = analysis_column(Float, '$.sentiment_score')
+    relevance_score = analysis_column(Float, '$.relevance_score')
     source_keyword = Column(String(255), default='')
 
 class ZhihuComment(Base):
@@ -166,6 +195,9 @@ class WeixinArticle(Base):
     account_name = Column(String(255), nullable=False)
     add_ts = Column(BigInteger)
     analysis_info = Column(JSON)
+    sentiment = analysis_column(String(16), '$.sentiment')
+    sentiment_score = analysis_column(Float, '$.sentiment_score')
+    relevance_score = analysis_column(Float, '$.relevance_score')
     source_keyword = Column(String(255))
 
 class NewsArticle(Base):
@@ -181,6 +213,9 @@ class NewsArticle(Base):
     source_site = Column(String(255))
     add_ts = Column(BigInteger)
     analysis_info = Column(JSON)
+    sentiment = analysis_column(String(16), '$.sentiment')
+    sentiment_score = analysis_column(Float, '$.sentiment_score')
+    relevance_score = analysis_column(Float, '$.relevance_score')
     source_keyword = Column(String(64))
 
 # 平台模型映射
@@ -203,13 +238,18 @@ class DatabaseManager:
         self.config = config or DATABASE_CONFIG
         self.engine = None
         self.session_factory = None
+        # 数据库中是否有看板统计汇总表，第一次写入分析结果时检查
+        self._stats_rollup_ready: Optional[bool] = None
         self.connect()
     
     def connect(self):
         """建立数据库连接"""
         try:
-            db_url = f"mysql+pymysql://{self.config['user']}:{self.config['password']}@{self.config['host']}:{self.config['port']}/{self.config['database']}?charset={self.config['charset']}"
-            self.engine = create_engine(db_url, pool_recycle=3600)
+            if self.config.get('sqlite_path'):
+                self.engine = create_engine(f"sqlite:///{self.config['sqlite_path']}", connect_args={"timeout": 30})
+            else:
+                db_url = f"mysql+pymysql://{self.config['user']}:{self.config['password']}@{self.config['host']}:{self.config['port']}/{self.config['database']}?charset={self.config['charset']}"
+                self.engine = create_engine(db_url, pool_recycle=3600)
             self.session_factory = sessionmaker(bind=self.engine)
             logger.info("数据库连接成功")
         except Exception as e:
@@ -393,6 +433,41 @@ class DatabaseManager:
         
         return content_items
     
+    def get_analysis_stats(self, platform: str) -> Dict[str, Any]:
+        """
+        平台内容的分析统计：总数、未分析数，以及按情感分组的数量和平均情感评分
+        情感分组使用从 analysis_info 生成的列，只需要扫描（发布时间, sentiment, sentiment_score）联合索引
+        """
+        if platform not in PLATFORM_MODELS:
+            raise ValueError(f"不支持的平台: {platform}")
+        
+        MainModel = PLATFORM_MODELS[platform]['main']
+        
+        session = self.get_session()
+        try:
+            stats: Dict[str, Any] = {
+                'total': session.query(func.count(MainModel.id)).scalar() or 0,
+                'unanalyzed': session.query(func.count(MainModel.id)).filter(MainModel.analysis_info.is_(None)).scalar() or 0,
+            }
+            columns = {column['name'] for column in inspect(self.engine).get_columns(MainModel.__tablename__)}
+            if 'sentiment' not in columns:
+                logger.warning(f"表 {MainModel.__tablename__} 没有情感生成列，执行 schema/analysis_columns.sql 后可按情感统计")
+                return stats
+            
+            rows = session.query(
+                MainModel.sentiment, func.count(), func.avg(MainModel.sentiment_score)
+            ).filter(MainModel.sentiment.isnot(None)).group_by(MainModel.sentiment).all()
+            for sentiment, count, avg_score in rows:
+                stats[sentiment] = count
+                stats[f'{sentiment}_avg_score'] = round(float(avg_score), 4) if avg_score is not None else None
+            return stats
+            
+        except Exception as e:
+            logger.error(f"获取分析统计失败: {e}")
+            raise
+        finally:
+            session.close()
+    
     def batch_update_analysis_results(self, platform: str, results: List[AnalysisResult]) -> int:
         """批量更新分析结果"""
         if platform not in PLATFORM_MODELS:
@@ -416,6 +491,7 @@ class DatabaseManager:
             
             session.commit()
             logger.info(f"批量更新分析结果成功: {updated_count} 条记录")
+            self._refresh_stats_rollup(MainModel.__tablename__, [result.content_id for result in results])
             return updated_count
             
         except Exception as e:
@@ -423,4 +499,23 @@ class DatabaseManager:
             logger.error(f"批量更新分析结果失败: {e}")
             raise
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
+
+    def _refresh_stats_rollup(self, table_name: str, content_ids: List[str]):
+        """
+        分析结果写入后，刷新看板统计汇总表中这些内容所在日期的情感分布（见 tools/stats_rollup.py）
+        没有汇总表时跳过；刷新失败只记录日志，不影响已提交的分析结果，之后可以重建汇总表
+        """
+        if table_name not in ROLLUP_TABLES or not content_ids:
+            return
+        if self._stats_rollup_ready is None:
+            self._stats_rollup_ready = inspect(self.engine).has_table(STATS_ROLLUP_TABLE)
+        if not self._stats_rollup_ready:
+            return
+        platform = ROLLUP_TABLES[table_name][0]
+        try:
+            with self.engine.begin() as conn:
+                days = find_days_sync(conn, platform, content_ids)
+                refresh_days_sync(conn, platform, days)
+        except Exception as e:
+            logger.warning(f"刷新平台 {platform} 的看板统计汇总失败: {e}")
@@ -0,0 +1,133 @@
+"""
+贴吧、知乎发布时间回填任务
+
+贴吧 publish_time、知乎 created_time 是 '2024-05-28 15:33'、'3天前' 这类字符串，无法在 SQL 中按时间筛选。
+爬虫入库时会同时写入归一化的 publish_ts（秒级时间戳，见 tools/time_util.normalize_publish_ts），
+本任务为已有数据补上这一列：按 id 分批读取 publish_ts 为 NULL 的记录，解析后批量更新，每批一个事务。
+回填过的记录不再是 NULL（无法解析的写入0），任务中断后重新运行会从剩下的记录继续。
+
+使用: python -m analysis_job.publish_ts_backfill --platform all
+"""
+
+import argparse
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from tools.time_util import normalize_publish_ts
+from .database_orm import DatabaseManager
+
+
+logger = logging.getLogger(__name__)
+
+# 平台 -> (表名, 字符串发布时间字段, publish_ts 索引名)
+PUBLISH_TIME_COLUMNS = {
+    "tieba": ("tieba_note", "publish_time", "idx_tieba_note_publish_ts"),
+    "zhihu": ("zhihu_content", "created_time", "idx_zhihu_content_publish_ts"),
+}
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _crawl_time(add_ts: Optional[int]) -> Optional[datetime]:
+    """记录的抓取时间（add_ts 为毫秒时间戳），作为 '3天前' 这类相对时间的基准"""
+    if not add_ts:
+        return None
+    try:
+        return datetime.fromtimestamp(add_ts / 1000)
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+class PublishTsBackfill:
+    """publish_ts 回填"""
+    
+    def __init__(self, engine: Engine, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.engine = engine
+        self.batch_size = max(1, batch_size)
+    
+    def ensure_column(self, platform: str) -> None:
+        """表中没有 publish_ts 列或索引时创建（MySQL 也可以先执行 schema/publish_ts.sql）"""
+        table, _, index_name = PUBLISH_TIME_COLUMNS[platform]
+        inspector = inspect(self.engine)
+        with self.engine.begin() as conn:
+            if not any(column["name"] == "publish_ts" for column in inspector.get_columns(table)):
+                conn.execute(text(f"ALTER TABLE `{table}` ADD COLUMN `publish_ts` BIGINT DEFAULT NULL"))
+                logger.info(f"表 {table} 已添加 publish_ts 列")
+            if not any(index["column_names"] == ["publish_ts"] for index in inspector.get_indexes(table)):
+                conn.execute(text(f"CREATE INDEX `{index_name}` ON `{table}` (`publish_ts`)"))
+                logger.info(f"表 {table} 已添加 publish_ts 索引")
+    
+    def remaining(self, platform: str) -> int:
+        """尚未回填的记录数"""
+        table = PUBLISH_TIME_COLUMNS[platform][0]
+        with self.engine.connect() as conn:
+            return conn.execute(text(f"SELECT COUNT(*) FROM `{table}` WHERE `publish_ts` IS NULL")).scalar() or 0
+    
+    def backfill(self, platform: str) -> Dict[str, int]:
+        """
+        回填一个平台的 publish_ts
+        Returns: {'updated': 回填的记录数, 'unparsed': 其中无法解析、写入0的记录数}
+        """
+        table, time_column, _ = PUBLISH_TIME_COLUMNS[platform]
+        select_sql = text(
+            f"SELECT `id`, `{time_column}`, `add_ts` FROM `{table}` "
+            f"WHERE `publish_ts` IS NULL AND `id` > :last_id ORDER BY `id` LIMIT :limit"
+        )
+        update_sql = text(f"UPDATE `{table}` SET `publish_ts` = :publish_ts WHERE `id` = :id")
+        
+        stats = {"updated": 0, "unparsed": 0}
+        last_id = 0
+        while True:
+            with self.engine.begin() as conn:
+                rows = conn.execute(select_sql, {"last_id": last_id, "limit": self.batch_size}).fetchall()
+                if not rows:
+                    break
+                params = []
+                for row_id, publish_time, add_ts in rows:
+                    publish_ts = normalize_publish_ts(publish_time, _crawl_time(add_ts))
+                    if not publish_ts:
+                        stats["unparsed"] += 1
+                    params.append({"id": row_id, "publish_ts": publish_ts})
+                conn.execute(update_sql, params)
+            last_id = rows[-1][0]
+            stats["updated"] += len(rows)
+            logger.info(f"平台 {platform} 已回填 {stats['updated']} 条，当前 id: {last_id}")
+        return stats
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="回填贴吧、知乎的归一化发布时间 publish_ts")
+    parser.add_argument("--platform", choices=list(PUBLISH_TIME_COLUMNS.keys()) + ["all"], default="all",
+                       help="平台名称，使用 'all' 处理所有平台")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="每批回填的记录数")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                       help="日志级别")
+    
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=getattr(logging, args.log_level),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    
+    backfill = PublishTsBackfill(DatabaseManager().engine, args.batch_size)
+    platforms = [args.platform] if args.platform != "all" else list(PUBLISH_TIME_COLUMNS.keys())
+    
+    try:
+        for platform in platforms:
+            backfill.ensure_column(platform)
+            stats = backfill.backfill(platform)
+            print(f"平台 {platform} 回填完成: {stats}, 剩余未回填: {backfill.remaining(platform)}")
+        return 0
+    except Exception as e:
+        print(f"回填失败: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,113 @@
+"""
+看板统计汇总表重建任务
+
+看板的平台数据量、情感分布读取 content_daily_stats（按平台、发布日期、来源关键词汇总，见 tools/stats_rollup.py），
+爬虫和分析任务只会刷新它们写入过的日期，已有数据需要本任务汇总一次：
+按发布时间索引跳到下一个有数据的日期，逐天重新计算汇总行，每天一个事务；
+全部完成后在 content_daily_stats_state 中记录该平台，看板从此对该平台使用汇总表，重建期间仍扫描内容表。
+任务中断后重新运行即可（汇总行按天整体重新计算）。
+
+使用: python -m analysis_job.stats_rollup_rebuild --platform all
+"""
+
+import argparse
+import logging
+from typing import Any, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from tools.stats_rollup import (ROLLUP_SOURCES, STATS_ROLLUP_STATE_TABLE, STATS_ROLLUP_TABLE, build_state_statements,
+                                day_bounds, driver_sql, refresh_days_sync, to_day)
+from .database_orm import DatabaseManager
+
+
+logger = logging.getLogger(__name__)
+
+
+class StatsRollupRebuild:
+    """看板统计汇总表重建"""
+    
+    def __init__(self, engine: Engine):
+        self.engine = engine
+    
+    def ensure_tables(self) -> None:
+        """检查汇总表是否存在（SQLite 由建表脚本创建，MySQL 先执行 schema/content_daily_stats.sql）"""
+        inspector = inspect(self.engine)
+        for table in (STATS_ROLLUP_TABLE, STATS_ROLLUP_STATE_TABLE):
+            if not inspector.has_table(table):
+                raise RuntimeError(f"表 {table} 不存在，请先执行 schema/content_daily_stats.sql")
+    
+    def rebuild(self, platform: str) -> int:
+        """
+        重建一个平台的汇总行
+        Returns: 有数据的天数
+        """
+        source = ROLLUP_SOURCES[platform]
+        if not inspect(self.engine).has_table(source.table):
+            logger.info(f"平台 {platform} 的表 {source.table} 不存在，跳过")
+            return 0
+        # 先取消标记、清空旧的汇总行，重建完成前看板不读取该平台的汇总表
+        with self.engine.begin() as conn:
+            for table in (STATS_ROLLUP_STATE_TABLE, STATS_ROLLUP_TABLE):
+                conn.exec_driver_sql(driver_sql(conn, f"DELETE FROM `{table}` WHERE `platform` = %s"), (platform,))
+        
+        days = 0
+        cursor: Optional[Any] = None
+        while True:
+            with self.engine.begin() as conn:
+                # 下一个有数据的日期：发布时间索引上的一次查找
+                sql = f"SELECT MIN(`{source.time_field}`) FROM `{source.table}`"
+                if cursor is None:
+                    value = conn.exec_driver_sql(sql).scalar()
+                else:
+                    value = conn.exec_driver_sql(driver_sql(conn, f"{sql} WHERE `{source.time_field}` >= %s"),
+                                                 (cursor,)).scalar()
+                if value is None:
+                    break
+                day = to_day(platform, value)
+                if day is None:
+                    raise RuntimeError(f"平台 {platform} 的发布时间 {value!r} 无法解析")
+                refresh_days_sync(conn, platform, [day])
+            cursor = day_bounds(platform, day)[1]
+            days += 1
+            if days % 100 == 0:
+                logger.info(f"平台 {platform} 已汇总 {days} 天，当前日期: {day}")
+        
+        with self.engine.begin() as conn:
+            for sql, args in build_state_statements(platform):
+                conn.exec_driver_sql(driver_sql(conn, sql), tuple(args))
+        return days
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="重建看板统计汇总表 content_daily_stats")
+    parser.add_argument("--platform", choices=list(ROLLUP_SOURCES.keys()) + ["all"], default="all",
+                       help="看板平台名称，使用 'all' 处理所有平台")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                       help="日志级别")
+    
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=getattr(logging, args.log_level),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    
+    rebuild = StatsRollupRebuild(DatabaseManager().engine)
+    platforms = [args.platform] if args.platform != "all" else list(ROLLUP_SOURCES.keys())
+    
+    try:
+        rebuild.ensure_tables()
+        for platform in platforms:
+            days = rebuild.rebuild(platform)
+            print(f"平台 {platform} 汇总完成: {days} 天")
+        return 0
+    except Exception as e:
+        print(f"重建失败: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -13,14 +13,104 @@
 # @Author  : relakkes@gmail.com
 # @Time    : 2024/4/6 14:21
 # @Desc    : 异步Aiomysql的增删改查封装
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 import aiomysql
 
+from tools import stats_rollup, utils
+from tools.seen_id_index import get_seen_id_index, invalidate_seen_ids
+
+# 批量写入时每条 INSERT 语句携带的最大行数，避免单条语句超过 max_allowed_packet
+BATCH_UPSERT_CHUNK_SIZE = 500
+# 建表之后新增的列：(表名, 列名, 列定义, 索引名)，老库在初始化时自动补上，与 schema/publish_ts.sql 对应
+MYSQL_ADDED_COLUMNS = (
+    ("tieba_note", "publish_ts", "bigint DEFAULT NULL COMMENT '归一化的发布时间（秒级时间戳，无法解析时为0）'",
+     "idx_tieba_note_publish_ts"),
+    ("zhihu_content", "publish_ts", "bigint DEFAULT NULL COMMENT '归一化的发布时间（秒级时间戳，无法解析时为0）'",
+     "idx_zhihu_content_publish_ts"),
+)
+# batch_upsert 依赖的唯一索引：表名 -> 字段，与 schema/batch_upsert_unique_keys.sql 对应
+MYSQL_UNIQUE_KEYS = {
+    "bilibili_video": "video_id",
+    "bilibili_video_comment": "comment_id",
+    "douyin_aweme": "aweme_id",
+    "douyin_aweme_comment": "comment_id",
+    "kuaishou_video": "video_id",
+    "kuaishou_video_comment": "comment_id",
+    "weibo_note": "note_id",
+    "weibo_note_comment": "comment_id",
+    "xhs_note": "note_id",
+    "xhs_note_comment": "comment_id",
+    "tieba_note": "note_id",
+    "tieba_comment": "comment_id",
+    "zhihu_content": "content_id",
+    "zhihu_comment": "comment_id",
+}
+
+
+def build_upsert_sql(table_name: str, fields: Sequence[str], insert_only_fields: Iterable[str] = ()) -> str:
+    """
+    生成 INSERT ... ON DUPLICATE KEY UPDATE 语句，依赖表上的唯一索引判断记录是否已存在
+    :param table_name: 表名
+    :param fields: 写入的字段
+    :param insert_only_fields: 只在插入时写入的字段（例如 add_ts），记录已存在时保留原值
+    :return:
+    """
+    insert_only_fields = set(insert_only_fields)
+    fieldstr = ','.join(f'`{field}`' for field in fields)
+    valstr = ','.join(['%s'] * len(fields))
+    update_fields = [field for field in fields if field not in insert_only_fields] or list(fields)
+    updatestr = ','.join(f'`{field}`=VALUES(`{field}`)' for field in update_fields)
+    return "INSERT INTO %s (%s) VALUES (%s) ON DUPLICATE KEY UPDATE %s" % (table_name, fieldstr, valstr, updatestr)
+
 
 class AsyncMysqlDB:
     def __init__(self, pool: aiomysql.Pool) -> None:
         self.__pool = pool
+        # 缺少唯一索引的表 -> 字段，这些表的 batch_upsert 退回逐条 查询 + 插入/更新
+        self.missing_unique_keys: Dict[str, str] = {}
+
+    async def add_missing_columns(self):
+        """
+        给旧数据库补上 MYSQL_ADDED_COLUMNS 中的列和索引，表不存在时跳过
+        存储层总是写入这些列，缺列时每次写入都会报 Unknown column
+        :return:
+        """
+        rows = await self.query(
+            "SELECT TABLE_NAME, COLUMN_NAME FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE()")
+        columns: Dict[str, set] = {}
+        for row in rows:
+            columns.setdefault(row["TABLE_NAME"], set()).add(row["COLUMN_NAME"])
+        for table, column, definition, index_name in MYSQL_ADDED_COLUMNS:
+            if table not in columns or column in columns[table]:
+                continue
+            try:
+                await self.execute(
+                    f"ALTER TABLE `{table}` ADD COLUMN `{column}` {definition}, ADD KEY `{index_name}` (`{column}`)")
+            except Exception as e:
+                utils.logger.error(f"[AsyncMysqlDB.add_missing_columns] add column {table}.{column} failed: {e}, "
+                                   f"please run schema/publish_ts.sql manually")
+                continue
+            utils.logger.info(f"[AsyncMysqlDB.add_missing_columns] added column {table}.{column}")
+
+    async def check_unique_keys(self):
+        """
+        检查 MYSQL_UNIQUE_KEYS 中的唯一索引，表不存在时跳过
+        旧数据库上是普通索引，ON DUPLICATE KEY UPDATE 不会触发，每次写入都会插入重复记录；
+        建唯一索引前需要先删除重复记录，不自动执行，缺少唯一索引的表退回逐条写入
+        :return:
+        """
+        rows = await self.query(
+            "SELECT TABLE_NAME, COLUMN_NAME, NON_UNIQUE FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND SEQ_IN_INDEX = 1")
+        tables = {row["TABLE_NAME"] for row in rows}
+        unique_keys = {(row["TABLE_NAME"], row["COLUMN_NAME"]) for row in rows if int(row["NON_UNIQUE"]) == 0}
+        self.missing_unique_keys = {table: column for table, column in MYSQL_UNIQUE_KEYS.items()
+                                    if table in tables and (table, column) not in unique_keys}
+        if self.missing_unique_keys:
+            utils.logger.error(f"[AsyncMysqlDB.check_unique_keys] tables without unique key: "
+                               f"{sorted(self.missing_unique_keys)}, fall back to row by row writes, "
+                               f"please run schema/batch_upsert_unique_keys.sql to enable batch upsert")
 
     async def query(self, sql: str, *args: Union[str, int]) -> List[Dict[str, Any]]:
         """
@@ -65,7 +155,8 @@ class AsyncMysqlDB:
             async with conn.cursor(aiomysql.DictCursor) as cur:
                 await cur.execute(sql, values)
                 lastrowid = cur.lastrowid
-                return lastrowid
+        await stats_rollup.mark_written(self, table_name, [item])
+        return lastrowid
 
     async def update_table(self, table_name: str, updates: Dict[str, Any], field_where: str,
                            value_where: Union[str, int, float]) -> int:
@@ -92,7 +183,9 @@ class AsyncMysqlDB:
         async with self.__pool.acquire() as conn:
             async with conn.cursor() as cur:
                 rows = await cur.execute(sql, values)
-                return rows
+        invalidate_seen_ids(self, table_name, field_where, [value_where])
+        await stats_rollup.mark_written(self, table_name, [{**updates, field_where: value_where}])
+        return rows
 
     async def execute(self, sql: str, *args: Union[str, int]) -> int:
         """
@@ -105,3 +198,97 @@ class AsyncMysqlDB:
             async with conn.cursor() as cur:
                 rows = await cur.execute(sql, args)
                 return rows
+
+    async def execute_in_transaction(self, statements: List[Tuple[str, Sequence[Any]]]) -> int:
+        """
+        在同一个事务中依次执行多条写入语句，任一语句失败时全部回滚
+        :param statements: (sql, 参数列表) 列表
+        :return: 影响的行数
+        """
+        rows = 0
+        async with self.__pool.acquire() as conn:
+            await conn.begin()
+            try:
+                async with conn.cursor() as cur:
+                    for sql, args in statements:
+                        rows += await cur.execute(sql, args)
+                await conn.commit()
+            except Exception:
+                await conn.rollback()
+                raise
+        return rows
+
+    async def executemany(self, sql: str, args_list: List[Sequence[Any]]) -> int:
+        """
+        用多组参数执行同一条写入语句，INSERT ... VALUES 语句会被 aiomysql 合并成一条多行 INSERT
+        :param sql:
+        :param args_list: 每行的参数列表
+        :return:
+        """
+        if not args_list:
+            return 0
+        async with self.__pool.acquire() as conn:
+            async with conn.cursor() as cur:
+                rows = await cur.executemany(sql, args_list)
+                return rows
+
+    async def batch_upsert(self, table_name: str, items: List[Dict[str, Any]],
+                           insert_only_fields: Tuple[str, ...] = ("add_ts",),
+                           chunk_size: int = BATCH_UPSERT_CHUNK_SIZE,
+                           key_field: Optional[str] = None) -> int:
+        """
+        批量插入记录，唯一索引冲突时更新已有记录，代替逐条的 查询 + 插入/更新
+        表上需要有对应的唯一索引，老库见 schema/batch_upsert_unique_keys.sql，初始化时检查出缺少唯一索引的表退回逐条写入
+        :param table_name: 表名
+        :param items: 记录列表，字段不同的记录分组写入
+        :param insert_only_fields: 只在插入时写入的字段，记录已存在时保留原值
+        :param chunk_size: 每条语句携带的最大行数
+        :param key_field: 唯一索引字段，传入时用已入库 ID 索引跳过库中已有且内容没有变化的记录
+        :return: 影响的行数（MySQL 中新插入的行计 1，更新的行计 2）
+        """
+        seen_index = get_seen_id_index(self, table_name, key_field) if key_field else None
+        if seen_index is not None:
+            items = await seen_index.skip_unchanged(self, items)
+        if table_name in self.missing_unique_keys:
+            rows = await self._upsert_row_by_row(table_name, items, self.missing_unique_keys[table_name],
+                                                 insert_only_fields)
+        else:
+            groups: Dict[Tuple[str, ...], List[List[Any]]] = {}
+            for item in items:
+                groups.setdefault(tuple(item.keys()), []).append(list(item.values()))
+            rows = 0
+            for fields, values in groups.items():
+                sql = build_upsert_sql(table_name, fields, insert_only_fields)
+                for start in range(0, len(values), chunk_size):
+                    rows += await self.executemany(sql, values[start:start + chunk_size])
+        if seen_index is not None:
+            seen_index.mark_written(items)
+        await stats_rollup.mark_written(self, table_name, items)
+        return rows
+
+    async def _upsert_row_by_row(self, table_name: str, items: List[Dict[str, Any]], key_field: str,
+                                 insert_only_fields: Iterable[str]) -> int:
+        """
+        表上没有唯一索引时逐条写入：按 key_field 查询记录是否存在，存在则更新（跳过只在插入时写入的字段），否则插入
+        :param table_name: 表名
+        :param items: 记录列表
+        :param key_field: 判断记录是否存在的字段
+        :param insert_only_fields: 只在插入时写入的字段
+        :return: 影响的行数
+        """
+        insert_only_fields = set(insert_only_fields)
+        rows = 0
+        for item in items:
+            exists = await self.get_first(f"SELECT id FROM {table_name} WHERE `{key_field}` = %s", item[key_field])
+            if exists:
+                updates = {k: v for k, v in item.items() if k not in insert_only_fields and k != key_field}
+                if not updates:
+                    continue
+                setstr = ','.join(f'`{field}`=%s' for field in updates)
+                rows += await self.execute(f"UPDATE {table_name} SET {setstr} WHERE `{key_field}` = %s",
+                                           *updates.values(), item[key_field])
+            else:
+                fieldstr = ','.join(f'`{field}`' for field in item)
+                valstr = ','.join(['%s'] * len(item))
+                rows += await self.execute(f"INSERT INTO {table_name} ({fieldstr}) VALUES ({valstr})", *item.values())
+        return rows
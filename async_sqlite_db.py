@@ -0,0 +1,432 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 异步 SQLite 的增删改查封装，接口与 AsyncMysqlDB 一致，各平台的 *_store_sql.py 不需要修改
+#            数据库使用 WAL 模式，读写各用一个连接、各自在独立的线程中执行；
+#            所有写操作进入队列，由一个写入任务合并到同一个事务中提交，每个操作在自己的 savepoint 中执行，失败时只回滚这一个操作。
+#            MySQL 风格的 SQL（%s 占位符、ON DUPLICATE KEY UPDATE ... VALUES(col)）在执行前转换为 SQLite 语法，需要 SQLite 3.35 及以上版本。
+import asyncio
+import pathlib
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from async_db import build_upsert_sql
+from tools import stats_rollup, text_index, utils
+from tools.seen_id_index import get_seen_id_index, invalidate_seen_ids
+
+# 写入任务一个事务中最多合并的写操作数
+SQLITE_WRITE_BATCH_SIZE = 200
+SQLITE_SCHEMA_FILE = str(pathlib.Path(__file__).parent / "schema" / "sqlite_tables.sql")
+# 建表脚本之后新增的列：(表名, 列名, 列类型, 索引名)，旧数据库的表中没有这些列，打开数据库时补上
+SQLITE_ADDED_COLUMNS = (
+    ("tieba_note", "publish_ts", "INTEGER", "idx_tieba_note_publish_ts"),
+    ("zhihu_content", "publish_ts", "INTEGER", "idx_zhihu_content_publish_ts"),
+)
+# analysis_info 中看板按情感、相关度筛选和统计的字段，生成为列：(列名, 列类型, JSON 路径)
+SQLITE_ANALYSIS_COLUMNS = (
+    ("sentiment", "TEXT", "$.sentiment"),
+    ("sentiment_score", "REAL", "$.sentiment_score"),
+    ("relevance_score", "REAL", "$.relevance_score"),
+)
+# 分析任务写入 analysis_info 的内容表 -> 发布时间字段，生成列和发布时间建联合索引，看板的统计、筛选只需要扫描索引
+SQLITE_ANALYSIS_TABLES = {
+    "xhs_note": "time",
+    "douyin_aweme": "create_time",
+    "kuaishou_video": "create_time",
+    "bilibili_video": "create_time",
+    "weibo_note": "create_time",
+    "tieba_note": "publish_ts",
+    "zhihu_content": "publish_ts",
+    "weixin_article": "publish_timestamp",
+    "news_article": "publish_date",
+}
+
+_VALUES_FUNC_PATTERN = re.compile(r"VALUES\s*\(\s*(`?\w+`?)\s*\)", re.I)
+_ON_DUPLICATE_PATTERN = re.compile(r"ON\s+DUPLICATE\s+KEY\s+UPDATE", re.I)
+
+# 一个写操作由一条或多条语句组成：(sql, 参数列表, 是否 executemany)
+_Statement = Tuple[str, Sequence[Any], bool]
+
+
+def to_sqlite_sql(sql: str) -> str:
+    """
+    把 MySQL 风格的 SQL 转换为 SQLite 语法
+    :param sql: 使用 %s 占位符的 SQL，可以带 ON DUPLICATE KEY UPDATE `col`=VALUES(`col`)
+    :return:
+    """
+    sql = sql.replace("%s", "?").replace("%%", "%")
+    match = _ON_DUPLICATE_PATTERN.search(sql)
+    if match:
+        update_part = _VALUES_FUNC_PATTERN.sub(r"excluded.\1", sql[match.end():])
+        sql = sql[:match.start()] + "ON CONFLICT DO UPDATE SET" + update_part
+    return sql
+
+
+def _dict_factory(cursor: sqlite3.Cursor, row: tuple) -> Dict[str, Any]:
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+class AsyncSqliteDB:
+    def __init__(self, db_path: str, write_batch_size: int = SQLITE_WRITE_BATCH_SIZE,
+                 schema_file: Optional[str] = SQLITE_SCHEMA_FILE, text_index: bool = True) -> None:
+        """
+        :param db_path: 数据库文件路径
+        :param write_batch_size: 一个事务中最多合并的写操作数
+        :param schema_file: 打开数据库时执行的建表脚本，为 None 时不建表
+        :param text_index: 写入内容表时是否同时更新 FTS5 全文索引（需要建表脚本）
+        """
+        self.db_path = db_path
+        self.write_batch_size = write_batch_size
+        self.schema_file = schema_file
+        self.text_index = text_index and schema_file is not None
+        self.transactions = 0
+        self._read_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-read")
+        self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-write")
+        self._read_conn: Optional[sqlite3.Connection] = None
+        self._write_conn: Optional[sqlite3.Connection] = None
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    async def open(self) -> None:
+        """
+        打开数据库：开启 WAL 模式、建表，并启动写入任务
+        :return:
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._write_executor, self._open_write_conn)
+        await loop.run_in_executor(self._read_executor, self._open_read_conn)
+        self._write_queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._write_loop())
+        utils.logger.info(f"[AsyncSqliteDB.open] sqlite db opened: {self.db_path}")
+
+    def _open_write_conn(self):
+        pathlib.Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        if self.schema_file:
+            with open(self.schema_file, "r", encoding="utf-8") as f:
+                conn.executescript(f.read())
+            self._add_missing_columns(conn)
+            self._add_analysis_columns(conn)
+        if self.text_index:
+            pending = text_index.ensure_text_index_tables(conn)
+            if pending:
+                utils.logger.warning(f"[AsyncSqliteDB.open] full-text index not built for {pending}, "
+                                     f"run `python -m tools.text_index` to index existing rows")
+            # 分词在写入线程中执行，打开时先加载词典，避免第一次写入时等待
+            text_index.register_functions(conn)
+            text_index.jieba.initialize()
+        self._write_conn = conn
+
+    @staticmethod
+    def _add_missing_columns(conn: sqlite3.Connection):
+        """
+        给旧数据库补上 SQLITE_ADDED_COLUMNS 中的列和索引（CREATE TABLE IF NOT EXISTS 不会修改已有的表）
+        :param conn:
+        :return:
+        """
+        for table, column, column_type, index_name in SQLITE_ADDED_COLUMNS:
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info(`{table}`)")}
+            if not columns:
+                continue
+            if column not in columns:
+                conn.execute(f"ALTER TABLE `{table}` ADD COLUMN `{column}` {column_type} DEFAULT NULL")
+                utils.logger.info(f"[AsyncSqliteDB._add_missing_columns] added column {table}.{column}")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS `{index_name}` ON `{table}` (`{column}`)")
+
+    @staticmethod
+    def _add_analysis_columns(conn: sqlite3.Connection):
+        """
+        给内容表加上从 analysis_info 生成的列和联合索引（与 schema/analysis_columns.sql 对应）
+        SQLite 的查询计划不会把包含生成列的索引当作覆盖索引，这里用普通列 + 触发器代替 MySQL 的 STORED 生成列：
+        写入 analysis_info 时由触发器更新，按索引筛选、统计时不需要读取记录、解析 JSON
+        :param conn:
+        :return:
+        """
+        for table, time_column in SQLITE_ANALYSIS_TABLES.items():
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info(`{table}`)")}
+            if "analysis_info" not in columns or time_column not in columns:
+                continue
+            added = []
+            for column, column_type, _ in SQLITE_ANALYSIS_COLUMNS:
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE `{table}` ADD COLUMN `{column}` {column_type} DEFAULT NULL")
+                    added.append(column)
+            # 格式错误的 analysis_info 生成 NULL，避免写入失败
+            assignments = ", ".join(
+                f"`{column}` = CASE WHEN json_valid(NEW.`analysis_info`) THEN json_extract(NEW.`analysis_info`, '{path}') END"
+                for column, _, path in SQLITE_ANALYSIS_COLUMNS
+            )
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS `trg_{table}_analysis_insert` AFTER INSERT ON `{table}` "
+                         f"WHEN NEW.`analysis_info` IS NOT NULL "
+                         f"BEGIN UPDATE `{table}` SET {assignments} WHERE `id` = NEW.`id`; END")
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS `trg_{table}_analysis_update` AFTER UPDATE OF `analysis_info` ON `{table}` "
+                         f"BEGIN UPDATE `{table}` SET {assignments} WHERE `id` = NEW.`id`; END")
+            if added:
+                conn.execute(f"UPDATE `{table}` SET {assignments.replace('NEW.', '')} WHERE `analysis_info` IS NOT NULL")
+                utils.logger.info(f"[AsyncSqliteDB._add_analysis_columns] added analysis columns {table}.{added}")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS `idx_{table}_time_sentiment` "
+                         f"ON `{table}` (`{time_column}`, `sentiment`, `sentiment_score`)")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS `idx_{table}_time_relevance` "
+                         f"ON `{table}` (`{time_column}`, `relevance_score`)")
+
+    def _open_read_conn(self):
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.row_factory = _dict_factory
+        self._read_conn = conn
+
+    async def close(self) -> None:
+        """
+        等待队列中的写操作提交后关闭数据库
+        :return:
+        """
+        if self._writer_task is not None and not self._closing:
+            await stats_rollup.flush_stats_rollup(self)
+        self._closing = True
+        if self._writer_task is not None:
+            await self._write_queue.put(None)
+            await self._writer_task
+            self._writer_task = None
+        loop = asyncio.get_running_loop()
+        if self._write_conn is not None:
+            await loop.run_in_executor(self._write_executor, self._write_conn.close)
+            self._write_conn = None
+        if self._read_conn is not None:
+            await loop.run_in_executor(self._read_executor, self._read_conn.close)
+            self._read_conn = None
+        self._write_executor.shutdown(wait=False)
+        self._read_executor.shutdown(wait=False)
+        utils.logger.info(f"[AsyncSqliteDB.close] sqlite db closed: {self.db_path}, transactions: {self.transactions}")
+
+    async def _read(self, sql: str, args: Sequence[Any], fetch_one: bool):
+        def run():
+            cursor = self._read_conn.execute(to_sqlite_sql(sql), tuple(args))
+            try:
+                return cursor.fetchone() if fetch_one else cursor.fetchall()
+            finally:
+                cursor.close()
+
+        return await asyncio.get_running_loop().run_in_executor(self._read_executor, run)
+
+    async def _write(self, statements: List[_Statement]) -> Tuple[int, Optional[int]]:
+        """
+        把写操作放进队列，等待所在的事务提交
+        :return: (影响的行数, lastrowid)
+        """
+        if self._closing or self._writer_task is None:
+            raise RuntimeError(f"sqlite db is not open: {self.db_path}")
+        future = asyncio.get_running_loop().create_future()
+        await self._write_queue.put((statements, future))
+        return await future
+
+    async def _write_content(self, table_name: str, statements: List[_Statement], field: str,
+                             values: List[Any]) -> Tuple[int, Optional[int]]:
+        """
+        写入内容表，并更新写入记录的全文索引
+        全文索引作为紧随其后的另一个写操作，一般和内容在同一个事务中提交；索引失败不影响内容写入，影响的行数只统计内容
+        :param field: 定位写入记录的字段
+        :param values: 写入记录的 field 值
+        """
+        index_statement = text_index.build_index_statement(table_name, field, values) if self.text_index else None
+        if not index_statement:
+            return await self._write(statements)
+        result, index_result = await asyncio.gather(
+            self._write(statements), self._write([(*index_statement, True)]), return_exceptions=True
+        )
+        if isinstance(index_result, Exception):
+            utils.logger.warning(f"[AsyncSqliteDB._write_content] update full-text index of {table_name} error: {index_result}")
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def _write_loop(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            operation = await self._write_queue.get()
+            while True:
+                if operation is None:
+                    stopping = True
+                    break
+                batch.append(operation)
+                if len(batch) >= self.write_batch_size or self._write_queue.empty():
+                    break
+                operation = self._write_queue.get_nowait()
+            if not batch:
+                continue
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(
+                    self._write_executor, self._apply_batch, [statements for statements, _ in batch]
+                )
+            except Exception as e:
+                utils.logger.error(f"[AsyncSqliteDB._write_loop] commit {len(batch)} operations error: {e}")
+                results = [e] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _apply_batch(self, operations: List[List[_Statement]]) -> List[Union[Tuple[int, Optional[int]], Exception]]:
+        """
+        在写入线程中把一批写操作放在一个事务里执行
+        """
+        conn = self._write_conn
+        results = []
+        conn.execute("BEGIN")
+        try:
+            for statements in operations:
+                conn.execute("SAVEPOINT op")
+                try:
+                    rows, lastrowid = 0, None
+                    for sql, args, many in statements:
+                        if many:
+                            cursor = conn.executemany(to_sqlite_sql(sql), [tuple(row) for row in args])
+                        else:
+                            cursor = conn.execute(to_sqlite_sql(sql), tuple(args))
+                        rows += max(cursor.rowcount, 0)
+                        lastrowid = cursor.lastrowid
+                    conn.execute("RELEASE op")
+                    results.append((rows, lastrowid))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO op")
+                    conn.execute("RELEASE op")
+                    results.append(e)
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        self.transactions += 1
+        return results
+
+    async def query(self, sql: str, *args: Union[str, int]) -> List[Dict[str, Any]]:
+        """
+        从给定的 SQL 中查询记录，返回的是一个列表
+        :param sql: 查询的sql
+        :param args: sql中传递动态参数列表
+        :return:
+        """
+        return await self._read(sql, args, fetch_one=False) or []
+
+    async def get_first(self, sql: str, *args: Union[str, int]) -> Union[Dict[str, Any], None]:
+        """
+        从给定的 SQL 中查询记录，返回的是符合条件的第一个结果
+        :param sql: 查询的sql
+        :param args:sql中传递动态参数列表
+        :return:
+        """
+        return await self._read(sql, args, fetch_one=True)
+
+    async def item_to_table(self, table_name: str, item: Dict[str, Any]) -> int:
+        """
+        表中插入数据
+        :param table_name: 表名
+        :param item: 一条记录的字典信息
+        :return:
+        """
+        fieldstr = ','.join(f'`{field}`' for field in item.keys())
+        valstr = ','.join(['%s'] * len(item))
+        sql = "INSERT INTO %s (%s) VALUES(%s)" % (table_name, fieldstr, valstr)
+        key_field = text_index.TEXT_INDEX_TABLES.get(table_name, ("",))[0]
+        _, lastrowid = await self._write_content(table_name, [(sql, list(item.values()), False)],
+                                                 key_field, [item.get(key_field)])
+        await stats_rollup.mark_written(self, table_name, [item])
+        return lastrowid
+
+    async def update_table(self, table_name: str, updates: Dict[str, Any], field_where: str,
+                           value_where: Union[str, int, float]) -> int:
+        """
+        更新指定表的记录
+        :param table_name: 表名
+        :param updates: 需要更新的字段和值的 key - value 映射
+        :param field_where: update 语句 where 条件中的字段名
+        :param value_where: update 语句 where 条件中的字段值
+        :return:
+        """
+        upsets = ','.join('`%s`=%%s' % k for k in updates.keys())
+        sql = 'UPDATE %s SET %s WHERE `%s`=%%s' % (table_name, upsets, field_where)
+        rows, _ = await self._write_content(table_name, [(sql, [*updates.values(), value_where], False)],
+                                            field_where, [value_where])
+        invalidate_seen_ids(self, table_name, field_where, [value_where])
+        await stats_rollup.mark_written(self, table_name, [{**updates, field_where: value_where}])
+        return rows
+
+    async def execute(self, sql: str, *args: Union[str, int]) -> int:
+        """
+        需要更新、写入等操作的 excute 执行语句
+        :param sql:
+        :param args:
+        :return:
+        """
+        rows, _ = await self._write([(sql, args, False)])
+        return rows
+
+    async def execute_in_transaction(self, statements: List[Tuple[str, Sequence[Any]]]) -> int:
+        """
+        在同一个事务中依次执行多条写入语句（作为一个写操作），任一语句失败时全部回滚
+        :param statements: (sql, 参数列表) 列表
+        :return: 影响的行数
+        """
+        rows, _ = await self._write([(sql, args, False) for sql, args in statements])
+        return rows
+
+    async def executemany(self, sql: str, args_list: List[Sequence[Any]]) -> int:
+        """
+        用多组参数执行同一条写入语句
+        :param sql:
+        :param args_list: 每行的参数列表
+        :return:
+        """
+        if not args_list:
+            return 0
+        rows, _ = await self._write([(sql, args_list, True)])
+        return rows
+
+    async def batch_upsert(self, table_name: str, items: List[Dict[str, Any]],
+                           insert_only_fields: Tuple[str, ...] = ("add_ts",), key_field: Optional[str] = None,
+                           **kwargs) -> int:
+        """
+        批量插入记录，唯一索引冲突时更新已有记录，所有记录在同一个事务中写入
+        :param table_name: 表名
+        :param items: 记录列表，字段不同的记录分组写入
+        :param insert_only_fields: 只在插入时写入的字段，记录已存在时保留原值
+        :param key_field: 唯一索引字段，传入时用已入库 ID 索引跳过库中已有且内容没有变化的记录
+        :return: 影响的行数
+        """
+        seen_index = get_seen_id_index(self, table_name, key_field) if key_field else None
+        if seen_index is not None:
+            items = await seen_index.skip_unchanged(self, items)
+        if not items:
+            return 0
+        groups: Dict[Tuple[str, ...], List[List[Any]]] = {}
+        for item in items:
+            groups.setdefault(tuple(item.keys()), []).append(list(item.values()))
+        statements = [
+            (build_upsert_sql(table_name, fields, insert_only_fields), values, True)
+            for fields, values in groups.items()
+        ]
+        key_field = text_index.TEXT_INDEX_TABLES.get(table_name, (key_field,))[0]
+        rows, _ = await self._write_content(table_name, statements, key_field,
+                                            [item.get(key_field) for item in items] if key_field else [])
+        if seen_index is not None:
+            seen_index.mark_written(items)
+        await stats_rollup.mark_written(self, table_name, items)
+        return rows
@@ -9,6 +9,7 @@
 # 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。  
 
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Dict, Optional, List, Any, Tuple
 
@@ -16,6 +17,49 @@ from playwright.async_api import BrowserContext, BrowserType, Playwright
 from tools import utils
 
 
+class _PageProgressTracker:
+    """
+    流水线模式下的页级进度跟踪：某一页的所有条目都离开流水线后才算这一页完成，
+    并且按页码顺序提交进度和检查点，保证断点续爬不会跳过还没处理完的页
+    """
+
+    def __init__(self, crawler: "AbstractCrawler", keyword: str):
+        self.crawler = crawler
+        self.keyword = keyword
+        self.pages: Dict[int, Dict[str, Any]] = {}
+        self.order: List[int] = []
+
+    async def add_page(self, page: int, content_count: int, items: List[Dict]):
+        self.pages[page] = {
+            'items_count': content_count,
+            'remaining': len(items),
+            'last_item': items[-1] if items else None,
+            'page_stats': {'new': 0, 'duplicate': 0, 'failed': 0},
+        }
+        self.order.append(page)
+        await self._commit_done_pages()
+
+    async def item_done(self, page: int, status: str):
+        page_info = self.pages[page]
+        page_info['page_stats'][status] += 1
+        page_info['remaining'] -= 1
+        await self._commit_done_pages()
+
+    async def _commit_done_pages(self):
+        while self.order and self.pages[self.order[0]]['remaining'] == 0:
+            page = self.order.pop(0)
+            page_info = self.pages.pop(page)
+            last_item = page_info['last_item']
+            await self.crawler.update_crawl_progress(self.keyword, page, page_info['items_count'], last_item)
+            await self.crawler.save_crawl_checkpoint(self.keyword, page, {
+                'page': page,
+                'items_count': page_info['items_count'],
+                'last_item_id': self.crawler.extract_item_id(last_item) if last_item else None,
+                'last_item_time': self.crawler.extract_item_timestamp(last_item) if last_item else None,
+                'page_stats': page_info['page_stats'],
+            })
+
+
 class AbstractCrawler(ABC):
     def __init__(self):
         self.progress_manager = None
@@ -228,15 +272,18 @@ class AbstractCrawler(ABC):
         :param page: 页码
         :return: 是否继续爬取
         """
-        # 默认实现：检查连续空页面阈值
+        # 默认实现：检查连续空页面阈值，按关键词分别计数，多个关键词并行时互不影响
         import config
-        if hasattr(self, '_empty_page_count'):
-            self._empty_page_count = getattr(self, '_empty_page_count', 0) + 1
-            if self._empty_page_count >= config.EMPTY_PAGE_THRESHOLD:
-                return False
-        else:
-            self._empty_page_count = 1
-        return True
+        empty_page_counts = self.__dict__.setdefault('_empty_page_counts', {})
+        empty_page_counts[keyword] = empty_page_counts.get(keyword, 0) + 1
+        return empty_page_counts[keyword] < config.EMPTY_PAGE_THRESHOLD
+
+    def reset_empty_page_count(self, keyword: str):
+        """
+        遇到非空页面时重置该关键词的连续空页面计数
+        :param keyword: 关键词
+        """
+        self.__dict__.setdefault('_empty_page_counts', {}).pop(keyword, None)
 
     async def process_crawl_batch(self, keyword: str, page: int, items: List[Dict]) -> List[Dict]:
         """
@@ -263,12 +310,15 @@ class AbstractCrawler(ABC):
         
         # 获取平台配置
         platform_config = self.get_platform_config()
-        
-        for keyword in config.KEYWORDS.split(","):
-            keyword = keyword.strip()
-            if not keyword:
-                continue
-                
+        keywords = [keyword.strip() for keyword in config.KEYWORDS.split(",") if keyword.strip()]
+        keyword_concurrency = getattr(config, 'KEYWORD_CONCURRENCY', 1)
+
+        if keyword_concurrency > 1 and len(keywords) > 1:
+            await self._search_keywords_concurrently(keywords, platform_config, keyword_concurrency)
+            utils.logger.info(f"[{self.__class__.__name__}] All keywords search completed")
+            return
+
+        for keyword in keywords:
             source_keyword_var.set(keyword)
             utils.logger.info(f"[{self.__class__.__name__}] Current search keyword: {keyword}")
             
@@ -287,27 +337,88 @@ class AbstractCrawler(ABC):
             await self.mark_keyword_completed(keyword)
         
         utils.logger.info(f"[{self.__class__.__name__}] All keywords search completed")
+
+    async def _search_keywords_concurrently(self, keywords: List[str], platform_config: Dict, concurrency: int) -> None:
+        """
+        多关键词并行搜索：最多 concurrency 个关键词同时爬取，
+        每个关键词每轮最多爬 KEYWORD_PAGES_PER_TURN 页后回到队尾，页数很深的关键词不会一直占着并发名额
+        """
+        import config
+        from var import source_keyword_var
+        pages_per_turn = getattr(config, 'KEYWORD_PAGES_PER_TURN', 5)
+
+        keyword_queue: asyncio.Queue = asyncio.Queue()
+        for keyword in keywords:
+            start_page = await self.get_resume_start_page(keyword)
+            if start_page >= 999999:
+                utils.logger.info(f"[{self.__class__.__name__}] Keyword {keyword} already completed, skip")
+                continue
+            keyword_queue.put_nowait((keyword, start_page))
+
+        async def crawl_turn(keyword: str, start_page: int) -> Optional[int]:
+            # 每轮在独立的 task 中执行，source_keyword_var 只在当前 task 的上下文中生效
+            source_keyword_var.set(keyword)
+            utils.logger.info(f"[{self.__class__.__name__}] Current search keyword: {keyword}, start page: {start_page}")
+            return await self._search_keyword_with_resume(keyword, start_page, platform_config, pages_per_turn)
+
+        async def worker():
+            while True:
+                keyword, start_page = await keyword_queue.get()
+                try:
+                    next_page = await asyncio.create_task(crawl_turn(keyword, start_page))
+                    if next_page is None:
+                        await self.mark_keyword_completed(keyword)
+                    else:
+                        keyword_queue.put_nowait((keyword, next_page))
+                except Exception as e:
+                    utils.logger.error(f"[{self.__class__.__name__}] Search keyword {keyword} error: {e}")
+                finally:
+                    keyword_queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, keyword_queue.qsize()))]
+        try:
+            await keyword_queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _record_keyword_statistics(self, total_items: int, new_items: int, duplicate_items: int, failed_items: int):
+        """
+        累加各关键词（各轮）的统计后整体写入，crawl_statistics 按任务记录，不能只保留最后一个关键词的数据
+        """
+        totals = self.__dict__.setdefault('_crawl_totals', [0, 0, 0, 0])
+        for index, value in enumerate((total_items, new_items, duplicate_items, failed_items)):
+            totals[index] += value
+        await self.update_crawl_statistics(*totals)
     
-    async def _search_keyword_with_resume(self, keyword: str, start_page: int, platform_config: Dict) -> None:
+    async def _search_keyword_with_resume(self, keyword: str, start_page: int, platform_config: Dict,
+                                          max_turn_pages: Optional[int] = None) -> Optional[int]:
         """
         单个关键词的断点续爬搜索流程
+        :param max_turn_pages: 本轮最多爬取的页数，None 表示爬完为止
+        :return: 本轮页数用完但关键词还没爬完时返回下一页页码，爬完返回 None
         """
         import config
+
+        if getattr(config, 'ENABLE_CRAWL_PIPELINE', False):
+            return await self._search_keyword_with_pipeline(keyword, start_page, platform_config, max_turn_pages)
         
         page = max(start_page, 1)
+        first_page = page
+        next_page = None
         total_items = 0
         new_items = 0
         duplicate_items = 0
         failed_items = 0
-        empty_page_count = 0
         
-        page_limit = platform_config.get('page_limit', 20)
-        max_pages = min(
-            (config.CRAWLER_MAX_NOTES_COUNT + page_limit - 1) // page_limit,  # 基于内容数量的页数限制
-            getattr(config, 'PAGE_LIMIT', 20)  # 直接的页数限制
-        )
+        max_pages = self._get_max_pages(platform_config)
         
         while page <= max_pages:
+            if max_turn_pages and page - first_page >= max_turn_pages:
+                next_page = page
+                break
+
             # 检查是否应该停止
             if await self.should_stop_keyword_crawl(keyword, page):
                 utils.logger.info(f"[{self.__class__.__name__}] Stop crawling keyword {keyword} at page {page}")
@@ -321,14 +432,12 @@ class AbstractCrawler(ABC):
                 utils.logger.info(f"[{self.__class__.__name__}] Page {page} contents count: {len(content_list) if content_list else 0}")
                 
                 if not content_list:
-                    empty_page_count += 1
                     if not await self.handle_empty_page(keyword, page):
                         utils.logger.info(f"[{self.__class__.__name__}] Too many empty pages for keyword {keyword}, stopping")
                         break
                     page += 1
                     continue
-                else:
-                    empty_page_count = 0
+                self.reset_empty_page_count(keyword)
 
                 # 批量处理数据
                 processed_items = await self.process_crawl_batch(keyword, page, content_list)
@@ -390,8 +499,117 @@ class AbstractCrawler(ABC):
                 continue
         
         # 更新统计信息
-        await self.update_crawl_statistics(total_items, new_items, duplicate_items, failed_items)
-        utils.logger.info(f"[{self.__class__.__name__}] Keyword {keyword} completed: total={total_items}, new={new_items}, duplicate={duplicate_items}, failed={failed_items}")
+        await self._record_keyword_statistics(total_items, new_items, duplicate_items, failed_items)
+        utils.logger.info(f"[{self.__class__.__name__}] Keyword {keyword} {'paused' if next_page else 'completed'}: total={total_items}, new={new_items}, duplicate={duplicate_items}, failed={failed_items}")
+        return next_page
+
+    def _get_max_pages(self, platform_config: Dict) -> int:
+        import config
+        page_limit = platform_config.get('page_limit', 20)
+        return min(
+            (config.CRAWLER_MAX_NOTES_COUNT + page_limit - 1) // page_limit,  # 基于内容数量的页数限制
+            getattr(config, 'PAGE_LIMIT', 20)  # 直接的页数限制
+        )
+
+    async def _search_keyword_with_pipeline(self, keyword: str, start_page: int, platform_config: Dict,
+                                            max_turn_pages: Optional[int] = None) -> Optional[int]:
+        """
+        单个关键词的流水线搜索流程：当前协程负责翻页，每条内容依次经过 详情 -> 存储 -> 媒体 -> 评论 四个阶段，
+        各阶段由独立的 worker 并发处理，翻页和下游处理重叠进行
+        参数和返回值同 _search_keyword_with_resume
+        """
+        import config
+        from tools.crawl_pipeline import CrawlPipeline, PipelineStage
+
+        stats = {'total': 0, 'new': 0, 'duplicate': 0, 'failed': 0}
+        tracker = _PageProgressTracker(self, keyword)
+        enable_comments = platform_config.get('enable_comments', False)
+
+        async def detail_stage(task: Dict) -> Optional[Dict]:
+            if await self.should_skip_content(task['item'], keyword):
+                task['status'] = 'duplicate'
+                return None
+            task['item'] = await self.fetch_content_detail(task['item'])
+            return task if task['item'] else None
+
+        async def store_stage(task: Dict) -> Dict:
+            await self.store_content(task['item'])
+            task['status'] = 'new'
+            return task
+
+        async def media_stage(task: Dict) -> Dict:
+            await self.fetch_content_media(task['item'])
+            return task
+
+        async def comments_stage(task: Dict) -> Dict:
+            if enable_comments:
+                await self.batch_get_comments([task['item']])
+            return task
+
+        async def on_finished(task: Dict, error: Optional[BaseException]):
+            # 存储成功后媒体/评论阶段失败不影响内容本身的统计
+            if task['status'] == 'pending':
+                task['status'] = 'failed' if error is not None else 'duplicate'
+            stats[task['status']] += 1
+            await tracker.item_done(task['page'], task['status'])
+
+        workers = config.CRAWL_PIPELINE_WORKERS
+        queue_size = config.CRAWL_PIPELINE_QUEUE_SIZE
+        pipeline = CrawlPipeline(
+            [
+                PipelineStage('detail', detail_stage, workers.get('detail', 1), queue_size),
+                PipelineStage('store', store_stage, workers.get('store', 1), queue_size),
+                PipelineStage('media', media_stage, workers.get('media', 1), queue_size),
+                PipelineStage('comments', comments_stage, workers.get('comments', 1), queue_size),
+            ],
+            on_finished=on_finished,
+            name=f"{self.__class__.__name__}.pipeline",
+            metrics_interval=config.CRAWL_PIPELINE_METRICS_INTERVAL,
+        )
+
+        page = max(start_page, 1)
+        first_page = page
+        next_page = None
+        max_pages = self._get_max_pages(platform_config)
+        async with pipeline:
+            while page <= max_pages:
+                if max_turn_pages and page - first_page >= max_turn_pages:
+                    next_page = page
+                    break
+                if await self.should_stop_keyword_crawl(keyword, page):
+                    utils.logger.info(f"[{self.__class__.__name__}] Stop crawling keyword {keyword} at page {page}")
+                    break
+                try:
+                    utils.logger.info(f"[{self.__class__.__name__}] search keyword: {keyword}, page: {page}")
+                    content_list = await self.get_page_content(keyword, page)
+                    utils.logger.info(f"[{self.__class__.__name__}] Page {page} contents count: {len(content_list) if content_list else 0}")
+                    if not content_list:
+                        if not await self.handle_empty_page(keyword, page):
+                            utils.logger.info(f"[{self.__class__.__name__}] Too many empty pages for keyword {keyword}, stopping")
+                            break
+                        page += 1
+                        continue
+                    self.reset_empty_page_count(keyword)
+
+                    processed_items = await self.process_crawl_batch(keyword, page, content_list)
+                    await tracker.add_page(page, len(content_list), processed_items)
+                    for content in processed_items:
+                        stats['total'] += 1
+                        # 第一个阶段队列写满时这里会等待，翻页速度受下游处理能力约束
+                        task = {'item': content, 'page': page, 'status': 'pending'}
+                        await pipeline.put(task, meta=task)
+                    page += 1
+                except Exception as e:
+                    import traceback
+                    utils.logger.error(f"[{self.__class__.__name__}] Search keyword {keyword} page {page} error: {e}")
+                    utils.logger.error(f"[{self.__class__.__name__}] Traceback: {traceback.format_exc()}")
+                    stats['failed'] += 1
+                    page += 1
+
+        pipeline.log_metrics()
+        await self._record_keyword_statistics(stats['total'], stats['new'], stats['duplicate'], stats['failed'])
+        utils.logger.info(f"[{self.__class__.__name__}] Keyword {keyword} {'paused' if next_page else 'completed'}: total={stats['total']}, new={stats['new']}, duplicate={stats['duplicate']}, failed={stats['failed']}")
+        return next_page
 
     # ==================== 平台需要实现的核心抽象方法 ====================
 
@@ -433,6 +651,23 @@ class AbstractCrawler(ABC):
         # 默认实现：不获取评论
         pass
 
+    async def fetch_content_detail(self, content_item: Dict) -> Optional[Dict]:
+        """
+        获取内容详情（可选实现，流水线模式的详情阶段调用）
+        :param content_item: 搜索结果中的内容项
+        :return: 补全详情后的内容项，返回 None 表示丢弃
+        """
+        # 默认实现：搜索结果已包含所需字段
+        return content_item
+
+    async def fetch_content_media(self, content_item: Dict) -> None:
+        """
+        获取内容的图片/视频（可选实现，流水线模式的媒体阶段调用）
+        :param content_item: 内容项
+        """
+        # 默认实现：不获取媒体
+        pass
+
 
 class AbstractLogin(ABC):
     @abstractmethod
@@ -461,6 +696,20 @@ class AbstractStore(ABC):
     async def store_comment(self, comment_item: Dict):
         pass
 
+    async def store_contents(self, content_items: List[Dict]):
+        """
+        批量存储内容，默认逐条调用 store_content，支持批量写入的存储实现可以覆盖
+        """
+        for content_item in content_items:
+            await self.store_content(content_item)
+
+    async def store_comments(self, comment_items: List[Dict]):
+        """
+        批量存储评论，默认逐条调用 store_comment，支持批量写入的存储实现可以覆盖
+        """
+        for comment_item in comment_items:
+            await self.store_comment(comment_item)
+
     # TODO support all platform
     # only xhs is supported, so @abstractmethod is commented
     @abstractmethod
@@ -0,0 +1,170 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 对比评论「逐条 查询 + 插入/更新」与「批量 upsert」的 rows/sec
+#            没有 MySQL 时用 SQLite 内存库代替，SQL 方言在连接层转换；每条语句额外等待 rtt 毫秒模拟网络往返
+# 用法：python -m benchmarks.bench_batch_upsert [评论数] [每批评论数] [rtt 毫秒]
+
+import asyncio
+import re
+import sqlite3
+import sys
+import time
+from typing import Dict, List
+
+from async_db import AsyncMysqlDB
+from store.xhs.xhs_store_impl import XhsDbStoreImplement
+from store.xhs.xhs_store_sql import (add_new_comment, query_comment_by_comment_id,
+                                     update_comment_by_comment_id)
+from tools import utils
+from var import media_crawler_db_var
+
+CREATE_TABLE_SQL = """
+CREATE TABLE xhs_note_comment (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    comment_id TEXT NOT NULL UNIQUE,
+    note_id TEXT NOT NULL,
+    content TEXT,
+    like_count INTEGER,
+    add_ts INTEGER NOT NULL,
+    last_modify_ts INTEGER NOT NULL
+)
+"""
+
+
+def to_sqlite_sql(sql: str) -> str:
+    sql = sql.replace("%s", "?").replace("ON DUPLICATE KEY UPDATE", "ON CONFLICT DO UPDATE SET")
+    return re.sub(r"VALUES\((`\w+`)\)", r"excluded.\1", sql)
+
+
+class _SqliteCursor:
+    def __init__(self, conn: sqlite3.Connection, rtt: float):
+        self._cursor = conn.cursor()
+        self._rtt = rtt
+        self.lastrowid = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self._cursor.close()
+
+    async def execute(self, sql, args=()):
+        await asyncio.sleep(self._rtt)
+        self._cursor.execute(to_sqlite_sql(sql), tuple(args or ()))
+        self.lastrowid = self._cursor.lastrowid
+        return self._cursor.rowcount
+
+    async def executemany(self, sql, args_list):
+        await asyncio.sleep(self._rtt)
+        self._cursor.executemany(to_sqlite_sql(sql), args_list)
+        return self._cursor.rowcount
+
+    async def fetchall(self):
+        columns = [column[0] for column in self._cursor.description]
+        return [dict(zip(columns, row)) for row in self._cursor.fetchall()]
+
+    async def fetchone(self):
+        rows = await self.fetchall()
+        return rows[0] if rows else None
+
+
+class _SqliteConnection:
+    def __init__(self, conn: sqlite3.Connection, rtt: float):
+        self._conn = conn
+        self._rtt = rtt
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def cursor(self, cursor_class=None):
+        return _SqliteCursor(self._conn, self._rtt)
+
+
+class SqliteStandInPool:
+    """实现 AsyncMysqlDB 用到的 aiomysql.Pool 接口，autocommit 的 SQLite 内存库"""
+
+    def __init__(self, rtt: float):
+        self._conn = sqlite3.connect(":memory:", isolation_level=None)
+        self._conn.execute(CREATE_TABLE_SQL)
+        self._rtt = rtt
+
+    def acquire(self):
+        return _SqliteConnection(self._conn, self._rtt)
+
+    def count(self) -> int:
+        return self._conn.execute("select count(*) from xhs_note_comment").fetchone()[0]
+
+
+def make_comments(total: int, round_no: int) -> List[Dict]:
+    return [
+        {
+            "comment_id": f"c{i}",
+            "note_id": f"n{i // 20}",
+            "content": f"comment {i} round {round_no}",
+            "like_count": round_no,
+            "last_modify_ts": utils.get_current_timestamp(),
+        }
+        for i in range(total)
+    ]
+
+
+async def store_row_by_row(comments: List[Dict], batch_size: int):
+    """旧实现：每条评论先查询，再插入或更新"""
+    for comment_item in comments:
+        comment_id = comment_item.get("comment_id")
+        comment_detail: Dict = await query_comment_by_comment_id(comment_id=comment_id)
+        if not comment_detail:
+            comment_item["add_ts"] = utils.get_current_timestamp()
+            await add_new_comment(comment_item)
+        else:
+            await update_comment_by_comment_id(comment_id, comment_item=comment_item)
+
+
+async def store_batched(comments: List[Dict], batch_size: int):
+    """新实现：每页评论一次批量 upsert"""
+    store = XhsDbStoreImplement()
+    for start in range(0, len(comments), batch_size):
+        await store.store_comments(comments[start:start + batch_size])
+
+
+async def run(store_func, total: int, batch_size: int, rtt: float) -> Dict[str, float]:
+    pool = SqliteStandInPool(rtt)
+    media_crawler_db_var.set(AsyncMysqlDB(pool))
+    result = {}
+    for round_no, name in enumerate(("insert", "update")):
+        comments = make_comments(total, round_no)
+        start = time.perf_counter()
+        await store_func(comments, batch_size)
+        result[name] = total / (time.perf_counter() - start)
+    assert pool.count() == total
+    return result
+
+
+async def main(total: int = 2000, batch_size: int = 20, rtt_ms: int = 1):
+    rtt = rtt_ms / 1000
+    before = await run(store_row_by_row, total, batch_size, rtt)
+    after = await run(store_batched, total, batch_size, rtt)
+
+    print(f"comments={total} batch_size={batch_size} rtt={rtt_ms}ms (sqlite stand-in)")
+    for name in ("insert", "update"):
+        print(f"{name:6s} row-by-row   : {before[name]:10.1f} rows/s")
+        print(f"{name:6s} batch upsert : {after[name]:10.1f} rows/s")
+        print(f"{name:6s} speedup      : {after[name] / before[name]:10.2f}x")
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:4]]
+    asyncio.get_event_loop().run_until_complete(main(*args))
@@ -0,0 +1,97 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 对比 CSV 存储「每行打开一次文件」与「常驻缓冲句柄」写入评论的 rows/sec
+#            旧实现较慢，默认只写 10000 行
+# 用法：python -m benchmarks.bench_csv_store [新实现评论数] [旧实现评论数]
+
+import asyncio
+import csv
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import aiofiles
+
+from store.csv_sink import close_csv_sinks
+from store.xhs.xhs_store_impl import XhsCsvStoreImplement
+from var import crawler_type_var
+
+
+def make_comments(total: int) -> List[Dict]:
+    return [
+        {
+            "comment_id": f"c{i}",
+            "create_time": 1700000000000 + i,
+            "ip_location": "上海",
+            "note_id": f"n{i // 20}",
+            "content": f"第 {i} 条评论，包含逗号, 引号\" 和换行\n",
+            "user_id": f"u{i % 1000}",
+            "nickname": "用户",
+            "avatar": "https://example.com/avatar.jpg",
+            "sub_comment_count": "0",
+            "pictures": "",
+            "parent_comment_id": 0,
+            "last_modify_ts": 1700000000000,
+            "like_count": str(i % 100),
+        }
+        for i in range(total)
+    ]
+
+
+async def save_data_to_csv_legacy(store: XhsCsvStoreImplement, save_item: Dict, store_type: str):
+    """旧实现：每行都经 aiofiles 打开文件、判断是否写表头、写一行后关闭"""
+    save_file_name = store.make_save_file_name(store_type=store_type)
+    async with aiofiles.open(save_file_name, mode='a+', encoding="utf-8-sig", newline="") as f:
+        f.fileno()
+        writer = csv.writer(f)
+        if await f.tell() == 0:
+            await writer.writerow(save_item.keys())
+        await writer.writerow(save_item.values())
+
+
+async def run(total: int, legacy: bool) -> float:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        class TmpCsvStore(XhsCsvStoreImplement):
+            csv_store_path = tmp_dir
+
+        store = TmpCsvStore()
+        comments = make_comments(total)
+        start = time.perf_counter()
+        for comment_item in comments:
+            if legacy:
+                await save_data_to_csv_legacy(store, comment_item, "comments")
+            else:
+                await store.store_comment(comment_item)
+        close_csv_sinks()
+        elapsed = time.perf_counter() - start
+
+        with open(store.make_save_file_name("comments"), encoding="utf-8-sig", newline="") as f:
+            assert sum(1 for _ in csv.reader(f)) == total + 1
+    return total / elapsed
+
+
+async def main(total: int = 100000, legacy_total: int = 10000):
+    crawler_type_var.set("search")
+    before = await run(legacy_total, legacy=True)
+    after = await run(total, legacy=False)
+
+    print(f"comments: per-row open={legacy_total} buffered sink={total}")
+    print(f"per-row open  : {before:10.1f} rows/s")
+    print(f"buffered sink : {after:10.1f} rows/s")
+    print(f"speedup       : {after / before:10.2f}x")
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.get_event_loop().run_until_complete(main(*args))
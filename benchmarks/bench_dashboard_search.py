@@ -0,0 +1,141 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : web 看板跨平台搜索：对比旧实现（每个平台 query.all() 后在内存中去重、排序、分页）
+#            与 SQL 分页 + 多路归并在不同数据量下的单页耗时和内存峰值
+#            小红书、抖音两张表各 N 行，发布时间均匀分布在最近 30 天，搜索最近 7 天，每页 20 条；
+#            索引与 schema/sqlite_tables.sql 一致（时间字段、内容 ID）
+#            旧实现在大表上需要几十秒和数 GB 内存，默认只在不超过 200000 行时运行
+# 用法：python -m benchmarks.bench_dashboard_search [每张表行数,逗号分隔] [旧实现最大行数]
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from web.database.connection import Base
+from web.database.models import DouyinAweme, XhsNote
+from web.database.queries import ContentItem, DataQueryService, SearchFilters, get_field_mapping
+
+NOW = datetime(2025, 6, 1)
+PLATFORMS = {"xhs": XhsNote, "douyin": DouyinAweme}
+
+
+def create_database(path: str, rows: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[model.__table__ for model in PLATFORMS.values()])
+    connection = engine.raw_connection()
+    cursor = connection.cursor()
+    start_ts = int((NOW - timedelta(days=30)).timestamp())
+    span = 30 * 86400
+    rng = random.Random(0)
+    xhs_sql = ("INSERT INTO xhs_note (add_ts,last_modify_ts,note_id,type,title,`desc`,time,last_update_time,user_id,nickname,"
+               "liked_count,collected_count,comment_count,share_count,note_url,source_keyword) "
+               "VALUES (0,0,?,'normal',?,?,?,0,?,?,?,?,?,?,?,'关键词')")
+    douyin_sql = ("INSERT INTO douyin_aweme (add_ts,last_modify_ts,aweme_id,aweme_type,title,`desc`,create_time,user_id,nickname,"
+                  "liked_count,comment_count,share_count,collected_count,aweme_url,source_keyword) "
+                  "VALUES (0,0,?,'0',?,?,?,?,?,?,?,?,?,?,'关键词')")
+    batch = 50000
+    for offset in range(0, rows, batch):
+        ids = range(offset, min(offset + batch, rows))
+        cursor.executemany(xhs_sql, [
+            (f"x{i}", f"笔记标题 {i}", "笔记正文" * 20, (start_ts + rng.randrange(span)) * 1000, f"u{i % 5000}", "昵称",
+             str(rng.randrange(10000)), str(rng.randrange(1000)), str(rng.randrange(500)), "0", f"https://www.xiaohongshu.com/explore/x{i}")
+            for i in ids
+        ])
+        cursor.executemany(douyin_sql, [
+            (f"d{i}", f"视频标题 {i}", "视频描述" * 20, start_ts + rng.randrange(span), f"u{i % 5000}", "昵称",
+             str(rng.randrange(10000)), str(rng.randrange(500)), str(rng.randrange(100)), "0", f"https://www.douyin.com/video/d{i}")
+            for i in ids
+        ])
+    cursor.execute("CREATE INDEX idx_xhs_note_time ON xhs_note (time)")
+    cursor.execute("CREATE UNIQUE INDEX idx_xhs_note_note_id ON xhs_note (note_id)")
+    cursor.execute("CREATE INDEX idx_douyin_awem_create ON douyin_aweme (create_time)")
+    cursor.execute("CREATE UNIQUE INDEX idx_douyin_awem_aweme_id ON douyin_aweme (aweme_id)")
+    connection.commit()
+    connection.close()
+    return engine
+
+
+def legacy_search(session: Session, filters: SearchFilters):
+    """旧实现的主要步骤：每个平台 count() + all()，全部转换为 ContentItem 后去重、排序、分页"""
+    all_results, total = [], 0
+    for platform in filters.platforms:
+        model = PLATFORMS[platform]
+        time_column = getattr(model, get_field_mapping(platform)['publish_time'])
+        scale = 1000 if platform == 'xhs' else 1
+        query = session.query(model).filter(time_column >= int(filters.start_time.timestamp() * scale),
+                                            time_column <= int(filters.end_time.timestamp() * scale))
+        total += query.count()
+        all_results += [ContentItem.from_model(row, platform) for row in query.order_by(time_column.desc()).all()]
+    seen, unique = set(), []
+    for item in all_results:
+        if f"{item.platform}_{item.content_id}" not in seen:
+            seen.add(f"{item.platform}_{item.content_id}")
+            unique.append(item)
+    unique.sort(key=lambda x: x.publish_time, reverse=True)
+    start = (filters.page - 1) * filters.page_size
+    return unique[start:start + filters.page_size], len(unique)
+
+
+def measure(func: Callable[[], object]):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 1024 / 1024
+
+
+def main(sizes: List[int], legacy_max_rows: int = 200000):
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            start = time.perf_counter()
+            engine = create_database(os.path.join(tmp_dir, "bench.db"), rows)
+            print(f"rows per table: {rows:,} (build {time.perf_counter() - start:.1f}s)")
+            service = DataQueryService()
+            service.session = Session(engine)
+
+            def filters(**kwargs) -> SearchFilters:
+                return SearchFilters(platforms=list(PLATFORMS), start_time=NOW - timedelta(days=7), end_time=NOW,
+                                     page_size=20, **kwargs)
+
+            cases = [
+                ("page 1", lambda: service.search_content(filters(page=1))),
+                ("page 50", lambda: service.search_content(filters(page=50))),
+                ("page 1 by interaction", lambda: service.search_content(filters(page=1, sort_by="interaction"))),
+            ]
+            cursor = None
+            for _ in range(49):
+                cursor = service.search_content_page(filters(cursor=cursor)).next_cursor
+            cases.append(("page 50 by cursor", lambda: service.search_content_page(filters(cursor=cursor))))
+            if rows <= legacy_max_rows:
+                cases.append(("legacy page 1", lambda: legacy_search(service.session, filters(page=1))))
+            for name, func in cases:
+                service.session.expunge_all()
+                elapsed, peak = measure(func)
+                print(f"  {name:<24} {elapsed:>9.1f}ms  peak {peak:>8.2f}MB")
+            service.session.close()
+            engine.dispose()
+
+
+if __name__ == '__main__':
+    sizes = [int(size) for size in sys.argv[1].split(",")] if len(sys.argv) > 1 else [10000, 100000, 1000000]
+    main(sizes, *[int(arg) for arg in sys.argv[2:3]])
@@ -0,0 +1,73 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 对比「每次请求新建 httpx.AsyncClient」与「HttpTransport 长连接复用」的 requests/sec
+# 用法：python -m benchmarks.bench_http_transport [请求数] [并发数]
+
+import asyncio
+import sys
+import time
+
+import httpx
+
+from test.stub_server import StubHttpServer
+from tools.http_transport import HttpTransport
+
+
+async def run_per_request_client(url: str, total: int, concurrency: int) -> float:
+    """旧实现：每次请求都新建 client，每次都要重新建立 TCP 连接"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            async with httpx.AsyncClient() as client:
+                await client.request("GET", url, timeout=10)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(total)])
+    return total / (time.perf_counter() - start)
+
+
+async def run_pooled_transport(url: str, total: int, concurrency: int) -> float:
+    """新实现：共享 HttpTransport，keep-alive 复用连接"""
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = HttpTransport(timeout=10)
+
+    async def one():
+        async with semaphore:
+            await transport.request("GET", url)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(total)])
+    rps = total / (time.perf_counter() - start)
+    await transport.aclose()
+    return rps
+
+
+async def main(total: int = 2000, concurrency: int = 10):
+    async with StubHttpServer() as server:
+        url = f"{server.base_url}/api/bench"
+        before = await run_per_request_client(url, total, concurrency)
+        before_conns = server.connections
+        server.connections = 0
+        after = await run_pooled_transport(url, total, concurrency)
+        after_conns = server.connections
+
+    print(f"requests={total} concurrency={concurrency}")
+    print(f"per-request AsyncClient : {before:8.1f} req/s, tcp connections={before_conns}")
+    print(f"pooled HttpTransport    : {after:8.1f} req/s, tcp connections={after_conns}")
+    print(f"speedup                 : {after / before:8.2f}x")
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.get_event_loop().run_until_complete(main(*args))
@@ -0,0 +1,59 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 签名吞吐对比：PyExecJS（每次 call 新起进程） vs 常驻 JsSignPool（单次 call / sign_many 批量）
+# 用法：python -m benchmarks.bench_js_sign [每项签名次数]
+
+import sys
+import time
+from typing import Callable, List, Tuple
+
+import execjs
+
+from tools.js_sign_pool import JsSignPool
+
+DOUYIN_UA = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+ZHIHU_COOKIES = "d_c0=AJDTestCookieValue|1700000000; z_c0=xxx"
+
+CASES: List[Tuple[str, str, Callable[[int], tuple]]] = [
+    ("libs/douyin.js", "sign_datail", lambda i: (f"aweme_id={i}&aid=6383&device_platform=webapp", DOUYIN_UA)),
+    ("libs/douyin.js", "sign_reply", lambda i: (f"aweme_id={i}&cursor=0&count=20", DOUYIN_UA)),
+    ("libs/zhihu.js", "get_sign", lambda i: (f"/api/v4/search_v3?q=test&offset={i}", ZHIHU_COOKIES)),
+]
+
+
+def per_second(count: int, func: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start)
+
+
+def main(count: int = 50):
+    print(f"{'function':<12} {'execjs/s':>10} {'pool call/s':>12} {'sign_many/s':>12}")
+    for script, fn, make_args in CASES:
+        args_list = [make_args(i) for i in range(count)]
+        with open(script, encoding="utf-8-sig") as f:
+            ctx = execjs.compile(f.read())
+        # PyExecJS 较慢，只取 1/5 的样本
+        execjs_count = max(1, count // 5)
+        execjs_rate = per_second(execjs_count, lambda: [ctx.call(fn, *args) for args in args_list[:execjs_count]])
+
+        pool = JsSignPool(script, size=2)
+        pool.call(fn, *args_list[0])  # 预热，启动常驻进程
+        call_rate = per_second(count, lambda: [pool.call(fn, *args) for args in args_list])
+        batch_rate = per_second(count, lambda: pool.sign_many(fn, args_list))
+        pool.close()
+        print(f"{fn:<12} {execjs_rate:>10.1f} {call_rate:>12.1f} {batch_rate:>12.1f}")
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,114 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : web 看板关键词搜索：对比 LIKE '%关键词%' 全表扫描与 SQLite FTS5 全文索引（jieba 分词）在不同数据量下的单页耗时
+#            小红书笔记表 N 行，标题 6 个词、正文 40 个词，随机取自常用词表；少见词出现在约 0.1% 的笔记中，
+#            常见词出现在约 10% 的笔记中；每页 20 条，包含总数统计
+# 用法：python -m benchmarks.bench_keyword_search [行数,逗号分隔]
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from tools import text_index
+from web.database.connection import Base
+from web.database.models import XhsNote
+from web.database.queries import DataQueryService, SearchFilters
+
+NOW = datetime(2025, 6, 1)
+WORDS = ["今天", "分享", "一下", "我们", "非常", "推荐", "好用", "效果", "价格", "质量", "朋友", "生活", "工作", "学习",
+         "旅行", "美食", "城市", "周末", "早上", "晚上", "喜欢", "觉得", "真的", "可以", "这个", "那个", "时候", "东西",
+         "体验", "感觉", "大家", "问题", "方法", "经验", "记录", "日常", "开心", "简单", "颜色", "味道", "衣服", "护肤",
+         "健身", "咖啡", "电影", "音乐", "摄影", "宠物", "家居", "装修"]
+COMMON_WORD = "手机"
+RARE_WORD = "鸿蒙"
+
+
+def random_text(rng: random.Random, words: int, common: float, rare: float) -> str:
+    tokens = [rng.choice(WORDS) for _ in range(words)]
+    if rng.random() < common:
+        tokens[rng.randrange(words)] = COMMON_WORD
+    if rng.random() < rare:
+        tokens[rng.randrange(words)] = RARE_WORD
+    return "".join(tokens)
+
+
+def create_database(path: str, rows: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[XhsNote.__table__])
+    conn = sqlite3.connect(path, isolation_level=None)
+    start_ts = int((NOW - timedelta(days=30)).timestamp())
+    rng = random.Random(0)
+    sql = ("INSERT INTO xhs_note (add_ts,last_modify_ts,note_id,type,title,`desc`,time,last_update_time,user_id,nickname,"
+           "liked_count,collected_count,comment_count,share_count,note_url) "
+           "VALUES (0,0,?,'normal',?,?,?,0,'u','昵称',?,'0','0','0','')")
+    batch = 50000
+    for offset in range(0, rows, batch):
+        conn.execute("BEGIN")
+        conn.executemany(sql, [
+            (f"x{i}", random_text(rng, 6, 0.05, 0.0005), random_text(rng, 40, 0.05, 0.0005),
+             (start_ts + rng.randrange(30 * 86400)) * 1000, str(rng.randrange(10000)))
+            for i in range(offset, min(offset + batch, rows))
+        ])
+        conn.execute("COMMIT")
+    conn.execute("CREATE INDEX idx_xhs_note_time ON xhs_note (time)")
+    conn.execute("CREATE UNIQUE INDEX idx_xhs_note_note_id ON xhs_note (note_id)")
+    start = time.perf_counter()
+    text_index.ensure_text_index_tables(conn)
+    text_index.rebuild_text_index(conn, "xhs_note")
+    index_seconds = time.perf_counter() - start
+    conn.close()
+    return engine, index_seconds
+
+
+def main(sizes: List[int]):
+    text_index.jieba.setLogLevel("WARNING")
+    text_index.jieba.initialize()
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            engine, index_seconds = create_database(os.path.join(tmp_dir, "bench.db"), rows)
+            print(f"rows: {rows:,} (build full-text index {index_seconds:.1f}s)")
+            cases = [
+                ("rare word", RARE_WORD, "or", "time"),
+                ("common word", COMMON_WORD, "or", "time"),
+                ("common AND rare", f"{COMMON_WORD} {RARE_WORD}", "and", "time"),
+                ("rare by relevance", RARE_WORD, "or", "relevance"),
+            ]
+            for name, keywords, mode, sort_by in cases:
+                results = {}
+                for backend in ("like", "fts"):
+                    service = DataQueryService()
+                    service.session = Session(engine)
+                    service._keyword_backends["xhs_note"] = backend
+                    filters = SearchFilters(platforms=["xhs"], start_time=NOW - timedelta(days=30), end_time=NOW,
+                                            keywords=keywords, keyword_mode=mode, sort_by=sort_by, page_size=20)
+                    start = time.perf_counter()
+                    items, total = service.search_content(filters)
+                    results[backend] = ((time.perf_counter() - start) * 1000, total, [item.content_id for item in items])
+                    service.session.close()
+                (like_ms, like_total, like_ids), (fts_ms, fts_total, fts_ids) = results["like"], results["fts"]
+                same = like_total == fts_total and (sort_by == "relevance" or like_ids == fts_ids)
+                print(f"  {name:<20} matches {fts_total:>7,}  like {like_ms:>9.1f}ms  fts {fts_ms:>9.1f}ms"
+                      f"  {'same results' if same else 'DIFFERENT RESULTS'}")
+            engine.dispose()
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1].split(",")] if len(sys.argv) > 1 else [10000, 100000, 1000000])
@@ -0,0 +1,122 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : ExpiringLocalCache 微基准：在 N 个键（默认 100 万）上对比旧实现（dict + 全量扫描清理）与新实现（LRU + 过期堆）的
+#            set/get/get_many 吞吐、1% 键过期时一次清理的耗时、glob keys() 耗时、每百万个键的内存占用
+#            旧实现的 _clear 边遍历边删除会抛 RuntimeError，这里按修正后的写法（先复制键列表）计时
+# 用法：python -m benchmarks.bench_local_cache [键数量]
+
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from cache.local_cache import ExpiringLocalCache
+
+
+class LegacyLocalCache:
+    """旧实现的数据结构：key -> (value, 过期时间)，清理时扫描全部键，keys() 按子串匹配"""
+
+    def __init__(self):
+        self._cache_container: Dict[str, Tuple[Any, float]] = {}
+
+    def get(self, key: str):
+        value, expire_time = self._cache_container.get(key, (None, 0))
+        if value is None:
+            return None
+        if expire_time < time.time():
+            del self._cache_container[key]
+            return None
+        return value
+
+    def set(self, key: str, value: Any, expire_time: int):
+        self._cache_container[key] = (value, time.time() + expire_time)
+
+    def keys(self, pattern: str) -> List[str]:
+        pattern = pattern.replace('*', '')
+        return [key for key in self._cache_container.keys() if pattern in key]
+
+    def _clear(self):
+        now = time.time()
+        for key, (_, expire_time) in list(self._cache_container.items()):
+            if expire_time < now:
+                del self._cache_container[key]
+
+
+def timed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def new_cache() -> ExpiringLocalCache:
+    cache = ExpiringLocalCache(max_size=0)
+    # 基准在同步代码中运行，定时清理任务不会被调度
+    cache._cron_task.cancel()
+    return cache
+
+
+def bench(name: str, cache, keys: List[str]):
+    total = len(keys)
+    set_sec = timed(lambda: [cache.set(key, key, 3600) for key in keys])
+    get_sec = timed(lambda: [cache.get(key) for key in keys])
+    if isinstance(cache, ExpiringLocalCache):
+        get_many_sec = timed(lambda: [cache.get_many(keys[i:i + 100]) for i in range(0, total, 100)])
+    else:
+        get_many_sec = float("nan")
+    # 1% 的键已经过期（新实现用 set_many 一次写入，避免 set 自带的增量清理提前把它们清掉）
+    if isinstance(cache, ExpiringLocalCache):
+        cache.set_many({key: key for key in keys[::100]}, -1)
+    else:
+        for key in keys[::100]:
+            cache.set(key, key, -1)
+    clear_sec = timed(cache._clear)
+    assert cache.get(keys[0]) is None
+    keys_sec = timed(lambda: cache.keys("user_12*"))
+    glob_sec = timed(lambda: cache.keys("user_1?3*")) if isinstance(cache, ExpiringLocalCache) else float("nan")
+    print(
+        f"{name:<8} set {total / set_sec:>11,.0f}/s  get {total / get_sec:>11,.0f}/s  "
+        f"get_many(100) {total / get_many_sec:>11,.0f}/s  clear(1% expired) {clear_sec * 1000:>8.2f}ms  "
+        f"keys('user_12*') {keys_sec * 1000:>7.1f}ms  keys('user_1?3*') {glob_sec * 1000:>7.1f}ms"
+    )
+
+
+def memory_mb(factory: Callable[[], Any], keys: List[str]) -> float:
+    tracemalloc.start()
+    cache = factory()
+    for key in keys:
+        cache.set(key, 1, 3600)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cache
+    return current / 1024 / 1024
+
+
+def main(total: int = 1_000_000):
+    keys = [f"user_{i}" for i in range(total)]
+    print(f"keys: {total:,}")
+    bench("legacy", LegacyLocalCache(), keys)
+    bench("new", new_cache(), keys)
+
+    # 固定容量下持续写入新键：每次写入淘汰一个最久没有访问的键
+    cache = ExpiringLocalCache(max_size=total // 10)
+    cache._cron_task.cancel()
+    evict_sec = timed(lambda: [cache.set(key, key, 3600) for key in keys])
+    print(f"new      set with max_size={total // 10:,}: {total / evict_sec:,.0f}/s, stats {cache.stats}, size {len(cache):,}")
+
+    scale = 1_000_000 / total
+    print(f"memory per 1M keys: legacy {memory_mb(LegacyLocalCache, keys) * scale:.1f}MB, "
+          f"new {memory_mb(new_cache, keys) * scale:.1f}MB")
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,128 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 对比「整个响应读入内存后写文件」与媒体下载器（流式写入 + 内容去重）的峰值内存、耗时和占用磁盘
+#            本地 HTTP 服务（python -m http.server）提供一个大视频，以及一批图片（其中一部分内容相同，模拟不同笔记转发同一张图片）
+# 用法：python -m benchmarks.bench_media_downloader [视频 MB] [图片数] [不同图片数] [并发数]
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Tuple
+
+import aiofiles
+
+from tools.http_transport import HttpTransport
+from tools.media_downloader import MediaDownloader
+
+IMAGE_SIZE = 200 * 1024
+
+
+def dir_size(path: str) -> int:
+    """按 inode 统计，硬链接只计算一次"""
+    inodes = {}
+    for root, _, files in os.walk(path):
+        for name in files:
+            stat = os.stat(os.path.join(root, name))
+            inodes[stat.st_ino] = stat.st_size
+    return sum(inodes.values())
+
+
+async def download_in_memory(transport: HttpTransport, jobs, workers: int):
+    """旧实现：response.content 保存完整文件后一次写入"""
+    semaphore = asyncio.Semaphore(workers)
+
+    async def download(url: str, save_path: str):
+        async with semaphore:
+            response = await transport.request("GET", url)
+            os.makedirs(os.path.dirname(save_path), exist_ok=True)
+            async with aiofiles.open(save_path, "wb") as f:
+                await f.write(response.content)
+
+    await asyncio.gather(*(download(url, save_path) for url, save_path in jobs))
+
+
+async def download_streaming(transport: HttpTransport, jobs, workers: int, store_path: str):
+    downloader = MediaDownloader(transport=transport, workers=workers, store_path=store_path)
+    for url, save_path in jobs:
+        await downloader.submit(url, save_path)
+    await downloader.drain()
+
+
+async def measure(func, *args) -> Tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    await func(*args)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 1024 / 1024
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def main(video_mb: int = 100, images: int = 200, distinct_images: int = 50, workers: int = 4):
+    with tempfile.TemporaryDirectory() as serve_dir:
+        # 文件服务运行在子进程中，峰值内存只统计下载端
+        with open(os.path.join(serve_dir, "video.mp4"), "wb") as f:
+            for _ in range(video_mb):
+                f.write(os.urandom(1024 * 1024))
+        os.makedirs(os.path.join(serve_dir, "images"))
+        image_contents = [os.urandom(IMAGE_SIZE) for _ in range(distinct_images)]
+        for i in range(images):
+            with open(os.path.join(serve_dir, "images", f"{i}.jpg"), "wb") as f:
+                f.write(image_contents[i % distinct_images])
+        port = free_port()
+        server = subprocess.Popen([sys.executable, "-m", "http.server", str(port), "--bind", "127.0.0.1",
+                                   "--directory", serve_dir], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            await asyncio.sleep(1)
+            for name in ("in memory", "streaming"):
+                await run(name, base_url, video_mb, images, distinct_images, workers)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+async def run(name: str, base_url: str, video_mb: int, images: int, distinct_images: int, workers: int):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        transport = HttpTransport(timeout=60)
+        data_dir = os.path.join(tmp_dir, "data")
+        video_job = [(f"{base_url}/video.mp4", os.path.join(data_dir, "video", "video.mp4"))]
+        image_jobs = [(f"{base_url}/images/{i}.jpg", os.path.join(data_dir, "images", f"{i}.jpg"))
+                      for i in range(images)]
+        if name == "in memory":
+            video_result = await measure(download_in_memory, transport, video_job, workers)
+            image_result = await measure(download_in_memory, transport, image_jobs, workers)
+        else:
+            store_path = os.path.join(tmp_dir, "store")
+            video_result = await measure(download_streaming, transport, video_job, workers, store_path)
+            image_result = await measure(download_streaming, transport, image_jobs, workers, store_path)
+        await transport.aclose()
+        print(f"{name:9s}: video {video_mb}MB {video_result[0]:.2f}s peak {video_result[1]:.1f}MB | "
+              f"{images} images ({distinct_images} distinct) {image_result[0]:.2f}s "
+              f"peak {image_result[1]:.1f}MB, disk {dir_size(tmp_dir) / 1024 / 1024:.1f}MB")
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:5]]
+    asyncio.get_event_loop().run_until_complete(main(*args))
@@ -0,0 +1,102 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 对比同一批评论保存为 csv 与 parquet 的写入速度、文件大小和 pandas 读取耗时/内存（需要安装 pyarrow）
+# 用法：python -m benchmarks.bench_parquet_store [评论数]
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import pandas as pd
+
+from store.csv_sink import close_csv_sinks
+from store.parquet_store import close_parquet_writers
+from store.xhs.xhs_store_impl import XhsCsvStoreImplement, XhsParquetStoreImplement
+from var import crawler_type_var
+
+KEYWORDS = ["编程副业", "编程兼职", "python", "旅游攻略", "美食"]
+LOCATIONS = ["北京", "上海", "广东", "浙江", "四川", "江苏", "湖北", "未知"]
+
+
+def make_comments(total: int) -> List[Dict]:
+    rand = random.Random(0)
+    return [
+        {
+            "comment_id": f"6{i:023d}",
+            "create_time": 1700000000000 + i * 1000,
+            "ip_location": rand.choice(LOCATIONS),
+            "note_id": f"65{i // 50:022d}",
+            "content": f"第 {i} 条评论，" + "内容" * rand.randint(1, 30),
+            "user_id": f"5{rand.randint(0, 20000):023d}",
+            "nickname": f"用户{rand.randint(0, 20000)}",
+            "avatar": f"https://sns-avatar-qc.xhscdn.com/avatar/{rand.randint(0, 20000)}.jpg",
+            "sub_comment_count": str(rand.randint(0, 10)),
+            "pictures": "",
+            "parent_comment_id": 0,
+            "last_modify_ts": 1700000000000,
+            "like_count": str(rand.randint(0, 1000)),
+            "source_keyword": rand.choice(KEYWORDS),
+        }
+        for i in range(total)
+    ]
+
+
+async def write(store_class, comments: List[Dict], batch_size: int = 20) -> float:
+    store = store_class()
+    start = time.perf_counter()
+    for i in range(0, len(comments), batch_size):
+        await store.store_comments(comments[i:i + batch_size])
+    close_csv_sinks()
+    close_parquet_writers()
+    return time.perf_counter() - start
+
+
+def load(path: str, reader) -> Dict[str, float]:
+    start = time.perf_counter()
+    df = reader(path)
+    return {"seconds": time.perf_counter() - start, "memory_mb": df.memory_usage(deep=True).sum() / 1024 / 1024}
+
+
+async def main(total: int = 200000):
+    crawler_type_var.set("search")
+    comments = make_comments(total)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        class TmpCsvStore(XhsCsvStoreImplement):
+            csv_store_path = os.path.join(tmp_dir, "csv")
+
+        class TmpParquetStore(XhsParquetStoreImplement):
+            parquet_store_path = os.path.join(tmp_dir, "parquet")
+
+        results = {}
+        for name, store_class, reader in (
+                ("csv", TmpCsvStore, lambda p: pd.read_csv(p, encoding="utf-8-sig")),
+                ("parquet", TmpParquetStore, pd.read_parquet),
+        ):
+            write_seconds = await write(store_class, comments)
+            path = store_class().make_save_file_name("comments")
+            results[name] = {"rows_per_sec": total / write_seconds, "size_mb": os.path.getsize(path) / 1024 / 1024,
+                             **load(path, reader)}
+
+    print(f"comments={total}")
+    print(f"{'':8s} {'write rows/s':>14s} {'size MB':>10s} {'load s':>10s} {'pandas MB':>10s}")
+    for name, r in results.items():
+        print(f"{name:8s} {r['rows_per_sec']:14.1f} {r['size_mb']:10.2f} {r['seconds']:10.3f} {r['memory_mb']:10.2f}")
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:2]]
+    asyncio.get_event_loop().run_until_complete(main(*args))
@@ -0,0 +1,151 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 已入库 ID 索引：重复抓取同一批评论时的数据库往返次数、写入行数，以及每百万个 ID 的内存占用
+#            第一次运行写入全部评论；第二次运行（新进程，索引从库中预热）抓到的评论 90% 没有变化、5% 有变化、5% 是新评论
+#            数据库使用 benchmarks/bench_batch_upsert.py 中的 SQLite 替身，每条语句额外等待 rtt 毫秒模拟网络往返
+# 用法：python -m benchmarks.bench_seen_id_index [评论数] [每批评论数] [rtt 毫秒] [内存测试 ID 数]
+
+import asyncio
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+from unittest import mock
+
+from async_db import AsyncMysqlDB
+from benchmarks.bench_batch_upsert import SqliteStandInPool, _SqliteConnection, _SqliteCursor
+from store.xhs.xhs_store_impl import XhsDbStoreImplement
+from tools import utils
+from tools.seen_id_index import BloomFilter, SeenIdIndex, _hash128, clear_seen_id_indexes
+from var import media_crawler_db_var
+
+
+class _CountingCursor(_SqliteCursor):
+    def __init__(self, pool: "CountingPool"):
+        super().__init__(pool._conn, pool._rtt)
+        self._pool = pool
+
+    async def execute(self, sql, args=()):
+        self._pool.round_trips += 1
+        return await super().execute(sql, args)
+
+    async def executemany(self, sql, args_list):
+        args_list = list(args_list)
+        self._pool.round_trips += 1
+        self._pool.rows_sent += len(args_list)
+        return await super().executemany(sql, args_list)
+
+
+class _CountingConnection(_SqliteConnection):
+    def __init__(self, pool: "CountingPool"):
+        super().__init__(pool._conn, pool._rtt)
+        self._pool = pool
+
+    def cursor(self, cursor_class=None):
+        return _CountingCursor(self._pool)
+
+
+class CountingPool(SqliteStandInPool):
+    """统计数据库往返次数和写入语句发送的行数"""
+
+    def __init__(self, rtt: float):
+        super().__init__(rtt)
+        self.round_trips = 0
+        self.rows_sent = 0
+
+    def acquire(self):
+        return _CountingConnection(self)
+
+
+def make_comments(total: int, round_no: int) -> List[Dict]:
+    comments = []
+    for i in range(total):
+        if round_no == 1 and i >= total * 0.95:
+            # 第二次运行：最后 5% 是新评论
+            i += total
+        changed = round_no == 1 and total * 0.90 <= i < total * 0.95
+        comments.append({
+            "comment_id": f"c{i}",
+            "note_id": f"n{i // 20}",
+            "content": f"comment {i}" + (" edited" if changed else ""),
+            "like_count": i + (1 if changed else 0),
+            "last_modify_ts": utils.get_current_timestamp(),
+        })
+    return comments
+
+
+async def store_second_run(pool: CountingPool, comments: List[Dict], batch_size: int, enable_index: bool) -> Dict:
+    clear_seen_id_indexes()
+    media_crawler_db_var.set(AsyncMysqlDB(pool))
+    pool.round_trips = pool.rows_sent = 0
+    store = XhsDbStoreImplement()
+    start = time.perf_counter()
+    with mock.patch("config.ENABLE_SEEN_ID_INDEX", enable_index):
+        for offset in range(0, len(comments), batch_size):
+            await store.store_comments(comments[offset:offset + batch_size])
+    return {"seconds": time.perf_counter() - start, "round_trips": pool.round_trips, "rows_sent": pool.rows_sent}
+
+
+async def run(total: int, batch_size: int, rtt: float) -> Dict[str, Dict]:
+    result = {}
+    for enable_index in (False, True):
+        pool = CountingPool(rtt)
+        media_crawler_db_var.set(AsyncMysqlDB(pool))
+        with mock.patch("config.ENABLE_SEEN_ID_INDEX", False):
+            store = XhsDbStoreImplement()
+            first_run = make_comments(total, 0)
+            for offset in range(0, total, batch_size):
+                await store.store_comments(first_run[offset:offset + batch_size])
+        result["index" if enable_index else "no index"] = await store_second_run(
+            pool, make_comments(total, 1), batch_size, enable_index
+        )
+        assert pool.count() == total + total // 20
+    clear_seen_id_indexes()
+    return result
+
+
+def measure_memory(total: int) -> Dict[str, float]:
+    """每百万个 ID 的内存占用（MB）"""
+    tracemalloc.start()
+    bloom = BloomFilter(total, 0.01)
+    for i in range(total):
+        bloom.add(f"c{i}")
+    bloom_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    index = SeenIdIndex("xhs_note_comment", "comment_id", recent_capacity=total)
+    index.fields = ("comment_id", "content", "like_count", "note_id")
+    tracemalloc.start()
+    for i in range(total):
+        index._remember(f"c{i}", _hash128(f"comment {i}")[0])
+    recent_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    scale = 1_000_000 / total / 1024 / 1024
+    return {"bloom": bloom_bytes * scale, "recent": recent_bytes * scale}
+
+
+async def main(total: int = 5000, batch_size: int = 20, rtt_ms: int = 1, memory_ids: int = 1_000_000):
+    result = await run(total, batch_size, rtt_ms / 1000)
+    print(f"second run: comments={total} batch_size={batch_size} rtt={rtt_ms}ms (sqlite stand-in)")
+    for name, stats in result.items():
+        print(f"{name:9s}: {stats['round_trips']:6d} round trips, {stats['rows_sent']:6d} rows sent, "
+              f"{stats['seconds']:.2f}s")
+
+    memory = measure_memory(memory_ids)
+    print(f"memory per 1M ids: bloom(1%) {memory['bloom']:.1f}MB, recent fingerprints {memory['recent']:.1f}MB")
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:5]]
+    asyncio.get_event_loop().run_until_complete(main(*args))
@@ -16,7 +16,7 @@
 # @Desc    : 抽象类
 
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 
 class AbstractCache(ABC):
@@ -51,3 +51,67 @@ class AbstractCache(ABC):
         :return:
         """
         raise NotImplementedError
+
+
+class AbstractAsyncCache(ABC):
+    """
+    异步缓存接口，在事件循环中使用（例如 AsyncRedisCache），方法与 AbstractCache 一一对应
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        从缓存中获取键的值
+        :param key: 键
+        :return:
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, expire_time: int) -> None:
+        """
+        将键的值设置到缓存中
+        :param key: 键
+        :param value: 值
+        :param expire_time: 过期时间
+        :return:
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def keys(self, pattern: str) -> List[str]:
+        """
+        获取所有符合pattern的key
+        :param pattern: 匹配模式
+        :return:
+        """
+        raise NotImplementedError
+
+    async def mget(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        批量获取，只返回存在的键，子类可以覆盖为一次往返的实现
+        :param keys: 键列表
+        :return:
+        """
+        result = {}
+        for key in keys:
+            value = await self.get(key)
+            if value is not None:
+                result[key] = value
+        return result
+
+    async def mset(self, mapping: Dict[str, Any], expire_time: int) -> None:
+        """
+        批量设置，所有键使用相同的过期时间，子类可以覆盖为一次往返的实现
+        :param mapping: key -> value
+        :param expire_time: 过期时间
+        :return:
+        """
+        for key, value in mapping.items():
+            await self.set(key, value, expire_time)
+
+    async def close(self) -> None:
+        """
+        释放连接等资源
+        :return:
+        """
@@ -0,0 +1,133 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 异步 Redis 缓存（redis.asyncio），在事件循环中使用，不会像 RedisCache 那样阻塞事件循环
+#            - 连接池复用连接，最大连接数 REDIS_CACHE_MAX_CONNECTIONS，连接用完时排队等待
+#            - mget 使用 MGET、mset 使用非事务 pipeline，一批键只需要一次往返
+#            - keys() 使用 SCAN 增量遍历，不会像 KEYS 那样长时间阻塞 redis 服务端
+#            - 值默认按 JSON 编码（可选 msgpack），pickle 需要显式开启，见 cache/serializer.py
+
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from redis.asyncio import BlockingConnectionPool, Redis
+
+from cache.abs_cache import AbstractAsyncCache
+from cache.serializer import CacheSerializer
+from config import db_config
+from tools import utils
+
+
+class AsyncRedisCache(AbstractAsyncCache):
+
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None, db: Optional[int] = None,
+                 password: Optional[str] = None, serializer: Optional[CacheSerializer] = None,
+                 max_connections: Optional[int] = None):
+        """
+        参数为空时读取 config.db_config 中的 redis 配置
+        :param serializer: 值编码方式，默认按 REDIS_CACHE_SERIALIZER、REDIS_CACHE_ALLOW_PICKLE 创建
+        :param max_connections: 连接池最大连接数
+        """
+        self._serializer = serializer or CacheSerializer(db_config.REDIS_CACHE_SERIALIZER,
+                                                         allow_pickle=db_config.REDIS_CACHE_ALLOW_PICKLE)
+        # 连接用完时等待其他协程归还连接，而不是像 ConnectionPool 那样直接抛出 Too many connections
+        self._pool = BlockingConnectionPool(
+            host=host or db_config.REDIS_DB_HOST,
+            port=int(port or db_config.REDIS_DB_PORT),
+            db=int(db_config.REDIS_DB_NUM if db is None else db),
+            password=db_config.REDIS_DB_PWD if password is None else password,
+            max_connections=max_connections or db_config.REDIS_CACHE_MAX_CONNECTIONS,
+        )
+        self._redis_client = Redis(connection_pool=self._pool)
+
+    def _loads(self, key: str, data: Optional[bytes]) -> Optional[Any]:
+        if data is None:
+            return None
+        try:
+            return self._serializer.loads(data)
+        except Exception as e:
+            # 无法解码的值（例如未开启 allow_pickle 时读到 RedisCache 写入的 pickle 值）按缓存未命中处理
+            utils.logger.warning(f"[AsyncRedisCache._loads] decode {key} error: {e}")
+            return None
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        从缓存中获取键的值, 并且反序列化
+        :param key:
+        :return:
+        """
+        return self._loads(key, await self._redis_client.get(key))
+
+    async def set(self, key: str, value: Any, expire_time: int) -> None:
+        """
+        将键的值设置到缓存中, 并且序列化
+        :param key:
+        :param value:
+        :param expire_time: 过期时间（秒）
+        :return:
+        """
+        await self._redis_client.set(key, self._serializer.dumps(value), ex=expire_time)
+
+    async def mget(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        一次 MGET 批量获取，只返回存在的键
+        :param keys:
+        :return:
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        result = {}
+        for key, data in zip(keys, await self._redis_client.mget(keys)):
+            value = self._loads(key, data)
+            if value is not None:
+                result[key] = value
+        return result
+
+    async def mset(self, mapping: Dict[str, Any], expire_time: int) -> None:
+        """
+        批量设置，所有 SET 命令放在一个非事务 pipeline 中一次发送（MSET 不支持过期时间）
+        :param mapping: key -> value
+        :param expire_time: 过期时间（秒）
+        :return:
+        """
+        if not mapping:
+            return
+        async with self._redis_client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, self._serializer.dumps(value), ex=expire_time)
+            await pipe.execute()
+
+    async def iter_keys(self, pattern: str, count: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        使用 SCAN 增量遍历符合pattern的key，遍历期间新增或删除的键可能出现也可能不出现（与 SCAN 语义一致）
+        :param pattern: glob 匹配模式
+        :param count: 每次 SCAN 返回的键数量提示，默认 REDIS_CACHE_SCAN_COUNT
+        :return:
+        """
+        async for key in self._redis_client.scan_iter(match=pattern, count=count or db_config.REDIS_CACHE_SCAN_COUNT):
+            yield key.decode()
+
+    async def keys(self, pattern: str) -> List[str]:
+        """
+        获取所有符合pattern的key
+        :param pattern: glob 匹配模式
+        :return:
+        """
+        # SCAN 可能重复返回同一个键，这里去重
+        return list(dict.fromkeys([key async for key in self.iter_keys(pattern)]))
+
+    async def close(self) -> None:
+        """
+        关闭连接池
+        :return:
+        """
+        await self._redis_client.close(close_connection_pool=True)
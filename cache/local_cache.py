@@ -14,24 +14,52 @@
 # @Name    : 程序员阿江-Relakkes
 # @Time    : 2024/6/2 11:05
 # @Desc    : 本地缓存
+#            - 过期时间保存在最小堆中，清理时只弹出堆顶已过期的键，代价与过期键的数量成正比（不再每次扫描全部键）
+#            - 键按最近访问排序，超过 max_size 时淘汰最久没有访问的键（LRU）
+#            - keys() 按 glob 规则匹配（*、?、[abc]、[!abc]），与 RedisCache 的 KEYS 一致
+#            性能见 benchmarks/bench_local_cache.py
 
 import asyncio
+import fnmatch
+import functools
+import heapq
+import re
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
+import config
 from cache.abs_cache import AbstractCache
 
 
+@functools.lru_cache(maxsize=128)
+def _compile_pattern(pattern: str) -> Tuple[str, Optional[Callable[[str], Any]]]:
+    """
+    把 glob 模式编译为 (前缀, 正则匹配函数)，Redis 风格的 [^abc] 与 [!abc] 等价；
+    最常见的 "prefix*" 不需要正则，返回 (prefix, None) 直接按前缀比较
+    """
+    prefix = pattern[:-1]
+    if pattern.endswith("*") and not any(char in prefix for char in "*?["):
+        return prefix, None
+    return "", re.compile(fnmatch.translate(pattern.replace("[^", "[!"))).match
+
+
 class ExpiringLocalCache(AbstractCache):
 
-    def __init__(self, cron_interval: int = 10):
+    def __init__(self, cron_interval: int = 10, max_size: Optional[int] = None):
         """
         初始化本地缓存
         :param cron_interval: 定时清楚cache的时间间隔
+        :param max_size: 最多保存的键数量，超过时淘汰最久没有访问的键，默认读取 config.LOCAL_CACHE_MAX_SIZE，0 表示不限制
         :return:
         """
         self._cron_interval = cron_interval
-        self._cache_container: Dict[str, Tuple[Any, float]] = {}
+        self._max_size = config.LOCAL_CACHE_MAX_SIZE if max_size is None else max_size
+        # key -> (value, 过期时间)，按最近访问排序，最久没有访问的在最前面
+        self._cache_container: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        # (过期时间, key) 最小堆；键被覆盖或淘汰后堆中的旧记录不立即删除，弹出时与 _cache_container 比对后忽略
+        self._expire_heap: List[Tuple[float, str]] = []
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
         self._cron_task: Optional[asyncio.Task] = None
         # 开启定时清理任务
         self._schedule_clear()
@@ -44,47 +72,103 @@ class ExpiringLocalCache(AbstractCache):
         if self._cron_task is not None:
             self._cron_task.cancel()
 
+    def __len__(self) -> int:
+        return len(self._cache_container)
+
     def get(self, key: str) -> Optional[Any]:
         """
         从缓存中获取键的值
         :param key:
         :return:
         """
-        value, expire_time = self._cache_container.get(key, (None, 0))
-        if value is None:
+        entry = self._cache_container.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
             return None
 
         # 如果键已过期，则删除键并返回None
-        if expire_time < time.time():
+        value, expire_at = entry
+        if expire_at <= time.monotonic():
             del self._cache_container[key]
+            self.stats["expirations"] += 1
+            self.stats["misses"] += 1
             return None
 
+        self._cache_container.move_to_end(key)
+        self.stats["hits"] += 1
         return value
 
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        批量获取，只返回存在且没有过期的键
+        :param keys:
+        :return:
+        """
+        result = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                result[key] = value
+        return result
+
     def set(self, key: str, value: Any, expire_time: int) -> None:
         """
         将键的值设置到缓存中
         :param key:
         :param value:
-        :param expire_time:
+        :param expire_time: 过期时间（秒）
+        :return:
+        """
+        now = time.monotonic()
+        self._clear(now)
+        self._put(key, value, now + expire_time)
+
+    def set_many(self, mapping: Dict[str, Any], expire_time: int) -> None:
+        """
+        批量设置，所有键使用相同的过期时间
+        :param mapping: key -> value
+        :param expire_time: 过期时间（秒）
         :return:
         """
-        self._cache_container[key] = (value, time.time() + expire_time)
+        now = time.monotonic()
+        self._clear(now)
+        expire_at = now + expire_time
+        for key, value in mapping.items():
+            self._put(key, value, expire_at)
+
+    def _put(self, key: str, value: Any, expire_at: float):
+        container = self._cache_container
+        if key in container:
+            container.move_to_end(key)
+        container[key] = (value, expire_at)
+        heapq.heappush(self._expire_heap, (expire_at, key))
+        if self._max_size and len(container) > self._max_size:
+            container.popitem(last=False)
+            self.stats["evictions"] += 1
+        # 被覆盖、淘汰的键在堆中留下的旧记录过多时重建堆，重建的代价分摊到每次写入上仍是 O(1)
+        if len(self._expire_heap) > 2 * len(container) + 1024:
+            self._rebuild_heap()
+
+    def _rebuild_heap(self):
+        self._expire_heap = [(expire_at, key) for key, (_, expire_at) in self._cache_container.items()]
+        heapq.heapify(self._expire_heap)
 
     def keys(self, pattern: str) -> List[str]:
         """
         获取所有符合pattern的key
-        :param pattern: 匹配模式
+        :param pattern: glob 匹配模式，例如 "xhs_*"、"user_?"
         :return:
         """
+        self._clear()
+        # 按底层 dict 的插入顺序遍历，比沿 OrderedDict 的 LRU 链表遍历快数倍，keys() 不需要保证顺序
+        names = dict.keys(self._cache_container)
         if pattern == '*':
-            return list(self._cache_container.keys())
-
-        # 本地缓存通配符暂时将*替换为空
-        if '*' in pattern:
-            pattern = pattern.replace('*', '')
+            return list(names)
 
-        return [key for key in self._cache_container.keys() if pattern in key]
+        prefix, match = _compile_pattern(pattern)
+        if match is None:
+            return [key for key in names if key.startswith(prefix)]
+        return [key for key in names if match(key)]
 
     def _schedule_clear(self):
         """
@@ -100,14 +184,22 @@ class ExpiringLocalCache(AbstractCache):
 
         self._cron_task = loop.create_task(self._start_clear_cron())
 
-    def _clear(self):
+    def _clear(self, now: Optional[float] = None):
         """
-        根据过期时间清理缓存
+        根据过期时间清理缓存，只弹出堆顶已经过期的记录
+        :param now: 当前时间（time.monotonic()）
         :return:
         """
-        for key, (value, expire_time) in self._cache_container.items():
-            if expire_time < time.time():
-                del self._cache_container[key]
+        now = time.monotonic() if now is None else now
+        heap = self._expire_heap
+        container = self._cache_container
+        while heap and heap[0][0] <= now:
+            expire_at, key = heapq.heappop(heap)
+            entry = container.get(key)
+            # 键被重新设置过（过期时间不同）或者已经被删除时，这是一条旧记录
+            if entry is not None and entry[1] == expire_at:
+                del container[key]
+                self.stats["expirations"] += 1
 
     async def _start_clear_cron(self):
         """
@@ -120,12 +212,15 @@ class ExpiringLocalCache(AbstractCache):
 
 
 if __name__ == '__main__':
-    cache = ExpiringLocalCache(cron_interval=2)
+    cache = ExpiringLocalCache(cron_interval=2, max_size=2)
     cache.set('name', '程序员阿江-Relakkes', 3)
-    print(cache.get('key'))
-    print(cache.keys("*"))
+    print(cache.get('name'))
+    print(cache.keys("na*"))
+    cache.set('a', 1, 10)
+    cache.set('b', 2, 10)
+    print(cache.keys("*"), cache.stats)
     time.sleep(4)
-    print(cache.get('key'))
+    print(cache.get('name'))
     del cache
     time.sleep(1)
     print("done")
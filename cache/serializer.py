@@ -0,0 +1,91 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 缓存值序列化
+#            编码结果的第一个字节是类型标记：s 字符串、b 字节串、j JSON、m msgpack；
+#            pickle 编码不加标记（以协议字节 0x80 开头），与 RedisCache 写入的值兼容，只有 allow_pickle 时才会反序列化
+#            （反序列化不可信的 pickle 数据可以执行任意代码）
+
+import json
+import pickle
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+SERIALIZER_JSON = "json"
+SERIALIZER_MSGPACK = "msgpack"
+SERIALIZER_PICKLE = "pickle"
+
+_TAG_STR = b"s"
+_TAG_BYTES = b"b"
+_TAG_JSON = b"j"
+_TAG_MSGPACK = b"m"
+_TAG_PICKLE = b"\x80"
+
+
+class CacheSerializer:
+    """
+    缓存值编解码，字符串和字节串不经过 JSON/msgpack 直接保存
+    JSON 与 msgpack 不能表示的类型（例如自定义对象）在 allow_pickle 时改用 pickle，否则抛出 TypeError；
+    注意 JSON 会把元组变成列表、把字典的非字符串键变成字符串
+    """
+
+    def __init__(self, fmt: str = SERIALIZER_JSON, allow_pickle: bool = False):
+        """
+        Args:
+            fmt: json | msgpack | pickle
+            allow_pickle: 是否允许写入、读取 pickle 编码的值，fmt 为 pickle 时总是允许
+        """
+        if fmt not in (SERIALIZER_JSON, SERIALIZER_MSGPACK, SERIALIZER_PICKLE):
+            raise ValueError(f"Unknown cache serializer: {fmt}")
+        if fmt == SERIALIZER_MSGPACK and msgpack is None:
+            raise ImportError("msgpack cache serializer requires msgpack, please run: pip install msgpack")
+        self.fmt = fmt
+        self.allow_pickle = allow_pickle or fmt == SERIALIZER_PICKLE
+
+    def dumps(self, value: Any) -> bytes:
+        if isinstance(value, str):
+            return _TAG_STR + value.encode("utf-8")
+        if isinstance(value, bytes):
+            return _TAG_BYTES + value
+        if self.fmt == SERIALIZER_PICKLE:
+            return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            if self.fmt == SERIALIZER_MSGPACK:
+                return _TAG_MSGPACK + msgpack.packb(value, use_bin_type=True)
+            return _TAG_JSON + json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        except (TypeError, ValueError, OverflowError):
+            if not self.allow_pickle:
+                raise TypeError(f"{type(value).__name__} value is not {self.fmt} serializable, "
+                                f"enable allow_pickle to store it with pickle")
+            return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data: bytes) -> Any:
+        tag, payload = data[:1], data[1:]
+        if tag == _TAG_STR:
+            return payload.decode("utf-8")
+        if tag == _TAG_BYTES:
+            return payload
+        if tag == _TAG_JSON:
+            return json.loads(payload)
+        if tag == _TAG_MSGPACK:
+            if msgpack is None:
+                raise ImportError("cached value is msgpack encoded, please run: pip install msgpack")
+            return msgpack.unpackb(payload, raw=False)
+        if tag == _TAG_PICKLE:
+            if not self.allow_pickle:
+                raise ValueError("cached value is pickle encoded, enable allow_pickle to read it")
+            return pickle.loads(data)
+        raise ValueError(f"Unknown cached value tag: {tag!r}")
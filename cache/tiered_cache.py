@@ -0,0 +1,252 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 二级缓存：先查进程内的 ExpiringLocalCache，再查 Redis（TIERED_CACHE_USE_REDIS 时，多个爬虫进程共享）
+#            - get_or_load：同一个键同时未命中时只调用一次 loader，其余协程等待这次加载的结果（single-flight）
+#            - “不存在”的结果（None 或空的 dict/list）按 TIERED_CACHE_NEGATIVE_TTL_SEC 短时间缓存，避免反复请求
+#            - 返回的 dict/list 是缓存内容的深拷贝，调用方修改返回值不会影响缓存
+#            用于作者信息、被多个关键词重复搜到的笔记详情，见 tiered_cached 的使用处
+
+import asyncio
+import copy
+import functools
+import inspect
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import config
+from cache.abs_cache import AbstractAsyncCache
+from cache.local_cache import ExpiringLocalCache
+from tools import utils
+
+# 缓存“不存在”（None）时保存的标记值，ExpiringLocalCache 和 Redis 都不能直接保存 None
+NOT_FOUND = "__tiered_cache_not_found__"
+
+
+def _is_negative(value: Any) -> bool:
+    return value is None or (isinstance(value, (dict, list, tuple)) and not value)
+
+
+def _copy(value: Any) -> Any:
+    return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+
+class TieredCache(AbstractAsyncCache):
+
+    def __init__(self, local: Optional[ExpiringLocalCache] = None, remote: Optional[AbstractAsyncCache] = None,
+                 local_ttl: Optional[int] = None, negative_ttl: Optional[int] = None):
+        """
+        :param local: 进程内缓存
+        :param remote: 共享缓存（例如 AsyncRedisCache），为空时只使用进程内缓存
+        :param local_ttl: 有共享缓存时进程内缓存的最长保存时间（秒），默认 TIERED_CACHE_LOCAL_TTL_SEC，
+                          限制其他进程更新共享缓存后本进程读到旧值的时间
+        :param negative_ttl: “不存在”结果的缓存时间（秒），默认 TIERED_CACHE_NEGATIVE_TTL_SEC
+        """
+        self.local = local or ExpiringLocalCache()
+        self.remote = remote
+        self.local_ttl = config.TIERED_CACHE_LOCAL_TTL_SEC if local_ttl is None else local_ttl
+        self.negative_ttl = config.TIERED_CACHE_NEGATIVE_TTL_SEC if negative_ttl is None else negative_ttl
+        self.stats = {"local_hits": 0, "remote_hits": 0, "misses": 0, "negative_hits": 0,
+                      "loads": 0, "coalesced": 0, "remote_errors": 0}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _local_expire(self, expire_time: int) -> int:
+        return expire_time if self.remote is None else min(expire_time, self.local_ttl)
+
+    async def _lookup(self, key: str) -> Tuple[bool, Any]:
+        """
+        依次查询两级缓存
+        :return: (是否命中, 值)，命中“不存在”标记时值为 None
+        """
+        value = self.local.get(key)
+        if value is not None:
+            self.stats["local_hits"] += 1
+        elif self.remote is not None:
+            try:
+                value = await self.remote.get(key)
+            except Exception as e:
+                # Redis 不可用时退化为只用进程内缓存，不影响抓取
+                self.stats["remote_errors"] += 1
+                utils.logger.warning(f"[TieredCache._lookup] remote get {key} error: {e}")
+            if value is not None:
+                self.stats["remote_hits"] += 1
+                self.local.set(key, value, self.local_ttl)
+        if value is None:
+            self.stats["misses"] += 1
+            return False, None
+        if value == NOT_FOUND:
+            self.stats["negative_hits"] += 1
+            return True, None
+        return True, _copy(value)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        从缓存中获取键的值
+        :param key:
+        :return:
+        """
+        _, value = await self._lookup(key)
+        return value
+
+    async def set(self, key: str, value: Any, expire_time: int) -> None:
+        """
+        写入两级缓存，值为 None 时写入“不存在”标记
+        :param key:
+        :param value:
+        :param expire_time: 过期时间（秒）
+        :return:
+        """
+        value = NOT_FOUND if value is None else value
+        self.local.set(key, value, self._local_expire(expire_time))
+        if self.remote is not None:
+            try:
+                await self.remote.set(key, value, expire_time)
+            except Exception as e:
+                self.stats["remote_errors"] += 1
+                utils.logger.warning(f"[TieredCache.set] remote set {key} error: {e}")
+
+    async def keys(self, pattern: str) -> List[str]:
+        """
+        获取两级缓存中所有符合pattern的key
+        :param pattern: glob 匹配模式
+        :return:
+        """
+        keys = self.local.keys(pattern)
+        if self.remote is not None:
+            try:
+                keys += await self.remote.keys(pattern)
+            except Exception as e:
+                self.stats["remote_errors"] += 1
+                utils.logger.warning(f"[TieredCache.keys] remote keys {pattern} error: {e}")
+        return list(dict.fromkeys(keys))
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]], expire_time: int,
+                          negative_ttl: Optional[int] = None) -> Any:
+        """
+        获取缓存值，未命中时调用 loader 加载并写入缓存；同一个键同时只有一个 loader 在运行
+        loader 抛出的异常会传给所有等待的协程，不会被缓存
+        :param key: 缓存键，例如 xhs:creator:<user_id>
+        :param loader: 异步加载函数
+        :param expire_time: 缓存时间（秒）
+        :param negative_ttl: “不存在”结果的缓存时间（秒），默认 self.negative_ttl，0 表示不缓存
+        :return:
+        """
+        hit, value = await self._lookup(key)
+        if hit:
+            return value
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            try:
+                return _copy(await asyncio.shield(future))
+            except asyncio.CancelledError:
+                # 负责加载的协程被取消了，自己重新加载；自身被取消时照常抛出
+                if future.cancelled():
+                    return await self.get_or_load(key, loader, expire_time, negative_ttl)
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+            self.stats["loads"] += 1
+            if not _is_negative(value):
+                await self.set(key, value, expire_time)
+            else:
+                negative_ttl = self.negative_ttl if negative_ttl is None else negative_ttl
+                if negative_ttl > 0:
+                    await self.set(key, value, negative_ttl)
+            future.set_result(value)
+            return _copy(value)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 没有协程等待时避免 “Future exception was never retrieved” 警告
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def close(self) -> None:
+        """
+        关闭共享缓存的连接，停止进程内缓存的定时清理任务
+        :return:
+        """
+        if self.local._cron_task is not None:
+            self.local._cron_task.cancel()
+        if self.remote is not None:
+            await self.remote.close()
+
+
+_tiered_cache: Optional[TieredCache] = None
+
+
+def get_tiered_cache() -> TieredCache:
+    """
+    获取进程内共享的二级缓存，TIERED_CACHE_USE_REDIS 时第二级使用 AsyncRedisCache
+    """
+    global _tiered_cache
+    if _tiered_cache is None:
+        remote = None
+        if config.TIERED_CACHE_USE_REDIS:
+            from cache.cache_factory import CacheFactory
+            remote = CacheFactory.create_cache(config.CACHE_TYPE_REDIS_ASYNC)
+        _tiered_cache = TieredCache(remote=remote)
+    return _tiered_cache
+
+
+async def close_tiered_cache():
+    """
+    输出命中统计并关闭连接，程序退出时调用
+    """
+    global _tiered_cache
+    if _tiered_cache is None:
+        return
+    cache, _tiered_cache = _tiered_cache, None
+    utils.logger.info(f"[tiered_cache.close_tiered_cache] stats: {cache.stats}")
+    try:
+        await cache.close()
+    except Exception as e:
+        utils.logger.error(f"[tiered_cache.close_tiered_cache] close error: {e}")
+
+
+def tiered_cached(key_template: str, ttl_config_name: str, negative_ttl: Optional[int] = None):
+    """
+    用二级缓存包装 API client 的异步方法，未开启 ENABLE_TIERED_CACHE 时直接调用原方法
+    用法：
+        @tiered_cached("xhs:creator:{user_id}", "CREATOR_INFO_CACHE_TTL_SEC")
+        async def get_creator_info(self, user_id: str) -> Dict: ...
+    :param key_template: 缓存键模板，按方法的参数名格式化
+    :param ttl_config_name: 缓存时间对应的配置项名称（调用时读取，便于运行时修改配置）
+    :param negative_ttl: “不存在”结果的缓存时间，0 表示不缓存（例如空结果可能只是被限流）
+    """
+
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not config.ENABLE_TIERED_CACHE:
+                return await func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = key_template.format(**bound.arguments)
+            return await get_tiered_cache().get_or_load(
+                key, lambda: func(*args, **kwargs), getattr(config, ttl_config_name), negative_ttl
+            )
+
+        return wrapper
+
+    return decorator
@@ -38,6 +38,40 @@ IP_PROXY_POOL_COUNT = 2
 # 代理IP提供商名称
 IP_PROXY_PROVIDER_NAME = "kuaidaili"
 
+# 后台验证代理的间隔（秒），验证不阻塞取代理
+IP_PROXY_VALIDATE_INTERVAL_SEC = 60
+
+# 同时验证的代理数量
+IP_PROXY_VALIDATE_CONCURRENCY = 10
+
+# 验证请求的超时时间（秒）
+IP_PROXY_VALIDATE_TIMEOUT = 10
+
+# 代理成功率、延迟的指数衰减系数：最近一次请求结果所占的权重
+IP_PROXY_HEALTH_DECAY = 0.3
+
+# 成功率低于该值的代理移出代理池
+IP_PROXY_MIN_SUCCESS_RATE = 0.3
+
+# 代理过期前多少秒停止分配，避免请求进行中代理过期
+IP_PROXY_EXPIRE_MARGIN_SEC = 30
+
+# 是否开启代理轮换（需要开启 ENABLE_IP_PROXY）：API 请求由 HTTP 传输层从代理池选择代理，
+# 代理出现连接错误、限流状态码或 IP 被封时隔离该代理，换一个代理重试
+ENABLE_PROXY_ROTATION = False
+
+# 代理轮换模式：request 每个请求重新选择代理 | sticky 每个平台 client（账号）固定一个代理，被隔离后才更换
+PROXY_ROTATION_MODE = "sticky"
+
+# 请求失败后换代理重试的次数
+PROXY_ROTATION_MAX_RETRIES = 2
+
+# 代理第一次被隔离的时间（秒），连续被隔离时翻倍
+PROXY_QUARANTINE_BASE_SEC = 30
+
+# 代理隔离时间上限（秒）
+PROXY_QUARANTINE_MAX_SEC = 600
+
 # ==================== 快代理配置 ====================
 # 快代理用户名
 KDL_USER_NAME = "d2867368032"
@@ -51,6 +85,55 @@ KDL_SECRET_ID = "olj9unpyex5nffwhecl6"
 # 快代理签名
 KDL_SIGNATURE = "n1zziu4o3uqz7w23ct8fveqnwy9x07vr"
 
+# ==================== HTTP 连接池配置 ====================
+# 各平台 API client 共享长连接池（tools/http_transport.py），每个代理一个连接池
+# 是否启用 HTTP/2，需要额外安装 h2 依赖：pip install httpx[http2]
+ENABLE_HTTP2 = False
+
+# 单个连接池的最大连接数
+HTTP_POOL_MAX_CONNECTIONS = 100
+
+# 单个连接池保持的最大空闲长连接数
+HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS = 20
+
+# 空闲长连接的过期时间（秒）
+HTTP_POOL_KEEPALIVE_EXPIRY = 30
+
+# 每个 transport 最多保留多少个代理的连接池，超过时关闭最久未使用的（等其上的请求结束后再关闭）
+HTTP_POOL_MAX_PROXY_CLIENTS = 32
+
+# 常驻 JS 签名进程数量（抖音 a_bogus、知乎 x-zse-96 签名，见 tools/js_sign_pool.py）
+JS_SIGN_POOL_SIZE = 2
+
+# 等待签名进程返回一次结果的最长时间（秒），超时后重启该进程
+JS_SIGN_TIMEOUT_SEC = 10
+
+# 签名上下文（小红书 b1、B站 wbi key、抖音 msToken）的缓存时间（秒），见 tools/signing_context.py
+# 调用 update_cookies 时会立即失效并重新从浏览器读取
+SIGN_CONTEXT_TTL_SEC = 600
+
+# ==================== 自适应限速配置 ====================
+# 开启后所有平台 client 的请求都经过全局调度器（tools/rate_limiter.py）：
+# 按 (域名, 接口类型) 的令牌桶控制速率，按域名的 AIMD 并发窗口根据延迟和限流信号自动调整，
+# 此时翻页之间固定的 crawl_interval 休眠不再生效，MAX_CONCURRENCY_NUM 由 RATE_LIMIT_MAX_CONCURRENCY 代替
+ENABLE_ADAPTIVE_RATE_LIMIT = False
+
+# 各接口类型的速率限制：(每秒请求数, 突发请求数)
+RATE_LIMIT_ENDPOINT_RATES = {
+    "search": (0.5, 1),
+    "detail": (2, 4),
+    "comments": (2, 4),
+    "media": (10, 20),
+    "default": (1, 2),
+}
+
+# 每个域名的初始并发窗口和最大并发窗口
+RATE_LIMIT_INITIAL_CONCURRENCY = 2
+RATE_LIMIT_MAX_CONCURRENCY = 8
+
+# 请求延迟目标（秒），超过后缓慢缩小并发窗口
+RATE_LIMIT_LATENCY_TARGET_SEC = 3
+
 # 设置为True不会打开浏览器（无头浏览器）
 # 设置False会打开一个浏览器
 # 小红书如果一直扫码登录不通过，打开浏览器手动过一下滑动验证码
@@ -91,8 +174,26 @@ BROWSER_LAUNCH_TIMEOUT = 30
 # 设置为False可以保持浏览器运行，便于调试
 AUTO_CLOSE_BROWSER = True
 
-# 数据保存类型选项配置,支持三种类型：csv、db、json, 最好保存到DB，有排重的功能。
-SAVE_DATA_OPTION = "db"  # csv or db or json
+# 数据保存类型选项配置,支持六种类型：csv、db、sqlite、json、jsonl、parquet, 最好保存到DB，有排重的功能。
+# sqlite 使用本地数据库文件（config.SQLITE_DB_PATH），表结构与 db 相同，不需要部署 MySQL
+# jsonl 每行一条记录、只追加写入，数据量大时代替 json（json 每写一条都要重写整个文件）
+# parquet 列式压缩存储，适合用 pandas 做数据分析，需要安装 pyarrow
+SAVE_DATA_OPTION = "db"  # csv or db or sqlite or json or jsonl or parquet
+
+# jsonl 存储在程序退出时是否同时导出旧的 JSON 数组格式（与 json 存储的文件格式一致）
+JSONL_EXPORT_JSON_ON_CLOSE = False
+
+# csv 存储的文件句柄在运行期间保持打开，数据先写入缓冲区，最多间隔多少秒写入一次文件（程序退出时全部写入）
+CSV_FLUSH_INTERVAL_SEC = 5
+
+# parquet 存储每攒够多少条记录写入一个 row group（程序退出前记录保存在内存中，异常退出时未关闭的文件无法读取）
+PARQUET_ROW_GROUP_SIZE = 5000
+
+# parquet 存储的压缩算法：zstd、snappy、gzip、none
+PARQUET_COMPRESSION = "zstd"
+
+# parquet 存储中使用字典编码的列（重复值多的列）
+PARQUET_DICTIONARY_COLUMNS = ["source_keyword", "ip_location", "nickname"]
 
 # 用户浏览器缓存的浏览器文件配置
 USER_DATA_DIR = "%s_user_data_dir"  # %s will be replaced by platform name
@@ -329,6 +430,96 @@ ENABLE_SMART_SEARCH = True
 # 连续空页面阈值（连续遇到多少个空页面后停止该关键词）
 EMPTY_PAGE_THRESHOLD = 3
 
+# ==================== 抓取流水线配置 ====================
+# 是否启用分阶段抓取流水线（tools/crawl_pipeline.py），仅对走通用搜索流程 search_with_resume 的平台生效
+# 开启后搜索翻页、详情、存储、媒体、评论各阶段并行重叠执行，不再是一页处理完才请求下一页
+ENABLE_CRAWL_PIPELINE = False
+
+# 各阶段的 worker 数量
+CRAWL_PIPELINE_WORKERS = {
+    "detail": 4,
+    "store": 1,
+    "media": 2,
+    "comments": 2,
+}
+
+# 每个阶段输入队列的容量，队列写满后上游阶段等待（背压），控制内存占用
+CRAWL_PIPELINE_QUEUE_SIZE = 20
+
+# 流水线指标（各阶段吞吐、队列深度）的日志打印间隔（秒）
+CRAWL_PIPELINE_METRICS_INTERVAL = 30
+
+# 同时爬取的关键词数量，1 表示按顺序逐个爬取（仅对走通用搜索流程 search_with_resume 的平台生效）
+KEYWORD_CONCURRENCY = 1
+
+# 关键词并行时，每个关键词每轮最多爬取的页数，用完后让出名额排到队尾，避免页数很深的关键词饿死其他关键词
+KEYWORD_PAGES_PER_TURN = 5
+
+# ==================== 写缓冲配置 ====================
+# 是否启用写缓冲（store/write_behind.py），开启后内容、评论、创作者先写入内存缓冲区，由后台任务批量落库/落盘，
+# 抓取流程不再等待存储；爬虫 close() 和 Ctrl+C 退出时会把缓冲区写完
+ENABLE_WRITE_BEHIND_STORE = True
+
+# 缓冲区达到多少条时立即写入
+WRITE_BEHIND_BATCH_SIZE = 50
+
+# 缓冲区中最早的数据等待超过多少秒时写入
+WRITE_BEHIND_FLUSH_INTERVAL_SEC = 2
+
+# 缓冲区加写入中的数据上限，超过后存储调用方等待（背压），控制内存占用
+WRITE_BEHIND_MAX_PENDING = 2000
+
+# 写入失败后的重试次数，重试仍失败的数据追加到死信文件，退出时 drain_all 报告失败数量
+WRITE_BEHIND_MAX_RETRIES = 3
+
+# 死信文件目录，每个写缓冲存储、每种数据类型一个 JSONL 文件，例如 xhs_db_contents.jsonl
+WRITE_BEHIND_DEAD_LETTER_DIR = "data/write_behind_dead_letter"
+
+# ==================== 已入库ID索引配置 ====================
+# 是否启用已入库 ID 索引（tools/seen_id_index.py），db/sqlite 存储批量写入内容和评论前，
+# 跳过库中已有且内容没有变化的记录（只比较除 add_ts、last_modify_ts 以外的字段）
+ENABLE_SEEN_ID_INDEX = True
+
+# 布隆过滤器误判率，误判只会让记录照常 upsert，不会漏写
+SEEN_ID_BLOOM_ERROR_RATE = 0.01
+
+# 布隆过滤器的最小容量（ID 数），实际容量为 max(表中记录数 * 2, 该值)，写满后自动扩容
+SEEN_ID_BLOOM_MIN_CAPACITY = 1000000
+
+# 每张表保存内容指纹的最近记录数，每百万条约占用 155MB 内存
+SEEN_ID_RECENT_CAPACITY = 200000
+
+# 启动预热时每次从库中读取的记录数
+SEEN_ID_WARM_CHUNK_SIZE = 5000
+
+# ==================== 看板统计汇总表配置 ====================
+# 是否在 db/sqlite 存储写入内容和评论后更新看板统计汇总表 content_daily_stats（tools/stats_rollup.py），
+# 按平台、发布日期、来源关键词汇总内容数、评论数和情感分布；已有数据执行 python -m analysis_job.stats_rollup_rebuild 重建
+ENABLE_STATS_ROLLUP = True
+
+# 写入后最多间隔多少秒刷新一次受影响日期的汇总行，关闭数据库时也会刷新
+STATS_ROLLUP_FLUSH_INTERVAL = 60
+
+# ==================== 媒体文件下载配置 ====================
+# 开启 ENABLE_GET_IMAGES 后图片、视频由 tools/media_downloader.py 在后台下载
+# 同时下载的文件数
+MEDIA_DOWNLOAD_WORKERS = 4
+
+# 等待下载的任务上限，超过后提交下载的抓取流程等待（背压）
+MEDIA_DOWNLOAD_QUEUE_SIZE = 200
+
+# 流式写入临时文件时每次读取的字节数
+MEDIA_DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# 单个文件下载超时时间（秒），视频文件较大，超时时间比 API 请求长
+MEDIA_DOWNLOAD_TIMEOUT = 60
+
+# 下载中断后的重试次数，重试时用 HTTP Range 从已下载的位置续传
+MEDIA_DOWNLOAD_MAX_RETRIES = 3
+
+# 按 SHA-256 保存文件内容的目录，各平台的图片、视频目录中的文件是指向这里的硬链接，相同内容只保存一份
+MEDIA_STORE_PATH = "data/media_store"
+
 # 重试失败任务的最大次数
 MAX_RETRY_COUNT = 3
 
@@ -338,6 +529,30 @@ TASK_TIMEOUT = 3600  # 1小时
 # 是否在启动时清理历史任务
 CLEANUP_HISTORY_TASKS = False
 
+# ==================== 本地缓存配置 ====================
+# ExpiringLocalCache 最多保存的键数量，超过时淘汰最久没有访问的键，0 表示不限制
+LOCAL_CACHE_MAX_SIZE = 100000
+
+# ==================== 二级缓存配置 ====================
+# 作者信息、笔记详情先查进程内缓存再查 Redis，同一个键同时只请求一次，见 cache/tiered_cache.py
+ENABLE_TIERED_CACHE = True
+
+# 第二级使用 Redis（连接配置见 config/db_config.py），多个爬虫进程共享缓存
+TIERED_CACHE_USE_REDIS = False
+
+# 使用 Redis 时进程内缓存的最长保存时间（秒）
+TIERED_CACHE_LOCAL_TTL_SEC = 60
+
+# “不存在”结果（空的作者信息、已删除的笔记）的缓存时间（秒）；
+# 各平台的空作者信息和抖音、快手、小红书、微博的空笔记详情常常是被限流（例如小红书验证码时返回空），这些接口不缓存空结果
+TIERED_CACHE_NEGATIVE_TTL_SEC = 30
+
+# 作者信息缓存时间（秒）
+CREATOR_INFO_CACHE_TTL_SEC = 3600
+
+# 笔记/视频详情缓存时间（秒），同一条笔记被多个关键词搜到时只请求一次详情
+NOTE_DETAIL_CACHE_TTL_SEC = 600
+
 # ==================== 小红书模拟爬虫配置 ====================
 # 是否启用小红书模拟爬虫
 XHS_SIMULATION_ENABLED = True
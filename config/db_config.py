@@ -18,6 +18,11 @@ RELATION_DB_HOST = os.getenv("RELATION_DB_HOST", "localhost")
 RELATION_DB_PORT = os.getenv("RELATION_DB_PORT", 3306)
 RELATION_DB_NAME = os.getenv("RELATION_DB_NAME", "media_crawler")
 
+# sqlite config（SAVE_DATA_OPTION = "sqlite" 时使用，web 看板和分析任务设置了 SQLITE_DB_PATH 环境变量时也读取这个文件）
+SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "data/media_crawler.db")
+# 写入内容时同时维护 jieba 分词的 FTS5 全文索引，web 看板关键词搜索使用（见 tools/text_index.py）
+SQLITE_TEXT_INDEX = True
+
 
 # redis config
 REDIS_DB_HOST = "127.0.0.1"  # your redis host
@@ -25,6 +30,13 @@ REDIS_DB_PWD = os.getenv("REDIS_DB_PWD", "123456")  # your redis password
 REDIS_DB_PORT = os.getenv("REDIS_DB_PORT", 6379)  # your redis port
 REDIS_DB_NUM = os.getenv("REDIS_DB_NUM", 0)  # your redis db num
 
+# async redis cache config（CACHE_TYPE_REDIS_ASYNC）
+REDIS_CACHE_SERIALIZER = "json"  # 缓存值编码：json | msgpack（需要 pip install msgpack） | pickle
+REDIS_CACHE_ALLOW_PICKLE = False  # json/msgpack 不能表示的值是否改用 pickle 保存，只在 redis 可信时开启
+REDIS_CACHE_MAX_CONNECTIONS = 20  # 连接池最大连接数
+REDIS_CACHE_SCAN_COUNT = 1000  # keys() 使用 SCAN 遍历时每次返回的键数量提示
+
 # cache type
 CACHE_TYPE_REDIS = "redis"
-CACHE_TYPE_MEMORY = "memory"
\ No newline at end of file
+CACHE_TYPE_MEMORY = "memory"
+CACHE_TYPE_REDIS_ASYNC = "redis_async"
\ No newline at end of file
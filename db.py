@@ -22,6 +22,9 @@ import aiomysql
 
 import config
 from async_db import AsyncMysqlDB
+from async_sqlite_db import AsyncSqliteDB
+from tools.seen_id_index import clear_seen_id_indexes, log_seen_id_stats
+from tools.stats_rollup import flush_stats_rollup
 from tools import utils
 from var import db_conn_pool_var, media_crawler_db_var
 
@@ -41,12 +44,25 @@ async def init_mediacrawler_db():
         autocommit=True,
     )
     async_db_obj = AsyncMysqlDB(pool)
+    await async_db_obj.add_missing_columns()
+    await async_db_obj.check_unique_keys()
 
     # 将连接池对象和封装的CRUD sql接口对象放到上下文变量中
     db_conn_pool_var.set(pool)
     media_crawler_db_var.set(async_db_obj)
 
 
+async def init_sqlite_db():
+    """
+    打开 SQLite 数据库（不存在时自动建表），并将该对象塞给media_crawler_db_var上下文变量
+    Returns:
+
+    """
+    async_db_obj = AsyncSqliteDB(config.SQLITE_DB_PATH, text_index=config.SQLITE_TEXT_INDEX)
+    await async_db_obj.open()
+    media_crawler_db_var.set(async_db_obj)
+
+
 async def init_db():
     """
     初始化db连接池
@@ -54,7 +70,10 @@ async def init_db():
 
     """
     utils.logger.info("[init_db] start init mediacrawler db connect object")
-    await init_mediacrawler_db()
+    if config.SAVE_DATA_OPTION == "sqlite":
+        await init_sqlite_db()
+    else:
+        await init_mediacrawler_db()
     utils.logger.info("[init_db] end init mediacrawler db connect object")
 
 
@@ -65,6 +84,13 @@ async def close():
 
     """
     utils.logger.info("[close] close mediacrawler db pool")
+    log_seen_id_stats()
+    clear_seen_id_indexes()
+    async_db_obj = media_crawler_db_var.get()
+    await flush_stats_rollup(async_db_obj)
+    if isinstance(async_db_obj, AsyncSqliteDB):
+        await async_db_obj.close()
+        return
     db_pool: aiomysql.Pool = db_conn_pool_var.get()
     if db_pool is not None:
         db_pool.close()
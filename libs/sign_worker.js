@@ -0,0 +1,41 @@
+// 常驻签名进程：加载指定的签名脚本，通过 stdin/stdout 按行收发 JSON 请求
+// 由 tools/js_sign_pool.py 启动和管理，避免 PyExecJS 每次调用都重新拉起 node 进程
+//
+// 请求:  {"id": 1, "fn": "sign_datail", "args": ["a=1", "ua"]}
+//        {"id": 2, "fn": "sign_reply", "batch": [["a=1", "ua"], ["a=2", "ua"]]}
+// 响应:  {"id": 1, "result": "..."} | {"id": 2, "result": ["...", "..."]} | {"id": 1, "error": "..."}
+
+const fs = require('fs');
+const readline = require('readline');
+const vm = require('vm');
+
+const scriptPath = process.argv[2];
+const sandbox = {require, console, Buffer, setTimeout, clearTimeout, setInterval, clearInterval};
+sandbox.global = sandbox;
+vm.createContext(sandbox);
+vm.runInContext(fs.readFileSync(scriptPath, 'utf-8').replace(/^\uFEFF/, ''), sandbox, {filename: scriptPath});
+
+const rl = readline.createInterface({input: process.stdin, terminal: false});
+rl.on('line', (line) => {
+    if (!line.trim()) {
+        return;
+    }
+    let request = {};
+    let response;
+    try {
+        request = JSON.parse(line);
+        const fn = sandbox[request.fn];
+        if (typeof fn !== 'function') {
+            throw new Error(`function ${request.fn} not found in ${scriptPath}`);
+        }
+        const result = request.batch
+            ? request.batch.map((args) => fn.apply(null, args))
+            : fn.apply(null, request.args || []);
+        response = {id: request.id, result: result};
+    } catch (e) {
+        response = {id: request.id, error: String(e && e.stack || e)};
+    }
+    process.stdout.write(JSON.stringify(response) + '\n');
+});
+
+process.stdout.write(JSON.stringify({id: 0, result: 'ready'}) + '\n');
@@ -28,6 +28,14 @@ from media_platform.xhs_simulation_new import XHSSimulationCrawler as XHSSimulat
 from media_platform.tieba_simulation import TiebaSimulationCrawler
 from media_platform.zhihu import ZhihuCrawler
 from media_platform.sogou_weixin import SogouWeixinCrawler
+from cache.tiered_cache import close_tiered_cache
+from proxy.proxy_ip_pool import close_ip_pools
+from store import write_behind
+from store.csv_sink import close_csv_sinks
+from store.jsonl_store import close_jsonl_writers
+from store.parquet_store import close_parquet_writers, require_pyarrow
+from tools import utils
+from tools.media_downloader import drain_media_downloader
 
 
 class CrawlerFactory:
@@ -52,26 +60,69 @@ class CrawlerFactory:
             raise ValueError("Invalid Media Platform Currently only supported xhs or xhs_simulation_new or tieba or tieba_simulation or dy or ks or bili or wb or zhihu or news or sogou_weixin ...")
         return crawler_class()
 
+async def shutdown():
+    """
+    退出前的收尾流程，正常结束、抓取异常和 Ctrl+C 都由 main() 的 finally 执行
+    每一步单独捕获异常，前面的步骤失败时仍然写完缓冲中的数据并关闭数据库
+    Returns:
+
+    """
+    steps = (
+        # 等待后台下载中的图片、视频
+        ("drain_media_downloader", drain_media_downloader),
+        ("close_ip_pools", close_ip_pools),
+        ("close_tiered_cache", close_tiered_cache),
+        # 先写完写缓冲中的数据，再关闭数据库连接池
+        ("write_behind.drain_all", write_behind.drain_all),
+        ("close_csv_sinks", close_csv_sinks),
+        ("close_jsonl_writers", close_jsonl_writers),
+        ("close_parquet_writers", close_parquet_writers),
+    )
+    if config.SAVE_DATA_OPTION in ("db", "sqlite"):
+        steps += (("db.close", db.close),)
+    for name, step in steps:
+        try:
+            result = step()
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            utils.logger.error(f"[main.shutdown] {name} error: {e}")
+
+
 async def main():
 
     # parse cmd
     await cmd_arg.parse_cmd()
 
+    # parquet 存储需要 pyarrow，启动时检查，避免抓取后写入时才失败
+    if config.SAVE_DATA_OPTION == "parquet":
+        require_pyarrow()
+
     # init db
-    if config.SAVE_DATA_OPTION == "db":
+    if config.SAVE_DATA_OPTION in ("db", "sqlite"):
         await db.init_db()
 
     crawler = CrawlerFactory.create_crawler(platform=config.PLATFORM)
-    await crawler.start()
-
-    if config.SAVE_DATA_OPTION == "db":
-        await db.close()
+    try:
+        await crawler.start()
+    finally:
+        # 抓取异常、Ctrl+C（main 任务被取消）时同样执行，否则缓冲中的数据和看板统计汇总都会丢失
+        await shutdown()
 
     
 
 if __name__ == '__main__':
+    loop = asyncio.get_event_loop()
+    main_task = loop.create_task(main())
     try:
         # asyncio.run(main())
-        asyncio.get_event_loop().run_until_complete(main())
+        loop.run_until_complete(main_task)
     except KeyboardInterrupt:
+        # Ctrl+C 时取消 main 任务，由 main() 中的 finally 在原来的上下文中写完缓冲区的数据并关闭数据库
+        if not main_task.done():
+            main_task.cancel()
+            try:
+                loop.run_until_complete(main_task)
+            except asyncio.CancelledError:
+                pass
         sys.exit()
@@ -23,7 +23,12 @@ from playwright.async_api import BrowserContext, Page
 
 import config
 from base.base_crawler import AbstractApiClient
+from cache.tiered_cache import tiered_cached
+from proxy.proxy_rotator import get_proxy_rotator
 from tools import utils
+from tools.http_transport import HttpTransport, format_httpx_proxy
+from tools.rate_limiter import crawl_sleep, get_request_scheduler
+from tools.signing_context import SigningContext, read_local_storage
 
 from .exception import DataFetchError
 from .field import CommentOrderType, SearchOrderType
@@ -51,27 +56,25 @@ class BilibiliClient(AbstractApiClient):
         self._proxy_failed = False  # 代理失败标记
         self._proxy_retry_count = 0  # 代理重试计数
         self._max_proxy_retries = 3  # 最大代理重试次数
+        self._transport = HttpTransport(timeout=timeout, scheduler=get_request_scheduler(), rotator=get_proxy_rotator())
+        self.sign_context = SigningContext()
 
     async def request(self, method, url, **kwargs) -> Any:
         # 处理代理参数
         proxy = None
         use_proxy = False
         
-        # 如果代理未失败且配置了代理，则使用代理
-        if not self._proxy_failed and self.proxies:
-            if isinstance(self.proxies, dict):
-                proxy = list(self.proxies.values())[0] if self.proxies else None
-            else:
-                proxy = self.proxies
+        # 如果代理未失败且配置了代理，则使用代理（开启代理轮换时由 HttpTransport 选择代理并在出错时换代理，不降级）
+        if not self._proxy_failed and self.proxies and self._transport.rotator is None:
+            proxy = format_httpx_proxy(self.proxies)
             use_proxy = True
         
         # 尝试请求
         try:
-            async with httpx.AsyncClient(proxy=proxy) as client:
-                response = await client.request(
-                    method, url, timeout=self.timeout,
-                    **kwargs
-                )
+            response = await self._transport.request(
+                method, url, proxy=proxy, timeout=self.timeout,
+                **kwargs
+            )
             
             # 请求成功，重置代理重试计数
             if use_proxy:
@@ -134,7 +137,7 @@ class BilibiliClient(AbstractApiClient):
         """
         if not req_data:
             return {}
-        img_key, sub_key = await self.get_wbi_keys()
+        img_key, sub_key = await self.sign_context.get("wbi_keys", self.get_wbi_keys)
         return BilibiliSign(img_key, sub_key).sign(req_data)
 
     async def get_wbi_keys(self) -> Tuple[str, str]:
@@ -142,9 +145,12 @@ class BilibiliClient(AbstractApiClient):
         获取最新的 img_key 和 sub_key
         :return:
         """
-        local_storage = await self.playwright_page.evaluate("() => window.localStorage")
-        wbi_img_urls = local_storage.get("wbi_img_urls", "") or local_storage.get(
-            "wbi_img_url") + "-" + local_storage.get("wbi_sub_url")
+        local_storage = await read_local_storage(
+            self.playwright_page, ["wbi_img_urls", "wbi_img_url", "wbi_sub_url"]
+        )
+        wbi_img_urls = local_storage.get("wbi_img_urls") or ""
+        if not wbi_img_urls and local_storage.get("wbi_img_url") and local_storage.get("wbi_sub_url"):
+            wbi_img_urls = local_storage["wbi_img_url"] + "-" + local_storage["wbi_sub_url"]
         if wbi_img_urls and "-" in wbi_img_urls:
             img_url, sub_url = wbi_img_urls.split("-")
         else:
@@ -191,6 +197,13 @@ class BilibiliClient(AbstractApiClient):
         cookie_str, cookie_dict = utils.convert_cookies(await browser_context.cookies())
         self.headers["Cookie"] = cookie_str
         self.cookie_dict = cookie_dict
+        self.sign_context.invalidate()
+
+    async def close(self):
+        """
+        关闭 HTTP 长连接池，一般在爬虫结束时调用
+        """
+        await self._transport.aclose()
 
     async def search_video_by_keyword(self, keyword: str, page: int = 1, page_size: int = 20,
                                       order: SearchOrderType = SearchOrderType.DEFAULT,
@@ -218,6 +231,7 @@ class BilibiliClient(AbstractApiClient):
         }
         return await self.get(uri, post_data)
 
+    @tiered_cached("bilibili:video:{aid}:{bvid}", "NOTE_DETAIL_CACHE_TTL_SEC")
     async def get_video_info(self, aid: Union[int, None] = None, bvid: Union[str, None] = None) -> Dict:
         """
         Bilibli web video detail api, aid 和 bvid任选一个参数
@@ -258,21 +272,14 @@ class BilibiliClient(AbstractApiClient):
         return await self.get(uri, params, enable_params_sign=True)
 
     async def get_video_media(self, url: str) -> Union[bytes, None]:
-        # 处理代理参数
-        proxy = None
-        if self.proxies:
-            if isinstance(self.proxies, dict):
-                proxy = list(self.proxies.values())[0] if self.proxies else None
-            else:
-                proxy = self.proxies
-        
-        async with httpx.AsyncClient(proxy=proxy) as client:
-            response = await client.request("GET", url, timeout=self.timeout, headers=self.headers)
-            if not response.reason_phrase == "OK":
-                utils.logger.error(f"[BilibiliClient.get_video_media] request {url} err, res:{response.text}")
-                return None
-            else:
-                return response.content
+        response = await self._transport.request(
+            "GET", url, proxy=format_httpx_proxy(self.proxies), timeout=self.timeout, headers=self.headers
+        )
+        if not response.reason_phrase == "OK":
+            utils.logger.error(f"[BilibiliClient.get_video_media] request {url} err, res:{response.text}")
+            return None
+        else:
+            return response.content
 
     async def get_video_comments(self,
                                  video_id: str,
@@ -330,7 +337,7 @@ class BilibiliClient(AbstractApiClient):
                 comment_list = comment_list[:max_count - len(result)]
             if callback:  # 如果有回调函数，就执行回调函数
                 await callback(video_id, comment_list)
-            await asyncio.sleep(crawl_interval)
+            await crawl_sleep(crawl_interval)
             if not is_fetch_sub_comments:
                 result.extend(comment_list)
                 continue
@@ -362,7 +369,7 @@ class BilibiliClient(AbstractApiClient):
             comment_list: List[Dict] = result.get("replies", [])
             if callback:  # 如果有回调函数，就执行回调函数
                 await callback(video_id, comment_list)
-            await asyncio.sleep(crawl_interval)
+            await crawl_sleep(crawl_interval)
             if (int(result["page"]["count"]) <= pn * ps):
                 break
 
@@ -412,6 +419,7 @@ class BilibiliClient(AbstractApiClient):
         }
         return await self.get(uri, post_data)
 
+    @tiered_cached("bilibili:creator:{creator_id}", "CREATOR_INFO_CACHE_TTL_SEC", negative_ttl=0)
     async def get_creator_info(self, creator_id: int) -> Dict:
         """
         get creator info
@@ -506,7 +514,7 @@ class BilibiliClient(AbstractApiClient):
                 fans_list = fans_list[:max_count - len(result)]
             if callback:  # 如果有回调函数，就执行回调函数
                 await callback(creator_info, fans_list)
-            await asyncio.sleep(crawl_interval)
+            await crawl_sleep(crawl_interval)
             if not fans_list:
                 break
             result.extend(fans_list)
@@ -536,7 +544,7 @@ class BilibiliClient(AbstractApiClient):
                 followings_list = followings_list[:max_count - len(result)]
             if callback:  # 如果有回调函数，就执行回调函数
                 await callback(creator_info, followings_list)
-            await asyncio.sleep(crawl_interval)
+            await crawl_sleep(crawl_interval)
             if not followings_list:
                 break
             result.extend(followings_list)
@@ -567,6 +575,6 @@ class BilibiliClient(AbstractApiClient):
                 dynamics_list = dynamics_list[:max_count - len(result)]
             if callback:
                 await callback(creator_info, dynamics_list)
-            await asyncio.sleep(crawl_interval)
+            await crawl_sleep(crawl_interval)
             result.extend(dynamics_list)
         return result
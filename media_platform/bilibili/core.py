@@ -28,8 +28,12 @@ import config
 from base.base_crawler import AbstractCrawler
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import bilibili as bilibili_store
+from store import write_behind
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.http_transport import format_httpx_proxy
+from tools.media_downloader import get_media_downloader
+from tools.rate_limiter import crawl_semaphore
 from var import crawler_type_var, source_keyword_var
 
 from .client import BilibiliClient
@@ -176,7 +180,7 @@ class BilibiliCrawler(AbstractCrawler):
                     )
                     video_list: List[Dict] = videos_res.get("result")
 
-                    semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+                    semaphore = crawl_semaphore()
                     task_list = []
                     try:
                         task_list = [self.get_video_info_task(aid=video_item.get("aid"), bvid="", semaphore=semaphore) for video_item in video_list]
@@ -221,7 +225,7 @@ class BilibiliCrawler(AbstractCrawler):
                             )
                             video_list: List[Dict] = videos_res.get("result")
 
-                            semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+                            semaphore = crawl_semaphore()
                             task_list = [self.get_video_info_task(aid=video_item.get("aid"), bvid="", semaphore=semaphore) for video_item in video_list]
                             video_items = await asyncio.gather(*task_list)
                             for video_item in video_items:
@@ -250,7 +254,7 @@ class BilibiliCrawler(AbstractCrawler):
 
         utils.logger.info(
             f"[BilibiliCrawler.batch_get_video_comments] video ids:{video_id_list}")
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = crawl_semaphore()
         task_list: List[Task] = []
         for video_id in video_id_list:
             task = asyncio.create_task(self.get_comments(
@@ -305,7 +309,7 @@ class BilibiliCrawler(AbstractCrawler):
         get specified videos info
         :return:
         """
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = crawl_semaphore()
         task_list = [
             self.get_video_info_task(aid=0, bvid=video_id, semaphore=semaphore) for video_id in
             bvids_list
@@ -473,6 +477,11 @@ class BilibiliCrawler(AbstractCrawler):
 
     async def close(self):
         """Close browser context"""
+        # 写完写缓冲中尚未落库的数据
+        await write_behind.drain_all()
+        # 关闭 API client 的 HTTP 长连接池
+        if hasattr(self, "bili_client"):
+            await self.bili_client.close()
         # 如果使用CDP模式，需要特殊处理
         if self.cdp_manager:
             await self.cdp_manager.cleanup()
@@ -608,11 +617,14 @@ class BilibiliCrawler(AbstractCrawler):
             utils.logger.info("[BilibiliCrawler.get_bilibili_video] get video url failed")
             return
 
-        content = await self.bili_client.get_video_media(video_url)
-        if content is None:
-            return
+        # 视频由媒体下载器流式写入文件，不在内存中保存完整视频，中断后按 Range 续传
         extension_file_name = f"video.mp4"
-        await bilibili_store.store_video(aid, content, extension_file_name)
+        await get_media_downloader().submit(
+            video_url,
+            bilibili_store.BilibiliVideo().make_save_file_name(str(aid), extension_file_name),
+            headers=self.bili_client.headers,
+            proxy=format_httpx_proxy(self.bili_client.proxies),
+        )
 
     async def get_all_creator_details(self, creator_id_list: List[int]):
         """
@@ -623,7 +635,7 @@ class BilibiliCrawler(AbstractCrawler):
         utils.logger.info(
             f"[BilibiliCrawler.get_creator_details] creator ids:{creator_id_list}")
 
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = crawl_semaphore()
         task_list: List[Task] = []
         try:
             for creator_id in creator_id_list:
@@ -15,11 +15,15 @@ import json
 import urllib.parse
 from typing import Any, Callable, Dict, Optional
 
-import requests
 from playwright.async_api import BrowserContext
 
 from base.base_crawler import AbstractApiClient
+from cache.tiered_cache import tiered_cached
+from proxy.proxy_rotator import get_proxy_rotator
 from tools import utils
+from tools.http_transport import HttpTransport, format_httpx_proxy
+from tools.rate_limiter import crawl_sleep, get_request_scheduler
+from tools.signing_context import SigningContext, read_local_storage
 from var import request_keyword_var
 
 from .exception import *
@@ -43,6 +47,18 @@ class DOUYINClient(AbstractApiClient):
         self._host = "https://www.douyin.com"
         self.playwright_page = playwright_page
         self.cookie_dict = cookie_dict
+        self._transport = HttpTransport(timeout=timeout, scheduler=get_request_scheduler(), rotator=get_proxy_rotator())
+        self.sign_context = SigningContext()
+
+    async def _get_ms_token(self) -> Optional[str]:
+        """
+        msToken 取自 localStorage 的 xmst，缓存起来，cookie 更新时失效
+        """
+        async def load_ms_token() -> Optional[str]:
+            local_storage = await read_local_storage(self.playwright_page, ["xmst"])  # type: ignore
+            return local_storage.get("xmst")
+
+        return await self.sign_context.get("msToken", load_ms_token)
 
     async def __process_req_params(
             self, uri: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
@@ -52,7 +68,6 @@ class DOUYINClient(AbstractApiClient):
         if not params:
             return
         headers = headers or self.headers
-        local_storage: Dict = await self.playwright_page.evaluate("() => window.localStorage")  # type: ignore
         common_params = {
             "device_platform": "webapp",
             "aid": "6383",
@@ -79,7 +94,7 @@ class DOUYINClient(AbstractApiClient):
             'effective_type': '4g',
             "round_trip_time": "50",
             "webid": get_web_id(),
-            "msToken": local_storage.get("xmst"),
+            "msToken": await self._get_ms_token(),
         }
         params.update(common_params)
         query_string = urllib.parse.urlencode(params)
@@ -92,11 +107,9 @@ class DOUYINClient(AbstractApiClient):
         params["a_bogus"] = a_bogus
 
     async def request(self, method, url, **kwargs):
-        response = None
-        if method == "GET":
-            response = requests.request(method, url, **kwargs)
-        elif method == "POST":
-            response = requests.request(method, url, **kwargs)
+        response = await self._transport.request(
+            method, url, proxy=format_httpx_proxy(self.proxies), timeout=self.timeout, **kwargs
+        )
         try:
             if response.text == "" or response.text == "blocked":
                 utils.logger.error(f"request params incrr, response.text: {response.text}")
@@ -130,6 +143,13 @@ class DOUYINClient(AbstractApiClient):
         cookie_str, cookie_dict = utils.convert_cookies(await browser_context.cookies())
         self.headers["Cookie"] = cookie_str
         self.cookie_dict = cookie_dict
+        self.sign_context.invalidate()
+
+    async def close(self):
+        """
+        关闭 HTTP 长连接池，一般在爬虫结束时调用
+        """
+        await self._transport.aclose()
 
     async def search_info_by_keyword(
             self,
@@ -176,6 +196,7 @@ class DOUYINClient(AbstractApiClient):
         headers["Referer"] = urllib.parse.quote(referer_url, safe=':/')
         return await self.get("/aweme/v1/web/general/search/single/", query_params, headers=headers)
 
+    @tiered_cached("douyin:aweme:{aweme_id}", "NOTE_DETAIL_CACHE_TTL_SEC", negative_ttl=0)
     async def get_video_by_id(self, aweme_id: str) -> Any:
         """
         DouYin Video Detail API
@@ -257,7 +278,7 @@ class DOUYINClient(AbstractApiClient):
             if callback:  # 如果有回调函数，就执行回调函数
                 await callback(aweme_id, comments)
 
-            await asyncio.sleep(crawl_interval)
+            await crawl_sleep(crawl_interval)
             if not is_fetch_sub_comments:
                 continue
             # 获取二级评论
@@ -280,9 +301,10 @@ class DOUYINClient(AbstractApiClient):
                         result.extend(sub_comments)
                         if callback:  # 如果有回调函数，就执行回调函数
                             await callback(aweme_id, sub_comments)
-                        await asyncio.sleep(crawl_interval)
+                        await crawl_sleep(crawl_interval)
         return result
 
+    @tiered_cached("douyin:creator:{sec_user_id}", "CREATOR_INFO_CACHE_TTL_SEC", negative_ttl=0)
     async def get_user_info(self, sec_user_id: str):
         uri = "/aweme/v1/web/user/profile/other/"
         params = {
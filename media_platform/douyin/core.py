@@ -22,8 +22,12 @@ import config
 from base.base_crawler import AbstractCrawler
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import douyin as douyin_store
+from store import write_behind
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.http_transport import format_httpx_proxy
+from tools.media_downloader import get_media_downloader
+from tools.rate_limiter import crawl_semaphore
 from var import crawler_type_var, source_keyword_var
 
 from .client import DOUYINClient
@@ -142,12 +146,13 @@ class DouYinCrawler(AbstractCrawler):
                         continue
                     aweme_list.append(aweme_info.get("aweme_id", ""))
                     await douyin_store.update_douyin_aweme(aweme_item=aweme_info)
+                    await self.get_aweme_media(aweme_info)
             utils.logger.info(f"[DouYinCrawler.search] keyword:{keyword}, aweme_list:{aweme_list}")
             await self.batch_get_note_comments(aweme_list)
 
     async def get_specified_awemes(self):
         """Get the information and comments of the specified post"""
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = crawl_semaphore()
         task_list = [
             self.get_aweme_detail(aweme_id=aweme_id, semaphore=semaphore) for aweme_id in config.DY_SPECIFIED_ID_LIST
         ]
@@ -155,6 +160,7 @@ class DouYinCrawler(AbstractCrawler):
         for aweme_detail in aweme_details:
             if aweme_detail is not None:
                 await douyin_store.update_douyin_aweme(aweme_detail)
+                await self.get_aweme_media(aweme_detail)
         await self.batch_get_note_comments(config.DY_SPECIFIED_ID_LIST)
 
     async def get_aweme_detail(self, aweme_id: str, semaphore: asyncio.Semaphore) -> Any:
@@ -170,6 +176,27 @@ class DouYinCrawler(AbstractCrawler):
                     f"[DouYinCrawler.get_aweme_detail] have not fund note detail aweme_id:{aweme_id}, err: {ex}")
                 return None
 
+    async def get_aweme_media(self, aweme_item: Dict) -> None:
+        """
+        下载图集作品的图片或视频作品的视频，由媒体下载器在后台流式下载
+        """
+        if not config.ENABLE_GET_IMAGES:
+            return
+        aweme_id = aweme_item.get("aweme_id")
+        if not aweme_id:
+            return
+        downloader = get_media_downloader()
+        media_store = douyin_store.DouyinMedia()
+        # 抖音 CDN 校验 Referer，不能带上 API 请求的 Host 等请求头
+        headers = {
+            "User-Agent": self.dy_client.headers.get("User-Agent", ""),
+            "Referer": "https://www.douyin.com/",
+        }
+        proxy = format_httpx_proxy(self.dy_client.proxies)
+        for url, extension_file_name in douyin_store.get_aweme_media_urls(aweme_item):
+            await downloader.submit(url, media_store.make_save_file_name(aweme_id, extension_file_name),
+                                    headers=headers, proxy=proxy)
+
     async def batch_get_note_comments(self, aweme_list: List[str]) -> None:
         """
         Batch get note comments
@@ -179,7 +206,7 @@ class DouYinCrawler(AbstractCrawler):
             return
 
         task_list: List[Task] = []
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = crawl_semaphore()
         for aweme_id in aweme_list:
             task = asyncio.create_task(
                 self.get_comments(aweme_id, semaphore), name=aweme_id)
@@ -226,7 +253,7 @@ class DouYinCrawler(AbstractCrawler):
         """
         Concurrently obtain the specified post list and save the data
         """
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = crawl_semaphore()
         task_list = [
             self.get_aweme_detail(post_item.get("aweme_id"), semaphore) for post_item in video_list
         ]
@@ -235,6 +262,7 @@ class DouYinCrawler(AbstractCrawler):
         for aweme_item in note_details:
             if aweme_item is not None:
                 await douyin_store.update_douyin_aweme(aweme_item)
+                await self.get_aweme_media(aweme_item)
 
     @staticmethod
     def format_proxy_info(ip_proxy_info: IpInfoModel) -> Tuple[Optional[Dict], Optional[Dict]]:
@@ -326,6 +354,11 @@ class DouYinCrawler(AbstractCrawler):
 
     async def close(self) -> None:
         """Close browser context"""
+        # 写完写缓冲中尚未落库的数据
+        await write_behind.drain_all()
+        # 关闭 API client 的 HTTP 长连接池
+        if hasattr(self, "dy_client"):
+            await self.dy_client.close()
         # 如果使用CDP模式，需要特殊处理
         if self.cdp_manager:
             await self.cdp_manager.cleanup()
@@ -17,10 +17,11 @@
 
 import random
 
-import execjs
 from playwright.async_api import Page
 
-douyin_sign_obj = execjs.compile(open('libs/douyin.js', encoding='utf-8-sig').read())
+from tools.js_sign_pool import get_js_sign_pool
+
+douyin_sign_pool = get_js_sign_pool("libs/douyin.js")
 
 def get_web_id():
     """
@@ -47,8 +48,23 @@ def get_web_id():
 async def get_a_bogus(url: str, params: str, post_data: dict, user_agent: str, page: Page = None):
     """
     获取 a_bogus 参数, 目前不支持post请求类型的签名
+    签名在常驻 JS 进程中计算，不阻塞事件循环
+    """
+    return await douyin_sign_pool.async_call(get_sign_js_name(url), params, user_agent)
+
+
+def get_sign_js_name(url: str) -> str:
+    """
+    根据请求路由选择签名函数
+    Args:
+        url:
+
+    Returns:
+
     """
-    return get_a_bogus_from_js(url, params, user_agent)
+    if "/reply" in url:
+        return "sign_reply"
+    return "sign_datail"
 
 def get_a_bogus_from_js(url: str, params: str, user_agent: str):
     """
@@ -61,10 +77,7 @@ def get_a_bogus_from_js(url: str, params: str, user_agent: str):
     Returns:
 
     """
-    sign_js_name = "sign_datail"
-    if "/reply" in url:
-        sign_js_name = "sign_reply"
-    return douyin_sign_obj.call(sign_js_name, params, user_agent)
+    return douyin_sign_pool.call(get_sign_js_name(url), params, user_agent)
 
 
 
@@ -15,12 +15,15 @@ import json
 from typing import Any, Callable, Dict, List, Optional
 from urllib.parse import urlencode
 
-import httpx
 from playwright.async_api import BrowserContext, Page
 
 import config
 from base.base_crawler import AbstractApiClient
+from cache.tiered_cache import tiered_cached
+from proxy.proxy_rotator import get_proxy_rotator
 from tools import utils
+from tools.http_transport import HttpTransport, format_httpx_proxy
+from tools.rate_limiter import crawl_sleep, get_request_scheduler
 
 from .exception import DataFetchError
 from .graphql import KuaiShouGraphQL
@@ -43,18 +46,12 @@ class KuaiShouClient(AbstractApiClient):
         self.playwright_page = playwright_page
         self.cookie_dict = cookie_dict
         self.graphql = KuaiShouGraphQL()
+        self._transport = HttpTransport(timeout=timeout, scheduler=get_request_scheduler(), rotator=get_proxy_rotator())
 
     async def request(self, method, url, **kwargs) -> Any:
-        # 处理代理参数
-        proxy = None
-        if self.proxies:
-            if isinstance(self.proxies, dict):
-                proxy = list(self.proxies.values())[0] if self.proxies else None
-            else:
-                proxy = self.proxies
-        
-        async with httpx.AsyncClient(proxy=proxy) as client:
-            response = await client.request(method, url, timeout=self.timeout, **kwargs)
+        response = await self._transport.request(
+            method, url, proxy=format_httpx_proxy(self.proxies), timeout=self.timeout, **kwargs
+        )
         data: Dict = response.json()
         if data.get("errors"):
             raise DataFetchError(data.get("errors", "unkonw error"))
@@ -102,6 +99,12 @@ class KuaiShouClient(AbstractApiClient):
         self.headers["Cookie"] = cookie_str
         self.cookie_dict = cookie_dict
 
+    async def close(self):
+        """
+        关闭 HTTP 长连接池，一般在爬虫结束时调用
+        """
+        await self._transport.aclose()
+
     async def search_info_by_keyword(
         self, keyword: str, pcursor: str, search_session_id: str = ""
     ):
@@ -124,6 +127,7 @@ class KuaiShouClient(AbstractApiClient):
         }
         return await self.post("", post_data)
 
+    @tiered_cached("kuaishou:video:{photo_id}", "NOTE_DETAIL_CACHE_TTL_SEC", negative_ttl=0)
     async def get_video_info(self, photo_id: str) -> Dict:
         """
         Kuaishou web video detail api
@@ -214,7 +218,7 @@ class KuaiShouClient(AbstractApiClient):
             if callback:  # 如果有回调函数，就执行回调函数
                 await callback(photo_id, comments)
             result.extend(comments)
-            await asyncio.sleep(crawl_interval)
+            await crawl_sleep(crawl_interval)
             sub_comments = await self.get_comments_all_sub_comments(
                 comments, photo_id, crawl_interval, callback
             )
@@ -267,10 +271,11 @@ class KuaiShouClient(AbstractApiClient):
                 comments = vision_sub_comment_list.get("subComments", {})
                 if callback:
                     await callback(photo_id, comments)
-                await asyncio.sleep(crawl_interval)
+                await crawl_sleep(crawl_interval)
                 result.extend(comments)
         return result
 
+    @tiered_cached("kuaishou:creator:{user_id}", "CREATOR_INFO_CACHE_TTL_SEC", negative_ttl=0)
     async def get_creator_info(self, user_id: str) -> Dict:
         """
         eg: https://www.kuaishou.com/profile/3x4jtnbfter525a
@@ -316,6 +321,6 @@ class KuaiShouClient(AbstractApiClient):
 
             if callback:
                 await callback(videos)
-            await asyncio.sleep(crawl_interval)
+            await crawl_sleep(crawl_interval)
             result.extend(videos)
         return result
@@ -22,8 +22,10 @@ import config
 from base.base_crawler import AbstractCrawler
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import kuaishou as kuaishou_store
+from store import write_behind
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.rate_limiter import crawl_semaphore
 from var import comment_tasks_var, crawler_type_var, source_keyword_var
 
 from .client import KuaiShouClient
@@ -156,7 +158,7 @@ class KuaishouCrawler(AbstractCrawler):
 
     async def get_specified_videos(self):
         """Get the information and comments of the specified post"""
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = crawl_semaphore()
         task_list = [
             self.get_video_info_task(video_id=video_id, semaphore=semaphore)
             for video_id in config.KS_SPECIFIED_ID_LIST
@@ -204,7 +206,7 @@ class KuaishouCrawler(AbstractCrawler):
         utils.logger.info(
             f"[KuaishouCrawler.batch_get_video_comments] video ids:{video_id_list}"
         )
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = crawl_semaphore()
         task_list: List[Task] = []
         for video_id in video_id_list:
             task = asyncio.create_task(
@@ -373,7 +375,7 @@ class KuaishouCrawler(AbstractCrawler):
         """
         Concurrently obtain the specified post list and save the data
         """
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = crawl_semaphore()
         task_list = [
             self.get_video_info_task(post_item.get("photo", {}).get("id"), semaphore)
             for post_item in video_list
@@ -386,6 +388,11 @@ class KuaishouCrawler(AbstractCrawler):
 
     async def close(self):
         """Close browser context"""
+        # 写完写缓冲中尚未落库的数据
+        await write_behind.drain_all()
+        # 关闭 API client 的 HTTP 长连接池
+        if hasattr(self, "ks_client"):
+            await self.ks_client.close()
         # 如果使用CDP模式，需要特殊处理
         if self.cdp_manager:
             await self.cdp_manager.cleanup()
@@ -14,7 +14,6 @@ import json
 from typing import Any, Callable, Dict, List, Optional, Union
 from urllib.parse import urlencode
 
-import httpx
 from playwright.async_api import BrowserContext
 from tenacity import RetryError, retry, stop_after_attempt, wait_fixed
 
@@ -22,7 +21,10 @@ import config
 from base.base_crawler import AbstractApiClient
 from model.m_baidu_tieba import TiebaComment, TiebaCreator, TiebaNote
 from proxy.proxy_ip_pool import ProxyIpPool
+from proxy.proxy_rotator import get_proxy_rotator
 from tools import utils
+from tools.http_transport import HttpTransport, format_httpx_proxy
+from tools.rate_limiter import crawl_sleep, get_request_scheduler
 
 from .field import SearchNoteType, SearchSortType
 from .help import TieBaExtractor
@@ -44,6 +46,7 @@ class BaiduTieBaClient(AbstractApiClient):
         self._host = "https://tieba.baidu.com"
         self._page_extractor = TieBaExtractor()
         self.default_ip_proxy = default_ip_proxy
+        self._transport = HttpTransport(timeout=timeout, scheduler=get_request_scheduler(), rotator=get_proxy_rotator())
         # self.last_verification_html = None  # 保存最后一次的安全验证HTML - 暂时注释掉
 
     @retry(stop=stop_after_attempt(3), wait=wait_fixed(1))
@@ -61,19 +64,10 @@ class BaiduTieBaClient(AbstractApiClient):
 
         """
         actual_proxies = proxies if proxies else self.default_ip_proxy
-        # 处理代理参数
-        proxy = None
-        if actual_proxies:
-            if isinstance(actual_proxies, dict):
-                proxy = list(actual_proxies.values())[0] if actual_proxies else None
-            else:
-                proxy = actual_proxies
-        
-        async with httpx.AsyncClient(proxy=proxy) as client:
-            response = await client.request(
-                method, url, timeout=self.timeout,
-                headers=self.headers, **kwargs
-            )
+        response = await self._transport.request(
+            method, url, proxy=format_httpx_proxy(actual_proxies), timeout=self.timeout,
+            headers=self.headers, **kwargs
+        )
 
         # if response.status_code == 403:
         #     # 403 错误，直接抛出异常
@@ -192,6 +186,12 @@ class BaiduTieBaClient(AbstractApiClient):
         """
         pass
 
+    async def close(self):
+        """
+        关闭 HTTP 长连接池，一般在爬虫结束时调用
+        """
+        await self._transport.aclose()
+
     async def get_notes_by_keyword(
             self, keyword: str,
             page: int = 1,
@@ -274,7 +274,7 @@ class BaiduTieBaClient(AbstractApiClient):
             result.extend(comments)
             # 获取所有子评论
             await self.get_comments_all_sub_comments(comments, crawl_interval=crawl_interval, callback=callback)
-            await asyncio.sleep(crawl_interval)
+            await crawl_sleep(crawl_interval)
             current_page += 1
         return result
 
@@ -321,7 +321,7 @@ class BaiduTieBaClient(AbstractApiClient):
                 if callback:
                     await callback(parment_comment.note_id, sub_comments)
                 all_sub_comments.extend(sub_comments)
-                await asyncio.sleep(crawl_interval)
+                await crawl_sleep(crawl_interval)
                 current_page += 1
         return all_sub_comments
 
@@ -428,7 +428,7 @@ class BaiduTieBaClient(AbstractApiClient):
             notes = await asyncio.gather(*note_detail_task)
             if callback:
                 await callback(notes)
-            await asyncio.sleep(crawl_interval)
+            await crawl_sleep(crawl_interval)
             result.extend(notes)
             page_number += 1
             total_get_count += page_per_count
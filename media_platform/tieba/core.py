@@ -23,8 +23,10 @@ from base.base_crawler import AbstractCrawler
 from model.m_baidu_tieba import TiebaCreator, TiebaNote
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import tieba as tieba_store
+from store import write_behind
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.rate_limiter import crawl_semaphore
 from tools.crawler_util import format_proxy_info
 from var import crawler_type_var, source_keyword_var
 
@@ -220,7 +222,7 @@ class TieBaCrawler(AbstractCrawler):
         Returns:
 
         """
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = crawl_semaphore()
         task_list = [
             self.get_note_detail_async_task(note_id=note_id, semaphore=semaphore) for note_id in note_id_list
         ]
@@ -271,7 +273,7 @@ class TieBaCrawler(AbstractCrawler):
         if not config.ENABLE_GET_COMMENTS:
             return
 
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = crawl_semaphore()
         task_list: List[Task] = []
         for note_detail in note_detail_list:
             task = asyncio.create_task(self.get_comments_async_task(note_detail, semaphore), name=note_detail.note_id)
@@ -427,7 +429,12 @@ class TieBaCrawler(AbstractCrawler):
         Returns:
 
         """
+        # 写完写缓冲中尚未落库的数据
+        await write_behind.drain_all()
         try:
+            # 关闭 API client 的 HTTP 长连接池
+            if hasattr(self, "tieba_client"):
+                await self.tieba_client.close()
             # 如果使用CDP模式，需要特殊处理
             if self.cdp_manager:
                 await self.cdp_manager.cleanup()
@@ -23,8 +23,10 @@ import config
 from base.base_crawler import AbstractCrawler
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import tieba as tieba_store
+from store import write_behind
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.time_util import normalize_publish_ts
 from var import crawler_type_var, source_keyword_var
 from model.m_baidu_tieba import TiebaNote, TiebaComment
 
@@ -412,34 +414,12 @@ class TiebaSimulationCrawler(AbstractCrawler):
         return processed_items
     
     def extract_item_timestamp(self, content: Dict) -> int:
-        """提取内容时间戳"""
-        import time
-        import re
-        from datetime import datetime
-        
-        publish_time = content.get("publish_time", "")
-        if not publish_time:
-            return int(time.time() * 1000)  # 返回当前时间戳
-        
-        try:
-            # 尝试解析贴吧时间格式：2024-05-28 15:33
-            if re.match(r'\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}', str(publish_time)):
-                dt = datetime.strptime(str(publish_time), '%Y-%m-%d %H:%M')
-                return int(dt.timestamp() * 1000)
-            
-            # 如果已经是时间戳，直接返回
-            if isinstance(publish_time, (int, float)):
-                return int(publish_time)
-            
-            # 如果是字符串数字，转换为整数
-            if str(publish_time).isdigit():
-                return int(publish_time)
-                
-        except Exception as e:
-            utils.logger.debug(f"[TiebaSimulationCrawler] 时间戳解析失败: {e}")
-        
-        # 如果无法解析，返回当前时间戳
-        return int(time.time() * 1000)
+        """提取内容时间戳（毫秒），与入库时写入的 publish_ts 使用同一套解析规则"""
+        publish_ts = normalize_publish_ts(content.get("publish_time", ""))
+        if not publish_ts:
+            # 如果无法解析，返回当前时间戳
+            return int(time.time() * 1000)
+        return publish_ts * 1000
     
     async def login(self) -> None:
         """登录处理"""
@@ -562,6 +542,8 @@ class TiebaSimulationCrawler(AbstractCrawler):
     
     async def close(self) -> None:
         """关闭爬虫"""
+        # 写完写缓冲中尚未落库的数据
+        await write_behind.drain_all()
         utils.logger.info("[TiebaSimulationCrawler] 关闭模拟爬虫")
         
         # 如果使用CDP模式，需要特殊处理
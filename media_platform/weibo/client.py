@@ -21,12 +21,15 @@ import re
 from typing import Callable, Dict, List, Optional, Union
 from urllib.parse import parse_qs, unquote, urlencode
 
-import httpx
 from httpx import Response
 from playwright.async_api import BrowserContext, Page
 
 import config
+from cache.tiered_cache import tiered_cached
+from proxy.proxy_rotator import get_proxy_rotator
 from tools import utils
+from tools.http_transport import HttpTransport, format_httpx_proxy
+from tools.rate_limiter import crawl_sleep, get_request_scheduler
 
 from .exception import DataFetchError
 from .field import SearchType
@@ -49,22 +52,14 @@ class WeiboClient:
         self.playwright_page = playwright_page
         self.cookie_dict = cookie_dict
         self._image_agent_host = "https://i1.wp.com/"
+        self._transport = HttpTransport(timeout=timeout, scheduler=get_request_scheduler(), rotator=get_proxy_rotator())
 
     async def request(self, method, url, **kwargs) -> Union[Response, Dict]:
         enable_return_response = kwargs.pop("return_response", False)
-        # 处理代理参数
-        proxy = None
-        if self.proxies:
-            if isinstance(self.proxies, dict):
-                proxy = list(self.proxies.values())[0] if self.proxies else None
-            else:
-                proxy = self.proxies
-        
-        async with httpx.AsyncClient(proxy=proxy) as client:
-            response = await client.request(
-                method, url, timeout=self.timeout,
-                **kwargs
-            )
+        response = await self._transport.request(
+            method, url, proxy=format_httpx_proxy(self.proxies), timeout=self.timeout,
+            **kwargs
+        )
 
         if enable_return_response:
             return response
@@ -107,9 +102,8 @@ class WeiboClient:
         else:
             full_url = url
             
-        async with httpx.AsyncClient() as client:
-            response = await client.get(full_url, headers=simple_headers, timeout=self.timeout)
-            return response.json()
+        response = await self._transport.request("GET", full_url, headers=simple_headers, timeout=self.timeout)
+        return response.json()
 
     async def pong(self) -> bool:
         """get a note to check if login state is ok"""
@@ -132,6 +126,12 @@ class WeiboClient:
         self.headers["Cookie"] = cookie_str
         self.cookie_dict = cookie_dict
 
+    async def close(self):
+        """
+        关闭 HTTP 长连接池，一般在爬虫结束时调用
+        """
+        await self._transport.aclose()
+
     async def get_note_by_keyword(
             self,
             keyword: str,
@@ -277,7 +277,7 @@ class WeiboClient:
                     await callback(note_id, comment_list)
                     
                 # 添加延迟
-                await asyncio.sleep(crawl_interval)
+                await crawl_sleep(crawl_interval)
                 
                 # 添加到结果中
                 result.extend(comment_list)
@@ -325,6 +325,7 @@ class WeiboClient:
                 res_sub_comments.extend(sub_comments)
         return res_sub_comments
 
+    @tiered_cached("weibo:note:{note_id}", "NOTE_DETAIL_CACHE_TTL_SEC", negative_ttl=0)
     async def get_note_info_by_id(self, note_id: str) -> Dict:
         """
         根据帖子ID获取详情
@@ -332,34 +333,33 @@ class WeiboClient:
         :return:
         """
         url = f"{self._host}/detail/{note_id}"
-        # 处理代理参数
-        proxy = None
-        if self.proxies:
-            if isinstance(self.proxies, dict):
-                proxy = list(self.proxies.values())[0] if self.proxies else None
-            else:
-                proxy = self.proxies
-        
-        async with httpx.AsyncClient(proxy=proxy) as client:
-            response = await client.request(
-                "GET", url, timeout=self.timeout, headers=self.headers
-            )
-            if response.status_code != 200:
-                raise DataFetchError(f"get weibo detail err: {response.text}")
-            match = re.search(r'var \$render_data = (\[.*?\])\[0\]', response.text, re.DOTALL)
-            if match:
-                render_data_json = match.group(1)
-                render_data_dict = json.loads(render_data_json)
-                note_detail = render_data_dict[0].get("status")
-                note_item = {
-                    "mblog": note_detail
-                }
-                return note_item
-            else:
-                utils.logger.info(f"[WeiboClient.get_note_info_by_id] 未找到$render_data的值")
-                return dict()
+        response = await self._transport.request(
+            "GET", url, proxy=format_httpx_proxy(self.proxies), timeout=self.timeout, headers=self.headers
+        )
+        if response.status_code != 200:
+            raise DataFetchError(f"get weibo detail err: {response.text}")
+        match = re.search(r'var \$render_data = (\[.*?\])\[0\]', response.text, re.DOTALL)
+        if match:
+            render_data_json = match.group(1)
+            render_data_dict = json.loads(render_data_json)
+            note_detail = render_data_dict[0].get("status")
+            note_item = {
+                "mblog": note_detail
+            }
+            return note_item
+        else:
+            utils.logger.info(f"[WeiboClient.get_note_info_by_id] 未找到$render_data的值")
+            return dict()
 
-    async def get_note_image(self, image_url: str) -> bytes:
+    def get_note_image_url(self, image_url: str) -> str:
+        """
+        微博图片的高清大图地址（经图片代理访问）
+        Args:
+            image_url: mblog 中 pics 的 url
+
+        Returns:
+
+        """
         image_url = image_url[8:]  # 去掉 https://
         sub_url = image_url.split("/")
         image_url = ""
@@ -372,22 +372,18 @@ class WeiboClient:
                 image_url += sub_url[i] + "/"
         # 微博图床对外存在防盗链，所以需要代理访问
         # 由于微博图片是通过 i1.wp.com 来访问的，所以需要拼接一下
-        final_uri = (f"{self._image_agent_host}" f"{image_url}")
-        # 处理代理参数
-        proxy = None
-        if self.proxies:
-            if isinstance(self.proxies, dict):
-                proxy = list(self.proxies.values())[0] if self.proxies else None
-            else:
-                proxy = self.proxies
-        
-        async with httpx.AsyncClient(proxy=proxy) as client:
-            response = await client.request("GET", final_uri, timeout=self.timeout)
-            if not response.reason_phrase == "OK":
-                utils.logger.error(f"[WeiboClient.get_note_image] request {final_uri} err, res:{response.text}")
-                return None
-            else:
-                return response.content
+        return f"{self._image_agent_host}" f"{image_url}"
+
+    async def get_note_image(self, image_url: str) -> bytes:
+        final_uri = self.get_note_image_url(image_url)
+        response = await self._transport.request(
+            "GET", final_uri, proxy=format_httpx_proxy(self.proxies), timeout=self.timeout
+        )
+        if not response.reason_phrase == "OK":
+            utils.logger.error(f"[WeiboClient.get_note_image] request {final_uri} err, res:{response.text}")
+            return None
+        else:
+            return response.content
 
 
 
@@ -412,6 +408,7 @@ class WeiboClient:
             "lfid_container_id": m_weibocn_params_dict.get("lfid", [""])[0]
         }
 
+    @tiered_cached("weibo:creator:{creator_id}", "CREATOR_INFO_CACHE_TTL_SEC", negative_ttl=0)
     async def get_creator_info_by_id(self, creator_id: str) -> Dict:
         """
         根据用户ID获取用户详情
@@ -501,7 +498,7 @@ class WeiboClient:
             notes = [note for note  in notes if note.get("card_type") == 9]
             if callback:
                 await callback(notes)
-            await asyncio.sleep(crawl_interval)
+            await crawl_sleep(crawl_interval)
             result.extend(notes)
             crawler_total_count += 10
             notes_has_more = notes_res.get("cardlistInfo", {}).get("total", 0) > crawler_total_count
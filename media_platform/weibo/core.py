@@ -28,8 +28,12 @@ import config
 from base.base_crawler import AbstractCrawler
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import weibo as weibo_store
+from store import write_behind
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.http_transport import format_httpx_proxy
+from tools.media_downloader import get_media_downloader
+from tools.rate_limiter import crawl_semaphore
 from var import crawler_type_var, source_keyword_var
 
 from .client import WeiboClient
@@ -196,7 +200,7 @@ class WeiboCrawler(AbstractCrawler):
         get specified notes info
         :return:
         """
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = crawl_semaphore()
         task_list = [
             self.get_note_info_task(note_id=note_id, semaphore=semaphore) for note_id in
             config.WEIBO_SPECIFIED_ID_LIST
@@ -237,7 +241,7 @@ class WeiboCrawler(AbstractCrawler):
             return
 
         utils.logger.info(f"[WeiboCrawler.batch_get_notes_comments] note ids:{note_id_list}")
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = crawl_semaphore()
         task_list: List[Task] = []
         for note_id in note_id_list:
             task = asyncio.create_task(self.get_note_comments(note_id, semaphore), name=note_id)
@@ -278,14 +282,17 @@ class WeiboCrawler(AbstractCrawler):
         pics: Dict = mblog.get("pics")
         if not pics:
             return
+        # 图片由媒体下载器在后台流式下载，不阻塞微博抓取
+        downloader = get_media_downloader()
+        image_store = weibo_store.WeiboStoreImage()
         for pic in pics:
             url = pic.get("url")
             if not url:
                 continue
-            content = await self.wb_client.get_note_image(url)
-            if content != None:
-                extension_file_name = url.split(".")[-1]
-                await weibo_store.update_weibo_note_image(pic["pid"], content, extension_file_name)
+            extension_file_name = url.split(".")[-1]
+            await downloader.submit(self.wb_client.get_note_image_url(url),
+                                    image_store.make_save_file_name(pic["pid"], extension_file_name),
+                                    proxy=format_httpx_proxy(self.wb_client.proxies))
 
 
     async def get_creators_and_notes(self) -> None:
@@ -435,6 +442,11 @@ class WeiboCrawler(AbstractCrawler):
 
     async def close(self):
         """Close browser context"""
+        # 写完写缓冲中尚未落库的数据
+        await write_behind.drain_all()
+        # 关闭 API client 的 HTTP 长连接池
+        if hasattr(self, "wb_client"):
+            await self.wb_client.close()
         # 如果使用CDP模式，需要特殊处理
         if self.cdp_manager:
             await self.cdp_manager.cleanup()
@@ -15,13 +15,17 @@ import re
 from typing import Any, Callable, Dict, List, Optional, Union
 from urllib.parse import urlencode
 
-import httpx
 from playwright.async_api import BrowserContext, Page
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_result
 
 import config
 from base.base_crawler import AbstractApiClient
+from cache.tiered_cache import tiered_cached
+from proxy.proxy_rotator import get_proxy_rotator
 from tools import utils
+from tools.http_transport import HttpTransport, format_httpx_proxy
+from tools.rate_limiter import crawl_sleep, get_request_scheduler
+from tools.signing_context import SigningContext, read_local_storage
 from html import unescape
 
 from .exception import DataFetchError, IPBlockError
@@ -50,6 +54,18 @@ class XiaoHongShuClient(AbstractApiClient):
         self.NOTE_ABNORMAL_CODE = -510001
         self.playwright_page = playwright_page
         self.cookie_dict = cookie_dict
+        self._transport = HttpTransport(timeout=timeout, scheduler=get_request_scheduler(), rotator=get_proxy_rotator())
+        self.sign_context = SigningContext()
+
+    async def _get_b1(self) -> str:
+        """
+        localStorage 中的 b1 很少变化，缓存起来，cookie 更新时失效
+        """
+        async def load_b1() -> str:
+            local_storage = await read_local_storage(self.playwright_page, ["b1"])
+            return local_storage.get("b1") or ""
+
+        return await self.sign_context.get("b1", load_b1)
 
     async def _pre_headers(self, url: str, data=None) -> Dict:
         """
@@ -64,10 +80,9 @@ class XiaoHongShuClient(AbstractApiClient):
         encrypt_params = await self.playwright_page.evaluate(
             "([url, data]) => window._webmsxyw(url,data)", [url, data]
         )
-        local_storage = await self.playwright_page.evaluate("() => window.localStorage")
         signs = sign(
             a1=self.cookie_dict.get("a1", ""),
-            b1=local_storage.get("b1", ""),
+            b1=await self._get_b1(),
             x_s=encrypt_params.get("X-s", ""),
             x_t=str(encrypt_params.get("X-t", "")),
         )
@@ -95,17 +110,9 @@ class XiaoHongShuClient(AbstractApiClient):
         """
         # return response.text
         return_response = kwargs.pop("return_response", False)
-
-        # 处理代理参数
-        proxy = None
-        if self.proxies:
-            if isinstance(self.proxies, dict):
-                proxy = list(self.proxies.values())[0] if self.proxies else None
-            else:
-                proxy = self.proxies
-        
-        async with httpx.AsyncClient(proxy=proxy) as client:
-            response = await client.request(method, url, timeout=self.timeout, **kwargs)
+        response = await self._transport.request(
+            method, url, proxy=format_httpx_proxy(self.proxies), timeout=self.timeout, **kwargs
+        )
 
         if response.status_code == 471 or response.status_code == 461:
             # someday someone maybe will bypass captcha
@@ -121,6 +128,9 @@ class XiaoHongShuClient(AbstractApiClient):
         if data["success"]:
             return data.get("data", data.get("success", {}))
         elif data["code"] == self.IP_ERROR_CODE:
+            self._transport.report_throttled(url)
+            # 开启代理轮换时隔离当前代理，重试时换一个代理
+            self._transport.report_proxy_blocked(response)
             raise IPBlockError(self.IP_ERROR_STR)
         else:
             raise DataFetchError(data.get("msg", None))
@@ -164,23 +174,16 @@ class XiaoHongShuClient(AbstractApiClient):
         )
 
     async def get_note_media(self, url: str) -> Union[bytes, None]:
-        # 处理代理参数
-        proxy = None
-        if self.proxies:
-            if isinstance(self.proxies, dict):
-                proxy = list(self.proxies.values())[0] if self.proxies else None
-            else:
-                proxy = self.proxies
-        
-        async with httpx.AsyncClient(proxy=proxy) as client:
-            response = await client.request("GET", url, timeout=self.timeout)
-            if not response.reason_phrase == "OK":
-                utils.logger.error(
-                    f"[XiaoHongShuClient.get_note_media] request {url} err, res:{response.text}"
-                )
-                return None
-            else:
-                return response.content
+        response = await self._transport.request(
+            "GET", url, proxy=format_httpx_proxy(self.proxies), timeout=self.timeout
+        )
+        if not response.reason_phrase == "OK":
+            utils.logger.error(
+                f"[XiaoHongShuClient.get_note_media] request {url} err, res:{response.text}"
+            )
+            return None
+        else:
+            return response.content
 
     async def pong(self) -> bool:
         """
@@ -214,6 +217,15 @@ class XiaoHongShuClient(AbstractApiClient):
         cookie_str, cookie_dict = utils.convert_cookies(await browser_context.cookies())
         self.headers["Cookie"] = cookie_str
         self.cookie_dict = cookie_dict
+        self.sign_context.invalidate()
+
+    async def close(self):
+        """
+        关闭 HTTP 长连接池，一般在爬虫结束时调用
+        Returns:
+
+        """
+        await self._transport.aclose()
 
     async def get_note_by_keyword(
         self,
@@ -247,6 +259,7 @@ class XiaoHongShuClient(AbstractApiClient):
         }
         return await self.post(uri, data)
 
+    @tiered_cached("xhs:note:{note_id}", "NOTE_DETAIL_CACHE_TTL_SEC", negative_ttl=0)
     async def get_note_by_id(
         self, note_id: str, xsec_source: str, xsec_token: str
     ) -> Dict:
@@ -374,7 +387,7 @@ class XiaoHongShuClient(AbstractApiClient):
                 comments = comments[: max_count - len(result)]
             if callback:
                 await callback(note_id, comments)
-            await asyncio.sleep(crawl_interval)
+            await crawl_sleep(crawl_interval)
             result.extend(comments)
             sub_comments = await self.get_comments_all_sub_comments(
                 comments=comments,
@@ -447,10 +460,11 @@ class XiaoHongShuClient(AbstractApiClient):
                 comments = comments_res["comments"]
                 if callback:
                     await callback(note_id, comments)
-                await asyncio.sleep(crawl_interval)
+                await crawl_sleep(crawl_interval)
                 result.extend(comments)
         return result
 
+    @tiered_cached("xhs:creator:{user_id}", "CREATOR_INFO_CACHE_TTL_SEC", negative_ttl=0)
     async def get_creator_info(self, user_id: str) -> Dict:
         """
         通过解析网页版的用户主页HTML，获取用户个人简要信息
@@ -544,7 +558,7 @@ class XiaoHongShuClient(AbstractApiClient):
                 await callback(notes_to_add)
 
             result.extend(notes_to_add)
-            await asyncio.sleep(crawl_interval)
+            await crawl_sleep(crawl_interval)
 
         utils.logger.info(
             f"[XiaoHongShuClient.get_all_notes_by_creator] Finished getting notes for user {user_id}, total: {len(result)}"
@@ -25,8 +25,12 @@ from config import CRAWLER_MAX_COMMENTS_COUNT_SINGLENOTES
 from model.m_xiaohongshu import NoteUrlInfo
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import xhs as xhs_store
+from store import write_behind
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
+from tools.http_transport import format_httpx_proxy
+from tools.media_downloader import get_media_downloader
+from tools.rate_limiter import crawl_semaphore
 from var import crawler_type_var, source_keyword_var
 
 from .client import XiaoHongShuClient
@@ -175,7 +179,7 @@ class XiaoHongShuCrawler(AbstractCrawler):
                     if not notes_res or not notes_res.get("has_more", False):
                         utils.logger.info("No more content!")
                         break
-                    semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+                    semaphore = crawl_semaphore()
                     task_list = [
                         self.get_note_detail_async_task(
                             note_id=post_item.get("id"),
@@ -240,7 +244,7 @@ class XiaoHongShuCrawler(AbstractCrawler):
         """
         Concurrently obtain the specified post list and save the data
         """
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = crawl_semaphore()
         task_list = [
             self.get_note_detail_async_task(
                 note_id=post_item.get("note_id"),
@@ -392,6 +396,19 @@ class XiaoHongShuCrawler(AbstractCrawler):
         # 调用原有的评论获取方法
         await self.batch_get_note_comments(xhs_note_list)
 
+    async def fetch_content_media(self, content_item: Dict) -> None:
+        """流水线媒体阶段：下载笔记图片/视频，搜索结果卡片不含图片/视频地址，需要先获取笔记详情"""
+        if not config.ENABLE_GET_IMAGES:
+            return
+        note_detail = await self.get_note_detail_async_task(
+            note_id=content_item.get("note_id", ""),
+            xsec_source=content_item.get("xsec_source", ""),
+            xsec_token=content_item.get("xsec_token", ""),
+            semaphore=crawl_semaphore(),
+        )
+        if note_detail:
+            await self.get_notice_media(note_detail)
+
     async def get_specified_notes(self):
         """
         Get the information and comments of the specified post
@@ -409,7 +426,7 @@ class XiaoHongShuCrawler(AbstractCrawler):
                 note_id=note_url_info.note_id,
                 xsec_source=note_url_info.xsec_source,
                 xsec_token=note_url_info.xsec_token,
-                semaphore=asyncio.Semaphore(config.MAX_CONCURRENCY_NUM),
+                semaphore=crawl_semaphore(),
             )
             get_note_detail_task_list.append(crawler_task)
 
@@ -504,7 +521,7 @@ class XiaoHongShuCrawler(AbstractCrawler):
         utils.logger.info(
             f"[XiaoHongShuCrawler.batch_get_note_comments] Begin batch get note comments, note list: {note_list}"
         )
-        semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
+        semaphore = crawl_semaphore()
         task_list: List[Task] = []
         for index, note_id in enumerate(note_list):
             task = asyncio.create_task(
@@ -658,6 +675,11 @@ class XiaoHongShuCrawler(AbstractCrawler):
 
     async def close(self):
         """Close browser context"""
+        # 写完写缓冲中尚未落库的数据
+        await write_behind.drain_all()
+        # 关闭 API client 的 HTTP 长连接池
+        if hasattr(self, "xhs_client"):
+            await self.xhs_client.close()
         # 如果使用CDP模式，需要特殊处理
         if self.cdp_manager:
             await self.cdp_manager.cleanup()
@@ -692,17 +714,18 @@ class XiaoHongShuCrawler(AbstractCrawler):
 
         if not image_list:
             return
+        # 图片由媒体下载器在后台流式下载，不阻塞笔记抓取
+        downloader = get_media_downloader()
+        image_store = xhs_store.XiaoHongShuImage()
         picNum = 0
         for pic in image_list:
             url = pic.get("url")
             if not url:
                 continue
-            content = await self.xhs_client.get_note_media(url)
-            if content is None:
-                continue
             extension_file_name = f"{picNum}.jpg"
             picNum += 1
-            await xhs_store.update_xhs_note_image(note_id, content, extension_file_name)
+            await downloader.submit(url, image_store.make_save_file_name(note_id, extension_file_name),
+                                    proxy=format_httpx_proxy(self.xhs_client.proxies))
 
     async def get_notice_video(self, note_item: Dict):
         """
@@ -718,11 +741,11 @@ class XiaoHongShuCrawler(AbstractCrawler):
 
         if not videos:
             return
+        downloader = get_media_downloader()
+        image_store = xhs_store.XiaoHongShuImage()
         videoNum = 0
         for url in videos:
-            content = await self.xhs_client.get_note_media(url)
-            if content is None:
-                continue
             extension_file_name = f"{videoNum}.mp4"
             videoNum += 1
-            await xhs_store.update_xhs_note_image(note_id, content, extension_file_name)
+            await downloader.submit(url, image_store.make_save_file_name(note_id, extension_file_name),
+                                    proxy=format_httpx_proxy(self.xhs_client.proxies))
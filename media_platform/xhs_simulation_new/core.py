@@ -23,6 +23,7 @@ import config
 from base.base_crawler import AbstractCrawler
 from proxy.proxy_ip_pool import IpInfoModel, create_ip_pool
 from store import xhs as xhs_store
+from store import write_behind
 from tools import utils
 from tools.cdp_browser import CDPBrowserManager
 from var import crawler_type_var, source_keyword_var
@@ -431,6 +432,8 @@ class XHSSimulationCrawler(AbstractCrawler):
     
     async def close(self) -> None:
         """关闭爬虫"""
+        # 写完写缓冲中尚未落库的数据
+        await write_behind.drain_all()
         utils.logger.info("[XHSSimulationCrawler] 关闭模拟爬虫")
         
         # 如果使用CDP模式，需要特殊处理
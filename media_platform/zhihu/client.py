@@ -24,11 +24,14 @@ import config
 from base.base_crawler import AbstractApiClient
 from constant import zhihu as zhihu_constant
 from model.m_zhihu import ZhihuComment, ZhihuContent, ZhihuCreator
+from proxy.proxy_rotator import get_proxy_rotator
 from tools import utils
+from tools.http_transport import HttpTransport, format_httpx_proxy
+from tools.rate_limiter import crawl_sleep, get_request_scheduler
 
 from .exception import DataFetchError, ForbiddenError
 from .field import SearchSort, SearchTime, SearchType
-from .help import ZhihuExtractor, sign
+from .help import ZhihuExtractor, async_sign
 
 
 class ZhiHuClient(AbstractApiClient):
@@ -51,6 +54,7 @@ class ZhiHuClient(AbstractApiClient):
         self._proxy_failed = False  # 代理失败标记
         self._proxy_retry_count = 0  # 代理重试计数
         self._max_proxy_retries = 3  # 最大代理重试次数
+        self._transport = HttpTransport(timeout=timeout, scheduler=get_request_scheduler(), rotator=get_proxy_rotator())
 
     async def _pre_headers(self, url: str) -> Dict:
         """
@@ -63,7 +67,7 @@ class ZhiHuClient(AbstractApiClient):
         d_c0 = self.cookie_dict.get("d_c0")
         if not d_c0:
             raise Exception("d_c0 not found in cookies")
-        sign_res = sign(url, self.default_headers["cookie"])
+        sign_res = await async_sign(url, self.default_headers["cookie"])
         headers = self.default_headers.copy()
         headers['x-zst-81'] = sign_res["x-zst-81"]
         headers['x-zse-96'] = sign_res["x-zse-96"]
@@ -88,21 +92,17 @@ class ZhiHuClient(AbstractApiClient):
         proxy = None
         use_proxy = False
         
-        # 如果代理未失败且配置了代理，则使用代理
-        if not self._proxy_failed and self.proxies:
-            if isinstance(self.proxies, dict):
-                proxy = list(self.proxies.values())[0] if self.proxies else None
-            else:
-                proxy = self.proxies
+        # 如果代理未失败且配置了代理，则使用代理（开启代理轮换时由 HttpTransport 选择代理并在出错时换代理，不降级）
+        if not self._proxy_failed and self.proxies and self._transport.rotator is None:
+            proxy = format_httpx_proxy(self.proxies)
             use_proxy = True
         
         # 尝试请求
         try:
-            async with httpx.AsyncClient(proxy=proxy) as client:
-                response = await client.request(
-                    method, url, timeout=self.timeout,
-                    **kwargs
-                )
+            response = await self._transport.request(
+                method, url, proxy=proxy, timeout=self.timeout,
+                **kwargs
+            )
             
             # 请求成功，重置代理重试计数
             if use_proxy:
@@ -220,6 +220,12 @@ class ZhiHuClient(AbstractApiClient):
         self.default_headers["cookie"] = cookie_str
         self.cookie_dict = cookie_dict
 
+    async def close(self):
+        """
+        关闭 HTTP 长连接池，一般在爬虫结束时调用
+        """
+        await self._transport.aclose()
+
     async def get_current_user_info(self) -> Dict:
         """
         获取当前登录用户信息
@@ -386,7 +392,7 @@ class ZhiHuClient(AbstractApiClient):
 
                 result.extend(comments)
                 await self.get_comments_all_sub_comments(content, comments, crawl_interval=crawl_interval, callback=callback)
-                await asyncio.sleep(crawl_interval)
+                await crawl_sleep(crawl_interval)
                 
             except Exception as ex:
                 utils.logger.error(f"[ZhihuClient.get_note_all_comments] Error getting comments for {content.content_id}: {ex}")
@@ -470,7 +476,7 @@ class ZhiHuClient(AbstractApiClient):
                         await callback(sub_comments)
 
                     all_sub_comments.extend(sub_comments)
-                    await asyncio.sleep(crawl_interval)
+                    await crawl_sleep(crawl_interval)
                     
                 except Exception as ex:
                     utils.logger.error(f"[ZhihuClient.get_comments_all_sub_comments] Error getting sub comments for comment {parment_comment.comment_id}: {ex}")
@@ -582,7 +588,7 @@ class ZhiHuClient(AbstractApiClient):
                 await callback(contents)
             all_contents.extend(contents)
             offset += limit
-            await asyncio.sleep(crawl_interval)
+            await crawl_sleep(crawl_interval)
         return all_contents
 
 
@@ -613,7 +619,7 @@ class ZhiHuClient(AbstractApiClient):
                 await callback(contents)
             all_contents.extend(contents)
             offset += limit
-            await asyncio.sleep(crawl_interval)
+            await crawl_sleep(crawl_interval)
         return all_contents
 
 
@@ -644,7 +650,7 @@ class ZhiHuClient(AbstractApiClient):
                 await callback(contents)
             all_contents.extend(contents)
             offset += limit
-            await asyncio.sleep(crawl_interval)
+            await crawl_sleep(crawl_interval)
         return all_contents
 
 
@@ -14,15 +14,15 @@ import json
 from typing import Dict, List, Optional
 from urllib.parse import parse_qs, urlparse
 
-import execjs
 from parsel import Selector
 
 from constant import zhihu as zhihu_constant
 from model.m_zhihu import ZhihuComment, ZhihuContent, ZhihuCreator
 from tools import utils
 from tools.crawler_util import extract_text_from_html
+from tools.js_sign_pool import get_js_sign_pool
 
-ZHIHU_SGIN_JS = None
+ZHIHU_SIGN_JS_PATH = "libs/zhihu.js"
 
 
 def sign(url: str, cookies: str) -> Dict:
@@ -35,12 +35,20 @@ def sign(url: str, cookies: str) -> Dict:
     Returns:
 
     """
-    global ZHIHU_SGIN_JS
-    if not ZHIHU_SGIN_JS:
-        with open("libs/zhihu.js", mode="r", encoding="utf-8-sig") as f:
-            ZHIHU_SGIN_JS = execjs.compile(f.read())
+    return get_js_sign_pool(ZHIHU_SIGN_JS_PATH).call("get_sign", url, cookies)
 
-    return ZHIHU_SGIN_JS.call("get_sign", url, cookies)
+
+async def async_sign(url: str, cookies: str) -> Dict:
+    """
+    zhihu sign algorithm, 签名在常驻 JS 进程中计算，不阻塞事件循环
+    Args:
+        url: request url with query string
+        cookies: request cookies with d_c0 key
+
+    Returns:
+
+    """
+    return await get_js_sign_pool(ZHIHU_SIGN_JS_PATH).async_call("get_sign", url, cookies)
 
 
 class ZhihuExtractor:
@@ -13,85 +13,264 @@
 # @Author  : relakkes@gmail.com
 # @Time    : 2023/12/2 13:45
 # @Desc    : ip代理池实现
+#            - 代理取出后不再从池中移除，在代理商给出的过期时间之前一直可以复用（过期前 IP_PROXY_EXPIRE_MARGIN_SEC 秒停止分配）
+#            - 开启验证时由后台任务并发验证，get_proxy 不等待验证请求；验证复用每个代理的长连接
+#            - 每个代理按指数衰减记录成功率和延迟，按 成功率 / 延迟 加权随机选择，成功率过低的代理移出代理池
+#            - 可用代理不足 IP_PROXY_POOL_COUNT 的一半时在后台提前向代理商补充，代理池空了才需要同步等待
+import asyncio
 import random
-from typing import Dict, List
-
-import httpx
-from tenacity import retry, stop_after_attempt, wait_fixed
+import time
+from typing import Dict, List, Optional, Set
 
 import config
 from proxy.providers import new_jisu_http_proxy, new_kuai_daili_proxy
 from tools import utils
+from tools.http_transport import HttpTransport
 
 from .base_proxy import ProxyProvider
 from .types import IpInfoModel, ProviderNameEnum
 
+# 代理商没有给出过期时间时的默认租期（秒）
+DEFAULT_PROXY_LEASE_SEC = 3600
+
+
+def proxy_key(proxy: IpInfoModel) -> str:
+    return f"{proxy.ip}:{proxy.port}"
+
+
+def proxy_url(proxy: IpInfoModel) -> str:
+    """
+    httpx 使用的代理 URL
+    """
+    return f"http://{proxy.user}:{proxy.password}@{proxy.ip}:{proxy.port}"
+
+
+class ProxyHealth:
+    """
+    一个代理的租期和健康状况，成功率和延迟使用指数加权移动平均，越近的请求权重越大
+    """
+
+    def __init__(self, proxy: IpInfoModel, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        self.proxy = proxy
+        self.expire_at = self._lease_deadline(proxy, now)
+        # 没有验证过的代理先按可用处理，不让启动等待验证
+        self.success_rate = 1.0
+        self.latency: Optional[float] = None
+        self.samples = 0
+
+    @staticmethod
+    def _lease_deadline(proxy: IpInfoModel, now: float) -> float:
+        # 极速 HTTP 返回过期时间戳，快代理返回剩余可用秒数
+        expired = proxy.expired_time_ts
+        if not expired:
+            return now + DEFAULT_PROXY_LEASE_SEC
+        if expired < 1_000_000_000:
+            return now + expired
+        return float(expired)
+
+    def observe(self, success: bool, latency: Optional[float] = None, decay: Optional[float] = None):
+        """
+        记录一次请求结果
+        Args:
+            success: 请求是否成功
+            latency: 请求耗时（秒），失败时可以不传
+            decay: 最新一次结果的权重，默认读取 config.IP_PROXY_HEALTH_DECAY
+        """
+        alpha = config.IP_PROXY_HEALTH_DECAY if decay is None else decay
+        self.success_rate = (1 - alpha) * self.success_rate + alpha * (1.0 if success else 0.0)
+        if success and latency is not None:
+            self.latency = latency if self.latency is None else (1 - alpha) * self.latency + alpha * latency
+        self.samples += 1
+
+    def usable(self, now: float) -> bool:
+        return now < self.expire_at - config.IP_PROXY_EXPIRE_MARGIN_SEC
+
+    def weight(self, default_latency: float) -> float:
+        latency = self.latency if self.latency is not None else default_latency
+        return max(self.success_rate, 0.01) / max(latency, 0.01)
+
 
 class ProxyIpPool:
-    def __init__(self, ip_pool_count: int, enable_validate_ip: bool, ip_provider: ProxyProvider) -> None:
+    def __init__(self, ip_pool_count: int, enable_validate_ip: bool, ip_provider: ProxyProvider,
+                 valid_ip_url: str = "https://httpbin.org/ip") -> None:
         """
 
         Args:
-            ip_pool_count:
-            enable_validate_ip:
-            ip_provider:
+            ip_pool_count: 代理池中保持的代理数量
+            enable_validate_ip: 是否在后台验证代理
+            ip_provider: 代理商
+            valid_ip_url: 验证 IP 是否有效的地址
         """
-        self.valid_ip_url = "https://httpbin.org/ip"  # 验证 IP 是否有效的地址
+        self.valid_ip_url = valid_ip_url
         self.ip_pool_count = ip_pool_count
         self.enable_validate_ip = enable_validate_ip
-        self.proxy_list: List[IpInfoModel] = []
         self.ip_provider: ProxyProvider = ip_provider
+        self.proxies: Dict[str, ProxyHealth] = {}
+        self.stats = {"fetched": 0, "fetches": 0, "expired": 0, "evicted": 0, "validations": 0}
+        # 验证请求按代理复用长连接
+        self._transport = HttpTransport(timeout=config.IP_PROXY_VALIDATE_TIMEOUT)
+        self._refill_task: Optional[asyncio.Task] = None
+        self._validate_task: Optional[asyncio.Task] = None
+        self._refill_lock = asyncio.Lock()
+
+    @property
+    def proxy_list(self) -> List[IpInfoModel]:
+        return [health.proxy for health in self.proxies.values()]
 
     async def load_proxies(self) -> None:
         """
-        加载IP代理
+        加载IP代理，开启验证时启动后台验证任务
         Returns:
 
         """
-        self.proxy_list = await self.ip_provider.get_proxies(self.ip_pool_count)
+        await self._refill()
+        if self.enable_validate_ip and (self._validate_task is None or self._validate_task.done()):
+            self._validate_task = asyncio.create_task(self._validate_loop())
+
+    async def _refill(self, exclude: Optional[Set[str]] = None):
+        """
+        向代理商补充代理，补到 ip_pool_count 个可用代理
+        Args:
+            exclude: 暂时不能使用的代理（例如被隔离的代理），不计入可用数量
+        """
+        async with self._refill_lock:
+            self._remove_expired()
+            need = self.ip_pool_count - self._live_count(exclude)
+            if need <= 0:
+                return
+            proxies = await self.ip_provider.get_proxies(need)
+            self.stats["fetches"] += 1
+            now = time.time()
+            for proxy in proxies:
+                key = proxy_key(proxy)
+                if key in self.proxies:
+                    continue
+                health = ProxyHealth(proxy, now)
+                if health.usable(now):
+                    self.proxies[key] = health
+                    self.stats["fetched"] += 1
+
+    def _live_count(self, exclude: Optional[Set[str]] = None) -> int:
+        # 即将过期的代理不算在内，提前补充替换它们的代理
+        soon = time.time() + config.IP_PROXY_EXPIRE_MARGIN_SEC
+        return sum(1 for key, health in self.proxies.items() if health.usable(soon) and key not in (exclude or ()))
+
+    def _remove_expired(self):
+        now = time.time()
+        for key, health in list(self.proxies.items()):
+            if not health.usable(now):
+                self._remove(key, "expired")
+
+    def _remove(self, key: str, reason: str):
+        health = self.proxies.pop(key, None)
+        if health is None:
+            return
+        self.stats[reason] += 1
+        utils.logger.info(f"[ProxyIpPool] remove {reason} proxy {key}, success rate {health.success_rate:.2f}")
+        asyncio.ensure_future(self._transport.close_proxy(proxy_url(health.proxy)))
+
+    def _prefetch(self):
+        """
+        可用代理不足一半时在后台补充，不阻塞本次取代理
+        """
+        if self._live_count() * 2 > self.ip_pool_count:
+            return
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._background_refill())
+
+    async def _background_refill(self):
+        try:
+            await self._refill()
+        except Exception as e:
+            utils.logger.error(f"[ProxyIpPool._background_refill] get proxies from provider error: {e}")
+
+    async def get_proxy(self, exclude: Optional[Set[str]] = None) -> IpInfoModel:
+        """
+        按 成功率 / 延迟 加权随机选择一个代理，代理不会从池中移除，可以重复分配直到过期
+        :param exclude: 不参与选择的代理（proxy_key），例如被隔离的代理
+        :return:
+        """
+        self._remove_expired()
+        candidates = [health for key, health in self.proxies.items() if key not in (exclude or ())]
+        if not candidates:
+            await self._refill(exclude)
+            candidates = [health for key, health in self.proxies.items() if key not in (exclude or ())]
+            if not candidates:
+                raise Exception("[ProxyIpPool.get_proxy] no proxy available from provider")
+        self._prefetch()
+        latencies = [health.latency for health in candidates if health.latency is not None]
+        default_latency = sum(latencies) / len(latencies) if latencies else 1.0
+        weights = [health.weight(default_latency) for health in candidates]
+        return random.choices(candidates, weights=weights)[0].proxy
+
+    def report(self, proxy: IpInfoModel, success: bool, latency: Optional[float] = None):
+        """
+        上报使用代理请求的结果，成功率低于 IP_PROXY_MIN_SUCCESS_RATE 的代理移出代理池
+        Args:
+            proxy: get_proxy 返回的代理
+            success: 请求是否成功
+            latency: 请求耗时（秒）
+        """
+        key = proxy_key(proxy)
+        health = self.proxies.get(key)
+        if health is None:
+            return
+        health.observe(success, latency)
+        if health.success_rate < config.IP_PROXY_MIN_SUCCESS_RATE:
+            self._remove(key, "evicted")
+            self._prefetch()
 
     async def _is_valid_proxy(self, proxy: IpInfoModel) -> bool:
         """
-        验证代理IP是否有效
+        验证代理IP是否有效，结果计入代理的健康状况
         :param proxy:
         :return:
         """
-        utils.logger.info(f"[ProxyIpPool._is_valid_proxy] testing {proxy.ip} is it valid ")
+        start = time.monotonic()
         try:
-            proxy_url = f"http://{proxy.user}:{proxy.password}@{proxy.ip}:{proxy.port}"
-            async with httpx.AsyncClient(proxy=proxy_url) as client:
-                response = await client.get(self.valid_ip_url)
-            if response.status_code == 200:
-                return True
-            else:
-                return False
+            response = await self._transport.request("GET", self.valid_ip_url, proxy=proxy_url(proxy))
+            valid = response.status_code == 200
         except Exception as e:
             utils.logger.info(f"[ProxyIpPool._is_valid_proxy] testing {proxy.ip} err: {e}")
-            raise e
+            valid = False
+        self.stats["validations"] += 1
+        self.report(proxy, valid, time.monotonic() - start)
+        return valid
 
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(1))
-    async def get_proxy(self) -> IpInfoModel:
+    async def validate_all(self):
         """
-        从代理池中随机提取一个代理IP
-        :return:
+        并发验证池中的全部代理
         """
-        if len(self.proxy_list) == 0:
-            await self._reload_proxies()
+        semaphore = asyncio.Semaphore(config.IP_PROXY_VALIDATE_CONCURRENCY)
+
+        async def validate(proxy: IpInfoModel):
+            async with semaphore:
+                await self._is_valid_proxy(proxy)
+
+        await asyncio.gather(*(validate(proxy) for proxy in self.proxy_list))
 
-        proxy = random.choice(self.proxy_list)
-        self.proxy_list.remove(proxy) # 取出来一个IP就应该移出掉
-        if self.enable_validate_ip:
-            if not await self._is_valid_proxy(proxy):
-                raise Exception("[ProxyIpPool.get_proxy] current ip invalid and again get it")
-        return proxy
+    async def _validate_loop(self):
+        while True:
+            try:
+                await self.validate_all()
+                self._remove_expired()
+                self._prefetch()
+            except Exception as e:
+                utils.logger.error(f"[ProxyIpPool._validate_loop] validate proxies error: {e}")
+            await asyncio.sleep(config.IP_PROXY_VALIDATE_INTERVAL_SEC)
 
-    async def _reload_proxies(self):
+    async def close(self):
         """
-        # 重新加载代理池
-        :return:
+        停止后台任务，关闭验证使用的连接池
         """
-        self.proxy_list = []
-        await self.load_proxies()
+        for task in (self._validate_task, self._refill_task):
+            if task is not None and not task.done():
+                task.cancel()
+        await asyncio.gather(*(task for task in (self._validate_task, self._refill_task) if task is not None),
+                             return_exceptions=True)
+        self._validate_task = self._refill_task = None
+        await self._transport.aclose()
 
 
 IpProxyProvider: Dict[str, ProxyProvider] = {
@@ -99,6 +278,8 @@ IpProxyProvider: Dict[str, ProxyProvider] = {
     ProviderNameEnum.KUAI_DAILI_PROVIDER.value: new_kuai_daili_proxy()
 }
 
+_ip_pools: List[ProxyIpPool] = []
+
 
 async def create_ip_pool(ip_pool_count: int, enable_validate_ip: bool) -> ProxyIpPool:
     """
@@ -116,8 +297,24 @@ async def create_ip_pool(ip_pool_count: int, enable_validate_ip: bool) -> ProxyI
                        ip_provider=ip_provider
                        )
     await pool.load_proxies()
+    _ip_pools.append(pool)
+    # 开启代理轮换时，之后创建的平台 client 每次请求从该代理池选择代理
+    from .proxy_rotator import set_proxy_rotator
+    set_proxy_rotator(pool)
     return pool
 
 
+async def close_ip_pools():
+    """
+    关闭所有代理池的后台任务，程序退出时调用
+    """
+    from .proxy_rotator import set_proxy_rotator
+    set_proxy_rotator(None)
+    while _ip_pools:
+        pool = _ip_pools.pop()
+        utils.logger.info(f"[proxy_ip_pool.close_ip_pools] {pool.stats}")
+        await pool.close()
+
+
 if __name__ == '__main__':
     pass
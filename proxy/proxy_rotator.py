@@ -0,0 +1,132 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：  
+# 1. 不得用于任何商业用途。  
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。  
+# 3. 不得进行大规模爬取或对平台造成运营干扰。  
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。   
+# 5. 不得用于任何非法或不当的用途。
+#   
+# 详细许可条款请参阅项目根目录下的LICENSE文件。  
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。  
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 代理轮换，由 HttpTransport 在每次请求时选择代理
+#            - request 模式：每个请求从代理池中重新选择代理；sticky 模式：同一个会话（默认每个 API client，即每个账号）
+#              固定使用一个代理，直到该代理被隔离或过期
+#            - 出现连接/代理错误、限流状态码（429/461/471），或者平台 client 判断 IP 被封（IPBlockError）时隔离代理，
+#              隔离时间按 PROXY_QUARANTINE_BASE_SEC 指数增长（上限 PROXY_QUARANTINE_MAX_SEC），到期后重新参与选择，成功一次后清零
+#            - 隔离同时计入代理池的成功率，连续多次被隔离的代理由代理池移除并补充新代理
+#            - 全部代理都被隔离且代理商无法补充时，使用最早解除隔离的代理，不中断抓取
+import time
+from typing import Dict, Optional, Tuple
+
+import config
+from tools import utils
+
+from .proxy_ip_pool import ProxyIpPool, proxy_key, proxy_url
+from .types import IpInfoModel
+
+ROTATE_PER_REQUEST = "request"
+ROTATE_STICKY = "sticky"
+
+
+class ProxyRotator:
+
+    def __init__(self, pool: ProxyIpPool, mode: Optional[str] = None, max_retries: Optional[int] = None):
+        """
+        Args:
+            pool: 代理池
+            mode: request | sticky，默认读取 config.PROXY_ROTATION_MODE
+            max_retries: 请求失败后换代理重试的次数，默认读取 config.PROXY_ROTATION_MAX_RETRIES
+        """
+        self.pool = pool
+        self.mode = mode or config.PROXY_ROTATION_MODE
+        self.max_retries = config.PROXY_ROTATION_MAX_RETRIES if max_retries is None else max_retries
+        # 会话 -> 代理（sticky 模式）
+        self._sessions: Dict[str, IpInfoModel] = {}
+        # 代理 -> (解除隔离的时间, 连续被隔离的次数)
+        self._quarantine: Dict[str, Tuple[float, int]] = {}
+        self.stats = {"quarantined": 0, "released": 0, "retries": 0}
+
+    @staticmethod
+    def proxy_url(proxy: IpInfoModel) -> str:
+        return proxy_url(proxy)
+
+    def _quarantined_keys(self, now: float):
+        for key in [key for key in self._quarantine if key not in self.pool.proxies]:
+            # 已被代理池移除（过期或成功率过低）
+            self._quarantine.pop(key)
+        return {key for key, (until, _) in self._quarantine.items() if until > now}
+
+    async def acquire(self, session_key: Optional[str] = None) -> IpInfoModel:
+        """
+        为一次请求选择代理
+        Args:
+            session_key: sticky 模式下的会话标识，同一个会话复用同一个代理
+
+        Returns:
+
+        """
+        now = time.time()
+        quarantined = self._quarantined_keys(now)
+        if self.mode == ROTATE_STICKY and session_key is not None:
+            proxy = self._sessions.get(session_key)
+            if proxy is not None and proxy_key(proxy) not in quarantined and proxy_key(proxy) in self.pool.proxies:
+                return proxy
+        try:
+            proxy = await self.pool.get_proxy(exclude=quarantined)
+        except Exception as e:
+            # get_proxy 期间代理池可能移除了过期的代理，只能在仍然在池中的隔离代理里选
+            candidates = [key for key in self._quarantine if key in self.pool.proxies]
+            if not candidates:
+                raise
+            # 没有可用代理时退而使用最早解除隔离的代理
+            key = min(candidates, key=lambda k: self._quarantine[k][0])
+            proxy = self.pool.proxies[key].proxy
+            utils.logger.warning(f"[ProxyRotator.acquire] all proxies quarantined, fall back to {key}: {e}")
+        if self.mode == ROTATE_STICKY and session_key is not None:
+            self._sessions[session_key] = proxy
+        return proxy
+
+    def report_success(self, proxy: IpInfoModel, latency: Optional[float] = None):
+        key = proxy_key(proxy)
+        if key in self._quarantine:
+            self._quarantine.pop(key)
+            self.stats["released"] += 1
+        self.pool.report(proxy, True, latency)
+
+    def quarantine(self, proxy: IpInfoModel, reason: str):
+        """
+        隔离代理，连续被隔离时隔离时间翻倍
+        Args:
+            proxy: 代理
+            reason: 原因，写入日志
+        """
+        key = proxy_key(proxy)
+        _, strikes = self._quarantine.get(key, (0.0, 0))
+        seconds = min(config.PROXY_QUARANTINE_BASE_SEC * (2 ** strikes), config.PROXY_QUARANTINE_MAX_SEC)
+        self._quarantine[key] = (time.time() + seconds, strikes + 1)
+        self.stats["quarantined"] += 1
+        for session_key, session_proxy in list(self._sessions.items()):
+            if proxy_key(session_proxy) == key:
+                self._sessions.pop(session_key)
+        utils.logger.warning(f"[ProxyRotator.quarantine] quarantine proxy {key} for {seconds}s: {reason}")
+        self.pool.report(proxy, False)
+
+
+_proxy_rotator: Optional[ProxyRotator] = None
+
+
+def set_proxy_rotator(pool: Optional[ProxyIpPool]):
+    """
+    开启 ENABLE_PROXY_ROTATION 时为代理池创建全局轮换器，pool 为 None 时清除
+    """
+    global _proxy_rotator
+    _proxy_rotator = ProxyRotator(pool) if pool is not None and config.ENABLE_PROXY_ROTATION else None
+
+
+def get_proxy_rotator() -> Optional[ProxyRotator]:
+    """
+    获取全局代理轮换器，未开启代理或代理轮换时返回 None，平台 client 创建 HttpTransport 时传入
+    """
+    return _proxy_rotator
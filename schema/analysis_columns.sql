@@ -0,0 +1,67 @@
+-- 从 analysis_info（AI 分析结果）生成的情感、情感评分、相关性评分列，和发布时间建联合索引
+-- web 看板的情感分布统计、情感筛选、噪音过滤只需要扫描索引，不再逐行解析 JSON；分析任务只写 analysis_info，生成列由数据库维护
+-- 需要 MySQL 8.0.21+（JSON_VALUE）；贴吧、知乎的发布时间使用 publish_ts，先执行 schema/publish_ts.sql
+-- SQLite 数据库由 AsyncSqliteDB 打开时自动添加（普通列 + 写入 analysis_info 时更新这些列的触发器 + 同样的索引）
+
+ALTER TABLE `xhs_note`
+ADD COLUMN `sentiment` varchar(16) GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment')) STORED COMMENT '情感倾向',
+ADD COLUMN `sentiment_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment_score' RETURNING DOUBLE)) STORED COMMENT '情感评分',
+ADD COLUMN `relevance_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.relevance_score' RETURNING DOUBLE)) STORED COMMENT '相关性评分',
+ADD KEY `idx_xhs_note_time_sentiment` (`time`, `sentiment`, `sentiment_score`),
+ADD KEY `idx_xhs_note_time_relevance` (`time`, `relevance_score`);
+
+ALTER TABLE `douyin_aweme`
+ADD COLUMN `sentiment` varchar(16) GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment')) STORED COMMENT '情感倾向',
+ADD COLUMN `sentiment_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment_score' RETURNING DOUBLE)) STORED COMMENT '情感评分',
+ADD COLUMN `relevance_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.relevance_score' RETURNING DOUBLE)) STORED COMMENT '相关性评分',
+ADD KEY `idx_douyin_aweme_time_sentiment` (`create_time`, `sentiment`, `sentiment_score`),
+ADD KEY `idx_douyin_aweme_time_relevance` (`create_time`, `relevance_score`);
+
+ALTER TABLE `kuaishou_video`
+ADD COLUMN `sentiment` varchar(16) GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment')) STORED COMMENT '情感倾向',
+ADD COLUMN `sentiment_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment_score' RETURNING DOUBLE)) STORED COMMENT '情感评分',
+ADD COLUMN `relevance_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.relevance_score' RETURNING DOUBLE)) STORED COMMENT '相关性评分',
+ADD KEY `idx_kuaishou_video_time_sentiment` (`create_time`, `sentiment`, `sentiment_score`),
+ADD KEY `idx_kuaishou_video_time_relevance` (`create_time`, `relevance_score`);
+
+ALTER TABLE `bilibili_video`
+ADD COLUMN `sentiment` varchar(16) GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment')) STORED COMMENT '情感倾向',
+ADD COLUMN `sentiment_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment_score' RETURNING DOUBLE)) STORED COMMENT '情感评分',
+ADD COLUMN `relevance_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.relevance_score' RETURNING DOUBLE)) STORED COMMENT '相关性评分',
+ADD KEY `idx_bilibili_video_time_sentiment` (`create_time`, `sentiment`, `sentiment_score`),
+ADD KEY `idx_bilibili_video_time_relevance` (`create_time`, `relevance_score`);
+
+ALTER TABLE `weibo_note`
+ADD COLUMN `sentiment` varchar(16) GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment')) STORED COMMENT '情感倾向',
+ADD COLUMN `sentiment_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment_score' RETURNING DOUBLE)) STORED COMMENT '情感评分',
+ADD COLUMN `relevance_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.relevance_score' RETURNING DOUBLE)) STORED COMMENT '相关性评分',
+ADD KEY `idx_weibo_note_time_sentiment` (`create_time`, `sentiment`, `sentiment_score`),
+ADD KEY `idx_weibo_note_time_relevance` (`create_time`, `relevance_score`);
+
+ALTER TABLE `tieba_note`
+ADD COLUMN `sentiment` varchar(16) GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment')) STORED COMMENT '情感倾向',
+ADD COLUMN `sentiment_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment_score' RETURNING DOUBLE)) STORED COMMENT '情感评分',
+ADD COLUMN `relevance_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.relevance_score' RETURNING DOUBLE)) STORED COMMENT '相关性评分',
+ADD KEY `idx_tieba_note_time_sentiment` (`publish_ts`, `sentiment`, `sentiment_score`),
+ADD KEY `idx_tieba_note_time_relevance` (`publish_ts`, `relevance_score`);
+
+ALTER TABLE `zhihu_content`
+ADD COLUMN `sentiment` varchar(16) GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment')) STORED COMMENT '情感倾向',
+ADD COLUMN `sentiment_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment_score' RETURNING DOUBLE)) STORED COMMENT '情感评分',
+ADD COLUMN `relevance_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.relevance_score' RETURNING DOUBLE)) STORED COMMENT '相关性评分',
+ADD KEY `idx_zhihu_content_time_sentiment` (`publish_ts`, `sentiment`, `sentiment_score`),
+ADD KEY `idx_zhihu_content_time_relevance` (`publish_ts`, `relevance_score`);
+
+ALTER TABLE `weixin_article`
+ADD COLUMN `sentiment` varchar(16) GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment')) STORED COMMENT '情感倾向',
+ADD COLUMN `sentiment_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment_score' RETURNING DOUBLE)) STORED COMMENT '情感评分',
+ADD COLUMN `relevance_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.relevance_score' RETURNING DOUBLE)) STORED COMMENT '相关性评分',
+ADD KEY `idx_weixin_article_time_sentiment` (`publish_timestamp`, `sentiment`, `sentiment_score`),
+ADD KEY `idx_weixin_article_time_relevance` (`publish_timestamp`, `relevance_score`);
+
+ALTER TABLE `news_article`
+ADD COLUMN `sentiment` varchar(16) GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment')) STORED COMMENT '情感倾向',
+ADD COLUMN `sentiment_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.sentiment_score' RETURNING DOUBLE)) STORED COMMENT '情感评分',
+ADD COLUMN `relevance_score` double GENERATED ALWAYS AS (JSON_VALUE(`analysis_info`, '$.relevance_score' RETURNING DOUBLE)) STORED COMMENT '相关性评分',
+ADD KEY `idx_news_article_time_sentiment` (`publish_date`, `sentiment`, `sentiment_score`),
+ADD KEY `idx_news_article_time_relevance` (`publish_date`, `relevance_score`);
@@ -0,0 +1,44 @@
+-- 内容表、评论表的 ID 字段改为唯一索引，批量写入使用 INSERT ... ON DUPLICATE KEY UPDATE 依赖这些唯一索引
+-- 已有数据库执行本脚本：先删除重复记录（保留 id 最大的一条），再把普通索引替换成唯一索引
+
+DELETE t1 FROM `bilibili_video` t1 JOIN `bilibili_video` t2 ON t1.`video_id` = t2.`video_id` AND t1.`id` < t2.`id`;
+ALTER TABLE `bilibili_video` DROP INDEX `idx_bilibili_vi_video_i_31c36e`, ADD UNIQUE KEY `idx_bilibili_vi_video_i_31c36e` (`video_id`);
+
+DELETE t1 FROM `bilibili_video_comment` t1 JOIN `bilibili_video_comment` t2 ON t1.`comment_id` = t2.`comment_id` AND t1.`id` < t2.`id`;
+ALTER TABLE `bilibili_video_comment` DROP INDEX `idx_bilibili_vi_comment_41c34e`, ADD UNIQUE KEY `idx_bilibili_vi_comment_41c34e` (`comment_id`);
+
+DELETE t1 FROM `douyin_aweme` t1 JOIN `douyin_aweme` t2 ON t1.`aweme_id` = t2.`aweme_id` AND t1.`id` < t2.`id`;
+ALTER TABLE `douyin_aweme` DROP INDEX `idx_douyin_awem_aweme_i_6f7bc6`, ADD UNIQUE KEY `idx_douyin_awem_aweme_i_6f7bc6` (`aweme_id`);
+
+DELETE t1 FROM `douyin_aweme_comment` t1 JOIN `douyin_aweme_comment` t2 ON t1.`comment_id` = t2.`comment_id` AND t1.`id` < t2.`id`;
+ALTER TABLE `douyin_aweme_comment` DROP INDEX `idx_douyin_awem_comment_fcd7e4`, ADD UNIQUE KEY `idx_douyin_awem_comment_fcd7e4` (`comment_id`);
+
+DELETE t1 FROM `kuaishou_video` t1 JOIN `kuaishou_video` t2 ON t1.`video_id` = t2.`video_id` AND t1.`id` < t2.`id`;
+ALTER TABLE `kuaishou_video` DROP INDEX `idx_kuaishou_vi_video_i_c5c6a6`, ADD UNIQUE KEY `idx_kuaishou_vi_video_i_c5c6a6` (`video_id`);
+
+DELETE t1 FROM `kuaishou_video_comment` t1 JOIN `kuaishou_video_comment` t2 ON t1.`comment_id` = t2.`comment_id` AND t1.`id` < t2.`id`;
+ALTER TABLE `kuaishou_video_comment` DROP INDEX `idx_kuaishou_vi_comment_ed48fa`, ADD UNIQUE KEY `idx_kuaishou_vi_comment_ed48fa` (`comment_id`);
+
+DELETE t1 FROM `weibo_note` t1 JOIN `weibo_note` t2 ON t1.`note_id` = t2.`note_id` AND t1.`id` < t2.`id`;
+ALTER TABLE `weibo_note` DROP INDEX `idx_weibo_note_note_id_f95b1a`, ADD UNIQUE KEY `idx_weibo_note_note_id_f95b1a` (`note_id`);
+
+DELETE t1 FROM `weibo_note_comment` t1 JOIN `weibo_note_comment` t2 ON t1.`comment_id` = t2.`comment_id` AND t1.`id` < t2.`id`;
+ALTER TABLE `weibo_note_comment` DROP INDEX `idx_weibo_note__comment_c7611c`, ADD UNIQUE KEY `idx_weibo_note__comment_c7611c` (`comment_id`);
+
+DELETE t1 FROM `xhs_note` t1 JOIN `xhs_note` t2 ON t1.`note_id` = t2.`note_id` AND t1.`id` < t2.`id`;
+ALTER TABLE `xhs_note` DROP INDEX `idx_xhs_note_note_id_209457`, ADD UNIQUE KEY `idx_xhs_note_note_id_209457` (`note_id`);
+
+DELETE t1 FROM `xhs_note_comment` t1 JOIN `xhs_note_comment` t2 ON t1.`comment_id` = t2.`comment_id` AND t1.`id` < t2.`id`;
+ALTER TABLE `xhs_note_comment` DROP INDEX `idx_xhs_note_co_comment_8e8349`, ADD UNIQUE KEY `idx_xhs_note_co_comment_8e8349` (`comment_id`);
+
+DELETE t1 FROM `tieba_note` t1 JOIN `tieba_note` t2 ON t1.`note_id` = t2.`note_id` AND t1.`id` < t2.`id`;
+ALTER TABLE `tieba_note` DROP INDEX `idx_tieba_note_note_id`, ADD UNIQUE KEY `idx_tieba_note_note_id` (`note_id`);
+
+DELETE t1 FROM `tieba_comment` t1 JOIN `tieba_comment` t2 ON t1.`comment_id` = t2.`comment_id` AND t1.`id` < t2.`id`;
+ALTER TABLE `tieba_comment` DROP INDEX `idx_tieba_comment_comment_id`, ADD UNIQUE KEY `idx_tieba_comment_comment_id` (`comment_id`);
+
+DELETE t1 FROM `zhihu_content` t1 JOIN `zhihu_content` t2 ON t1.`content_id` = t2.`content_id` AND t1.`id` < t2.`id`;
+ALTER TABLE `zhihu_content` DROP INDEX `idx_zhihu_content_content_id`, ADD UNIQUE KEY `idx_zhihu_content_content_id` (`content_id`);
+
+DELETE t1 FROM `zhihu_comment` t1 JOIN `zhihu_comment` t2 ON t1.`comment_id` = t2.`comment_id` AND t1.`id` < t2.`id`;
+ALTER TABLE `zhihu_comment` DROP INDEX `idx_zhihu_comment_comment_id`, ADD UNIQUE KEY `idx_zhihu_comment_comment_id` (`comment_id`);
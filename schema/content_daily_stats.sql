@@ -0,0 +1,30 @@
+-- 看板统计汇总表（tools/stats_rollup.py）：按平台、发布日期、来源关键词汇总内容数、评论数和情感分布，
+-- 看板的平台数据量、情感分布按天读取汇总行，不再扫描内容表；db 存储写入内容、评论后增量刷新
+-- 情感分布使用 sentiment 生成列，贴吧、知乎的发布时间使用 publish_ts，先执行 schema/analysis_columns.sql、schema/publish_ts.sql
+-- 执行后运行 python -m analysis_job.stats_rollup_rebuild 汇总已有数据
+
+CREATE TABLE `content_daily_stats`
+(
+    `platform`       varchar(16)  NOT NULL COMMENT '看板平台',
+    `stat_date`      date         NOT NULL COMMENT '发布日期（本地时间）',
+    `source_keyword` varchar(255) NOT NULL DEFAULT '' COMMENT '来源关键词',
+    `content_count`  int          NOT NULL DEFAULT 0 COMMENT '内容数',
+    `comment_count`  int          NOT NULL DEFAULT 0 COMMENT '评论数',
+    `positive_count` int          NOT NULL DEFAULT 0 COMMENT '正面内容数',
+    `negative_count` int          NOT NULL DEFAULT 0 COMMENT '负面内容数',
+    `neutral_count`  int          NOT NULL DEFAULT 0 COMMENT '中性内容数',
+    `unknown_count`  int          NOT NULL DEFAULT 0 COMMENT '其他情感值的内容数',
+    `last_modify_ts` bigint       NOT NULL COMMENT '最后刷新时间戳',
+    PRIMARY KEY (`platform`, `stat_date`, `source_keyword`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='看板统计汇总表';
+
+CREATE TABLE `content_daily_stats_state`
+(
+    `platform` varchar(16) NOT NULL COMMENT '看板平台',
+    `built_ts` bigint      NOT NULL COMMENT '重建完成时间戳',
+    PRIMARY KEY (`platform`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='看板统计汇总表重建状态';
+
+-- 刷新汇总行时按内容 ID 统计评论数，小红书评论表原来没有 note_id 索引
+ALTER TABLE `xhs_note_comment`
+ADD KEY `idx_xhs_note_comment_note_id` (`note_id`);
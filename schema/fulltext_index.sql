@@ -0,0 +1,23 @@
+-- 看板关键词搜索使用的全文索引：标题、正文上的 FULLTEXT 索引，ngram 分词（默认 ngram_token_size=2），
+-- 查询用 MATCH ... AGAINST 代替 LIKE '%关键词%' 全表扫描；没有该索引的表仍使用 LIKE
+
+ALTER TABLE `xhs_note`
+ADD FULLTEXT INDEX `idx_xhs_note_fulltext` (`title`, `desc`) WITH PARSER ngram;
+
+ALTER TABLE `douyin_aweme`
+ADD FULLTEXT INDEX `idx_douyin_aweme_fulltext` (`title`, `desc`) WITH PARSER ngram;
+
+ALTER TABLE `kuaishou_video`
+ADD FULLTEXT INDEX `idx_kuaishou_video_fulltext` (`title`, `desc`) WITH PARSER ngram;
+
+ALTER TABLE `bilibili_video`
+ADD FULLTEXT INDEX `idx_bilibili_video_fulltext` (`title`, `desc`) WITH PARSER ngram;
+
+ALTER TABLE `weibo_note`
+ADD FULLTEXT INDEX `idx_weibo_note_fulltext` (`content`) WITH PARSER ngram;
+
+ALTER TABLE `tieba_note`
+ADD FULLTEXT INDEX `idx_tieba_note_fulltext` (`title`, `desc`) WITH PARSER ngram;
+
+ALTER TABLE `zhihu_content`
+ADD FULLTEXT INDEX `idx_zhihu_content_fulltext` (`title`, `desc`) WITH PARSER ngram;
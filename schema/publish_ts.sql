@@ -0,0 +1,10 @@
+-- 为贴吧帖子、知乎内容表添加归一化的发布时间 publish_ts（秒级时间戳）
+-- publish_time / created_time 是字符串，无法在 SQL 中按时间筛选；执行后运行 python -m analysis_job.publish_ts_backfill 回填已有数据
+
+ALTER TABLE `tieba_note`
+ADD COLUMN `publish_ts` bigint DEFAULT NULL COMMENT '归一化的发布时间（秒级时间戳，无法解析时为0）',
+ADD KEY `idx_tieba_note_publish_ts` (`publish_ts`);
+
+ALTER TABLE `zhihu_content`
+ADD COLUMN `publish_ts` bigint DEFAULT NULL COMMENT '归一化的发布时间（秒级时间戳，无法解析时为0）',
+ADD KEY `idx_zhihu_content_publish_ts` (`publish_ts`);
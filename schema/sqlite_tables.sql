@@ -0,0 +1,779 @@
+-- SQLite 版本的表结构（SAVE_DATA_OPTION = "sqlite"），与 tables.sql、news_tables.sql、resume_crawl.sql 中的 MySQL 表一一对应
+-- 包含这些文件中后续 alter table 增加的字段，内容表额外带上 web 看板和分析任务使用的 analysis_info 字段
+-- 只使用 CREATE ... IF NOT EXISTS，AsyncSqliteDB 每次打开数据库时都会执行本脚本，已有的表和数据不受影响
+-- MySQL 表结构有变化时需要同步修改本文件；SQLite 中索引名在整个库内唯一，重名的索引名后面加上了表名
+
+-- ----------------------------
+-- B站视频 bilibili_video
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `bilibili_video`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `user_id` TEXT,                         -- 用户ID
+    `nickname` TEXT,                        -- 用户昵称
+    `avatar` TEXT,                          -- 用户头像地址
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,      -- 记录最后修改时间戳
+    `video_id` TEXT NOT NULL,               -- 视频ID
+    `video_type` TEXT NOT NULL,             -- 视频类型
+    `title` TEXT,                           -- 视频标题
+    `desc` TEXT,                            -- 视频描述
+    `create_time` INTEGER NOT NULL,         -- 视频发布时间戳
+    `liked_count` TEXT,                     -- 视频点赞数
+    `disliked_count` TEXT,                  -- 视频点踩数
+    `video_play_count` TEXT,                -- 视频播放数量
+    `video_favorite_count` TEXT,            -- 视频收藏数量
+    `video_share_count` TEXT,               -- 视频分享数量
+    `video_coin_count` TEXT,                -- 视频投币数量
+    `video_danmaku` TEXT,                   -- 视频弹幕数量
+    `video_comment` TEXT,                   -- 视频评论数量
+    `video_url` TEXT,                       -- 视频详情URL
+    `video_cover_url` TEXT,                 -- 视频封面图 URL
+    `source_keyword` TEXT DEFAULT '',       -- 搜索来源关键字
+    `analysis_info` TEXT                    -- AI分析结果
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_bilibili_vi_video_i_31c36e` ON `bilibili_video` (`video_id`);
+CREATE INDEX IF NOT EXISTS `idx_bilibili_vi_create__73e0ec` ON `bilibili_video` (`create_time`);
+
+-- ----------------------------
+-- B 站视频评论 bilibili_video_comment
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `bilibili_video_comment`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `user_id` TEXT,                         -- 用户ID
+    `nickname` TEXT,                        -- 用户昵称
+    `sex` TEXT,                             -- 用户性别
+    `sign` TEXT,                            -- 用户签名
+    `avatar` TEXT,                          -- 用户头像地址
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,      -- 记录最后修改时间戳
+    `comment_id` TEXT NOT NULL,             -- 评论ID
+    `video_id` TEXT NOT NULL,               -- 视频ID
+    `content` TEXT,                         -- 评论内容
+    `create_time` INTEGER NOT NULL,         -- 评论时间戳
+    `sub_comment_count` TEXT NOT NULL,      -- 评论回复数
+    `parent_comment_id` TEXT,               -- 父评论ID
+    `like_count` TEXT NOT NULL DEFAULT '0'  -- 点赞数
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_bilibili_vi_comment_41c34e` ON `bilibili_video_comment` (`comment_id`);
+CREATE INDEX IF NOT EXISTS `idx_bilibili_vi_video_i_f22873` ON `bilibili_video_comment` (`video_id`);
+
+-- ----------------------------
+-- B 站UP主信息 bilibili_up_info
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `bilibili_up_info`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `user_id` TEXT,                         -- 用户ID
+    `nickname` TEXT,                        -- 用户昵称
+    `sex` TEXT,                             -- 用户性别
+    `sign` TEXT,                            -- 用户签名
+    `avatar` TEXT,                          -- 用户头像地址
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,      -- 记录最后修改时间戳
+    `total_fans` INTEGER,                   -- 粉丝数
+    `total_liked` INTEGER,                  -- 总获赞数
+    `user_rank` INTEGER,                    -- 用户等级
+    `is_official` INTEGER                   -- 是否官号
+);
+CREATE INDEX IF NOT EXISTS `idx_bilibili_vi_user_123456` ON `bilibili_up_info` (`user_id`);
+
+-- ----------------------------
+-- B 站联系人信息 bilibili_contact_info
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `bilibili_contact_info`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `up_id` TEXT,                           -- up主ID
+    `fan_id` TEXT,                          -- 粉丝ID
+    `up_name` TEXT,                         -- up主昵称
+    `fan_name` TEXT,                        -- 粉丝昵称
+    `up_sign` TEXT,                         -- up主签名
+    `fan_sign` TEXT,                        -- 粉丝签名
+    `up_avatar` TEXT,                       -- up主头像地址
+    `fan_avatar` TEXT,                      -- 粉丝头像地址
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL       -- 记录最后修改时间戳
+);
+CREATE INDEX IF NOT EXISTS `idx_bilibili_contact_info_up_id` ON `bilibili_contact_info` (`up_id`);
+CREATE INDEX IF NOT EXISTS `idx_bilibili_contact_info_fan_id` ON `bilibili_contact_info` (`fan_id`);
+
+-- ----------------------------
+-- B 站up主动态信息 bilibili_up_dynamic
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `bilibili_up_dynamic`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `dynamic_id` TEXT,                      -- 动态ID
+    `user_id` TEXT,                         -- 用户ID
+    `user_name` TEXT,                       -- 用户名
+    `text` TEXT,                            -- 动态文本
+    `type` TEXT,                            -- 动态类型
+    `pub_ts` INTEGER,                       -- 动态发布时间
+    `total_comments` INTEGER,               -- 评论数
+    `total_forwards` INTEGER,               -- 转发数
+    `total_liked` INTEGER,                  -- 点赞数
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL       -- 记录最后修改时间戳
+);
+CREATE INDEX IF NOT EXISTS `idx_bilibili_up_dynamic_dynamic_id` ON `bilibili_up_dynamic` (`dynamic_id`);
+
+-- ----------------------------
+-- 抖音视频 douyin_aweme
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `douyin_aweme`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `user_id` TEXT,                         -- 用户ID
+    `sec_uid` TEXT,                         -- 用户sec_uid
+    `short_user_id` TEXT,                   -- 用户短ID
+    `user_unique_id` TEXT,                  -- 用户唯一ID
+    `nickname` TEXT,                        -- 用户昵称
+    `avatar` TEXT,                          -- 用户头像地址
+    `user_signature` TEXT,                  -- 用户签名
+    `ip_location` TEXT,                     -- 评论时的IP地址
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,      -- 记录最后修改时间戳
+    `aweme_id` TEXT NOT NULL,               -- 视频ID
+    `aweme_type` TEXT NOT NULL,             -- 视频类型
+    `title` TEXT,                           -- 视频标题
+    `desc` TEXT,                            -- 视频描述
+    `create_time` INTEGER NOT NULL,         -- 视频发布时间戳
+    `liked_count` TEXT,                     -- 视频点赞数
+    `comment_count` TEXT,                   -- 视频评论数
+    `share_count` TEXT,                     -- 视频分享数
+    `collected_count` TEXT,                 -- 视频收藏数
+    `aweme_url` TEXT,                       -- 视频详情页URL
+    `cover_url` TEXT,                       -- 视频封面图URL
+    `video_download_url` TEXT,              -- 视频下载地址
+    `source_keyword` TEXT DEFAULT '',       -- 搜索来源关键字
+    `analysis_info` TEXT                    -- AI分析结果
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_douyin_awem_aweme_i_6f7bc6` ON `douyin_aweme` (`aweme_id`);
+CREATE INDEX IF NOT EXISTS `idx_douyin_awem_create__299dfe` ON `douyin_aweme` (`create_time`);
+
+-- ----------------------------
+-- 抖音视频评论 douyin_aweme_comment
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `douyin_aweme_comment`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `user_id` TEXT,                         -- 用户ID
+    `sec_uid` TEXT,                         -- 用户sec_uid
+    `short_user_id` TEXT,                   -- 用户短ID
+    `user_unique_id` TEXT,                  -- 用户唯一ID
+    `nickname` TEXT,                        -- 用户昵称
+    `avatar` TEXT,                          -- 用户头像地址
+    `user_signature` TEXT,                  -- 用户签名
+    `ip_location` TEXT,                     -- 评论时的IP地址
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,      -- 记录最后修改时间戳
+    `comment_id` TEXT NOT NULL,             -- 评论ID
+    `aweme_id` TEXT NOT NULL,               -- 视频ID
+    `content` TEXT,                         -- 评论内容
+    `create_time` INTEGER NOT NULL,         -- 评论时间戳
+    `sub_comment_count` TEXT NOT NULL,      -- 评论回复数
+    `parent_comment_id` TEXT,               -- 父评论ID
+    `like_count` TEXT NOT NULL DEFAULT '0', -- 点赞数
+    `pictures` TEXT NOT NULL DEFAULT ''     -- 评论图片列表
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_douyin_awem_comment_fcd7e4` ON `douyin_aweme_comment` (`comment_id`);
+CREATE INDEX IF NOT EXISTS `idx_douyin_awem_aweme_i_c50049` ON `douyin_aweme_comment` (`aweme_id`);
+
+-- ----------------------------
+-- 抖音博主信息 dy_creator
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `dy_creator`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `user_id` TEXT NOT NULL,                -- 用户ID
+    `nickname` TEXT,                        -- 用户昵称
+    `avatar` TEXT,                          -- 用户头像地址
+    `ip_location` TEXT,                     -- 评论时的IP地址
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,      -- 记录最后修改时间戳
+    `desc` TEXT,                            -- 用户描述
+    `gender` TEXT,                          -- 性别
+    `follows` TEXT,                         -- 关注数
+    `fans` TEXT,                            -- 粉丝数
+    `interaction` TEXT,                     -- 获赞数
+    `videos_count` TEXT                     -- 作品数
+);
+
+-- ----------------------------
+-- 快手视频 kuaishou_video
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `kuaishou_video`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `user_id` TEXT,                         -- 用户ID
+    `nickname` TEXT,                        -- 用户昵称
+    `avatar` TEXT,                          -- 用户头像地址
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,      -- 记录最后修改时间戳
+    `video_id` TEXT NOT NULL,               -- 视频ID
+    `video_type` TEXT NOT NULL,             -- 视频类型
+    `title` TEXT,                           -- 视频标题
+    `desc` TEXT,                            -- 视频描述
+    `create_time` INTEGER NOT NULL,         -- 视频发布时间戳
+    `liked_count` TEXT,                     -- 视频点赞数
+    `viewd_count` TEXT,                     -- 视频浏览数量
+    `video_url` TEXT,                       -- 视频详情URL
+    `video_cover_url` TEXT,                 -- 视频封面图 URL
+    `video_play_url` TEXT,                  -- 视频播放 URL
+    `source_keyword` TEXT DEFAULT '',       -- 搜索来源关键字
+    `analysis_info` TEXT                    -- AI分析结果
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_kuaishou_vi_video_i_c5c6a6` ON `kuaishou_video` (`video_id`);
+CREATE INDEX IF NOT EXISTS `idx_kuaishou_vi_create__a10dee` ON `kuaishou_video` (`create_time`);
+
+-- ----------------------------
+-- 快手视频评论 kuaishou_video_comment
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `kuaishou_video_comment`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `user_id` TEXT,                         -- 用户ID
+    `nickname` TEXT,                        -- 用户昵称
+    `avatar` TEXT,                          -- 用户头像地址
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,      -- 记录最后修改时间戳
+    `comment_id` TEXT NOT NULL,             -- 评论ID
+    `video_id` TEXT NOT NULL,               -- 视频ID
+    `content` TEXT,                         -- 评论内容
+    `create_time` INTEGER NOT NULL,         -- 评论时间戳
+    `sub_comment_count` TEXT NOT NULL       -- 评论回复数
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_kuaishou_vi_comment_ed48fa` ON `kuaishou_video_comment` (`comment_id`);
+CREATE INDEX IF NOT EXISTS `idx_kuaishou_vi_video_i_e50914` ON `kuaishou_video_comment` (`video_id`);
+
+-- ----------------------------
+-- 微博帖子 weibo_note
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `weibo_note`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `user_id` TEXT,                         -- 用户ID
+    `nickname` TEXT,                        -- 用户昵称
+    `avatar` TEXT,                          -- 用户头像地址
+    `gender` TEXT,                          -- 用户性别
+    `profile_url` TEXT,                     -- 用户主页地址
+    `ip_location` TEXT DEFAULT '发布微博的地理信息',
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,      -- 记录最后修改时间戳
+    `note_id` TEXT NOT NULL,                -- 帖子ID
+    `content` TEXT,                         -- 帖子正文内容
+    `create_time` INTEGER NOT NULL,         -- 帖子发布时间戳
+    `create_date_time` TEXT NOT NULL,       -- 帖子发布日期时间
+    `liked_count` TEXT,                     -- 帖子点赞数
+    `comments_count` TEXT,                  -- 帖子评论数量
+    `shared_count` TEXT,                    -- 帖子转发数量
+    `note_url` TEXT,                        -- 帖子详情URL
+    `source_keyword` TEXT DEFAULT '',       -- 搜索来源关键字
+    `analysis_info` TEXT                    -- AI分析结果
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_weibo_note_note_id_f95b1a` ON `weibo_note` (`note_id`);
+CREATE INDEX IF NOT EXISTS `idx_weibo_note_create__692709` ON `weibo_note` (`create_time`);
+CREATE INDEX IF NOT EXISTS `idx_weibo_note_create__d05ed2` ON `weibo_note` (`create_date_time`);
+
+-- ----------------------------
+-- 微博帖子评论 weibo_note_comment
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `weibo_note_comment`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `user_id` TEXT,                         -- 用户ID
+    `nickname` TEXT,                        -- 用户昵称
+    `avatar` TEXT,                          -- 用户头像地址
+    `gender` TEXT,                          -- 用户性别
+    `profile_url` TEXT,                     -- 用户主页地址
+    `ip_location` TEXT DEFAULT '发布微博的地理信息',
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,      -- 记录最后修改时间戳
+    `comment_id` TEXT NOT NULL,             -- 评论ID
+    `note_id` TEXT NOT NULL,                -- 帖子ID
+    `content` TEXT,                         -- 评论内容
+    `create_time` INTEGER NOT NULL,         -- 评论时间戳
+    `create_date_time` TEXT NOT NULL,       -- 评论日期时间
+    `comment_like_count` TEXT NOT NULL,     -- 评论点赞数量
+    `sub_comment_count` TEXT NOT NULL,      -- 评论回复数
+    `parent_comment_id` TEXT                -- 父评论ID
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_weibo_note__comment_c7611c` ON `weibo_note_comment` (`comment_id`);
+CREATE INDEX IF NOT EXISTS `idx_weibo_note__note_id_24f108` ON `weibo_note_comment` (`note_id`);
+CREATE INDEX IF NOT EXISTS `idx_weibo_note__create__667fe3` ON `weibo_note_comment` (`create_date_time`);
+
+-- ----------------------------
+-- 小红书博主 xhs_creator
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `xhs_creator`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `user_id` TEXT NOT NULL,                -- 用户ID
+    `nickname` TEXT,                        -- 用户昵称
+    `avatar` TEXT,                          -- 用户头像地址
+    `ip_location` TEXT,                     -- 评论时的IP地址
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,      -- 记录最后修改时间戳
+    `desc` TEXT,                            -- 用户描述
+    `gender` TEXT,                          -- 性别
+    `follows` TEXT,                         -- 关注数
+    `fans` TEXT,                            -- 粉丝数
+    `interaction` TEXT,                     -- 获赞和收藏数
+    `tag_list` TEXT                         -- 标签列表
+);
+
+-- ----------------------------
+-- 小红书笔记 xhs_note
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `xhs_note`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `user_id` TEXT NOT NULL,                -- 用户ID
+    `nickname` TEXT,                        -- 用户昵称
+    `avatar` TEXT,                          -- 用户头像地址
+    `ip_location` TEXT,                     -- 评论时的IP地址
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,      -- 记录最后修改时间戳
+    `note_id` TEXT NOT NULL,                -- 笔记ID
+    `type` TEXT,                            -- 笔记类型(normal | video)
+    `title` TEXT,                           -- 笔记标题
+    `desc` TEXT,                            -- 笔记描述
+    `video_url` TEXT,                       -- 视频地址
+    `time` INTEGER NOT NULL,                -- 笔记发布时间戳
+    `last_update_time` INTEGER NOT NULL,    -- 笔记最后更新时间戳
+    `liked_count` TEXT,                     -- 笔记点赞数
+    `collected_count` TEXT,                 -- 笔记收藏数
+    `comment_count` TEXT,                   -- 笔记评论数
+    `share_count` TEXT,                     -- 笔记分享数
+    `image_list` TEXT,                      -- 笔记封面图片列表
+    `tag_list` TEXT,                        -- 标签列表
+    `note_url` TEXT,                        -- 笔记详情页的URL
+    `source_keyword` TEXT DEFAULT '',       -- 搜索来源关键字
+    `xsec_token` TEXT,                      -- 签名算法
+    `analysis_info` TEXT                    -- AI分析结果
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_xhs_note_note_id_209457` ON `xhs_note` (`note_id`);
+CREATE INDEX IF NOT EXISTS `idx_xhs_note_time_eaa910` ON `xhs_note` (`time`);
+
+-- ----------------------------
+-- 小红书笔记评论 xhs_note_comment
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `xhs_note_comment`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `user_id` TEXT NOT NULL,                -- 用户ID
+    `nickname` TEXT,                        -- 用户昵称
+    `avatar` TEXT,                          -- 用户头像地址
+    `ip_location` TEXT,                     -- 评论时的IP地址
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,      -- 记录最后修改时间戳
+    `comment_id` TEXT NOT NULL,             -- 评论ID
+    `create_time` INTEGER NOT NULL,         -- 评论时间戳
+    `note_id` TEXT NOT NULL,                -- 笔记ID
+    `content` TEXT NOT NULL,                -- 评论内容
+    `sub_comment_count` INTEGER NOT NULL,   -- 子评论数量
+    `pictures` TEXT,
+    `parent_comment_id` TEXT,               -- 父评论ID
+    `like_count` TEXT                       -- 评论点赞数量
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_xhs_note_co_comment_8e8349` ON `xhs_note_comment` (`comment_id`);
+CREATE INDEX IF NOT EXISTS `idx_xhs_note_co_create__204f8d` ON `xhs_note_comment` (`create_time`);
+CREATE INDEX IF NOT EXISTS `idx_xhs_note_comment_note_id` ON `xhs_note_comment` (`note_id`);
+
+-- ----------------------------
+-- 贴吧帖子表 tieba_note
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `tieba_note`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `note_id` TEXT NOT NULL,                -- 帖子ID
+    `title` TEXT NOT NULL,                  -- 帖子标题
+    `desc` TEXT,                            -- 帖子描述
+    `note_url` TEXT NOT NULL,               -- 帖子链接
+    `publish_time` TEXT NOT NULL,           -- 发布时间
+    `user_link` TEXT DEFAULT '',            -- 用户主页链接
+    `user_nickname` TEXT DEFAULT '',        -- 用户昵称
+    `user_avatar` TEXT DEFAULT '',          -- 用户头像地址
+    `tieba_id` TEXT DEFAULT '',             -- 贴吧ID
+    `tieba_name` TEXT NOT NULL,             -- 贴吧名称
+    `tieba_link` TEXT NOT NULL,             -- 贴吧链接
+    `total_replay_num` INTEGER DEFAULT 0,   -- 帖子回复总数
+    `total_replay_page` INTEGER DEFAULT 0,  -- 帖子回复总页数
+    `ip_location` TEXT DEFAULT '',          -- IP地理位置
+    `add_ts` INTEGER NOT NULL,              -- 添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,      -- 最后修改时间戳
+    `source_keyword` TEXT DEFAULT '',       -- 搜索来源关键字
+    `analysis_info` TEXT,                   -- AI分析结果
+    `publish_ts` INTEGER DEFAULT NULL       -- 归一化的发布时间（秒级时间戳，无法解析时为0），索引在 AsyncSqliteDB 打开数据库时创建
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_tieba_note_note_id` ON `tieba_note` (`note_id`);
+CREATE INDEX IF NOT EXISTS `idx_tieba_note_publish_time` ON `tieba_note` (`publish_time`);
+
+-- ----------------------------
+-- 贴吧评论表 tieba_comment
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `tieba_comment`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `comment_id` TEXT NOT NULL,             -- 评论ID
+    `parent_comment_id` TEXT DEFAULT '',    -- 父评论ID
+    `content` TEXT NOT NULL,                -- 评论内容
+    `user_link` TEXT DEFAULT '',            -- 用户主页链接
+    `user_nickname` TEXT DEFAULT '',        -- 用户昵称
+    `user_avatar` TEXT DEFAULT '',          -- 用户头像地址
+    `tieba_id` TEXT DEFAULT '',             -- 贴吧ID
+    `tieba_name` TEXT NOT NULL,             -- 贴吧名称
+    `tieba_link` TEXT NOT NULL,             -- 贴吧链接
+    `publish_time` TEXT DEFAULT '',         -- 发布时间
+    `ip_location` TEXT DEFAULT '',          -- IP地理位置
+    `sub_comment_count` INTEGER DEFAULT 0,  -- 子评论数
+    `note_id` TEXT NOT NULL,                -- 帖子ID
+    `note_url` TEXT NOT NULL,               -- 帖子链接
+    `add_ts` INTEGER NOT NULL,              -- 添加时间戳
+    `last_modify_ts` INTEGER NOT NULL       -- 最后修改时间戳
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_tieba_comment_comment_id` ON `tieba_comment` (`comment_id`);
+CREATE INDEX IF NOT EXISTS `idx_tieba_comment_note_id` ON `tieba_comment` (`note_id`);
+CREATE INDEX IF NOT EXISTS `idx_tieba_comment_publish_time` ON `tieba_comment` (`publish_time`);
+
+-- ----------------------------
+-- 微博博主 weibo_creator
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `weibo_creator`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `user_id` TEXT NOT NULL,                -- 用户ID
+    `nickname` TEXT,                        -- 用户昵称
+    `avatar` TEXT,                          -- 用户头像地址
+    `ip_location` TEXT,                     -- 评论时的IP地址
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,      -- 记录最后修改时间戳
+    `desc` TEXT,                            -- 用户描述
+    `gender` TEXT,                          -- 性别
+    `follows` TEXT,                         -- 关注数
+    `fans` TEXT,                            -- 粉丝数
+    `tag_list` TEXT                         -- 标签列表
+);
+
+-- ----------------------------
+-- 贴吧创作者 tieba_creator
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `tieba_creator`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `user_id` TEXT NOT NULL,                -- 用户ID
+    `user_name` TEXT NOT NULL,              -- 用户名
+    `nickname` TEXT,                        -- 用户昵称
+    `avatar` TEXT,                          -- 用户头像地址
+    `ip_location` TEXT,                     -- 评论时的IP地址
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,      -- 记录最后修改时间戳
+    `gender` TEXT,                          -- 性别
+    `follows` TEXT,                         -- 关注数
+    `fans` TEXT,                            -- 粉丝数
+    `registration_duration` TEXT            -- 吧龄
+);
+
+-- ----------------------------
+-- 知乎内容（回答、文章、视频） zhihu_content
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `zhihu_content`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT,       -- 自增ID
+    `content_id` TEXT NOT NULL,                   -- 内容ID
+    `content_type` TEXT NOT NULL,                 -- 内容类型(article | answer | zvideo)
+    `content_text` TEXT,                          -- 内容文本, 如果是视频类型这里为空
+    `content_url` TEXT NOT NULL,                  -- 内容落地链接
+    `question_id` TEXT,                           -- 问题ID, type为answer时有值
+    `title` TEXT NOT NULL,                        -- 内容标题
+    `desc` TEXT,                                  -- 内容描述
+    `created_time` TEXT NOT NULL,                 -- 创建时间
+    `updated_time` TEXT NOT NULL,                 -- 更新时间
+    `voteup_count` INTEGER NOT NULL DEFAULT '0',  -- 赞同人数
+    `comment_count` INTEGER NOT NULL DEFAULT '0', -- 评论数量
+    `source_keyword` TEXT,                        -- 来源关键词
+    `user_id` TEXT NOT NULL,                      -- 用户ID
+    `user_link` TEXT NOT NULL,                    -- 用户主页链接
+    `user_nickname` TEXT NOT NULL,                -- 用户昵称
+    `user_avatar` TEXT NOT NULL,                  -- 用户头像地址
+    `user_url_token` TEXT NOT NULL,               -- 用户url_token
+    `add_ts` INTEGER NOT NULL,                    -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,            -- 记录最后修改时间戳
+    `analysis_info` TEXT,                         -- AI分析结果
+    `publish_ts` INTEGER DEFAULT NULL             -- 归一化的发布时间（秒级时间戳，无法解析时为0），索引在 AsyncSqliteDB 打开数据库时创建
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_zhihu_content_content_id` ON `zhihu_content` (`content_id`);
+CREATE INDEX IF NOT EXISTS `idx_zhihu_content_created_time` ON `zhihu_content` (`created_time`);
+
+-- ----------------------------
+-- 知乎评论 zhihu_comment
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `zhihu_comment`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT,           -- 自增ID
+    `comment_id` TEXT NOT NULL,                       -- 评论ID
+    `parent_comment_id` TEXT,                         -- 父评论ID
+    `content` TEXT NOT NULL,                          -- 评论内容
+    `publish_time` TEXT NOT NULL,                     -- 发布时间
+    `ip_location` TEXT,                               -- IP地理位置
+    `sub_comment_count` INTEGER NOT NULL DEFAULT '0', -- 子评论数
+    `like_count` INTEGER NOT NULL DEFAULT '0',        -- 点赞数
+    `dislike_count` INTEGER NOT NULL DEFAULT '0',     -- 踩数
+    `content_id` TEXT NOT NULL,                       -- 内容ID
+    `content_type` TEXT NOT NULL,                     -- 内容类型(article | answer | zvideo)
+    `user_id` TEXT NOT NULL,                          -- 用户ID
+    `user_link` TEXT NOT NULL,                        -- 用户主页链接
+    `user_nickname` TEXT NOT NULL,                    -- 用户昵称
+    `user_avatar` TEXT NOT NULL,                      -- 用户头像地址
+    `add_ts` INTEGER NOT NULL,                        -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL                 -- 记录最后修改时间戳
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_zhihu_comment_comment_id` ON `zhihu_comment` (`comment_id`);
+CREATE INDEX IF NOT EXISTS `idx_zhihu_comment_content_id` ON `zhihu_comment` (`content_id`);
+CREATE INDEX IF NOT EXISTS `idx_zhihu_comment_publish_time` ON `zhihu_comment` (`publish_time`);
+
+-- ----------------------------
+-- 知乎创作者 zhihu_creator
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `zhihu_creator`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT,        -- 自增ID
+    `user_id` TEXT NOT NULL,                       -- 用户ID
+    `user_link` TEXT NOT NULL,                     -- 用户主页链接
+    `user_nickname` TEXT NOT NULL,                 -- 用户昵称
+    `user_avatar` TEXT NOT NULL,                   -- 用户头像地址
+    `url_token` TEXT NOT NULL,                     -- 用户URL Token
+    `gender` TEXT,                                 -- 用户性别
+    `ip_location` TEXT,                            -- IP地理位置
+    `follows` INTEGER NOT NULL DEFAULT 0,          -- 关注数
+    `fans` INTEGER NOT NULL DEFAULT 0,             -- 粉丝数
+    `anwser_count` INTEGER NOT NULL DEFAULT 0,     -- 回答数
+    `video_count` INTEGER NOT NULL DEFAULT 0,      -- 视频数
+    `question_count` INTEGER NOT NULL DEFAULT 0,   -- 问题数
+    `article_count` INTEGER NOT NULL DEFAULT 0,    -- 文章数
+    `column_count` INTEGER NOT NULL DEFAULT 0,     -- 专栏数
+    `get_voteup_count` INTEGER NOT NULL DEFAULT 0, -- 获得的赞同数
+    `add_ts` INTEGER NOT NULL,                     -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL              -- 记录最后修改时间戳
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_zhihu_creator_user_id` ON `zhihu_creator` (`user_id`);
+
+-- ----------------------------
+-- 微信公众号文章表 weixin_article
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `weixin_article`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `article_id` TEXT NOT NULL,             -- 文章唯一ID(URL MD5)
+    `title` TEXT NOT NULL,                  -- 文章标题
+    `content` TEXT,                         -- 文章正文内容
+    `summary` TEXT,                         -- 文章摘要/描述
+    `account_name` TEXT NOT NULL,           -- 公众号名称
+    `account_id` TEXT,                      -- 公众号微信号
+    `cover_image` TEXT,                     -- 封面图片URL
+    `original_url` TEXT NOT NULL,           -- 原文链接
+    `publish_time` TEXT,                    -- 发布时间
+    `publish_timestamp` INTEGER,            -- 发布时间戳
+    `read_count` TEXT,                      -- 阅读数
+    `like_count` TEXT,                      -- 点赞数
+    `source_keyword` TEXT,                  -- 搜索关键词
+    `analysis_info` TEXT,                   -- AI分析结果
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL       -- 记录最后修改时间戳
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `uk_article_id_weixin_article` ON `weixin_article` (`article_id`);
+CREATE INDEX IF NOT EXISTS `idx_account_name` ON `weixin_article` (`account_name`);
+CREATE INDEX IF NOT EXISTS `idx_source_keyword` ON `weixin_article` (`source_keyword`);
+CREATE INDEX IF NOT EXISTS `idx_publish_timestamp` ON `weixin_article` (`publish_timestamp`);
+
+-- ----------------------------
+-- 新闻搜索结果表 news_search_result
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `news_search_result`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `search_keyword` TEXT NOT NULL,         -- 搜索关键词
+    `search_engine` TEXT NOT NULL,          -- 搜索引擎
+    `result_title` TEXT NOT NULL,           -- 搜索结果标题
+    `result_url` TEXT NOT NULL,             -- 搜索结果URL
+    `result_score` REAL,                    -- 搜索结果评分
+    `result_description` TEXT,              -- 搜索结果描述
+    `article_id` TEXT,                      -- 关联的文章ID
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL       -- 记录最后修改时间戳
+);
+CREATE INDEX IF NOT EXISTS `idx_search_keyword` ON `news_search_result` (`search_keyword`);
+CREATE INDEX IF NOT EXISTS `idx_search_engine` ON `news_search_result` (`search_engine`);
+CREATE INDEX IF NOT EXISTS `idx_article_id` ON `news_search_result` (`article_id`);
+CREATE INDEX IF NOT EXISTS `idx_add_ts_news_search_result` ON `news_search_result` (`add_ts`);
+
+-- ----------------------------
+-- 新闻文章内容表 news_article
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `news_article`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT, -- 自增ID
+    `article_id` TEXT NOT NULL,             -- 文章唯一ID(URL的MD5)
+    `source_url` TEXT NOT NULL,             -- 原始URL
+    `title` TEXT NOT NULL,                  -- 文章标题
+    `content` TEXT,                         -- 文章正文内容
+    `summary` TEXT,                         -- 文章摘要
+    `keywords` TEXT,                        -- 关键词列表
+    `authors` TEXT,                         -- 作者列表
+    `publish_date` TEXT,                    -- 发布时间(newspaper3k提取)
+    `source_domain` TEXT,                   -- 来源域名
+    `source_site` TEXT,                     -- 来源网站名称
+    `source_keyword` TEXT,                  -- 来源关键词
+    `top_image` TEXT,                       -- 文章主图URL
+    `word_count` INTEGER,                   -- 字数统计
+    `language` TEXT DEFAULT 'zh',           -- 语言
+    `metadata` TEXT,                        -- 其他元数据
+    `add_ts` INTEGER NOT NULL,              -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL,      -- 记录最后修改时间戳
+    `analysis_info` TEXT                    -- AI分析结果
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `uk_article_id_news_article` ON `news_article` (`article_id`);
+CREATE INDEX IF NOT EXISTS `idx_source_domain` ON `news_article` (`source_domain`);
+CREATE INDEX IF NOT EXISTS `idx_source_site` ON `news_article` (`source_site`);
+CREATE INDEX IF NOT EXISTS `idx_publish_date` ON `news_article` (`publish_date`);
+CREATE INDEX IF NOT EXISTS `idx_add_ts_news_article` ON `news_article` (`add_ts`);
+
+-- ----------------------------
+-- 新闻搜索任务表 news_search_task
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `news_search_task`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT,   -- 自增ID
+    `task_id` TEXT NOT NULL,                  -- 任务唯一ID
+    `keywords` TEXT NOT NULL,                 -- 搜索关键词列表
+    `search_engines` TEXT,                    -- 搜索引擎配置
+    `status` TEXT NOT NULL DEFAULT 'pending', -- 任务状态
+    `total_results` INTEGER DEFAULT 0,        -- 总搜索结果数
+    `extracted_articles` INTEGER DEFAULT 0,   -- 成功提取文章数
+    `failed_extractions` INTEGER DEFAULT 0,   -- 提取失败数
+    `start_time` TEXT,                        -- 开始时间
+    `end_time` TEXT,                          -- 结束时间
+    `error_info` TEXT,                        -- 错误信息
+    `add_ts` INTEGER NOT NULL,                -- 记录添加时间戳
+    `last_modify_ts` INTEGER NOT NULL         -- 记录最后修改时间戳
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `uk_task_id` ON `news_search_task` (`task_id`);
+CREATE INDEX IF NOT EXISTS `idx_status` ON `news_search_task` (`status`);
+CREATE INDEX IF NOT EXISTS `idx_start_time_news_search_task` ON `news_search_task` (`start_time`);
+
+-- ----------------------------
+-- 爬取任务表 crawl_task
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `crawl_task`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT,          -- 自增ID
+    `task_id` TEXT NOT NULL,                         -- 任务ID
+    `platform` TEXT NOT NULL,                        -- 平台名称
+    `crawler_type` TEXT NOT NULL,                    -- 爬取类型
+    `keywords` TEXT NOT NULL,                        -- 关键词列表
+    `total_keywords` INTEGER NOT NULL DEFAULT 0,     -- 总关键词数
+    `completed_keywords` INTEGER NOT NULL DEFAULT 0, -- 已完成关键词数
+    `status` TEXT NOT NULL DEFAULT 'running',        -- 任务状态 running/paused/completed/failed
+    `start_time` INTEGER NOT NULL,                   -- 开始时间
+    `last_update_time` INTEGER NOT NULL,             -- 最后更新时间
+    `estimated_end_time` INTEGER,                    -- 预计结束时间
+    `total_items` INTEGER NOT NULL DEFAULT 0,        -- 总条目数
+    `config_snapshot` TEXT,                          -- 配置快照
+    `error_message` TEXT                             -- 错误信息
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_task_id` ON `crawl_task` (`task_id`);
+CREATE INDEX IF NOT EXISTS `idx_platform_status_crawl_task` ON `crawl_task` (`platform`,`status`);
+CREATE INDEX IF NOT EXISTS `idx_start_time_crawl_task` ON `crawl_task` (`start_time`);
+
+-- ----------------------------
+-- 关键词进度表 keyword_progress
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `keyword_progress`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT,    -- 自增ID
+    `task_id` TEXT NOT NULL,                   -- 任务ID
+    `keyword` TEXT NOT NULL,                   -- 关键词
+    `platform` TEXT NOT NULL,                  -- 平台名称
+    `current_page` INTEGER NOT NULL DEFAULT 1, -- 当前页数
+    `total_pages` INTEGER,                     -- 总页数
+    `items_count` INTEGER NOT NULL DEFAULT 0,  -- 已爬取条目数
+    `last_item_time` INTEGER,                  -- 最后条目时间戳
+    `last_item_id` TEXT,                       -- 最后条目ID
+    `status` TEXT NOT NULL DEFAULT 'running',  -- 关键词状态 running/completed/failed
+    `start_time` INTEGER NOT NULL,             -- 开始时间
+    `last_update_time` INTEGER NOT NULL,       -- 最后更新时间
+    `completion_time` INTEGER,                 -- 完成时间
+    `error_message` TEXT                       -- 错误信息
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_task_keyword` ON `keyword_progress` (`task_id`,`keyword`);
+CREATE INDEX IF NOT EXISTS `idx_platform_status_keyword_progress` ON `keyword_progress` (`platform`,`status`);
+CREATE INDEX IF NOT EXISTS `idx_last_update_time` ON `keyword_progress` (`last_update_time`);
+
+-- ----------------------------
+-- 爬取统计表 crawl_statistics
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `crawl_statistics`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT,       -- 自增ID
+    `task_id` TEXT NOT NULL,                      -- 任务ID
+    `platform` TEXT NOT NULL,                     -- 平台名称
+    `stat_date` TEXT NOT NULL,                    -- 统计日期
+    `total_items` INTEGER NOT NULL DEFAULT 0,     -- 总条目数
+    `new_items` INTEGER NOT NULL DEFAULT 0,       -- 新增条目数
+    `duplicate_items` INTEGER NOT NULL DEFAULT 0, -- 重复条目数
+    `failed_items` INTEGER NOT NULL DEFAULT 0,    -- 失败条目数
+    `avg_crawl_speed` REAL,                       -- 平均爬取速度(条/秒)
+    `total_time` INTEGER NOT NULL DEFAULT 0,      -- 总耗时(毫秒)
+    `create_time` INTEGER NOT NULL,               -- 创建时间
+    `update_time` INTEGER NOT NULL                -- 更新时间
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_task_platform_date` ON `crawl_statistics` (`task_id`,`platform`,`stat_date`);
+CREATE INDEX IF NOT EXISTS `idx_stat_date` ON `crawl_statistics` (`stat_date`);
+CREATE INDEX IF NOT EXISTS `idx_platform` ON `crawl_statistics` (`platform`);
+
+-- ----------------------------
+-- 爬取检查点表 crawl_checkpoints
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `crawl_checkpoints`
+(
+    `id` INTEGER PRIMARY KEY AUTOINCREMENT,       -- 自增ID
+    `task_id` TEXT NOT NULL,                      -- 任务ID
+    `keyword` TEXT NOT NULL,                      -- 关键词
+    `platform` TEXT NOT NULL,                     -- 平台名称
+    `page_number` INTEGER NOT NULL,               -- 页码
+    `checkpoint_data` TEXT NOT NULL,              -- 检查点数据(JSON)
+    `items_processed` INTEGER NOT NULL DEFAULT 0, -- 已处理条目数
+    `last_item_hash` TEXT,                        -- 最后条目哈希
+    `created_time` INTEGER NOT NULL               -- 创建时间
+);
+CREATE UNIQUE INDEX IF NOT EXISTS `idx_task_keyword_page` ON `crawl_checkpoints` (`task_id`,`keyword`,`page_number`);
+CREATE INDEX IF NOT EXISTS `idx_platform_created` ON `crawl_checkpoints` (`platform`,`created_time`);
+
+-- ----------------------------
+-- 看板统计汇总表 content_daily_stats（tools/stats_rollup.py）
+-- 按平台、发布日期、来源关键词汇总内容数、评论数和情感分布，写入内容、评论后增量刷新，
+-- 已有数据执行 python -m analysis_job.stats_rollup_rebuild 重建
+-- ----------------------------
+CREATE TABLE IF NOT EXISTS `content_daily_stats`
+(
+    `platform` TEXT NOT NULL,                     -- 看板平台
+    `stat_date` TEXT NOT NULL,                    -- 发布日期 YYYY-MM-DD（本地时间）
+    `source_keyword` TEXT NOT NULL DEFAULT '',    -- 来源关键词
+    `content_count` INTEGER NOT NULL DEFAULT 0,   -- 内容数
+    `comment_count` INTEGER NOT NULL DEFAULT 0,   -- 评论数
+    `positive_count` INTEGER NOT NULL DEFAULT 0,  -- 正面内容数
+    `negative_count` INTEGER NOT NULL DEFAULT 0,  -- 负面内容数
+    `neutral_count` INTEGER NOT NULL DEFAULT 0,   -- 中性内容数
+    `unknown_count` INTEGER NOT NULL DEFAULT 0,   -- 其他情感值的内容数
+    `last_modify_ts` INTEGER NOT NULL,            -- 最后刷新时间戳
+    PRIMARY KEY (`platform`, `stat_date`, `source_keyword`)
+);
+
+-- 汇总行已经重建完成的平台，看板只对这些平台读取汇总表
+CREATE TABLE IF NOT EXISTS `content_daily_stats_state`
+(
+    `platform` TEXT PRIMARY KEY,                  -- 看板平台
+    `built_ts` INTEGER NOT NULL                   -- 重建完成时间戳
+);
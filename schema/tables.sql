@@ -26,7 +26,7 @@ CREATE TABLE `bilibili_video`
     `video_url`        varchar(512) DEFAULT NULL COMMENT '视频详情URL',
     `video_cover_url`  varchar(512) DEFAULT NULL COMMENT '视频封面图 URL',
     PRIMARY KEY (`id`),
-    KEY                `idx_bilibili_vi_video_i_31c36e` (`video_id`),
+    UNIQUE KEY         `idx_bilibili_vi_video_i_31c36e` (`video_id`),
     KEY                `idx_bilibili_vi_create__73e0ec` (`create_time`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='B站视频';
 
@@ -50,7 +50,7 @@ CREATE TABLE `bilibili_video_comment`
     `create_time`       bigint      NOT NULL COMMENT '评论时间戳',
     `sub_comment_count` varchar(16) NOT NULL COMMENT '评论回复数',
     PRIMARY KEY (`id`),
-    KEY                 `idx_bilibili_vi_comment_41c34e` (`comment_id`),
+    UNIQUE KEY          `idx_bilibili_vi_comment_41c34e` (`comment_id`),
     KEY                 `idx_bilibili_vi_video_i_f22873` (`video_id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='B 站视频评论';
 
@@ -150,7 +150,7 @@ CREATE TABLE `douyin_aweme`
     `cover_url`       varchar(500) DEFAULT NULL COMMENT '视频封面图URL',
     `video_download_url`       varchar(1024) DEFAULT NULL COMMENT '视频下载地址',
     PRIMARY KEY (`id`),
-    KEY               `idx_douyin_awem_aweme_i_6f7bc6` (`aweme_id`),
+    UNIQUE KEY        `idx_douyin_awem_aweme_i_6f7bc6` (`aweme_id`),
     KEY               `idx_douyin_awem_create__299dfe` (`create_time`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='抖音视频';
 
@@ -177,7 +177,7 @@ CREATE TABLE `douyin_aweme_comment`
     `create_time`       bigint      NOT NULL COMMENT '评论时间戳',
     `sub_comment_count` varchar(16) NOT NULL COMMENT '评论回复数',
     PRIMARY KEY (`id`),
-    KEY                 `idx_douyin_awem_comment_fcd7e4` (`comment_id`),
+    UNIQUE KEY          `idx_douyin_awem_comment_fcd7e4` (`comment_id`),
     KEY                 `idx_douyin_awem_aweme_i_c50049` (`aweme_id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='抖音视频评论';
 
@@ -226,7 +226,7 @@ CREATE TABLE `kuaishou_video`
     `video_cover_url` varchar(512) DEFAULT NULL COMMENT '视频封面图 URL',
     `video_play_url`  varchar(512) DEFAULT NULL COMMENT '视频播放 URL',
     PRIMARY KEY (`id`),
-    KEY               `idx_kuaishou_vi_video_i_c5c6a6` (`video_id`),
+    UNIQUE KEY        `idx_kuaishou_vi_video_i_c5c6a6` (`video_id`),
     KEY               `idx_kuaishou_vi_create__a10dee` (`create_time`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='快手视频';
 
@@ -248,7 +248,7 @@ CREATE TABLE `kuaishou_video_comment`
     `create_time`       bigint      NOT NULL COMMENT '评论时间戳',
     `sub_comment_count` varchar(16) NOT NULL COMMENT '评论回复数',
     PRIMARY KEY (`id`),
-    KEY                 `idx_kuaishou_vi_comment_ed48fa` (`comment_id`),
+    UNIQUE KEY          `idx_kuaishou_vi_comment_ed48fa` (`comment_id`),
     KEY                 `idx_kuaishou_vi_video_i_e50914` (`video_id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='快手视频评论';
 
@@ -277,7 +277,7 @@ CREATE TABLE `weibo_note`
     `shared_count`     varchar(16)  DEFAULT NULL COMMENT '帖子转发数量',
     `note_url`         varchar(512) DEFAULT NULL COMMENT '帖子详情URL',
     PRIMARY KEY (`id`),
-    KEY                `idx_weibo_note_note_id_f95b1a` (`note_id`),
+    UNIQUE KEY         `idx_weibo_note_note_id_f95b1a` (`note_id`),
     KEY                `idx_weibo_note_create__692709` (`create_time`),
     KEY                `idx_weibo_note_create__d05ed2` (`create_date_time`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='微博帖子';
@@ -305,7 +305,7 @@ CREATE TABLE `weibo_note_comment`
     `comment_like_count` varchar(16) NOT NULL COMMENT '评论点赞数量',
     `sub_comment_count`  varchar(16) NOT NULL COMMENT '评论回复数',
     PRIMARY KEY (`id`),
-    KEY                  `idx_weibo_note__comment_c7611c` (`comment_id`),
+    UNIQUE KEY           `idx_weibo_note__comment_c7611c` (`comment_id`),
     KEY                  `idx_weibo_note__note_id_24f108` (`note_id`),
     KEY                  `idx_weibo_note__create__667fe3` (`create_date_time`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='微博帖子评论';
@@ -360,7 +360,7 @@ CREATE TABLE `xhs_note`
     `tag_list`         longtext COMMENT '标签列表',
     `note_url`         varchar(255) DEFAULT NULL COMMENT '笔记详情页的URL',
     PRIMARY KEY (`id`),
-    KEY                `idx_xhs_note_note_id_209457` (`note_id`),
+    UNIQUE KEY         `idx_xhs_note_note_id_209457` (`note_id`),
     KEY                `idx_xhs_note_time_eaa910` (`time`)
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='小红书笔记';
 
@@ -384,7 +384,7 @@ CREATE TABLE `xhs_note_comment`
     `sub_comment_count` int         NOT NULL COMMENT '子评论数量',
     `pictures`          varchar(512) DEFAULT NULL,
     PRIMARY KEY (`id`),
-    KEY                 `idx_xhs_note_co_comment_8e8349` (`comment_id`),
+    UNIQUE KEY          `idx_xhs_note_co_comment_8e8349` (`comment_id`),
     KEY                 `idx_xhs_note_co_create__204f8d` (`create_time`)
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='小红书笔记评论';
 
@@ -424,8 +424,10 @@ CREATE TABLE tieba_note
     ip_location       VARCHAR(255) DEFAULT '' COMMENT 'IP地理位置',
     add_ts            BIGINT       NOT NULL COMMENT '添加时间戳',
     last_modify_ts    BIGINT       NOT NULL COMMENT '最后修改时间戳',
-    KEY               `idx_tieba_note_note_id` (`note_id`),
-    KEY               `idx_tieba_note_publish_time` (`publish_time`)
+    publish_ts        BIGINT       DEFAULT NULL COMMENT '归一化的发布时间（秒级时间戳，无法解析时为0）',
+    UNIQUE KEY        `idx_tieba_note_note_id` (`note_id`),
+    KEY               `idx_tieba_note_publish_time` (`publish_time`),
+    KEY               `idx_tieba_note_publish_ts` (`publish_ts`)
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='贴吧帖子表';
 
 DROP TABLE IF EXISTS `tieba_comment`;
@@ -448,7 +450,7 @@ CREATE TABLE tieba_comment
     note_url          VARCHAR(255) NOT NULL COMMENT '帖子链接',
     add_ts            BIGINT       NOT NULL COMMENT '添加时间戳',
     last_modify_ts    BIGINT       NOT NULL COMMENT '最后修改时间戳',
-    KEY               `idx_tieba_comment_comment_id` (`note_id`),
+    UNIQUE KEY        `idx_tieba_comment_comment_id` (`comment_id`),
     KEY               `idx_tieba_comment_note_id` (`note_id`),
     KEY               `idx_tieba_comment_publish_time` (`publish_time`)
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='贴吧评论表';
@@ -531,9 +533,11 @@ CREATE TABLE `zhihu_content` (
     `user_url_token` varchar(255) NOT NULL COMMENT '用户url_token',
     `add_ts` bigint NOT NULL COMMENT '记录添加时间戳',
     `last_modify_ts` bigint NOT NULL COMMENT '记录最后修改时间戳',
+    `publish_ts` bigint DEFAULT NULL COMMENT '归一化的发布时间（秒级时间戳，无法解析时为0）',
     PRIMARY KEY (`id`),
-    KEY `idx_zhihu_content_content_id` (`content_id`),
-    KEY `idx_zhihu_content_created_time` (`created_time`)
+    UNIQUE KEY `idx_zhihu_content_content_id` (`content_id`),
+    KEY `idx_zhihu_content_created_time` (`created_time`),
+    KEY `idx_zhihu_content_publish_ts` (`publish_ts`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='知乎内容（回答、文章、视频）';
 
 
@@ -557,7 +561,7 @@ CREATE TABLE `zhihu_comment` (
     `add_ts` bigint NOT NULL COMMENT '记录添加时间戳',
     `last_modify_ts` bigint NOT NULL COMMENT '记录最后修改时间戳',
     PRIMARY KEY (`id`),
-    KEY `idx_zhihu_comment_comment_id` (`comment_id`),
+    UNIQUE KEY `idx_zhihu_comment_comment_id` (`comment_id`),
     KEY `idx_zhihu_comment_content_id` (`content_id`),
     KEY `idx_zhihu_comment_publish_time` (`publish_time`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='知乎评论';
@@ -621,4 +625,54 @@ CREATE TABLE `weixin_article` (
     KEY `idx_account_name` (`account_name`),
     KEY `idx_source_keyword` (`source_keyword`),
     KEY `idx_publish_timestamp` (`publish_timestamp`)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='微信公众号文章表';
\ No newline at end of file
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='微信公众号文章表';
+
+-- 看板关键词搜索的全文索引（已有数据库执行 schema/fulltext_index.sql）
+ALTER TABLE `xhs_note`
+ADD FULLTEXT INDEX `idx_xhs_note_fulltext` (`title`, `desc`) WITH PARSER ngram;
+
+ALTER TABLE `douyin_aweme`
+ADD FULLTEXT INDEX `idx_douyin_aweme_fulltext` (`title`, `desc`) WITH PARSER ngram;
+
+ALTER TABLE `kuaishou_video`
+ADD FULLTEXT INDEX `idx_kuaishou_video_fulltext` (`title`, `desc`) WITH PARSER ngram;
+
+ALTER TABLE `bilibili_video`
+ADD FULLTEXT INDEX `idx_bilibili_video_fulltext` (`title`, `desc`) WITH PARSER ngram;
+
+ALTER TABLE `weibo_note`
+ADD FULLTEXT INDEX `idx_weibo_note_fulltext` (`content`) WITH PARSER ngram;
+
+ALTER TABLE `tieba_note`
+ADD FULLTEXT INDEX `idx_tieba_note_fulltext` (`title`, `desc`) WITH PARSER ngram;
+
+ALTER TABLE `zhihu_content`
+ADD FULLTEXT INDEX `idx_zhihu_content_fulltext` (`title`, `desc`) WITH PARSER ngram;
+
+
+-- 看板统计汇总表（已有数据库执行 schema/content_daily_stats.sql）
+CREATE TABLE `content_daily_stats`
+(
+    `platform`       varchar(16)  NOT NULL COMMENT '看板平台',
+    `stat_date`      date         NOT NULL COMMENT '发布日期（本地时间）',
+    `source_keyword` varchar(255) NOT NULL DEFAULT '' COMMENT '来源关键词',
+    `content_count`  int          NOT NULL DEFAULT 0 COMMENT '内容数',
+    `comment_count`  int          NOT NULL DEFAULT 0 COMMENT '评论数',
+    `positive_count` int          NOT NULL DEFAULT 0 COMMENT '正面内容数',
+    `negative_count` int          NOT NULL DEFAULT 0 COMMENT '负面内容数',
+    `neutral_count`  int          NOT NULL DEFAULT 0 COMMENT '中性内容数',
+    `unknown_count`  int          NOT NULL DEFAULT 0 COMMENT '其他情感值的内容数',
+    `last_modify_ts` bigint       NOT NULL COMMENT '最后刷新时间戳',
+    PRIMARY KEY (`platform`, `stat_date`, `source_keyword`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='看板统计汇总表';
+
+CREATE TABLE `content_daily_stats_state`
+(
+    `platform` varchar(16) NOT NULL COMMENT '看板平台',
+    `built_ts` bigint      NOT NULL COMMENT '重建完成时间戳',
+    PRIMARY KEY (`platform`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='看板统计汇总表重建状态';
+
+-- 刷新汇总行时按内容 ID 统计评论数，小红书评论表原来没有 note_id 索引
+ALTER TABLE `xhs_note_comment`
+ADD KEY `idx_xhs_note_comment_note_id` (`note_id`);
\ No newline at end of file
@@ -14,9 +14,10 @@
 # @Time    : 2024/1/14 19:34
 # @Desc    :
 
-from typing import List
+from typing import List, Optional
 
 import config
+from store.write_behind import get_write_behind_store
 from var import source_keyword_var
 
 from .bilibili_store_impl import *
@@ -27,7 +28,10 @@ class BiliStoreFactory:
     STORES = {
         "csv": BiliCsvStoreImplement,
         "db": BiliDbStoreImplement,
+        "sqlite": BiliDbStoreImplement,
         "json": BiliJsonStoreImplement,
+        "jsonl": BiliJsonlStoreImplement,
+        "parquet": BiliParquetStoreImplement,
     }
 
     @staticmethod
@@ -37,7 +41,7 @@ class BiliStoreFactory:
             raise ValueError(
                 "[BiliStoreFactory.create_store] Invalid save option only supported csv or db or json ..."
             )
-        return store_class()
+        return get_write_behind_store(f"bilibili_{config.SAVE_DATA_OPTION}", store_class)
 
 
 async def update_bilibili_video(video_item: Dict):
@@ -97,11 +101,11 @@ async def update_up_info(video_item: Dict):
 async def batch_update_bilibili_video_comments(video_id: str, comments: List[Dict]):
     if not comments:
         return
-    for comment_item in comments:
-        await update_bilibili_video_comment(video_id, comment_item)
+    save_comment_items = [_build_bilibili_video_comment_item(video_id, comment_item) for comment_item in comments]
+    await BiliStoreFactory.create_store().store_comments([item for item in save_comment_items if item])
 
 
-async def update_bilibili_video_comment(video_id: str, comment_item: Dict):
+def _build_bilibili_video_comment_item(video_id: str, comment_item: Dict) -> Optional[Dict]:
     comment_id = str(comment_item.get("rpid"))
     parent_comment_id = str(comment_item.get("parent", 0))
     content: Dict = comment_item.get("content")
@@ -125,7 +129,13 @@ async def update_bilibili_video_comment(video_id: str, comment_item: Dict):
     utils.logger.info(
         f"[store.bilibili.update_bilibili_video_comment] Bilibili video comment: {comment_id}, content: {save_comment_item.get('content')}"
     )
-    await BiliStoreFactory.create_store().store_comment(comment_item=save_comment_item)
+    return save_comment_item
+
+
+async def update_bilibili_video_comment(video_id: str, comment_item: Dict):
+    save_comment_item = _build_bilibili_video_comment_item(video_id, comment_item)
+    if save_comment_item:
+        await BiliStoreFactory.create_store().store_comment(save_comment_item)
 
 
 async def store_video(aid, video_content, extension_file_name):
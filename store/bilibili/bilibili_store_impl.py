@@ -14,16 +14,18 @@
 # @Time    : 2024/1/14 19:34
 # @Desc    : B站存储实现类
 import asyncio
-import csv
 import json
 import os
 import pathlib
-from typing import Dict
+from typing import Dict, List
 
 import aiofiles
 
 import config
 from base.base_crawler import AbstractStore
+from store.csv_sink import get_csv_sink
+from store.jsonl_store import JsonlStoreImplement
+from store.parquet_store import ParquetStoreImplement
 from tools import utils, words
 from var import crawler_type_var
 
@@ -66,13 +68,8 @@ class BiliCsvStoreImplement(AbstractStore):
         Returns: no returns
 
         """
-        pathlib.Path(self.csv_store_path).mkdir(parents=True, exist_ok=True)
         save_file_name = self.make_save_file_name(store_type=store_type)
-        async with aiofiles.open(save_file_name, mode='a+', encoding="utf-8-sig", newline="") as f:
-            writer = csv.writer(f)
-            if await f.tell() == 0:
-                await writer.writerow(save_item.keys())
-            await writer.writerow(save_item.values())
+        get_csv_sink(save_file_name).write([save_item])
 
     async def store_content(self, content_item: Dict):
         """
@@ -142,17 +139,22 @@ class BiliDbStoreImplement(AbstractStore):
         Returns:
 
         """
+        await self.store_contents([content_item])
 
-        from .bilibili_store_sql import (add_new_content,
-                                         query_content_by_content_id,
-                                         update_content_by_content_id)
-        video_id = content_item.get("video_id")
-        video_detail: Dict = await query_content_by_content_id(content_id=video_id)
-        if not video_detail:
-            content_item["add_ts"] = utils.get_current_timestamp()
-            await add_new_content(content_item)
-        else:
-            await update_content_by_content_id(video_id, content_item=content_item)
+    async def store_contents(self, content_items: List[Dict]):
+        """
+        Bilibili content DB batch storage implementation, video_id 已存在时更新
+        Args:
+            content_items: content item dict list
+
+        Returns:
+
+        """
+        from .bilibili_store_sql import batch_upsert_contents
+        add_ts = utils.get_current_timestamp()
+        for content_item in content_items:
+            content_item["add_ts"] = add_ts
+        await batch_upsert_contents(content_items)
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -163,17 +165,22 @@ class BiliDbStoreImplement(AbstractStore):
         Returns:
 
         """
+        await self.store_comments([comment_item])
 
-        from .bilibili_store_sql import (add_new_comment,
-                                         query_comment_by_comment_id,
-                                         update_comment_by_comment_id)
-        comment_id = comment_item.get("comment_id")
-        comment_detail: Dict = await query_comment_by_comment_id(comment_id=comment_id)
-        if not comment_detail:
-            comment_item["add_ts"] = utils.get_current_timestamp()
-            await add_new_comment(comment_item)
-        else:
-            await update_comment_by_comment_id(comment_id, comment_item=comment_item)
+    async def store_comments(self, comment_items: List[Dict]):
+        """
+        Bilibili comment DB batch storage implementation, comment_id 已存在时更新
+        Args:
+            comment_items: comment item dict list
+
+        Returns:
+
+        """
+        from .bilibili_store_sql import batch_upsert_comments
+        add_ts = utils.get_current_timestamp()
+        for comment_item in comment_items:
+            comment_item["add_ts"] = add_ts
+        await batch_upsert_comments(comment_items)
 
     async def store_creator(self, creator: Dict):
         """
@@ -352,3 +359,48 @@ class BiliJsonStoreImplement(AbstractStore):
         """
 
         await self.save_data_to_json(save_item=dynamic_item, store_type="dynamics")
+
+
+class BiliJsonlStoreImplement(JsonlStoreImplement):
+    jsonl_store_path: str = "data/bilibili/jsonl"
+
+    async def store_contact(self, contact_item: Dict):
+        await self.save_data_to_jsonl([contact_item], "contacts")
+
+    async def store_dynamic(self, dynamic_item: Dict):
+        await self.save_data_to_jsonl([dynamic_item], "dynamics")
+
+
+class BiliParquetStoreImplement(ParquetStoreImplement):
+    parquet_store_path: str = "data/bilibili/parquet"
+    parquet_columns = {
+        "contents": (
+            "video_id", "video_type", "title", "desc", "create_time", "user_id", "nickname", "avatar",
+            "liked_count", "disliked_count", "video_play_count", "video_favorite_count", "video_share_count",
+            "video_coin_count", "video_danmaku", "video_comment", "last_modify_ts", "video_url",
+            "video_cover_url", "source_keyword",
+        ),
+        "comments": (
+            "comment_id", "parent_comment_id", "create_time", "video_id", "content", "user_id", "nickname",
+            "sex", "sign", "avatar", "sub_comment_count", "like_count", "last_modify_ts",
+        ),
+        "creator": (
+            "user_id", "nickname", "sex", "sign", "avatar", "last_modify_ts", "total_fans", "total_liked",
+            "user_rank", "is_official",
+        ),
+        "contacts": (
+            "up_id", "fan_id", "up_name", "fan_name", "up_sign", "fan_sign", "up_avatar", "fan_avatar",
+            "last_modify_ts",
+        ),
+        "dynamics": (
+            "dynamic_id", "user_id", "user_name", "text", "type", "pub_ts", "total_comments",
+            "total_forwards", "total_liked", "last_modify_ts",
+        ),
+    }
+    parquet_int_columns = frozenset({"create_time", "pub_ts", "last_modify_ts"})
+
+    async def store_contact(self, contact_item: Dict):
+        await self.save_data_to_parquet([contact_item], "contacts")
+
+    async def store_dynamic(self, dynamic_item: Dict):
+        await self.save_data_to_parquet([dynamic_item], "dynamics")
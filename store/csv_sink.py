@@ -0,0 +1,171 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : CSV 写入
+#            每个输出文件在进程内只打开一次并保持带缓冲的句柄，表头只写一次，
+#            按时间间隔和程序退出时把缓冲区写入文件（旧实现每一行都重新打开文件、经 aiofiles 线程池写一次）；
+#            与写缓冲存储一样由后台任务按间隔写入，抓取停顿或进程被杀时最多丢失一个间隔内的数据。
+#            记录中出现表头没有的字段时扩展表头并重写文件，缺少的字段写空值，保证列不会错位。
+
+import asyncio
+import csv
+import os
+import pathlib
+import time
+from typing import Dict, List, Optional
+
+import config
+from tools import utils
+
+CSV_WRITE_BUFFER_SIZE = 1024 * 1024
+CSV_ENCODING = "utf-8-sig"
+
+
+class CsvFileSink:
+    """
+    一个 CSV 文件的写入句柄
+    """
+
+    def __init__(self, path: str, flush_interval: Optional[float] = None, buffer_size: int = CSV_WRITE_BUFFER_SIZE):
+        """
+        Args:
+            path: 文件路径，文件已存在时沿用其表头继续追加
+            flush_interval: 两次写入文件之间的最长间隔（秒），默认读取 config.CSV_FLUSH_INTERVAL_SEC
+            buffer_size: 文件缓冲区大小
+        """
+        pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.flush_interval = config.CSV_FLUSH_INTERVAL_SEC if flush_interval is None else flush_interval
+        self.buffer_size = buffer_size
+        self.rows = 0
+        self.fieldnames: List[str] = self._read_header()
+        self._file = open(path, "a", encoding=CSV_ENCODING, newline="", buffering=buffer_size)
+        self._writer = self._make_writer()
+        self._last_flush = time.monotonic()
+
+    def _read_header(self) -> List[str]:
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return []
+        with open(self.path, "r", encoding=CSV_ENCODING, newline="") as f:
+            return next(csv.reader(f), [])
+
+    def _make_writer(self) -> csv.DictWriter:
+        return csv.DictWriter(self._file, fieldnames=self.fieldnames, restval="", extrasaction="ignore")
+
+    def write(self, items: List[Dict]):
+        """
+        写入多行，数据先进入文件缓冲区，超过刷新间隔时再写入文件
+        """
+        if not items:
+            return
+        new_fields = [key for item in items for key in item.keys() if key not in self.fieldnames]
+        if new_fields:
+            self._extend_header(list(dict.fromkeys(new_fields)))
+        self._writer.writerows(items)
+        self.rows += len(items)
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _extend_header(self, new_fields: List[str]):
+        if not self.fieldnames:
+            self.fieldnames = new_fields
+            self._writer = self._make_writer()
+            self._writer.writeheader()
+            return
+        # 字段变化很少见（例如平台接口新增了字段），这时把已写入的数据按新表头重写一遍
+        utils.logger.info(f"[CsvFileSink] {self.path} new columns {new_fields}, rewrite file with extended header")
+        self._file.close()
+        old_fieldnames = self.fieldnames
+        self.fieldnames = old_fieldnames + new_fields
+        tmp_path = self.path + ".tmp"
+        with open(self.path, "r", encoding=CSV_ENCODING, newline="") as src, \
+                open(tmp_path, "w", encoding=CSV_ENCODING, newline="") as dst:
+            reader = csv.reader(src)
+            next(reader, None)
+            writer = csv.writer(dst)
+            writer.writerow(self.fieldnames)
+            padding = [""] * len(new_fields)
+            for row in reader:
+                writer.writerow(row + padding)
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "a", encoding=CSV_ENCODING, newline="", buffering=self.buffer_size)
+        self._writer = self._make_writer()
+
+    def flush(self):
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def next_flush_delay(self) -> float:
+        """
+        距离下次按间隔写入文件的秒数
+        """
+        return max(0.0, self._last_flush + self.flush_interval - time.monotonic())
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+_csv_sinks: Dict[str, CsvFileSink] = {}
+_csv_flusher: Optional[asyncio.Task] = None
+
+
+async def _flush_periodically():
+    """
+    后台任务：没有新的写入时也按各文件的刷新间隔把缓冲区写入文件，所有文件关闭后退出
+    """
+    while _csv_sinks:
+        # 刷新间隔配置为 0 时避免空转
+        await asyncio.sleep(max(0.1, min(sink.next_flush_delay() for sink in _csv_sinks.values())))
+        for sink in list(_csv_sinks.values()):
+            if not sink.next_flush_delay():
+                try:
+                    sink.flush()
+                except Exception as e:
+                    utils.logger.error(f"[csv_sink._flush_periodically] flush {sink.path} error: {e}")
+
+
+def _ensure_flusher():
+    global _csv_flusher
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # 不在事件循环中调用时只在写入和关闭时写入文件
+        return
+    if _csv_flusher is not None and not _csv_flusher.done() and _csv_flusher.get_loop() is loop:
+        return
+    _csv_flusher = loop.create_task(_flush_periodically())
+
+
+def get_csv_sink(path: str) -> CsvFileSink:
+    """
+    获取文件的写入句柄，同一个文件在进程内只打开一次
+    """
+    sink = _csv_sinks.get(path)
+    if sink is None:
+        sink = CsvFileSink(path)
+        _csv_sinks[path] = sink
+    _ensure_flusher()
+    return sink
+
+
+def close_csv_sinks():
+    """
+    把缓冲区写入文件并关闭所有 CSV 文件，程序退出时调用
+    """
+    global _csv_flusher
+    while _csv_sinks:
+        _, sink = _csv_sinks.popitem()
+        sink.close()
+    if _csv_flusher is not None and not _csv_flusher.done():
+        _csv_flusher.cancel()
+    _csv_flusher = None
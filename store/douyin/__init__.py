@@ -13,19 +13,24 @@
 # @Author  : relakkes@gmail.com
 # @Time    : 2024/1/14 18:46
 # @Desc    :
-from typing import List
+from typing import List, Optional, Tuple
 
 import config
+from store.write_behind import get_write_behind_store
 from var import source_keyword_var
 
 from .douyin_store_impl import *
+from .douyin_store_media import *
 
 
 class DouyinStoreFactory:
     STORES = {
         "csv": DouyinCsvStoreImplement,
         "db": DouyinDbStoreImplement,
+        "sqlite": DouyinDbStoreImplement,
         "json": DouyinJsonStoreImplement,
+        "jsonl": DouyinJsonlStoreImplement,
+        "parquet": DouyinParquetStoreImplement,
     }
 
     @staticmethod
@@ -35,7 +40,7 @@ class DouyinStoreFactory:
             raise ValueError(
                 "[DouyinStoreFactory.create_store] Invalid save option only supported csv or db or json ..."
             )
-        return store_class()
+        return get_write_behind_store(f"douyin_{config.SAVE_DATA_OPTION}", store_class)
 
 
 def _extract_comment_image_list(comment_item: Dict) -> List[str]:
@@ -104,6 +109,27 @@ def _extract_video_download_url(aweme_detail: Dict) -> str:
     return actual_url_list[-1]
 
 
+def get_aweme_media_urls(aweme_detail: Dict) -> List[Tuple[str, str]]:
+    """
+    提取作品需要下载的媒体文件：图集作品的全部图片，视频作品的视频
+
+    Args:
+        aweme_detail (Dict): 抖音内容详情
+
+    Returns:
+        List[Tuple[str, str]]: (下载地址, 文件名) 列表
+    """
+    media_urls: List[Tuple[str, str]] = []
+    for image in aweme_detail.get("images") or []:
+        url_list = image.get("url_list", [])
+        if url_list:
+            media_urls.append((url_list[-1], f"{len(media_urls)}.jpeg"))
+    if media_urls:
+        return media_urls
+    video_url = _extract_video_download_url(aweme_detail)
+    return [(video_url, "video.mp4")] if video_url else []
+
+
 async def update_douyin_aweme(aweme_item: Dict):
     aweme_id = aweme_item.get("aweme_id")
     user_info = aweme_item.get("author", {})
@@ -143,17 +169,17 @@ async def update_douyin_aweme(aweme_item: Dict):
 async def batch_update_dy_aweme_comments(aweme_id: str, comments: List[Dict]):
     if not comments:
         return
-    for comment_item in comments:
-        await update_dy_aweme_comment(aweme_id, comment_item)
+    save_comment_items = [_build_dy_aweme_comment_item(aweme_id, comment_item) for comment_item in comments]
+    await DouyinStoreFactory.create_store().store_comments([item for item in save_comment_items if item])
 
 
-async def update_dy_aweme_comment(aweme_id: str, comment_item: Dict):
+def _build_dy_aweme_comment_item(aweme_id: str, comment_item: Dict) -> Optional[Dict]:
     comment_aweme_id = comment_item.get("aweme_id")
     if aweme_id != comment_aweme_id:
         utils.logger.error(
             f"[store.douyin.update_dy_aweme_comment] comment_aweme_id: {comment_aweme_id} != aweme_id: {aweme_id}"
         )
-        return
+        return None
     user_info = comment_item.get("user", {})
     comment_id = comment_item.get("cid")
     parent_comment_id = comment_item.get("reply_id", "0")
@@ -188,10 +214,13 @@ async def update_dy_aweme_comment(aweme_id: str, comment_item: Dict):
     utils.logger.info(
         f"[store.douyin.update_dy_aweme_comment] douyin aweme comment: {comment_id}, content: {save_comment_item.get('content')}"
     )
+    return save_comment_item
 
-    await DouyinStoreFactory.create_store().store_comment(
-        comment_item=save_comment_item
-    )
+
+async def update_dy_aweme_comment(aweme_id: str, comment_item: Dict):
+    save_comment_item = _build_dy_aweme_comment_item(aweme_id, comment_item)
+    if save_comment_item:
+        await DouyinStoreFactory.create_store().store_comment(save_comment_item)
 
 
 async def save_creator(user_id: str, creator: Dict):
@@ -14,16 +14,18 @@
 # @Time    : 2024/1/14 18:46
 # @Desc    : 抖音存储实现类
 import asyncio
-import csv
 import json
 import os
 import pathlib
-from typing import Dict
+from typing import Dict, List
 
 import aiofiles
 
 import config
 from base.base_crawler import AbstractStore
+from store.csv_sink import get_csv_sink
+from store.jsonl_store import JsonlStoreImplement
+from store.parquet_store import ParquetStoreImplement
 from tools import utils, words
 from var import crawler_type_var
 
@@ -68,13 +70,8 @@ class DouyinCsvStoreImplement(AbstractStore):
         Returns: no returns
 
         """
-        pathlib.Path(self.csv_store_path).mkdir(parents=True, exist_ok=True)
         save_file_name = self.make_save_file_name(store_type=store_type)
-        async with aiofiles.open(save_file_name, mode='a+', encoding="utf-8-sig", newline="") as f:
-            writer = csv.writer(f)
-            if await f.tell() == 0:
-                await writer.writerow(save_item.keys())
-            await writer.writerow(save_item.values())
+        get_csv_sink(save_file_name).write([save_item])
 
     async def store_content(self, content_item: Dict):
         """
@@ -120,18 +117,29 @@ class DouyinDbStoreImplement(AbstractStore):
         Returns:
 
         """
+        await self.store_contents([content_item])
 
-        from .douyin_store_sql import (add_new_content,
-                                       query_content_by_content_id,
+    async def store_contents(self, content_items: List[Dict]):
+        """
+        Douyin content DB batch storage implementation, aweme_id 已存在时更新
+        Args:
+            content_items: content item dict list
+
+        Returns:
+
+        """
+        from .douyin_store_sql import (batch_upsert_contents,
                                        update_content_by_content_id)
-        aweme_id = content_item.get("aweme_id")
-        aweme_detail: Dict = await query_content_by_content_id(content_id=aweme_id)
-        if not aweme_detail:
-            content_item["add_ts"] = utils.get_current_timestamp()
+        add_ts = utils.get_current_timestamp()
+        new_items = []
+        for content_item in content_items:
             if content_item.get("title"):
-                await add_new_content(content_item)
-        else:
-            await update_content_by_content_id(aweme_id, content_item=content_item)
+                content_item["add_ts"] = add_ts
+                new_items.append(content_item)
+            else:
+                # 没有标题的视频不新增记录，只更新已有记录
+                await update_content_by_content_id(content_item.get("aweme_id"), content_item=content_item)
+        await batch_upsert_contents(new_items)
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -142,16 +150,22 @@ class DouyinDbStoreImplement(AbstractStore):
         Returns:
 
         """
-        from .douyin_store_sql import (add_new_comment,
-                                       query_comment_by_comment_id,
-                                       update_comment_by_comment_id)
-        comment_id = comment_item.get("comment_id")
-        comment_detail: Dict = await query_comment_by_comment_id(comment_id=comment_id)
-        if not comment_detail:
-            comment_item["add_ts"] = utils.get_current_timestamp()
-            await add_new_comment(comment_item)
-        else:
-            await update_comment_by_comment_id(comment_id, comment_item=comment_item)
+        await self.store_comments([comment_item])
+
+    async def store_comments(self, comment_items: List[Dict]):
+        """
+        Douyin comment DB batch storage implementation, comment_id 已存在时更新
+        Args:
+            comment_items: comment item dict list
+
+        Returns:
+
+        """
+        from .douyin_store_sql import batch_upsert_comments
+        add_ts = utils.get_current_timestamp()
+        for comment_item in comment_items:
+            comment_item["add_ts"] = add_ts
+        await batch_upsert_comments(comment_items)
 
     async def store_creator(self, creator: Dict):
         """
@@ -257,4 +271,30 @@ class DouyinJsonStoreImplement(AbstractStore):
         Returns:
 
         """
-        await self.save_data_to_json(save_item=creator, store_type="creator")
\ No newline at end of file
+        await self.save_data_to_json(save_item=creator, store_type="creator")
+
+
+class DouyinJsonlStoreImplement(JsonlStoreImplement):
+    jsonl_store_path: str = "data/douyin/jsonl"
+
+
+class DouyinParquetStoreImplement(ParquetStoreImplement):
+    parquet_store_path: str = "data/douyin/parquet"
+    parquet_columns = {
+        "contents": (
+            "aweme_id", "aweme_type", "title", "desc", "create_time", "user_id", "sec_uid", "short_user_id",
+            "user_unique_id", "user_signature", "nickname", "avatar", "liked_count", "collected_count",
+            "comment_count", "share_count", "ip_location", "last_modify_ts", "aweme_url", "cover_url",
+            "video_download_url", "source_keyword",
+        ),
+        "comments": (
+            "comment_id", "create_time", "ip_location", "aweme_id", "content", "user_id", "sec_uid",
+            "short_user_id", "user_unique_id", "user_signature", "nickname", "avatar", "sub_comment_count",
+            "like_count", "last_modify_ts", "parent_comment_id", "pictures",
+        ),
+        "creator": (
+            "user_id", "nickname", "gender", "avatar", "desc", "ip_location", "follows", "fans",
+            "interaction", "videos_count", "last_modify_ts",
+        ),
+    }
+    parquet_int_columns = frozenset({"create_time", "last_modify_ts"})
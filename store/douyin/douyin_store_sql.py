@@ -66,6 +66,20 @@ async def update_content_by_content_id(content_id: str, content_item: Dict) -> i
     return effect_row
 
 
+async def batch_upsert_contents(content_items: List[Dict]) -> int:
+    """
+    批量写入内容记录，aweme_id 已存在时更新
+    Args:
+        content_items:
+
+    Returns:
+
+    """
+    async_db_conn: AsyncMysqlDB = media_crawler_db_var.get()
+    effect_row: int = await async_db_conn.batch_upsert("douyin_aweme", content_items, key_field="aweme_id")
+    return effect_row
+
+
 
 async def query_comment_by_comment_id(comment_id: str) -> Dict:
     """
@@ -113,6 +127,20 @@ async def update_comment_by_comment_id(comment_id: str, comment_item: Dict) -> i
     return effect_row
 
 
+async def batch_upsert_comments(comment_items: List[Dict]) -> int:
+    """
+    批量写入评论记录，comment_id 已存在时更新
+    Args:
+        comment_items:
+
+    Returns:
+
+    """
+    async_db_conn: AsyncMysqlDB = media_crawler_db_var.get()
+    effect_row: int = await async_db_conn.batch_upsert("douyin_aweme_comment", comment_items, key_field="comment_id")
+    return effect_row
+
+
 async def query_creator_by_user_id(user_id: str) -> Dict:
     """
     查询一条创作者记录
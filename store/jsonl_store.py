@@ -0,0 +1,181 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : JSONL 存储
+#            每行一条记录，只追加写入；每个文件在进程内只打开一次并保持带缓冲的句柄，
+#            写入耗时和内存占用与文件大小无关（旧的 JSON 存储每条记录都要读出整个文件再整体重写）。
+#            需要旧的 JSON 数组格式时，用 export_jsonl_to_json 逐行流式转换。
+# 用法：python -m store.jsonl_store data/xhs/jsonl/search_comments_2024-01-14.jsonl [...]
+
+import json
+import os
+import pathlib
+import sys
+from typing import Dict, List, Optional
+
+import config
+from base.base_crawler import AbstractStore
+from tools import utils
+from var import crawler_type_var
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSONL_WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def dumps_line(item: Dict) -> bytes:
+    """
+    序列化一条记录为 JSONL 的一行，安装了 orjson 时使用 orjson
+    """
+    if orjson is not None:
+        return orjson.dumps(item, default=str) + b"\n"
+    return (json.dumps(item, ensure_ascii=False, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+
+class JsonlFileWriter:
+    """
+    一个 JSONL 文件的追加写入句柄
+    """
+
+    def __init__(self, path: str, buffer_size: int = JSONL_WRITE_BUFFER_SIZE):
+        pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.lines = 0
+        self._file = open(path, "ab", buffering=buffer_size)
+
+    def write(self, items: List[Dict]):
+        # 追加写入的数据先进入进程内缓冲区和系统页缓存，不需要放到线程池里执行
+        self._file.write(b"".join(dumps_line(item) for item in items))
+        self.lines += len(items)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+_jsonl_writers: Dict[str, JsonlFileWriter] = {}
+
+
+def get_jsonl_writer(path: str) -> JsonlFileWriter:
+    """
+    获取文件的写入句柄，同一个文件在进程内只打开一次
+    """
+    writer = _jsonl_writers.get(path)
+    if writer is None:
+        writer = JsonlFileWriter(path)
+        _jsonl_writers[path] = writer
+    return writer
+
+
+def export_jsonl_to_json(jsonl_path: str, json_path: Optional[str] = None) -> str:
+    """
+    把 JSONL 文件转换成旧的 JSON 数组格式（与 json.dumps(list, ensure_ascii=False, indent=4) 的输出一致），
+    逐行读取和写入，内存占用与文件大小无关
+    Args:
+        jsonl_path: JSONL 文件路径
+        json_path: 输出路径，默认把扩展名改成 .json
+
+    Returns: 输出路径
+
+    """
+    json_path = json_path or os.path.splitext(jsonl_path)[0] + ".json"
+    tmp_path = json_path + ".tmp"
+    count = 0
+    with open(jsonl_path, "r", encoding="utf-8") as src, open(tmp_path, "w", encoding="utf-8") as dst:
+        for line in src:
+            if not line.strip():
+                continue
+            item_json = json.dumps(json.loads(line), ensure_ascii=False, indent=4)
+            dst.write("[\n    " if count == 0 else ",\n    ")
+            dst.write(item_json.replace("\n", "\n    "))
+            count += 1
+        dst.write("\n]" if count else "[]")
+    os.replace(tmp_path, json_path)
+    utils.logger.info(f"[jsonl_store.export_jsonl_to_json] export {count} items: {jsonl_path} -> {json_path}")
+    return json_path
+
+
+def close_jsonl_writers(export_json: Optional[bool] = None):
+    """
+    关闭所有 JSONL 文件，程序退出时调用
+    Args:
+        export_json: 是否同时导出旧的 JSON 数组格式，默认读取 config.JSONL_EXPORT_JSON_ON_CLOSE
+    """
+    export_json = config.JSONL_EXPORT_JSON_ON_CLOSE if export_json is None else export_json
+    while _jsonl_writers:
+        path, writer = _jsonl_writers.popitem()
+        writer.close()
+        if export_json:
+            try:
+                export_jsonl_to_json(path)
+            except Exception as e:
+                utils.logger.error(f"[jsonl_store.close_jsonl_writers] export {path} error: {e}")
+
+
+class JsonlStoreImplement(AbstractStore):
+    """
+    各平台的 JSONL 存储实现继承这个类，只需要指定 jsonl_store_path
+    """
+    jsonl_store_path: str = "data/jsonl"
+
+    def make_save_file_name(self, store_type: str) -> str:
+        """
+        make save file name by store type
+        Args:
+            store_type: Save type contains content and comments（contents | comments | creator）
+
+        Returns: eg: data/xhs/jsonl/search_comments_20240114.jsonl ...
+
+        """
+        return f"{self.jsonl_store_path}/{crawler_type_var.get()}_{store_type}_{utils.get_current_date()}.jsonl"
+
+    async def save_data_to_jsonl(self, save_items: List[Dict], store_type: str):
+        """
+        追加写入 JSONL 文件，每次调用后把缓冲区写入系统，进程异常退出时最多丢失正在写入的一批
+        Args:
+            save_items: 记录列表
+            store_type: Save type contains content and comments（contents | comments | creator）
+
+        Returns:
+
+        """
+        if not save_items:
+            return
+        writer = get_jsonl_writer(self.make_save_file_name(store_type))
+        writer.write(save_items)
+        writer.flush()
+
+    async def store_content(self, content_item: Dict):
+        await self.save_data_to_jsonl([content_item], "contents")
+
+    async def store_contents(self, content_items: List[Dict]):
+        await self.save_data_to_jsonl(content_items, "contents")
+
+    async def store_comment(self, comment_item: Dict):
+        await self.save_data_to_jsonl([comment_item], "comments")
+
+    async def store_comments(self, comment_items: List[Dict]):
+        await self.save_data_to_jsonl(comment_items, "comments")
+
+    async def store_creator(self, creator: Dict):
+        await self.save_data_to_jsonl([creator], "creator")
+
+
+if __name__ == '__main__':
+    for file_path in sys.argv[1:]:
+        print(export_jsonl_to_json(file_path))
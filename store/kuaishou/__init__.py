@@ -13,9 +13,10 @@
 # @Author  : relakkes@gmail.com
 # @Time    : 2024/1/14 20:03
 # @Desc    :
-from typing import List
+from typing import List, Optional
 
 import config
+from store.write_behind import get_write_behind_store
 from var import source_keyword_var
 
 from .kuaishou_store_impl import *
@@ -25,7 +26,10 @@ class KuaishouStoreFactory:
     STORES = {
         "csv": KuaishouCsvStoreImplement,
         "db": KuaishouDbStoreImplement,
-        "json": KuaishouJsonStoreImplement
+        "sqlite": KuaishouDbStoreImplement,
+        "json": KuaishouJsonStoreImplement,
+        "jsonl": KuaishouJsonlStoreImplement,
+        "parquet": KuaishouParquetStoreImplement
     }
 
     @staticmethod
@@ -34,7 +38,7 @@ class KuaishouStoreFactory:
         if not store_class:
             raise ValueError(
                 "[KuaishouStoreFactory.create_store] Invalid save option only supported csv or db or json ...")
-        return store_class()
+        return get_write_behind_store(f"kuaishou_{config.SAVE_DATA_OPTION}", store_class)
 
 
 async def update_kuaishou_video(video_item: Dict):
@@ -69,11 +73,11 @@ async def batch_update_ks_video_comments(video_id: str, comments: List[Dict]):
     utils.logger.info(f"[store.kuaishou.batch_update_ks_video_comments] video_id:{video_id}, comments:{comments}")
     if not comments:
         return
-    for comment_item in comments:
-        await update_ks_video_comment(video_id, comment_item)
+    save_comment_items = [_build_ks_video_comment_item(video_id, comment_item) for comment_item in comments]
+    await KuaishouStoreFactory.create_store().store_comments([item for item in save_comment_items if item])
 
 
-async def update_ks_video_comment(video_id: str, comment_item: Dict):
+def _build_ks_video_comment_item(video_id: str, comment_item: Dict) -> Optional[Dict]:
     comment_id = comment_item.get("commentId")
     save_comment_item = {
         "comment_id": comment_id,
@@ -88,7 +92,13 @@ async def update_ks_video_comment(video_id: str, comment_item: Dict):
     }
     utils.logger.info(
         f"[store.kuaishou.update_ks_video_comment] Kuaishou video comment: {comment_id}, content: {save_comment_item.get('content')}")
-    await KuaishouStoreFactory.create_store().store_comment(comment_item=save_comment_item)
+    return save_comment_item
+
+
+async def update_ks_video_comment(video_id: str, comment_item: Dict):
+    save_comment_item = _build_ks_video_comment_item(video_id, comment_item)
+    if save_comment_item:
+        await KuaishouStoreFactory.create_store().store_comment(save_comment_item)
 
 async def save_creator(user_id: str, creator: Dict):
     ownerCount = creator.get('ownerCount', {})
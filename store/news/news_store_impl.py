@@ -16,7 +16,7 @@ from datetime import datetime
 
 from model.m_news import NewsArticle, NewsSearchResult, NewsSearchTask
 from store.news.news_store_sql import NewsStoreSql
-from tools import utils
+from tools import stats_rollup, utils
 from var import media_crawler_db_var
 
 
@@ -66,6 +66,9 @@ class NewsStoreImpl:
                 current_ts,
                 current_ts
             )
+            # 文章不经过 batch_upsert 写入，单独记录到看板统计汇总
+            await stats_rollup.mark_written(self.mysql_db_var.get(), "news_article",
+                                            [{"article_id": article_data.get('article_id')}])
             
             # 如果有搜索信息，同时保存搜索结果
             if article_data.get('search_keyword') and article_data.get('search_engine'):
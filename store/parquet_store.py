@@ -0,0 +1,255 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : Parquet 列式存储（需要安装 pyarrow）
+#            每个平台、每种存储类型一个文件，记录在内存中攒够 config.PARQUET_ROW_GROUP_SIZE 条后写入一个 row group，
+#            程序退出时写入剩余记录和文件尾。列和类型由各平台的存储实现按存储类型声明（parquet_columns），
+#            所有值都转换成声明的类型，同一个目录下的文件 schema 一致；关键词、IP 属地、昵称这类重复值多的列使用字典编码。
+#            读取：pandas.read_parquet("data/xhs/parquet")
+
+import json
+import os
+import pathlib
+from typing import Any, Collection, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+import config
+from base.base_crawler import AbstractStore
+from tools import utils
+from var import crawler_type_var
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    if value is None or isinstance(value, int):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_str(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def require_pyarrow():
+    """
+    检查是否安装了 pyarrow，选择 parquet 存储时在启动和创建存储时调用，而不是等到后台写入时才失败
+    """
+    if pa is None:
+        raise ImportError("parquet store requires pyarrow, please run: pip install pyarrow")
+
+
+def make_schema(columns: Sequence[str], int_columns: Collection[str] = ()) -> "pa.Schema":
+    """
+    根据声明的列生成 schema：int_columns 中的列为 int64，其余列都按字符串保存
+    Args:
+        columns: 列名，按写入文件的顺序
+        int_columns: 整数列，只放程序生成或接口固定返回整数的列（时间戳等），点赞数这类可能是 "1万+" 的列按字符串保存
+
+    Returns:
+
+    """
+    require_pyarrow()
+    return pa.schema([(name, pa.int64() if name in int_columns else pa.string()) for name in columns])
+
+
+class ParquetFileWriter:
+    """
+    一个 Parquet 文件的写入句柄
+    """
+
+    def __init__(self, path: str, schema: "pa.Schema", row_group_size: Optional[int] = None):
+        """
+        Args:
+            path: 文件路径，Parquet 文件不能追加，文件已存在时（同一天多次运行）依次改用 xxx_1.parquet、xxx_2.parquet ...
+            schema: 文件的 schema，所有记录都按它转换
+            row_group_size: 每个 row group 的记录数，默认读取 config.PARQUET_ROW_GROUP_SIZE
+        """
+        require_pyarrow()
+        pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = self._available_path(path)
+        self.schema = schema
+        self.row_group_size = row_group_size or config.PARQUET_ROW_GROUP_SIZE
+        self.rows = 0
+        self.row_groups = 0
+        # 记录中出现过、但 schema 里没有的列，只提示一次
+        self.dropped_columns: Set[str] = set()
+        self._buffer: List[Dict] = []
+        self._writer: Optional[pq.ParquetWriter] = None
+
+    @staticmethod
+    def _available_path(path: str) -> str:
+        base, ext = os.path.splitext(path)
+        index = 0
+        while os.path.exists(path):
+            index += 1
+            path = f"{base}_{index}{ext}"
+        return path
+
+    def write(self, items: List[Dict]):
+        """
+        写入多行，攒够一个 row group 时写入文件
+        """
+        self._buffer.extend(items)
+        if len(self._buffer) >= self.row_group_size:
+            self.flush()
+
+    def _check_columns(self, items: List[Dict]):
+        names = set(self.schema.names)
+        dropped = {key for item in items for key in item if key not in names} - self.dropped_columns
+        if dropped:
+            self.dropped_columns |= dropped
+            utils.logger.warning(f"[ParquetFileWriter] {self.path} has no column for {sorted(dropped)}, these values are not saved")
+
+    def flush(self):
+        """
+        把缓冲区中的记录写入一个 row group
+        """
+        if not self._buffer:
+            return
+        items, self._buffer = self._buffer, []
+        self._check_columns(items)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(
+                self.path,
+                self.schema,
+                compression=config.PARQUET_COMPRESSION,
+                use_dictionary=[name for name in config.PARQUET_DICTIONARY_COLUMNS if name in self.schema.names],
+            )
+        columns = {}
+        for field in self.schema:
+            name = field.name
+            if pa.types.is_integer(field.type):
+                columns[name] = [_to_int(item.get(name)) for item in items]
+            else:
+                # 绝大多数值本身就是字符串，不需要转换
+                columns[name] = [value if value is None or type(value) is str else _to_str(value)
+                                 for value in (item.get(name) for item in items)]
+        self._writer.write_table(pa.Table.from_pydict(columns, schema=self.schema), row_group_size=len(items))
+        self.rows += len(items)
+        self.row_groups += 1
+
+    def close(self):
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+_parquet_writers: Dict[str, ParquetFileWriter] = {}
+
+
+def get_parquet_writer(path: str, schema: "pa.Schema") -> ParquetFileWriter:
+    """
+    获取文件的写入句柄，同一个文件在进程内只打开一次
+    """
+    writer = _parquet_writers.get(path)
+    if writer is None:
+        writer = ParquetFileWriter(path, schema)
+        _parquet_writers[path] = writer
+    return writer
+
+
+def close_parquet_writers():
+    """
+    写入剩余记录并关闭所有 Parquet 文件，程序退出时调用（没有写入文件尾的 Parquet 文件无法读取）
+    """
+    while _parquet_writers:
+        path, writer = _parquet_writers.popitem()
+        try:
+            writer.close()
+            utils.logger.info(f"[parquet_store.close_parquet_writers] {writer.path}: {writer.rows} rows, {writer.row_groups} row groups")
+        except Exception as e:
+            utils.logger.error(f"[parquet_store.close_parquet_writers] close {path} error: {e}")
+
+
+class ParquetStoreImplement(AbstractStore):
+    """
+    各平台的 Parquet 存储实现继承这个类，指定 parquet_store_path 和各存储类型的列
+    """
+    parquet_store_path: str = "data/parquet"
+    # 存储类型 -> 列名，和平台 store 模块生成的记录字段一致
+    parquet_columns: Dict[str, Tuple[str, ...]] = {}
+    # 按 int64 保存的列，其余列都是字符串
+    parquet_int_columns: FrozenSet[str] = frozenset({"last_modify_ts"})
+
+    def __init__(self):
+        require_pyarrow()
+        self._schemas: Dict[str, pa.Schema] = {}
+
+    def get_schema(self, store_type: str) -> "pa.Schema":
+        """
+        存储类型对应的 schema
+        Args:
+            store_type: contents | comments | creator ...
+
+        Returns:
+
+        """
+        schema = self._schemas.get(store_type)
+        if schema is None:
+            if store_type not in self.parquet_columns:
+                raise ValueError(f"{type(self).__name__} has no parquet columns for store type: {store_type}")
+            schema = make_schema(self.parquet_columns[store_type], self.parquet_int_columns)
+            self._schemas[store_type] = schema
+        return schema
+
+    def make_save_file_name(self, store_type: str) -> str:
+        """
+        make save file name by store type
+        Args:
+            store_type: Save type contains content and comments（contents | comments | creator）
+
+        Returns: eg: data/xhs/parquet/search_comments_20240114.parquet ...
+
+        """
+        return f"{self.parquet_store_path}/{crawler_type_var.get()}_{store_type}_{utils.get_current_date()}.parquet"
+
+    async def save_data_to_parquet(self, save_items: List[Dict], store_type: str):
+        """
+        写入 Parquet 文件
+        Args:
+            save_items: 记录列表
+            store_type: Save type contains content and comments（contents | comments | creator）
+
+        Returns:
+
+        """
+        if not save_items:
+            return
+        get_parquet_writer(self.make_save_file_name(store_type), self.get_schema(store_type)).write(save_items)
+
+    async def store_content(self, content_item: Dict):
+        await self.save_data_to_parquet([content_item], "contents")
+
+    async def store_contents(self, content_items: List[Dict]):
+        await self.save_data_to_parquet(content_items, "contents")
+
+    async def store_comment(self, comment_item: Dict):
+        await self.save_data_to_parquet([comment_item], "comments")
+
+    async def store_comments(self, comment_items: List[Dict]):
+        await self.save_data_to_parquet(comment_items, "comments")
+
+    async def store_creator(self, creator: Dict):
+        await self.save_data_to_parquet([creator], "creator")
@@ -10,9 +10,11 @@
 
 
 # -*- coding: utf-8 -*-
-from typing import List
+from typing import List, Optional
 
 from model.m_baidu_tieba import TiebaComment, TiebaCreator, TiebaNote
+from store.write_behind import get_write_behind_store
+from tools.time_util import normalize_publish_ts
 from var import source_keyword_var
 
 from . import tieba_store_impl
@@ -23,7 +25,10 @@ class TieBaStoreFactory:
     STORES = {
         "csv": TieBaCsvStoreImplement,
         "db": TieBaDbStoreImplement,
-        "json": TieBaJsonStoreImplement
+        "sqlite": TieBaDbStoreImplement,
+        "json": TieBaJsonStoreImplement,
+        "jsonl": TieBaJsonlStoreImplement,
+        "parquet": TieBaParquetStoreImplement
     }
 
     @staticmethod
@@ -32,7 +37,7 @@ class TieBaStoreFactory:
         if not store_class:
             raise ValueError(
                 "[TieBaStoreFactory.create_store] Invalid save option only supported csv or db or json ...")
-        return store_class()
+        return get_write_behind_store(f"tieba_{config.SAVE_DATA_OPTION}", store_class)
 
 
 async def batch_update_tieba_notes(note_list: List[TiebaNote]):
@@ -62,6 +67,8 @@ async def update_tieba_note(note_item: TiebaNote):
     note_item.source_keyword = source_keyword_var.get()
     save_note_item = note_item.model_dump()
     save_note_item.update({"last_modify_ts": utils.get_current_timestamp()})
+    # 发布时间是 '2024-05-28 15:33'、'3天前' 这类字符串，入库时归一化为秒级时间戳，相对时间以抓取时间为基准
+    save_note_item["publish_ts"] = normalize_publish_ts(note_item.publish_time)
     utils.logger.info(f"[store.tieba.update_tieba_note] tieba note: {save_note_item}")
 
     await TieBaStoreFactory.create_store().store_content(save_note_item)
@@ -79,13 +86,13 @@ async def batch_update_tieba_note_comments(note_id: str, comments: List[TiebaCom
     """
     if not comments:
         return
-    for comment_item in comments:
-        await update_tieba_note_comment(note_id, comment_item)
+    save_comment_items = [_build_tieba_note_comment_item(note_id, comment_item) for comment_item in comments]
+    await TieBaStoreFactory.create_store().store_comments([item for item in save_comment_items if item])
 
 
-async def update_tieba_note_comment(note_id: str, comment_item: TiebaComment):
+def _build_tieba_note_comment_item(note_id: str, comment_item: TiebaComment) -> Optional[Dict]:
     """
-    Update tieba note comment
+    Build tieba note comment save item
     Args:
         note_id:
         comment_item:
@@ -96,7 +103,13 @@ async def update_tieba_note_comment(note_id: str, comment_item: TiebaComment):
     save_comment_item = comment_item.model_dump()
     save_comment_item.update({"last_modify_ts": utils.get_current_timestamp()})
     utils.logger.info(f"[store.tieba.update_tieba_note_comment] tieba note id: {note_id} comment:{save_comment_item}")
-    await TieBaStoreFactory.create_store().store_comment(save_comment_item)
+    return save_comment_item
+
+
+async def update_tieba_note_comment(note_id: str, comment_item: TiebaComment):
+    save_comment_item = _build_tieba_note_comment_item(note_id, comment_item)
+    if save_comment_item:
+        await TieBaStoreFactory.create_store().store_comment(save_comment_item)
 
 
 async def save_creator(user_info: TiebaCreator):
@@ -11,16 +11,18 @@
 
 # -*- coding: utf-8 -*-
 import asyncio
-import csv
 import json
 import os
 import pathlib
-from typing import Dict
+from typing import Dict, List
 
 import aiofiles
 
 import config
 from base.base_crawler import AbstractStore
+from store.csv_sink import get_csv_sink
+from store.jsonl_store import JsonlStoreImplement
+from store.parquet_store import ParquetStoreImplement
 from tools import utils, words
 from var import crawler_type_var
 
@@ -65,14 +67,8 @@ class TieBaCsvStoreImplement(AbstractStore):
         Returns: no returns
 
         """
-        pathlib.Path(self.csv_store_path).mkdir(parents=True, exist_ok=True)
         save_file_name = self.make_save_file_name(store_type=store_type)
-        async with aiofiles.open(save_file_name, mode='a+', encoding="utf-8-sig", newline="") as f:
-            f.fileno()
-            writer = csv.writer(f)
-            if await f.tell() == 0:
-                await writer.writerow(save_item.keys())
-            await writer.writerow(save_item.values())
+        get_csv_sink(save_file_name).write([save_item])
 
     async def store_content(self, content_item: Dict):
         """
@@ -118,16 +114,22 @@ class TieBaDbStoreImplement(AbstractStore):
         Returns:
 
         """
-        from .tieba_store_sql import (add_new_content,
-                                      query_content_by_content_id,
-                                      update_content_by_content_id)
-        note_id = content_item.get("note_id")
-        note_detail: Dict = await query_content_by_content_id(content_id=note_id)
-        if not note_detail:
-            content_item["add_ts"] = utils.get_current_timestamp()
-            await add_new_content(content_item)
-        else:
-            await update_content_by_content_id(note_id, content_item=content_item)
+        await self.store_contents([content_item])
+
+    async def store_contents(self, content_items: List[Dict]):
+        """
+        tieba content DB batch storage implementation, note_id 已存在时更新
+        Args:
+            content_items: content item dict list
+
+        Returns:
+
+        """
+        from .tieba_store_sql import batch_upsert_contents
+        add_ts = utils.get_current_timestamp()
+        for content_item in content_items:
+            content_item["add_ts"] = add_ts
+        await batch_upsert_contents(content_items)
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -138,16 +140,22 @@ class TieBaDbStoreImplement(AbstractStore):
         Returns:
 
         """
-        from .tieba_store_sql import (add_new_comment,
-                                      query_comment_by_comment_id,
-                                      update_comment_by_comment_id)
-        comment_id = comment_item.get("comment_id")
-        comment_detail: Dict = await query_comment_by_comment_id(comment_id=comment_id)
-        if not comment_detail:
-            comment_item["add_ts"] = utils.get_current_timestamp()
-            await add_new_comment(comment_item)
-        else:
-            await update_comment_by_comment_id(comment_id, comment_item=comment_item)
+        await self.store_comments([comment_item])
+
+    async def store_comments(self, comment_items: List[Dict]):
+        """
+        tieba comment DB batch storage implementation, comment_id 已存在时更新
+        Args:
+            comment_items: comment item dict list
+
+        Returns:
+
+        """
+        from .tieba_store_sql import batch_upsert_comments
+        add_ts = utils.get_current_timestamp()
+        for comment_item in comment_items:
+            comment_item["add_ts"] = add_ts
+        await batch_upsert_comments(comment_items)
 
     async def store_creator(self, creator: Dict):
         """
@@ -254,3 +262,31 @@ class TieBaJsonStoreImplement(AbstractStore):
 
         """
         await self.save_data_to_json(creator, "creator")
+
+
+class TieBaJsonlStoreImplement(JsonlStoreImplement):
+    jsonl_store_path: str = "data/tieba/jsonl"
+
+
+class TieBaParquetStoreImplement(ParquetStoreImplement):
+    parquet_store_path: str = "data/tieba/parquet"
+    parquet_columns = {
+        "contents": (
+            "note_id", "title", "desc", "note_url", "publish_time", "publish_ts", "user_link",
+            "user_nickname", "user_avatar", "tieba_name", "tieba_link", "total_replay_num",
+            "total_replay_page", "ip_location", "source_keyword", "last_modify_ts",
+        ),
+        "comments": (
+            "comment_id", "parent_comment_id", "content", "user_link", "user_nickname", "user_avatar",
+            "publish_time", "ip_location", "sub_comment_count", "note_id", "note_url", "tieba_id",
+            "tieba_name", "tieba_link", "last_modify_ts",
+        ),
+        "creator": (
+            "user_id", "user_name", "nickname", "gender", "avatar", "ip_location", "follows", "fans",
+            "registration_duration", "last_modify_ts",
+        ),
+    }
+    parquet_int_columns = frozenset({
+        "publish_ts", "total_replay_num", "total_replay_page", "sub_comment_count", "follows", "fans",
+        "last_modify_ts",
+    })
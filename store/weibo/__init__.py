@@ -15,8 +15,9 @@
 # @Desc    :
 
 import re
-from typing import List
+from typing import List, Optional
 
+from store.write_behind import get_write_behind_store
 from var import source_keyword_var
 
 from .weibo_store_image import *
@@ -27,7 +28,10 @@ class WeibostoreFactory:
     STORES = {
         "csv": WeiboCsvStoreImplement,
         "db": WeiboDbStoreImplement,
+        "sqlite": WeiboDbStoreImplement,
         "json": WeiboJsonStoreImplement,
+        "jsonl": WeiboJsonlStoreImplement,
+        "parquet": WeiboParquetStoreImplement,
     }
 
     @staticmethod
@@ -36,7 +40,7 @@ class WeibostoreFactory:
         if not store_class:
             raise ValueError(
                 "[WeibotoreFactory.create_store] Invalid save option only supported csv or db or json ...")
-        return store_class()
+        return get_write_behind_store(f"weibo_{config.SAVE_DATA_OPTION}", store_class)
 
 
 async def batch_update_weibo_notes(note_list: List[Dict]):
@@ -110,13 +114,13 @@ async def batch_update_weibo_note_comments(note_id: str, comments: List[Dict]):
     """
     if not comments:
         return
-    for comment_item in comments:
-        await update_weibo_note_comment(note_id, comment_item)
+    save_comment_items = [_build_weibo_note_comment_item(note_id, comment_item) for comment_item in comments]
+    await WeibostoreFactory.create_store().store_comments([item for item in save_comment_items if item])
 
 
-async def update_weibo_note_comment(note_id: str, comment_item: Dict):
+def _build_weibo_note_comment_item(note_id: str, comment_item: Dict) -> Optional[Dict]:
     """
-    Update weibo note comment
+    Build weibo note comment save item
     Args:
         note_id: weibo note id
         comment_item: weibo comment item
@@ -125,7 +129,7 @@ async def update_weibo_note_comment(note_id: str, comment_item: Dict):
 
     """
     if not comment_item or not note_id:
-        return
+        return None
     comment_id = str(comment_item.get("id"))
     user_info: Dict = comment_item.get("user")
     content_text = comment_item.get("text")
@@ -151,7 +155,13 @@ async def update_weibo_note_comment(note_id: str, comment_item: Dict):
     }
     utils.logger.info(
         f"[store.weibo.update_weibo_note_comment] Weibo note comment: {comment_id}, content: {save_comment_item.get('content', '')[:24]} ...")
-    await WeibostoreFactory.create_store().store_comment(comment_item=save_comment_item)
+    return save_comment_item
+
+
+async def update_weibo_note_comment(note_id: str, comment_item: Dict):
+    save_comment_item = _build_weibo_note_comment_item(note_id, comment_item)
+    if save_comment_item:
+        await WeibostoreFactory.create_store().store_comment(save_comment_item)
 
 
 async def update_weibo_note_image(picid: str, pic_content, extension_file_name):
@@ -0,0 +1,326 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 写缓冲（write-behind）存储
+#            包装任意 AbstractStore：内容、评论、创作者按类型写入内存缓冲区后立即返回，
+#            后台任务在缓冲区达到批量大小或等待超时后批量写入被包装的存储，失败时重试；
+#            缓冲区写满时调用方等待（背压）。各平台 StoreFactory 通过 get_write_behind_store 共享同一个实例，
+#            退出前调用 drain_all 把缓冲区写完。重试仍失败的批次保存在死信列表中并追加到死信文件，
+#            drain_all 返回并记录每个存储写入失败的数量。
+
+import asyncio
+import os
+import pathlib
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+import config
+from base.base_crawler import AbstractStore
+from store.jsonl_store import dumps_line
+from tools import utils
+
+KIND_CONTENTS = "contents"
+KIND_COMMENTS = "comments"
+KIND_CREATORS = "creators"
+
+
+class _Buffer:
+    """一种数据类型的缓冲区和写入指标"""
+
+    def __init__(self):
+        self.items: List[Dict] = []
+        self.oldest_at: Optional[float] = None
+        self.flushes = 0
+        self.flushed_items = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.retries = 0
+        self.failed_items = 0
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self.items),
+            "flushes": self.flushes,
+            "flushed_items": self.flushed_items,
+            "avg_batch_size": round(self.flushed_items / self.flushes, 2) if self.flushes else 0.0,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "last_lag": round(self.last_lag, 3),
+            "max_lag": round(self.max_lag, 3),
+            "retries": self.retries,
+            "failed_items": self.failed_items,
+        }
+
+
+class WriteBehindStore(AbstractStore):
+    """
+    用法：
+        store = WriteBehindStore(XhsDbStoreImplement(), name="xhs_db")
+        await store.store_content(item)  # 只写入缓冲区
+        ...
+        await store.drain()  # 退出前写完缓冲区
+    """
+
+    def __init__(
+        self,
+        store: AbstractStore,
+        name: str = "WriteBehindStore",
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_pending: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff: float = 0.5,
+        dead_letter_dir: Optional[str] = None,
+    ):
+        """
+        Args:
+            store: 被包装的存储实现
+            name: 名称，用于日志和指标
+            batch_size: 缓冲区达到多少条时立即写入
+            flush_interval: 缓冲区中最早的数据最多等待多少秒
+            max_pending: 缓冲区加写入中的数据上限，超过后调用方等待
+            max_retries: 写入失败后的重试次数
+            retry_backoff: 第一次重试前的等待时间（秒），之后每次翻倍
+            dead_letter_dir: 死信文件目录，重试仍失败的批次追加到 {dir}/{name}_{数据类型}.jsonl
+        """
+        self.store = store
+        self.name = name
+        self.batch_size = max(1, batch_size or config.WRITE_BEHIND_BATCH_SIZE)
+        self.flush_interval = flush_interval or config.WRITE_BEHIND_FLUSH_INTERVAL_SEC
+        self.max_pending = max(self.batch_size, max_pending or config.WRITE_BEHIND_MAX_PENDING)
+        self.max_retries = config.WRITE_BEHIND_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_backoff = retry_backoff
+        self.dead_letter_dir = dead_letter_dir or config.WRITE_BEHIND_DEAD_LETTER_DIR
+        # 重试仍失败的批次：(数据类型, 数据)
+        self.dead_letters: List[Tuple[str, List[Dict]]] = []
+        self._buffers: Dict[str, _Buffer] = {
+            KIND_CONTENTS: _Buffer(),
+            KIND_COMMENTS: _Buffer(),
+            KIND_CREATORS: _Buffer(),
+        }
+        self._pending = 0
+        self._closing = False
+        self._flusher: Optional[asyncio.Task] = None
+        # asyncio 原语在 python3.9 中会绑定创建时的事件循环，在第一次写入时才创建
+        self._wakeup: Optional[asyncio.Event] = None
+        self._space: Optional[asyncio.Condition] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+    def __getattr__(self, item):
+        # 没有缓冲的方法（例如 B 站的 store_contact、store_dynamic）直接交给被包装的存储
+        return getattr(self.store, item)
+
+    async def store_content(self, content_item: Dict):
+        await self._put(KIND_CONTENTS, [content_item])
+
+    async def store_contents(self, content_items: List[Dict]):
+        await self._put(KIND_CONTENTS, content_items)
+
+    async def store_comment(self, comment_item: Dict):
+        await self._put(KIND_COMMENTS, [comment_item])
+
+    async def store_comments(self, comment_items: List[Dict]):
+        await self._put(KIND_COMMENTS, comment_items)
+
+    async def store_creator(self, creator: Dict):
+        await self._put(KIND_CREATORS, [creator])
+
+    def _ensure_started(self):
+        if self._flusher is not None and not self._flusher.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Condition()
+        self._flush_lock = asyncio.Lock()
+        self._flusher = asyncio.create_task(self._run())
+
+    async def _put(self, kind: str, items: List[Dict]):
+        if not items:
+            return
+        self._ensure_started()
+        if self._pending >= self.max_pending:
+            # 背压：存储跟不上时让抓取流程等待，而不是无限占用内存
+            self._wakeup.set()
+            async with self._space:
+                await self._space.wait_for(lambda: self._pending < self.max_pending)
+        buffer = self._buffers[kind]
+        if not buffer.items:
+            buffer.oldest_at = time.monotonic()
+        buffer.items.extend(items)
+        self._pending += len(items)
+        if len(buffer.items) >= self.batch_size:
+            self._wakeup.set()
+
+    def _next_timeout(self) -> float:
+        oldest = [buffer.oldest_at for buffer in self._buffers.values() if buffer.items]
+        if not oldest:
+            return self.flush_interval
+        return max(0.0, min(oldest) + self.flush_interval - time.monotonic())
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._next_timeout())
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush(force=self._closing)
+
+    async def flush(self, force: bool = True):
+        """
+        写入缓冲区中的数据
+        Args:
+            force: True 时写入全部数据，False 时只写入达到批量大小或等待超时的类型
+        """
+        if self._flush_lock is None:
+            return
+        async with self._flush_lock:
+            for kind, buffer in self._buffers.items():
+                expired = buffer.items and time.monotonic() - buffer.oldest_at >= self.flush_interval
+                while buffer.items and (force or expired or len(buffer.items) >= self.batch_size):
+                    batch = buffer.items[:self.batch_size]
+                    lag = time.monotonic() - buffer.oldest_at
+                    buffer.items = buffer.items[self.batch_size:]
+                    # 剩余数据的等待时间从本次写入开始重新计算
+                    buffer.oldest_at = time.monotonic() if buffer.items else None
+                    await self._write_batch(kind, buffer, batch)
+                    buffer.last_lag = lag
+                    buffer.max_lag = max(buffer.max_lag, lag)
+                    self._pending -= len(batch)
+                    async with self._space:
+                        self._space.notify_all()
+
+    def _get_writer(self, kind: str) -> Callable[[List[Dict]], Awaitable[None]]:
+        if kind == KIND_CONTENTS:
+            return self.store.store_contents
+        if kind == KIND_COMMENTS:
+            return self.store.store_comments
+
+        async def store_creators(creators: List[Dict]):
+            for creator in creators:
+                await self.store.store_creator(creator)
+        return store_creators
+
+    async def _write_batch(self, kind: str, buffer: _Buffer, batch: List[Dict]):
+        writer = self._get_writer(kind)
+        for attempt in range(self.max_retries + 1):
+            try:
+                await writer(batch)
+                break
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    buffer.failed_items += len(batch)
+                    self.dead_letters.append((kind, batch))
+                    utils.logger.error(
+                        f"[WriteBehindStore.flush] {self.name} {kind} write {len(batch)} items failed after "
+                        f"{attempt + 1} attempts: {e}, saved to {self._save_dead_letter(kind, batch)}"
+                    )
+                    return
+                buffer.retries += 1
+                utils.logger.warning(
+                    f"[WriteBehindStore.flush] {self.name} {kind} write failed, retry {attempt + 1}/{self.max_retries}: {e}"
+                )
+                await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+        buffer.flushes += 1
+        buffer.flushed_items += len(batch)
+        buffer.last_batch_size = len(batch)
+        buffer.max_batch_size = max(buffer.max_batch_size, len(batch))
+
+    def _save_dead_letter(self, kind: str, batch: List[Dict]) -> str:
+        """
+        把写入失败的批次追加到死信文件，返回文件路径；死信文件也写入失败时数据只保留在 dead_letters 中
+        """
+        path = os.path.join(self.dead_letter_dir, f"{self.name}_{kind}.jsonl")
+        try:
+            pathlib.Path(self.dead_letter_dir).mkdir(parents=True, exist_ok=True)
+            with open(path, "ab") as f:
+                f.write(b"".join(dumps_line(item) for item in batch))
+        except Exception as e:
+            utils.logger.error(f"[WriteBehindStore._save_dead_letter] {self.name} write {path} error: {e}")
+            return "dead_letters (memory only)"
+        return path
+
+    def failed_items(self) -> int:
+        """
+        重试仍失败、进入死信的数据条数
+        """
+        return sum(buffer.failed_items for buffer in self._buffers.values())
+
+    async def drain(self):
+        """
+        停止后台任务并写完缓冲区中的全部数据
+        """
+        if self._flusher is not None:
+            # 不能直接取消后台任务，否则正在写入的批次会丢失
+            self._closing = True
+            self._wakeup.set()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+            self._closing = False
+        await self.flush(force=True)
+        self.log_metrics()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        各数据类型的待写入数量、写入批量大小、写入延迟（数据进入缓冲区到开始写入的时间）、重试和失败数量
+        """
+        return {kind: buffer.metrics() for kind, buffer in self._buffers.items()}
+
+    def log_metrics(self):
+        for kind, kind_metrics in self.metrics().items():
+            if kind_metrics["flushes"] or kind_metrics["failed_items"]:
+                utils.logger.info(f"[WriteBehindStore] {self.name} {kind}: {kind_metrics}")
+
+
+_write_behind_stores: Dict[str, WriteBehindStore] = {}
+
+
+def get_write_behind_store(name: str, store_class: Type[AbstractStore]) -> AbstractStore:
+    """
+    获取某个平台、某种存储方式共享的写缓冲存储，未开启写缓冲时直接返回新的存储实例
+    Args:
+        name: 缓存 key，例如 xhs_db
+        store_class: 被包装的存储实现类
+
+    Returns:
+
+    """
+    if not config.ENABLE_WRITE_BEHIND_STORE:
+        return store_class()
+    store = _write_behind_stores.get(name)
+    if store is None:
+        store = WriteBehindStore(store_class(), name=name)
+        _write_behind_stores[name] = store
+    return store
+
+
+async def drain_all() -> Dict[str, int]:
+    """
+    写完所有写缓冲存储中的数据，爬虫 close() 和程序退出时调用
+    Returns: 写入失败（进入死信）的数据条数，key 为存储名称，全部写入成功时为空字典
+    """
+    failed: Dict[str, int] = {}
+    while _write_behind_stores:
+        _, store = _write_behind_stores.popitem()
+        try:
+            await store.drain()
+        except Exception as e:
+            utils.logger.error(f"[write_behind.drain_all] drain {store.name} error: {e}")
+        if store.failed_items():
+            failed[store.name] = store.failed_items()
+    if failed:
+        utils.logger.error(
+            f"[write_behind.drain_all] items not written: {failed}, "
+            f"failed batches are saved in {config.WRITE_BEHIND_DEAD_LETTER_DIR}"
+        )
+    return failed
@@ -13,9 +13,10 @@
 # @Author  : relakkes@gmail.com
 # @Time    : 2024/1/14 17:34
 # @Desc    :
-from typing import List
+from typing import List, Optional
 
 import config
+from store.write_behind import get_write_behind_store
 from var import source_keyword_var
 
 from . import xhs_store_impl
@@ -27,7 +28,10 @@ class XhsStoreFactory:
     STORES = {
         "csv": XhsCsvStoreImplement,
         "db": XhsDbStoreImplement,
-        "json": XhsJsonStoreImplement
+        "sqlite": XhsDbStoreImplement,
+        "json": XhsJsonStoreImplement,
+        "jsonl": XhsJsonlStoreImplement,
+        "parquet": XhsParquetStoreImplement
     }
 
     @staticmethod
@@ -35,7 +39,7 @@ class XhsStoreFactory:
         store_class = XhsStoreFactory.STORES.get(config.SAVE_DATA_OPTION)
         if not store_class:
             raise ValueError("[XhsStoreFactory.create_store] Invalid save option only supported csv or db or json ...")
-        return store_class()
+        return get_write_behind_store(f"xhs_{config.SAVE_DATA_OPTION}", store_class)
 
 
 def get_video_url_arr(note_item: Dict) -> List:
@@ -125,13 +129,13 @@ async def batch_update_xhs_note_comments(note_id: str, comments: List[Dict]):
     """
     if not comments:
         return
-    for comment_item in comments:
-        await update_xhs_note_comment(note_id, comment_item)
+    save_comment_items = [_build_xhs_note_comment_item(note_id, comment_item) for comment_item in comments]
+    await XhsStoreFactory.create_store().store_comments([item for item in save_comment_items if item])
 
 
-async def update_xhs_note_comment(note_id: str, comment_item: Dict):
+def _build_xhs_note_comment_item(note_id: str, comment_item: Dict) -> Optional[Dict]:
     """
-    更新小红书笔记评论
+    生成小红书笔记评论的存储记录
     Args:
         note_id:
         comment_item:
@@ -159,7 +163,13 @@ async def update_xhs_note_comment(note_id: str, comment_item: Dict):
         "like_count": comment_item.get("like_count", 0),
     }
     utils.logger.info(f"[store.xhs.update_xhs_note_comment] xhs note comment:{local_db_item}")
-    await XhsStoreFactory.create_store().store_comment(local_db_item)
+    return local_db_item
+
+
+async def update_xhs_note_comment(note_id: str, comment_item: Dict):
+    local_db_item = _build_xhs_note_comment_item(note_id, comment_item)
+    if local_db_item:
+        await XhsStoreFactory.create_store().store_comment(local_db_item)
 
 
 async def save_creator(user_id: str, creator: Dict):
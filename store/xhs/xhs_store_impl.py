@@ -14,16 +14,18 @@
 # @Time    : 2024/1/14 16:58
 # @Desc    : 小红书存储实现类
 import asyncio
-import csv
 import json
 import os
 import pathlib
-from typing import Dict
+from typing import Dict, List
 
 import aiofiles
 
 import config
 from base.base_crawler import AbstractStore
+from store.csv_sink import get_csv_sink
+from store.jsonl_store import JsonlStoreImplement
+from store.parquet_store import ParquetStoreImplement
 from tools import utils, words
 from var import crawler_type_var
 
@@ -68,14 +70,8 @@ class XhsCsvStoreImplement(AbstractStore):
         Returns: no returns
 
         """
-        pathlib.Path(self.csv_store_path).mkdir(parents=True, exist_ok=True)
         save_file_name = self.make_save_file_name(store_type=store_type)
-        async with aiofiles.open(save_file_name, mode='a+', encoding="utf-8-sig", newline="") as f:
-            f.fileno()
-            writer = csv.writer(f)
-            if await f.tell() == 0:
-                await writer.writerow(save_item.keys())
-            await writer.writerow(save_item.values())
+        get_csv_sink(save_file_name).write([save_item])
 
     async def store_content(self, content_item: Dict):
         """
@@ -121,16 +117,22 @@ class XhsDbStoreImplement(AbstractStore):
         Returns:
 
         """
-        from .xhs_store_sql import (add_new_content,
-                                    query_content_by_content_id,
-                                    update_content_by_content_id)
-        note_id = content_item.get("note_id")
-        note_detail: Dict = await query_content_by_content_id(content_id=note_id)
-        if not note_detail:
-            content_item["add_ts"] = utils.get_current_timestamp()
-            await add_new_content(content_item)
-        else:
-            await update_content_by_content_id(note_id, content_item=content_item)
+        await self.store_contents([content_item])
+
+    async def store_contents(self, content_items: List[Dict]):
+        """
+        Xiaohongshu content DB batch storage implementation, note_id 已存在时更新
+        Args:
+            content_items: content item dict list
+
+        Returns:
+
+        """
+        from .xhs_store_sql import batch_upsert_contents
+        add_ts = utils.get_current_timestamp()
+        for content_item in content_items:
+            content_item["add_ts"] = add_ts
+        await batch_upsert_contents(content_items)
 
     async def store_comment(self, comment_item: Dict):
         """
@@ -141,16 +143,22 @@ class XhsDbStoreImplement(AbstractStore):
         Returns:
 
         """
-        from .xhs_store_sql import (add_new_comment,
-                                    query_comment_by_comment_id,
-                                    update_comment_by_comment_id)
-        comment_id = comment_item.get("comment_id")
-        comment_detail: Dict = await query_comment_by_comment_id(comment_id=comment_id)
-        if not comment_detail:
-            comment_item["add_ts"] = utils.get_current_timestamp()
-            await add_new_comment(comment_item)
-        else:
-            await update_comment_by_comment_id(comment_id, comment_item=comment_item)
+        await self.store_comments([comment_item])
+
+    async def store_comments(self, comment_items: List[Dict]):
+        """
+        Xiaohongshu comment DB batch storage implementation, comment_id 已存在时更新
+        Args:
+            comment_items: comment item dict list
+
+        Returns:
+
+        """
+        from .xhs_store_sql import batch_upsert_comments
+        add_ts = utils.get_current_timestamp()
+        for comment_item in comment_items:
+            comment_item["add_ts"] = add_ts
+        await batch_upsert_comments(comment_items)
 
     async def store_creator(self, creator: Dict):
         """
@@ -255,3 +263,28 @@ class XhsJsonStoreImplement(AbstractStore):
 
         """
         await self.save_data_to_json(creator, "creator")
+
+
+class XhsJsonlStoreImplement(JsonlStoreImplement):
+    jsonl_store_path: str = "data/xhs/jsonl"
+
+
+class XhsParquetStoreImplement(ParquetStoreImplement):
+    parquet_store_path: str = "data/xhs/parquet"
+    parquet_columns = {
+        "contents": (
+            "note_id", "type", "title", "desc", "video_url", "time", "last_update_time", "user_id",
+            "nickname", "avatar", "liked_count", "collected_count", "comment_count", "share_count",
+            "ip_location", "image_list", "tag_list", "last_modify_ts", "note_url", "source_keyword",
+            "xsec_token",
+        ),
+        "comments": (
+            "comment_id", "create_time", "ip_location", "note_id", "content", "user_id", "nickname", "avatar",
+            "sub_comment_count", "pictures", "parent_comment_id", "last_modify_ts", "like_count",
+        ),
+        "creator": (
+            "user_id", "nickname", "gender", "avatar", "desc", "ip_location", "follows", "fans",
+            "interaction", "tag_list", "last_modify_ts",
+        ),
+    }
+    parquet_int_columns = frozenset({"time", "last_update_time", "create_time", "last_modify_ts"})
@@ -10,15 +10,19 @@
 
 
 # -*- coding: utf-8 -*-
-from typing import List
+from typing import Dict, List, Optional
 
 import config
 from base.base_crawler import AbstractStore
 from model.m_zhihu import ZhihuComment, ZhihuContent, ZhihuCreator
+from store.write_behind import get_write_behind_store
 from store.zhihu.zhihu_store_impl import (ZhihuCsvStoreImplement,
                                           ZhihuDbStoreImplement,
-                                          ZhihuJsonStoreImplement)
+                                          ZhihuJsonStoreImplement,
+                                          ZhihuJsonlStoreImplement,
+                                          ZhihuParquetStoreImplement)
 from tools import utils
+from tools.time_util import normalize_publish_ts
 from var import source_keyword_var
 
 
@@ -26,7 +30,10 @@ class ZhihuStoreFactory:
     STORES = {
         "csv": ZhihuCsvStoreImplement,
         "db": ZhihuDbStoreImplement,
-        "json": ZhihuJsonStoreImplement
+        "sqlite": ZhihuDbStoreImplement,
+        "json": ZhihuJsonStoreImplement,
+        "jsonl": ZhihuJsonlStoreImplement,
+        "parquet": ZhihuParquetStoreImplement
     }
 
     @staticmethod
@@ -34,7 +41,7 @@ class ZhihuStoreFactory:
         store_class = ZhihuStoreFactory.STORES.get(config.SAVE_DATA_OPTION)
         if not store_class:
             raise ValueError("[ZhihuStoreFactory.create_store] Invalid save option only supported csv or db or json ...")
-        return store_class()
+        return get_write_behind_store(f"zhihu_{config.SAVE_DATA_OPTION}", store_class)
 
 async def batch_update_zhihu_contents(contents: List[ZhihuContent]):
     """
@@ -63,6 +70,8 @@ async def update_zhihu_content(content_item: ZhihuContent):
     content_item.source_keyword = source_keyword_var.get()
     local_db_item = content_item.model_dump()
     local_db_item.update({"last_modify_ts": utils.get_current_timestamp()})
+    # created_time 在表中是字符串，入库时归一化为秒级时间戳，用于按时间筛选
+    local_db_item["publish_ts"] = normalize_publish_ts(content_item.created_time)
     utils.logger.info(f"[store.zhihu.update_zhihu_content] zhihu content: {local_db_item}")
     await ZhihuStoreFactory.create_store().store_content(local_db_item)
 
@@ -80,13 +89,13 @@ async def batch_update_zhihu_note_comments(comments: List[ZhihuComment]):
     if not comments:
         return
     
-    for comment_item in comments:
-        await update_zhihu_content_comment(comment_item)
+    save_comment_items = [_build_zhihu_content_comment_item(comment_item) for comment_item in comments]
+    await ZhihuStoreFactory.create_store().store_comments([item for item in save_comment_items if item])
 
 
-async def update_zhihu_content_comment(comment_item: ZhihuComment):
+def _build_zhihu_content_comment_item(comment_item: ZhihuComment) -> Optional[Dict]:
     """
-    更新知乎内容评论
+    生成知乎内容评论的存储记录
     Args:
         comment_item:
 
@@ -96,7 +105,13 @@ async def update_zhihu_content_comment(comment_item: ZhihuComment):
     local_db_item = comment_item.model_dump()
     local_db_item.update({"last_modify_ts": utils.get_current_timestamp()})
     utils.logger.info(f"[store.zhihu.update_zhihu_note_comment] zhihu content comment:{local_db_item}")
-    await ZhihuStoreFactory.create_store().store_comment(local_db_item)
+    return local_db_item
+
+
+async def update_zhihu_content_comment(comment_item: ZhihuComment):
+    local_db_item = _build_zhihu_content_comment_item(comment_item)
+    if local_db_item:
+        await ZhihuStoreFactory.create_store().store_comment(local_db_item)
 
 
 async def save_creator(creator: ZhihuCreator):
@@ -0,0 +1,153 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 本地 Redis 桩服务（RESP2），只实现缓存测试用到的命令：
+#            PING AUTH SELECT CLIENT GET SET(EX/PX) MGET DEL TTL SCAN KEYS FLUSHDB
+
+import asyncio
+import fnmatch
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+RespValue = Union[None, int, bytes, str, List["RespValue"], Exception]
+
+
+class FakeRedisServer:
+    """
+    基于 asyncio.start_server 的极简 Redis 服务
+    - 统计建立过的连接数、每种命令的次数
+    - round_trips：服务端等待新数据的次数，pipeline 中的多条命令一次到达时只计一次
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, password: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.connections = 0
+        self.round_trips = 0
+        self.commands: Dict[str, int] = {}
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> "FakeRedisServer":
+        self._server = await asyncio.start_server(self._handle_conn, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expire_at = entry
+        if expire_at is not None and expire_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    async def _read_command(self, reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+        if not reader._buffer:
+            self.round_trips += 1
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.strip().split()
+        args = []
+        for _ in range(int(line[1:])):
+            size = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(size + 2))[:-2])
+        return args
+
+    def _execute(self, args: List[bytes]) -> RespValue:
+        name = args[0].decode().upper()
+        self.commands[name] = self.commands.get(name, 0) + 1
+        if name == "PING":
+            return "PONG"
+        if name == "AUTH":
+            return "OK" if self.password is None or args[-1].decode() == self.password else ValueError("WRONGPASS")
+        if name in ("SELECT", "CLIENT", "FLUSHDB"):
+            if name == "FLUSHDB":
+                self.data.clear()
+            return "OK"
+        if name == "GET":
+            return self._get(args[1])
+        if name == "MGET":
+            return [self._get(key) for key in args[1:]]
+        if name == "SET":
+            expire_at = None
+            options = [arg.decode().upper() for arg in args[3:]]
+            if "EX" in options:
+                expire_at = time.monotonic() + int(options[options.index("EX") + 1])
+            if "PX" in options:
+                expire_at = time.monotonic() + int(options[options.index("PX") + 1]) / 1000
+            self.data[args[1]] = (args[2], expire_at)
+            return "OK"
+        if name == "DEL":
+            return sum(1 for key in args[1:] if self.data.pop(key, None) is not None)
+        if name == "TTL":
+            if self._get(args[1]) is None:
+                return -2
+            expire_at = self.data[args[1]][1]
+            return -1 if expire_at is None else int(expire_at - time.monotonic() + 0.5)
+        if name in ("SCAN", "KEYS"):
+            pattern, count, cursor = "*", 10, 0
+            if name == "KEYS":
+                pattern, count = args[1].decode(), len(self.data)
+            else:
+                cursor = int(args[1])
+                options = [arg.decode() for arg in args[2:]]
+                if "MATCH" in options or "match" in options:
+                    pattern = options[[option.upper() for option in options].index("MATCH") + 1]
+                if "COUNT" in [option.upper() for option in options]:
+                    count = int(options[[option.upper() for option in options].index("COUNT") + 1])
+            keys = sorted(key for key in list(self.data) if self._get(key) is not None)
+            page = keys[cursor:cursor + count]
+            matched = [key for key in page if fnmatch.fnmatchcase(key.decode(), pattern)]
+            if name == "KEYS":
+                return matched
+            next_cursor = cursor + count if cursor + count < len(keys) else 0
+            return [str(next_cursor).encode(), matched]
+        return ValueError(f"ERR unknown command '{name}'")
+
+    @classmethod
+    def _encode(cls, value: RespValue) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, Exception):
+            return f"-{value}\r\n".encode()
+        if isinstance(value, int):
+            return f":{value}\r\n".encode()
+        if isinstance(value, str):
+            return f"+{value}\r\n".encode()
+        if isinstance(value, bytes):
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        return b"*%d\r\n" % len(value) + b"".join(cls._encode(item) for item in value)
+
+    async def _handle_conn(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                writer.write(self._encode(self._execute(args)))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
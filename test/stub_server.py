@@ -0,0 +1,108 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 本地 HTTP 桩服务，供单元测试和基准测试使用（支持 keep-alive）
+
+import asyncio
+import json
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Union
+
+# handler(method, path, headers, body) -> (status, headers, body)
+StubResponse = Tuple[int, Dict[str, str], Union[bytes, str, Dict]]
+StubHandler = Callable[[str, str, Dict[str, str], bytes], Awaitable[StubResponse]]
+
+
+async def default_handler(method: str, path: str, headers: Dict[str, str], body: bytes) -> StubResponse:
+    return 200, {}, {"ok": 1, "success": True, "code": 0, "data": {"path": path}}
+
+
+class StubHttpServer:
+    """
+    基于 asyncio.start_server 的极简 HTTP/1.1 服务
+    - 支持 keep-alive，可以用来观察连接复用
+    - 统计建立过的 TCP 连接数、处理的请求数、同时在途的最大请求数
+    """
+
+    def __init__(self, handler: Optional[StubHandler] = None, host: str = "127.0.0.1", port: int = 0):
+        self.handler = handler or default_handler
+        self.host = host
+        self.port = port
+        self.connections = 0
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> "StubHttpServer":
+        self._server = await asyncio.start_server(self._handle_conn, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "StubHttpServer":
+        return await self.start()
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    async def _handle_conn(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, value = line.decode("latin-1").split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+                body = b""
+                if int(headers.get("content-length", 0)):
+                    body = await reader.readexactly(int(headers["content-length"]))
+
+                self.requests += 1
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                try:
+                    status, resp_headers, resp_body = await self.handler(method, path, headers, body)
+                finally:
+                    self.in_flight -= 1
+
+                if isinstance(resp_body, dict):
+                    resp_body = json.dumps(resp_body).encode()
+                    resp_headers.setdefault("Content-Type", "application/json")
+                elif isinstance(resp_body, str):
+                    resp_body = resp_body.encode()
+                resp_headers["Content-Length"] = str(len(resp_body))
+                head = f"HTTP/1.1 {status} {'OK' if status == 200 else 'ERR'}\r\n"
+                head += "".join(f"{k}: {v}\r\n" for k, v in resp_headers.items())
+                writer.write(head.encode("latin-1") + b"\r\n" + (resp_body if method != "HEAD" else b""))
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,157 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : analysis_info 生成列测试：SQLite 打开时添加生成列和联合索引，看板的情感统计、情感筛选、噪音过滤使用生成列
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from analysis_job.database_orm import DatabaseManager
+from async_sqlite_db import AsyncSqliteDB
+from web.database.queries import DataQueryService, SearchFilters
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+SENTIMENTS = ["positive", "negative", "neutral"]
+
+
+def analysis(i: int) -> str:
+    return json.dumps({"sentiment": SENTIMENTS[i % 3], "sentiment_score": (i % 10) / 10, "relevance_score": (i % 5) / 5})
+
+
+async def create_database(path: str):
+    db = AsyncSqliteDB(path, text_index=False)
+    await db.open()
+    try:
+        await db.batch_upsert("xhs_note", [
+            {"note_id": f"x{i}", "type": "normal", "title": f"笔记 {i}", "desc": "", "user_id": "u", "nickname": "n",
+             "time": int((NOW - timedelta(hours=i)).timestamp() * 1000), "last_update_time": 0,
+             "liked_count": "0", "collected_count": "0", "comment_count": "0", "share_count": "0", "note_url": "",
+             "add_ts": 0, "last_modify_ts": 0} for i in range(40)
+        ])
+        await db.batch_upsert("douyin_aweme", [
+            {"aweme_id": f"d{i}", "aweme_type": "0", "title": f"视频 {i}", "desc": "", "user_id": "u", "nickname": "n",
+             "create_time": int((NOW - timedelta(hours=i)).timestamp()), "liked_count": "0", "comment_count": "0",
+             "share_count": "0", "collected_count": "0", "aweme_url": "", "add_ts": 0, "last_modify_ts": 0}
+            for i in range(40)
+        ])
+        # 分析任务只写 analysis_info；最后几条未分析，x30 的分析结果格式错误
+        for i in range(30):
+            await db.update_table("xhs_note", {"analysis_info": analysis(i)}, "note_id", f"x{i}")
+            await db.update_table("douyin_aweme", {"analysis_info": analysis(i)}, "aweme_id", f"d{i}")
+        await db.update_table("xhs_note", {"analysis_info": "{broken"}, "note_id", "x30")
+    finally:
+        await db.close()
+
+
+class TestAnalysisColumns(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.db_path = os.path.join(cls.tmp_dir.name, "media_crawler.db")
+        asyncio.run(create_database(cls.db_path))
+        # 再次打开不会重复添加
+        asyncio.run(create_database(cls.db_path))
+        cls.engine = create_engine(f"sqlite:///{cls.db_path}")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.engine.dispose()
+        cls.tmp_dir.cleanup()
+
+    def service(self, use_columns: bool = True) -> DataQueryService:
+        service = DataQueryService()
+        service.session = Session(self.engine)
+        self.addCleanup(service.session.close)
+        if not use_columns:
+            service._analysis_columns_ready.update({"xhs_note": False, "douyin_aweme": False})
+        return service
+
+    def filters(self, **kwargs) -> SearchFilters:
+        return SearchFilters(platforms=["xhs", "douyin"], start_time=NOW - timedelta(hours=20), end_time=NOW,
+                             page_size=100, **kwargs)
+
+    def test_generated_columns(self):
+        with self.engine.connect() as conn:
+            rows = dict(conn.exec_driver_sql("SELECT note_id, sentiment FROM xhs_note").fetchall())
+            scores = conn.exec_driver_sql("SELECT relevance_score FROM xhs_note WHERE note_id = 'x4'").scalar()
+        self.assertEqual(rows["x1"], "negative")
+        self.assertIsNone(rows["x30"])
+        self.assertIsNone(rows["x35"])
+        self.assertAlmostEqual(scores, 0.8)
+
+    def test_sentiment_distribution_scans_index(self):
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if "GROUP BY" in statement:
+                statements.append((statement, parameters))
+
+        event.listen(self.engine, "before_cursor_execute", capture)
+        self.addCleanup(event.remove, self.engine, "before_cursor_execute", capture)
+        stats = self.service().get_sentiment_distribution(self.filters())
+        # 两个平台最近 20 小时各 21 条，都已分析；抖音的秒级时间戳不再按毫秒筛选
+        self.assertEqual(stats, {"positive": 14, "negative": 14, "neutral": 14, "unknown": 0})
+        self.assertEqual(stats, self.service(use_columns=False).get_sentiment_distribution(self.filters()))
+
+        with self.engine.connect() as conn:
+            for statement, parameters in statements[:2]:
+                plan = " ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+                self.assertIn("USING COVERING INDEX idx_", plan)
+                self.assertIn("_time_sentiment", plan)
+
+    def test_filters_match_json_path(self):
+        for kwargs in ({"sentiment": "negative"}, {"noise_filter": "filter_noise"}, {"noise_filter": "only_noise"}):
+            items, total = self.service().search_content(self.filters(**kwargs))
+            expected, expected_total = self.service(use_columns=False).search_content(self.filters(**kwargs))
+            self.assertEqual([item.content_id for item in items], [item.content_id for item in expected], kwargs)
+            self.assertEqual(total, expected_total)
+            self.assertGreater(total, 0)
+
+    def test_old_database_is_backfilled(self):
+        old_path = os.path.join(self.tmp_dir.name, "old.db")
+        conn = sqlite3.connect(old_path)
+        conn.execute("CREATE TABLE douyin_aweme (id INTEGER PRIMARY KEY AUTOINCREMENT, aweme_id TEXT NOT NULL, "
+                     "create_time INTEGER, analysis_info TEXT, add_ts INTEGER, last_modify_ts INTEGER)")
+        conn.executemany("INSERT INTO douyin_aweme (aweme_id, create_time, analysis_info) VALUES (?, 0, ?)",
+                         [("d1", analysis(1)), ("d2", None)])
+        conn.commit()
+        conn.close()
+
+        async def open_and_close():
+            db = AsyncSqliteDB(old_path, text_index=False)
+            await db.open()
+            await db.close()
+
+        asyncio.run(open_and_close())
+        conn = sqlite3.connect(old_path)
+        self.assertEqual(conn.execute("SELECT aweme_id, sentiment, relevance_score FROM douyin_aweme").fetchall(),
+                         [("d1", "negative", 0.2), ("d2", None, None)])
+        conn.close()
+
+    def test_analysis_job_stats(self):
+        stats = DatabaseManager({"sqlite_path": self.db_path}).get_analysis_stats("xhs")
+        self.assertEqual(stats["total"], 40)
+        self.assertEqual(stats["unanalyzed"], 9)
+        self.assertEqual(stats["positive"] + stats["negative"] + stats["neutral"], 30)
+        self.assertAlmostEqual(stats["positive_avg_score"], sum((i % 10) / 10 for i in range(0, 30, 3)) / 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 异步 Redis 缓存测试，使用 test/fake_redis_server.py 中的本地桩服务
+import asyncio
+import pickle
+import unittest
+from unittest import IsolatedAsyncioTestCase
+
+from cache.async_redis_cache import AsyncRedisCache
+from cache.cache_factory import CacheFactory
+from cache.serializer import CacheSerializer
+from test.fake_redis_server import FakeRedisServer
+
+
+class TestCacheSerializer(unittest.TestCase):
+
+    def test_round_trip(self):
+        serializer = CacheSerializer()
+        for value in ("程序员阿江", b"\x00\x01", 1, 1.5, True, [1, "a"], {"a": {"b": None}}):
+            self.assertEqual(serializer.loads(serializer.dumps(value)), value)
+        self.assertEqual(serializer.dumps("abc"), b"sabc")
+
+    def test_pickle_is_opt_in(self):
+        with self.assertRaises(TypeError):
+            CacheSerializer().dumps({1, 2})
+        # RedisCache 写入的纯 pickle 值
+        legacy = pickle.dumps({"a": 1})
+        with self.assertRaises(ValueError):
+            CacheSerializer().loads(legacy)
+        serializer = CacheSerializer(allow_pickle=True)
+        self.assertEqual(serializer.loads(legacy), {"a": 1})
+        self.assertEqual(serializer.loads(serializer.dumps({1, 2})), {1, 2})
+
+
+class TestAsyncRedisCache(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = await FakeRedisServer(password="secret").start()
+        self.cache = CacheFactory.create_cache("redis_async", host="127.0.0.1", port=self.server.port,
+                                               db=1, password="secret", max_connections=4)
+
+    async def asyncTearDown(self):
+        await self.cache.close()
+        await self.server.stop()
+
+    async def test_set_get_and_expire(self):
+        self.assertIsInstance(self.cache, AsyncRedisCache)
+        await self.cache.set("key", {"name": "value"}, 1)
+        self.assertEqual(await self.cache.get("key"), {"name": "value"})
+        self.assertEqual(self.server.data[b"key"][0], b'j{"name":"value"}')
+        await asyncio.sleep(1.1)
+        self.assertIsNone(await self.cache.get("key"))
+
+    async def test_mset_mget_single_round_trip(self):
+        await self.cache.get("warm-up")
+        mapping = {f"note_{i}": {"id": i} for i in range(200)}
+        round_trips = self.server.round_trips
+        await self.cache.mset(mapping, 60)
+        self.assertEqual(self.server.round_trips - round_trips, 1)
+        self.assertEqual(self.server.commands["SET"], 200)
+
+        round_trips = self.server.round_trips
+        result = await self.cache.mget(["note_1", "missing", "note_199"])
+        self.assertEqual(self.server.round_trips - round_trips, 1)
+        self.assertEqual(result, {"note_1": {"id": 1}, "note_199": {"id": 199}})
+
+    async def test_keys_uses_scan(self):
+        await self.cache.mset({f"xhs_{i}": i for i in range(25)}, 60)
+        await self.cache.set("dy_1", 1, 60)
+        keys = await self.cache.keys("xhs_*")
+        self.assertEqual(sorted(keys), sorted(f"xhs_{i}" for i in range(25)))
+        self.assertGreater(self.server.commands["SCAN"], 0)
+        self.assertNotIn("KEYS", self.server.commands)
+
+    async def test_connection_pool_reused(self):
+        await asyncio.gather(*[self.cache.set(f"k{i}", i, 60) for i in range(20)])
+        await asyncio.gather(*[self.cache.get(f"k{i}") for i in range(20)])
+        self.assertLessEqual(self.server.connections, 4)
+
+    async def test_undecodable_value_is_miss(self):
+        self.server.data[b"legacy"] = (pickle.dumps([1]), None)
+        self.assertIsNone(await self.cache.get("legacy"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : SQLite 存储测试
+import asyncio
+import os
+import sqlite3
+import tempfile
+from unittest import IsolatedAsyncioTestCase
+
+from async_sqlite_db import AsyncSqliteDB, to_sqlite_sql
+from store.xhs.xhs_store_impl import XhsDbStoreImplement
+from var import media_crawler_db_var
+
+
+def make_comment(i: int, content: str = "c"):
+    return {"comment_id": str(i), "note_id": "n", "user_id": "u", "content": content, "create_time": 0,
+            "sub_comment_count": "0", "last_modify_ts": 0}
+
+
+class TestAsyncSqliteDB(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "media_crawler.db")
+        self.db = AsyncSqliteDB(self.db_path)
+        await self.db.open()
+        media_crawler_db_var.set(self.db)
+
+    async def asyncTearDown(self):
+        await self.db.close()
+        self.tmp_dir.cleanup()
+
+    def test_to_sqlite_sql(self):
+        self.assertEqual(
+            to_sqlite_sql("INSERT INTO t (`a`,`b`) VALUES (%s,%s) ON DUPLICATE KEY UPDATE `b`=VALUES(`b`), c = VALUES(c)"),
+            "INSERT INTO t (`a`,`b`) VALUES (?,?) ON CONFLICT DO UPDATE SET `b`=excluded.`b`, c = excluded.c"
+        )
+        self.assertEqual(to_sqlite_sql("SELECT * FROM t WHERE a LIKE '%%x'"), "SELECT * FROM t WHERE a LIKE '%x'")
+
+    async def test_wal_and_schema(self):
+        rows = await self.db.query("PRAGMA journal_mode")
+        self.assertEqual(rows[0]["journal_mode"], "wal")
+        tables = await self.db.query("SELECT name FROM sqlite_master WHERE type = %s", "table")
+        self.assertTrue({"xhs_note", "xhs_note_comment", "crawl_task", "weixin_article"} <= {t["name"] for t in tables})
+
+    async def test_old_database_gets_added_columns(self):
+        old_path = os.path.join(self.tmp_dir.name, "old.db")
+        conn = sqlite3.connect(old_path)
+        conn.execute("CREATE TABLE tieba_note (id INTEGER PRIMARY KEY AUTOINCREMENT, note_id TEXT NOT NULL, "
+                     "publish_time TEXT NOT NULL, add_ts INTEGER, last_modify_ts INTEGER)")
+        conn.commit()
+        conn.close()
+
+        db = AsyncSqliteDB(old_path)
+        await db.open()
+        try:
+            await db.item_to_table("tieba_note", {"note_id": "1", "publish_time": "3天前", "publish_ts": 1700000000,
+                                                  "add_ts": 0, "last_modify_ts": 0})
+            rows = await db.query("SELECT publish_ts FROM tieba_note")
+            self.assertEqual(rows[0]["publish_ts"], 1700000000)
+            indexes = await db.query("PRAGMA index_list(tieba_note)")
+            self.assertIn("idx_tieba_note_publish_ts", {index["name"] for index in indexes})
+        finally:
+            await db.close()
+
+    async def test_db_store_upsert_on_natural_key(self):
+        store = XhsDbStoreImplement()
+        await store.store_comments([make_comment(i) for i in range(3)])
+        first = await self.db.get_first("SELECT add_ts FROM xhs_note_comment WHERE comment_id = %s", "1")
+        await store.store_comments([make_comment(i, "updated") for i in range(1, 5)])
+
+        rows = await self.db.query("SELECT comment_id, content, add_ts FROM xhs_note_comment ORDER BY comment_id")
+        self.assertEqual([r["comment_id"] for r in rows], ["0", "1", "2", "3", "4"])
+        self.assertEqual([r["content"] for r in rows], ["c", "updated", "updated", "updated", "updated"])
+        self.assertEqual(rows[1]["add_ts"], first["add_ts"])
+
+    async def test_concurrent_writes_share_transactions(self):
+        sql = ("INSERT INTO keyword_progress (task_id, keyword, platform, current_page, start_time, last_update_time) "
+               "VALUES (%s, %s, %s, %s, %s, %s) ON DUPLICATE KEY UPDATE current_page = VALUES(current_page)")
+        transactions = self.db.transactions
+        await asyncio.gather(*[self.db.execute(sql, "t", f"k{i % 10}", "xhs", i, 0, 0) for i in range(100)])
+
+        self.assertLess(self.db.transactions - transactions, 10)
+        rows = await self.db.query("SELECT keyword, current_page FROM keyword_progress ORDER BY keyword")
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[0], {"keyword": "k0", "current_page": 90})
+
+    async def test_failed_write_does_not_roll_back_others(self):
+        item = {"user_id": "u", "nickname": "n", "add_ts": 0, "last_modify_ts": 0}
+        results = await asyncio.gather(
+            self.db.item_to_table("xhs_creator", item),
+            self.db.item_to_table("xhs_creator", {"no_such_column": 1}),
+            self.db.update_table("xhs_creator", {"nickname": "changed"}, "user_id", "u"),
+            return_exceptions=True,
+        )
+        self.assertIsInstance(results[1], sqlite3.OperationalError)
+        self.assertEqual(results[2], 1)
+        self.assertEqual(await self.db.query("SELECT nickname FROM xhs_creator"), [{"nickname": "changed"}])
+
+    async def test_close_commits_queued_writes(self):
+        tasks = [asyncio.ensure_future(self.db.item_to_table("crawl_task", {
+            "task_id": str(i), "platform": "xhs", "crawler_type": "search", "keywords": "k", "start_time": 0,
+            "last_update_time": 0}))
+            for i in range(50)]
+        await asyncio.sleep(0)
+        await self.db.close()
+        await asyncio.gather(*tasks)
+
+        with sqlite3.connect(self.db_path) as conn:
+            self.assertEqual(conn.execute("SELECT count(*) FROM crawl_task").fetchone()[0], 50)
+        with self.assertRaises(RuntimeError):
+            await self.db.execute("DELETE FROM crawl_task")
@@ -0,0 +1,158 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 批量 upsert 存储路径测试，用记录 SQL 的假连接池代替 MySQL
+from typing import List, Tuple
+from unittest import IsolatedAsyncioTestCase, mock
+
+import store.xhs
+from async_db import AsyncMysqlDB, build_upsert_sql
+from store.xhs.xhs_store_impl import XhsDbStoreImplement
+from var import media_crawler_db_var
+
+
+class FakeCursor:
+    def __init__(self, pool: "FakePool"):
+        self.pool = pool
+        self.calls = pool.calls
+        self.sql = ""
+        self.args = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def executemany(self, sql, args_list):
+        self.calls.append((sql, list(args_list)))
+        return len(args_list)
+
+    async def execute(self, sql, args=None):
+        self.sql, self.args = sql, list(args or ())
+        if sql.startswith(("ALTER TABLE", "INSERT", "UPDATE")):
+            self.calls.append((sql, self.args))
+            return 1
+        return 0
+
+    async def fetchall(self):
+        if "information_schema.STATISTICS" in self.sql:
+            # 老库：xhs_note 上只有普通索引，xhs_note_comment 已经改成唯一索引
+            return [{"TABLE_NAME": "xhs_note", "COLUMN_NAME": "id", "NON_UNIQUE": 0},
+                    {"TABLE_NAME": "xhs_note", "COLUMN_NAME": "note_id", "NON_UNIQUE": 1},
+                    {"TABLE_NAME": "xhs_note_comment", "COLUMN_NAME": "comment_id", "NON_UNIQUE": 0}]
+        # 老库：两张表都存在，只有 zhihu_content 已经有 publish_ts
+        return [{"TABLE_NAME": "tieba_note", "COLUMN_NAME": "note_id"},
+                {"TABLE_NAME": "zhihu_content", "COLUMN_NAME": "publish_ts"}]
+
+    async def fetchone(self):
+        # 逐条写入时查询记录是否存在
+        return {"id": 1} if self.args and self.args[0] in self.pool.existing_keys else None
+
+
+class FakePool:
+    def __init__(self):
+        self.calls: List[Tuple[str, list]] = []
+        # 逐条写入时库中已有的记录
+        self.existing_keys = set()
+
+    def acquire(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def cursor(self, *args):
+        return FakeCursor(self)
+
+
+class TestBatchUpsert(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.pool = FakePool()
+        self.db = AsyncMysqlDB(self.pool)
+
+    def test_build_upsert_sql_keeps_insert_only_fields(self):
+        sql = build_upsert_sql("xhs_note", ["note_id", "title", "add_ts"], insert_only_fields=("add_ts",))
+        self.assertEqual(
+            sql,
+            "INSERT INTO xhs_note (`note_id`,`title`,`add_ts`) VALUES (%s,%s,%s) "
+            "ON DUPLICATE KEY UPDATE `note_id`=VALUES(`note_id`),`title`=VALUES(`title`)"
+        )
+
+    async def test_chunks_and_groups_by_fields(self):
+        items = [{"comment_id": str(i), "content": "c"} for i in range(5)]
+        items.append({"comment_id": "x", "content": "c", "pictures": ""})
+        rows = await self.db.batch_upsert("xhs_note_comment", items, chunk_size=2)
+
+        self.assertEqual(rows, 6)
+        self.assertEqual([len(args) for _, args in self.pool.calls], [2, 2, 1, 1])
+        self.assertNotIn("pictures", self.pool.calls[0][0])
+        self.assertIn("`pictures`", self.pool.calls[-1][0])
+
+    async def test_empty_items_skip_database(self):
+        self.assertEqual(await self.db.batch_upsert("xhs_note_comment", []), 0)
+        self.assertEqual(self.pool.calls, [])
+
+    async def test_db_store_comments_single_statement(self):
+        media_crawler_db_var.set(self.db)
+        comments = [{"comment_id": str(i), "content": "c"} for i in range(3)]
+        await XhsDbStoreImplement().store_comments(comments)
+
+        self.assertEqual(len(self.pool.calls), 1)
+        sql, args = self.pool.calls[0]
+        self.assertTrue(sql.startswith("INSERT INTO xhs_note_comment"))
+        self.assertNotIn("`add_ts`=VALUES", sql)
+        self.assertTrue(all(len(row) == 3 for row in args))
+
+    async def test_comment_callback_uses_batch_store(self):
+        media_crawler_db_var.set(self.db)
+        comments = [
+            {"id": str(i), "content": "c", "user_info": {"user_id": "u"}, "create_time": 0}
+            for i in range(20)
+        ]
+        with mock.patch("config.SAVE_DATA_OPTION", "db"), mock.patch("config.ENABLE_WRITE_BEHIND_STORE", False):
+            await store.xhs.batch_update_xhs_note_comments("note", comments)
+
+        self.assertEqual(len(self.pool.calls), 1)
+        self.assertEqual(len(self.pool.calls[0][1]), 20)
+
+    async def test_add_missing_columns_to_old_database(self):
+        await self.db.add_missing_columns()
+
+        alters = [sql for sql, _ in self.pool.calls if sql.startswith("ALTER TABLE")]
+        self.assertEqual(len(alters), 1)
+        self.assertIn("`tieba_note` ADD COLUMN `publish_ts` bigint", alters[0])
+        self.assertIn("ADD KEY `idx_tieba_note_publish_ts`", alters[0])
+
+    async def test_missing_unique_key_falls_back_to_row_by_row(self):
+        with mock.patch("tools.utils.logger.error") as error:
+            await self.db.check_unique_keys()
+        self.assertEqual(self.db.missing_unique_keys, {"xhs_note": "note_id"})
+        self.assertIn("batch_upsert_unique_keys.sql", error.call_args[0][0])
+
+        self.pool.existing_keys = {"1"}
+        items = [{"note_id": "1", "title": "a", "add_ts": 1}, {"note_id": "2", "title": "b", "add_ts": 1}]
+        rows = await self.db.batch_upsert("xhs_note", items, key_field="note_id")
+
+        self.assertEqual(rows, 2)
+        self.assertEqual(self.pool.calls, [
+            ("UPDATE xhs_note SET `title`=%s WHERE `note_id` = %s", ["a", "1"]),
+            ("INSERT INTO xhs_note (`note_id`,`title`,`add_ts`) VALUES (%s,%s,%s)", ["2", "b", 1]),
+        ])
+        # 有唯一索引的表照常批量写入
+        self.pool.calls.clear()
+        await self.db.batch_upsert("xhs_note_comment", [{"comment_id": "1", "content": "c"}])
+        self.assertIn("ON DUPLICATE KEY UPDATE", self.pool.calls[0][0])
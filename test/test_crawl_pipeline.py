@@ -0,0 +1,154 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 分阶段抓取流水线测试
+import asyncio
+import random
+import time
+from typing import Dict, List
+from unittest import IsolatedAsyncioTestCase, mock
+
+from base.base_crawler import AbstractCrawler
+from tools.crawl_pipeline import CrawlPipeline, PipelineStage
+
+STAGE_DELAY = 0.02
+
+
+def sleep_stage(delay: float = STAGE_DELAY):
+    async def handler(item):
+        await asyncio.sleep(delay)
+        return item
+    return handler
+
+
+class FakeCrawler(AbstractCrawler):
+    """只实现通用搜索流程需要的方法，页面内容和存储都在内存里"""
+
+    def __init__(self, pages: int, page_size: int):
+        super().__init__()
+        self.pages = pages
+        self.page_size = page_size
+        self.stored: List[str] = []
+        self.commented: List[str] = []
+        self.committed_pages: List[int] = []
+
+    async def start(self):
+        pass
+
+    async def launch_browser(self, chromium, playwright_proxy, user_agent, headless=True):
+        pass
+
+    def extract_item_id(self, content_item: Dict):
+        return content_item["id"]
+
+    def extract_item_timestamp(self, content_item: Dict):
+        return 0
+
+    async def get_page_content(self, keyword: str, page: int) -> List[Dict]:
+        await asyncio.sleep(STAGE_DELAY)
+        if page > self.pages:
+            return []
+        return [{"id": f"{page}-{i}"} for i in range(self.page_size)]
+
+    async def should_skip_content(self, content_item: Dict, keyword: str) -> bool:
+        return content_item["id"].endswith("-0")
+
+    async def fetch_content_detail(self, content_item: Dict):
+        await asyncio.sleep(random.uniform(0, STAGE_DELAY))
+        return content_item
+
+    async def store_content(self, content_item: Dict) -> None:
+        self.stored.append(content_item["id"])
+
+    async def batch_get_comments(self, content_list: List[Dict]) -> None:
+        await asyncio.sleep(STAGE_DELAY)
+        self.commented.extend(item["id"] for item in content_list)
+
+    async def update_crawl_progress(self, keyword, page, items_count, last_item=None):
+        self.committed_pages.append(page)
+
+    def get_platform_config(self) -> Dict:
+        return {'page_limit': self.page_size, 'enable_comments': True}
+
+
+class TestCrawlPipeline(IsolatedAsyncioTestCase):
+
+    async def test_stages_overlap(self):
+        items = 20
+        pipeline = CrawlPipeline([
+            PipelineStage("a", sleep_stage(), workers=2),
+            PipelineStage("b", sleep_stage(), workers=2),
+            PipelineStage("c", sleep_stage(), workers=2),
+        ])
+        start = time.perf_counter()
+        async with pipeline:
+            for i in range(items):
+                await pipeline.put(i)
+        elapsed = time.perf_counter() - start
+
+        metrics = pipeline.metrics()
+        self.assertEqual([metrics[name]["processed"] for name in "abc"], [items] * 3)
+        # 串行需要 3 * items * STAGE_DELAY
+        self.assertLess(elapsed, 3 * items * STAGE_DELAY / 2)
+
+    async def test_back_pressure_bounds_queues(self):
+        pipeline = CrawlPipeline([
+            PipelineStage("fast", sleep_stage(0), workers=1, queue_size=2),
+            PipelineStage("slow", sleep_stage(STAGE_DELAY), workers=1, queue_size=3),
+        ])
+        async with pipeline:
+            for i in range(15):
+                await pipeline.put(i)
+                self.assertLessEqual(pipeline.stages[0].queue.qsize(), 2)
+                self.assertLessEqual(pipeline.stages[1].queue.qsize(), 3)
+        metrics = pipeline.metrics()
+        self.assertLessEqual(metrics["fast"]["max_queue_depth"], 2)
+        self.assertLessEqual(metrics["slow"]["max_queue_depth"], 3)
+        self.assertEqual(metrics["slow"]["processed"], 15)
+
+    async def test_drop_and_error_reach_on_finished(self):
+        finished = {}
+
+        async def handler(item):
+            if item == 1:
+                return None
+            if item == 2:
+                raise ValueError("bad item")
+            return item
+
+        async def on_finished(meta, error):
+            finished[meta] = error
+
+        async with CrawlPipeline([PipelineStage("only", handler)], on_finished=on_finished) as pipeline:
+            for i in range(3):
+                await pipeline.put(i, meta=i)
+
+        self.assertIsNone(finished[0])
+        self.assertIsNone(finished[1])
+        self.assertIsInstance(finished[2], ValueError)
+        self.assertEqual(pipeline.metrics()["only"]["dropped"], 1)
+        self.assertEqual(pipeline.metrics()["only"]["failed"], 1)
+
+    async def test_search_with_resume_pipeline(self):
+        crawler = FakeCrawler(pages=4, page_size=5)
+        with mock.patch("config.KEYWORDS", "test"), \
+                mock.patch("config.CRAWLER_MAX_NOTES_COUNT", 100), \
+                mock.patch("config.PAGE_LIMIT", 5), \
+                mock.patch("config.ENABLE_CRAWL_PIPELINE", True), \
+                mock.patch("config.EMPTY_PAGE_THRESHOLD", 1):
+            await crawler.search_with_resume()
+
+        expected = [f"{page}-{i}" for page in range(1, 5) for i in range(1, 5)]
+        self.assertEqual(sorted(crawler.stored), expected)
+        self.assertEqual(sorted(crawler.commented), expected)
+        # 页级进度按页码顺序提交
+        self.assertEqual(crawler.committed_pages, [1, 2, 3, 4])
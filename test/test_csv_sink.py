@@ -0,0 +1,103 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : CSV 写入测试
+import asyncio
+import csv
+import os
+import tempfile
+from typing import List
+from unittest import IsolatedAsyncioTestCase
+
+from store.csv_sink import CsvFileSink, close_csv_sinks, get_csv_sink
+from store.xhs.xhs_store_impl import XhsCsvStoreImplement
+from var import crawler_type_var
+
+
+def read_rows(path: str) -> List[List[str]]:
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return list(csv.reader(f))
+
+
+class TestCsvSink(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "comments.csv")
+        crawler_type_var.set("search")
+
+    def tearDown(self):
+        close_csv_sinks()
+        self.tmp_dir.cleanup()
+
+    async def test_store_writes_header_once(self):
+        class TmpCsvStore(XhsCsvStoreImplement):
+            csv_store_path = self.tmp_dir.name
+
+        store = TmpCsvStore()
+        for i in range(3):
+            await store.store_comment({"comment_id": str(i), "content": "a,b\n\"c\""})
+        path = store.make_save_file_name("comments")
+        self.assertIs(get_csv_sink(path), get_csv_sink(path))
+        close_csv_sinks()
+
+        self.assertEqual(read_rows(path), [
+            ["comment_id", "content"],
+            ["0", "a,b\n\"c\""],
+            ["1", "a,b\n\"c\""],
+            ["2", "a,b\n\"c\""],
+        ])
+
+    def test_schema_drift_extends_header(self):
+        sink = CsvFileSink(self.path, flush_interval=0)
+        sink.write([{"id": "1", "content": "a"}])
+        sink.write([{"content": "b", "id": "2", "pictures": "p"}, {"id": "3"}])
+        sink.close()
+
+        self.assertEqual(read_rows(self.path), [
+            ["id", "content", "pictures"],
+            ["1", "a", ""],
+            ["2", "b", "p"],
+            ["3", "", ""],
+        ])
+
+    def test_reopen_keeps_existing_header(self):
+        sink = CsvFileSink(self.path)
+        sink.write([{"id": "1", "content": "a"}])
+        sink.close()
+
+        sink = CsvFileSink(self.path)
+        self.assertEqual(sink.fieldnames, ["id", "content"])
+        sink.write([{"content": "b", "id": "2"}])
+        sink.close()
+
+        self.assertEqual(read_rows(self.path), [["id", "content"], ["1", "a"], ["2", "b"]])
+
+    async def test_flush_on_interval_without_new_writes(self):
+        sink = get_csv_sink(self.path)
+        sink.flush_interval = 0.05
+        sink.write([{"id": "1"}])
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+        # 抓取停顿、没有新的写入时，后台任务同样按间隔写入文件
+        await asyncio.sleep(0.3)
+        self.assertEqual(read_rows(self.path), [["id"], ["1"]])
+
+    def test_buffered_until_interval_or_close(self):
+        sink = get_csv_sink(self.path)
+        sink.flush_interval = 3600
+        sink.write([{"id": "1"}])
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+        close_csv_sinks()
+        self.assertEqual(read_rows(self.path), [["id"], ["1"]])
+        self.assertIsNot(get_csv_sink(self.path), sink)
@@ -0,0 +1,163 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : web 看板跨平台搜索测试：SQL 分页 + 多路归并的结果与全部读入内存后排序分页一致，且只读取需要的记录
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from web.database.connection import Base
+from web.database.models import DouyinAweme, NewsArticle, TiebaNote, XhsNote
+from web.database.queries import ContentItem, DataQueryService, SearchFilters
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+
+
+def make_rows(session: Session):
+    for i in range(60):
+        publish_time = NOW - timedelta(minutes=7 * i)
+        relevance = {"relevance_score": 0.9 if i % 3 else 0.2}
+        common = dict(add_ts=0, last_modify_ts=0, liked_count=str(i * 3 % 50), comment_count=str(i % 7),
+                      analysis_info=relevance)
+        session.add(XhsNote(note_id=f"x{i}", type="normal", title=f"小红书 {i}", desc="", time=int(publish_time.timestamp() * 1000),
+                            last_update_time=0, user_id="u", nickname="n", collected_count="1", share_count="0",
+                            note_url="", **common))
+        session.add(DouyinAweme(aweme_id=f"d{i}", aweme_type="0", title=f"抖音 {i}", desc="",
+                                create_time=int((publish_time - timedelta(minutes=3)).timestamp()), share_count="2", **common))
+        session.add(TiebaNote(note_id=f"t{i}", title=f"贴吧 {i}", desc="", note_url="", user_link="", user_nickname="",
+                              tieba_name="", tieba_link="", total_replay_num=i % 11, add_ts=0, last_modify_ts=0,
+                              publish_time=(publish_time - timedelta(minutes=5)).strftime('%Y-%m-%d %H:%M'),
+                              analysis_info=relevance))
+    # 同一条笔记被重复入库
+    session.add(XhsNote(note_id="x1", type="normal", title="小红书 1", desc="", time=int((NOW - timedelta(minutes=7)).timestamp() * 1000),
+                        last_update_time=0, user_id="u", nickname="n", liked_count="3", collected_count="1", comment_count="1",
+                        share_count="0", note_url="", add_ts=0, last_modify_ts=0))
+    session.commit()
+
+
+class TestDashboardSearch(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine("sqlite://")
+        Base.metadata.create_all(cls.engine, tables=[XhsNote.__table__, DouyinAweme.__table__, TiebaNote.__table__])
+        with Session(cls.engine) as session:
+            make_rows(session)
+
+    def setUp(self):
+        self.service = DataQueryService()
+        self.service.session = Session(self.engine)
+        self.loaded = 0
+
+        def count_load(target, context):
+            self.loaded += 1
+
+        for model in (XhsNote, DouyinAweme, TiebaNote):
+            event.listen(model, "load", count_load)
+            self.addCleanup(event.remove, model, "load", count_load)
+
+    def tearDown(self):
+        self.service.session.close()
+
+    def filters(self, **kwargs) -> SearchFilters:
+        kwargs.setdefault("platforms", ["xhs", "douyin", "tieba"])
+        return SearchFilters(start_time=NOW - timedelta(hours=5), end_time=NOW, **kwargs)
+
+    def reference(self, filters: SearchFilters):
+        """旧实现：全部读入内存，筛选、去重、排序"""
+        items, seen = [], set()
+        for platform, model in (("xhs", XhsNote), ("douyin", DouyinAweme), ("tieba", TiebaNote)):
+            for instance in self.service.session.query(model).order_by(model.id):
+                item = ContentItem.from_model(instance, platform)
+                if not (filters.start_time <= item.publish_time <= filters.end_time):
+                    continue
+                score = (instance.get_analysis_info() or {}).get("relevance_score")
+                if filters.noise_filter == "filter_noise" and (score is None or score <= 0.6):
+                    continue
+                if f"{platform}_{item.content_id}" not in seen:
+                    seen.add(f"{platform}_{item.content_id}")
+                    items.append(item)
+        key = (lambda x: x.interaction_count) if filters.sort_by == "interaction" else (lambda x: x.publish_time)
+        items.sort(key=lambda x: (key(x), x.platform, x.id), reverse=filters.sort_order == "desc")
+        return [f"{item.platform}_{item.content_id}" for item in items]
+
+    def test_offset_pages_match_in_memory_result(self):
+        for sort_by in ("time", "interaction"):
+            for sort_order in ("desc", "asc"):
+                expected = self.reference(self.filters(sort_by=sort_by, sort_order=sort_order))
+                pages = []
+                for page in range(1, 5):
+                    results, total = self.service.search_content(
+                        self.filters(sort_by=sort_by, sort_order=sort_order, page=page, page_size=12))
+                    self.assertEqual(total, len(expected))
+                    pages += [f"{item.platform}_{item.content_id}" for item in results]
+                self.assertEqual(pages, expected[:len(pages)], f"{sort_by} {sort_order}")
+
+    def test_cursor_pages_match_offset_pages(self):
+        expected = self.reference(self.filters())
+        cursor, walked = None, []
+        while True:
+            page = self.service.search_content_page(self.filters(page_size=10, cursor=cursor))
+            walked += [f"{item.platform}_{item.content_id}" for item in page.items]
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(walked, expected)
+
+    def test_noise_filter_pushed_down(self):
+        expected = self.reference(self.filters(noise_filter="filter_noise"))
+        results, total = self.service.search_content(self.filters(noise_filter="filter_noise", page_size=100))
+        self.assertEqual([f"{item.platform}_{item.content_id}" for item in results], expected)
+        self.assertEqual(total, len(expected))
+
+    def test_first_page_loads_few_rows(self):
+        self.service.search_content(self.filters(page_size=10))
+        # 每个平台最多读取一页（加上归并时预读的一条），而不是全部记录
+        self.assertLessEqual(self.loaded, 3 * 10 + 3)
+
+
+class TestNullSortValues(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine, tables=[NewsArticle.__table__])
+        self.addCleanup(engine.dispose)
+        with Session(engine) as session:
+            for i in range(10):
+                # 部分新闻没有发布时间
+                publish_date = None if i % 3 == 0 else NOW - timedelta(hours=i)
+                session.add(NewsArticle(article_id=f"n{i}", source_url="", title=f"新闻 {i}", summary="",
+                                        publish_date=publish_date, word_count=i * 100, add_ts=0, last_modify_ts=0))
+            session.commit()
+        self.service = DataQueryService()
+        self.service.session = Session(engine)
+        self.addCleanup(self.service.session.close)
+
+    def test_cursor_pages_include_null_sort_values(self):
+        for sort_order in ("desc", "asc"):
+            cursor, walked = None, []
+            while True:
+                filters = SearchFilters(platforms=["news"], sort_order=sort_order, page_size=3, cursor=cursor)
+                # 不按时间筛选，没有发布时间的记录也在结果中
+                filters.start_time = filters.end_time = None
+                page = self.service.search_content_page(filters)
+                walked += [item.content_id for item in page.items]
+                if page.next_cursor is None:
+                    break
+                cursor = page.next_cursor
+            self.assertEqual(sorted(walked), sorted(f"n{i}" for i in range(10)), sort_order)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : DOUYINClient.request 非阻塞并发测试
+import asyncio
+import time
+from unittest import IsolatedAsyncioTestCase, mock
+
+from media_platform.douyin.client import DOUYINClient
+from media_platform.douyin.exception import DataFetchError
+from test.stub_server import StubHttpServer
+
+RESPONSE_DELAY = 0.2
+
+
+async def slow_handler(method, path, headers, body):
+    await asyncio.sleep(RESPONSE_DELAY)
+    if path.startswith("/blocked"):
+        return 200, {}, "blocked"
+    return 200, {}, {"status_code": 0, "path": path}
+
+
+class TestDouyinClient(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = await StubHttpServer(handler=slow_handler).start()
+        # 这里只验证 client 本身不阻塞，不经过全局限速调度器
+        with mock.patch("config.ENABLE_ADAPTIVE_RATE_LIMIT", False):
+            self.client = DOUYINClient(headers={"User-Agent": "test"}, playwright_page=None, cookie_dict={})
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.stop()
+
+    async def test_requests_overlap(self):
+        concurrency = 10
+        start = time.perf_counter()
+        results = await asyncio.gather(*[
+            self.client.request("GET", f"{self.server.base_url}/aweme/{i}") for i in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(results), concurrency)
+        self.assertEqual(self.server.max_in_flight, concurrency)
+        # 串行需要 concurrency * RESPONSE_DELAY，并发时接近一个 RESPONSE_DELAY
+        self.assertLess(elapsed, concurrency * RESPONSE_DELAY / 2)
+
+    async def test_blocked_response(self):
+        with self.assertRaises(DataFetchError):
+            await self.client.request("GET", f"{self.server.base_url}/blocked")
@@ -17,6 +17,7 @@
 
 import time
 import unittest
+from unittest import mock
 
 from cache.local_cache import ExpiringLocalCache
 
@@ -46,5 +47,54 @@ class TestExpiringLocalCache(unittest.TestCase):
         del self.cache
 
 
+class TestExpiringLocalCacheBounded(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("cache.local_cache.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ExpiringLocalCache(cron_interval=10, max_size=3)
+
+    def test_lru_eviction(self):
+        for key in ("a", "b", "c"):
+            self.cache.set(key, key, 10)
+        # 访问 a 后 b 成为最久没有访问的键
+        self.assertEqual(self.cache.get("a"), "a")
+        self.cache.set("d", "d", 10)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(sorted(self.cache.keys("*")), ["a", "c", "d"])
+        self.assertEqual(self.cache.stats["evictions"], 1)
+
+    def test_glob_keys(self):
+        cache = ExpiringLocalCache(max_size=0)
+        cache.set_many({"xhs_1": 1, "xhs_22": 2, "dy_xhs_3": 3}, 10)
+        self.assertEqual(sorted(cache.keys("xhs_*")), ["xhs_1", "xhs_22"])
+        self.assertEqual(cache.keys("xhs_?"), ["xhs_1"])
+        self.assertEqual(cache.keys("[^d]*"), ["xhs_1", "xhs_22"])
+
+    def test_expiry_only_pops_expired(self):
+        self.cache.set("short", 1, 5)
+        self.cache.set("long", 2, 50)
+        # 覆盖后旧的过期时间不再生效
+        self.cache.set("short", 3, 60)
+        self.now += 10
+        self.cache._clear()
+        self.assertEqual(self.cache.get_many(["short", "long", "missing"]), {"short": 3, "long": 2})
+        self.assertEqual(self.cache.stats["expirations"], 0)
+        self.now += 55
+        self.assertEqual(self.cache.keys("*"), [])
+        self.assertEqual(self.cache.stats["expirations"], 2)
+        self.assertEqual(self.cache.stats["hits"], 2)
+        self.assertEqual(self.cache.stats["misses"], 1)
+
+    def test_heap_does_not_grow_with_overwrites(self):
+        cache = ExpiringLocalCache(max_size=0)
+        for i in range(10000):
+            cache.set("same", i, 10)
+        self.assertEqual(len(cache), 1)
+        self.assertLess(len(cache._expire_heap), 2000)
+
+
 if __name__ == '__main__':
     unittest.main()
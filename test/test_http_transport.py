@@ -0,0 +1,94 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : HttpTransport 长连接复用测试
+import asyncio
+from unittest import IsolatedAsyncioTestCase, mock
+
+from test.stub_server import StubHttpServer, default_handler
+from tools.http_transport import HttpTransport, format_httpx_proxy
+
+
+class TestHttpTransport(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = await StubHttpServer().start()
+        self.transport = HttpTransport(timeout=5)
+
+    async def asyncTearDown(self):
+        await self.transport.aclose()
+        await self.server.stop()
+
+    async def test_keep_alive_reuses_connection(self):
+        for _ in range(20):
+            response = await self.transport.request("GET", f"{self.server.base_url}/ping")
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.requests, 20)
+        self.assertEqual(self.server.connections, 1)
+
+    async def test_client_per_proxy(self):
+        direct = self.transport.get_client(None)
+        self.assertIs(direct, self.transport.get_client(None))
+        proxied = self.transport.get_client("http://127.0.0.1:1")
+        self.assertIsNot(direct, proxied)
+        await self.transport.close_proxy("http://127.0.0.1:1")
+        self.assertTrue(proxied.is_closed)
+
+    async def test_aclose(self):
+        client = self.transport.get_client()
+        await self.transport.aclose()
+        self.assertTrue(client.is_closed)
+        # 关闭之后再次请求会重新建立连接池
+        response = await self.transport.request("GET", f"{self.server.base_url}/ping")
+        self.assertEqual(response.status_code, 200)
+
+    async def test_close_proxy_waits_for_in_flight_requests(self):
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_handler(method, path, headers, body):
+            started.set()
+            await release.wait()
+            return await default_handler(method, path, headers, body)
+
+        self.server.handler = slow_handler
+        client = self.transport.get_client()
+        pending = asyncio.create_task(self.transport.request("GET", f"{self.server.base_url}/slow"))
+        await started.wait()
+        # 其他协程的请求因为代理失效关闭连接池，正在进行的请求不受影响
+        await self.transport.close_proxy(None)
+        self.assertFalse(client.is_closed)
+        self.assertIsNot(self.transport.get_client(), client)
+
+        release.set()
+        self.assertEqual((await pending).status_code, 200)
+        self.assertTrue(client.is_closed)
+
+    async def test_proxy_clients_are_bounded(self):
+        with mock.patch("config.HTTP_POOL_MAX_PROXY_CLIENTS", 2):
+            first = self.transport.get_client("http://127.0.0.1:1")
+            second = self.transport.get_client("http://127.0.0.1:2")
+            # 最近使用过的 client 不会被淘汰
+            self.transport.get_client("http://127.0.0.1:1")
+            self.transport.get_client("http://127.0.0.1:3")
+            self.assertEqual(list(self.transport._clients), ["http://127.0.0.1:1", "http://127.0.0.1:3"])
+            # 被淘汰的 client 在下一次请求结束时关闭
+            await self.transport.request("GET", f"{self.server.base_url}/ping")
+        self.assertTrue(second.is_closed)
+        self.assertTrue(first.is_closed)
+        self.assertEqual(len(self.transport._clients), 2)
+        self.assertEqual(self.transport._retired, set())
+
+    def test_format_httpx_proxy(self):
+        self.assertIsNone(format_httpx_proxy(None))
+        self.assertEqual(format_httpx_proxy({"https://": "http://u:p@1.1.1.1:80"}), "http://u:p@1.1.1.1:80")
+        self.assertEqual(format_httpx_proxy("http://1.1.1.1:80"), "http://1.1.1.1:80")
@@ -0,0 +1,97 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 常驻 JS 签名进程池测试
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+
+from tools.js_sign_pool import JsSignError, JsSignPool, JsSignTimeoutError, _NodeSignWorker
+
+ZHIHU_COOKIES = "d_c0=AJDTestCookieValue|1700000000; z_c0=xxx"
+DOUYIN_UA = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+
+
+@unittest.skipIf(shutil.which("node") is None, "node is not installed")
+class TestJsSignPool(unittest.TestCase):
+
+    def setUp(self):
+        self.douyin_pool = JsSignPool("libs/douyin.js", size=2)
+        self.zhihu_pool = JsSignPool("libs/zhihu.js", size=1)
+
+    def tearDown(self):
+        self.douyin_pool.close()
+        self.zhihu_pool.close()
+
+    def test_call(self):
+        a_bogus = self.douyin_pool.call("sign_datail", "aweme_id=1&aid=6383", DOUYIN_UA)
+        self.assertIsInstance(a_bogus, str)
+        self.assertTrue(a_bogus)
+
+        zhihu_sign = self.zhihu_pool.call("get_sign", "/api/v4/search_v3?q=test", ZHIHU_COOKIES)
+        self.assertIn("x-zse-96", zhihu_sign)
+        self.assertIn("x-zst-81", zhihu_sign)
+
+    def test_sign_many(self):
+        urls = [f"/api/v4/search_v3?q={i}" for i in range(7)]
+        batch = self.zhihu_pool.sign_many("get_sign", [(url, ZHIHU_COOKIES) for url in urls])
+        self.assertEqual(len(batch), len(urls))
+        self.assertTrue(all("x-zse-96" in sign_res for sign_res in batch))
+
+    def test_sign_many_keeps_order(self):
+        # 签名结果带随机数，这里用一个确定性的脚本验证批量结果的顺序
+        with tempfile.NamedTemporaryFile("w", suffix=".js", delete=False) as f:
+            f.write("function echo(a, b) { return a + '|' + b }")
+        pool = JsSignPool(f.name, size=3)
+        try:
+            args_list = [(str(i), "x") for i in range(10)]
+            self.assertEqual(pool.sign_many("echo", args_list), [f"{i}|x" for i in range(10)])
+        finally:
+            pool.close()
+            os.remove(f.name)
+
+    def test_async_call(self):
+        async def run():
+            return await asyncio.gather(*[
+                self.douyin_pool.async_call("sign_reply", f"cursor={i}", DOUYIN_UA) for i in range(4)
+            ])
+
+        results = asyncio.new_event_loop().run_until_complete(run())
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(results))
+
+    def test_unknown_function(self):
+        with self.assertRaises(JsSignError):
+            self.zhihu_pool.call("not_exists")
+
+    def test_hung_worker_times_out_and_restarts(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".js", delete=False) as f:
+            f.write("function hang() { while (true) {} }\nfunction echo(a) { return a }")
+        self.addCleanup(os.remove, f.name)
+        worker = _NodeSignWorker(shutil.which("node"), f.name, timeout=0.5)
+        self.addCleanup(worker.close)
+        with self.assertRaises(JsSignTimeoutError):
+            worker.send({"fn": "hang", "args": []})
+        self.assertEqual(worker.send({"fn": "echo", "args": ["ok"]}), "ok")
+
+    def test_worker_restart(self):
+        self.zhihu_pool.call("get_sign", "/a", ZHIHU_COOKIES)
+        for worker in self.zhihu_pool._workers:
+            worker._proc.kill()
+            worker._proc.wait()
+        self.assertIn("x-zse-96", self.zhihu_pool.call("get_sign", "/a", ZHIHU_COOKIES))
+
+
+if __name__ == '__main__':
+    unittest.main()
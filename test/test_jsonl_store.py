@@ -0,0 +1,94 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : JSONL 存储测试
+import json
+import os
+import tempfile
+from unittest import IsolatedAsyncioTestCase
+
+from store.bilibili.bilibili_store_impl import BiliJsonlStoreImplement
+from store.jsonl_store import (JsonlStoreImplement, close_jsonl_writers, export_jsonl_to_json,
+                               get_jsonl_writer)
+from var import crawler_type_var
+
+
+def make_item(i: int):
+    return {
+        "note_id": str(i),
+        "title": f"标题 {i}",
+        "liked_count": i,
+        "tags": ["a", "b"] if i % 2 else [],
+        "user": {"nickname": "用户", "extra": {}},
+    }
+
+
+class TestJsonlStore(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        crawler_type_var.set("search")
+
+        class TmpJsonlStore(JsonlStoreImplement):
+            jsonl_store_path = self.tmp_dir.name
+
+        self.store = TmpJsonlStore()
+
+    def tearDown(self):
+        close_jsonl_writers(export_json=False)
+        self.tmp_dir.cleanup()
+
+    async def test_append_and_export_legacy_format(self):
+        items = [make_item(i) for i in range(50)]
+        for item in items[:10]:
+            await self.store.store_content(item)
+        await self.store.store_contents(items[10:])
+
+        path = self.store.make_save_file_name("contents")
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual([json.loads(line) for line in f], items)
+
+        json_path = export_jsonl_to_json(path)
+        with open(json_path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), json.dumps(items, ensure_ascii=False, indent=4))
+
+    async def test_one_handle_per_file(self):
+        await self.store.store_comment({"comment_id": "1"})
+        path = self.store.make_save_file_name("comments")
+        writer = get_jsonl_writer(path)
+        await self.store.store_comments([{"comment_id": "2"}, {"comment_id": "3"}])
+        self.assertIs(get_jsonl_writer(path), writer)
+        self.assertEqual(writer.lines, 3)
+
+    async def test_close_exports_json(self):
+        await self.store.store_creator({"user_id": "1"})
+        path = self.store.make_save_file_name("creator")
+        close_jsonl_writers(export_json=True)
+        with open(os.path.splitext(path)[0] + ".json", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), [{"user_id": "1"}])
+
+    async def test_bilibili_contacts_and_dynamics(self):
+        class TmpBiliJsonlStore(BiliJsonlStoreImplement):
+            jsonl_store_path = self.tmp_dir.name
+
+        store = TmpBiliJsonlStore()
+        await store.store_contact({"up_id": "1", "fan_id": "2"})
+        await store.store_dynamic({"dynamic_id": "3"})
+        for store_type, item in (("contacts", {"up_id": "1", "fan_id": "2"}), ("dynamics", {"dynamic_id": "3"})):
+            with open(store.make_save_file_name(store_type), encoding="utf-8") as f:
+                self.assertEqual([json.loads(line) for line in f], [item])
+
+    def test_export_empty_file(self):
+        path = os.path.join(self.tmp_dir.name, "empty.jsonl")
+        open(path, "w").close()
+        with open(export_jsonl_to_json(path), encoding="utf-8") as f:
+            self.assertEqual(f.read(), "[]")
@@ -0,0 +1,92 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 多关键词并行搜索测试
+import asyncio
+import time
+from typing import Dict, List
+from unittest import IsolatedAsyncioTestCase, mock
+
+from test.test_crawl_pipeline import STAGE_DELAY, FakeCrawler
+from var import source_keyword_var
+
+PAGES = 4
+PAGE_SIZE = 3
+
+
+class KeywordFakeCrawler(FakeCrawler):
+
+    def __init__(self):
+        super().__init__(pages=PAGES, page_size=PAGE_SIZE)
+        self.fetch_order: List[str] = []
+        self.keyword_mismatch: List[str] = []
+        self.committed: Dict[str, List[int]] = {}
+        self.completed: List[str] = []
+
+    async def get_page_content(self, keyword: str, page: int) -> List[Dict]:
+        self.fetch_order.append(keyword)
+        content_list = await super().get_page_content(keyword, page)
+        return [{"id": f"{item['id']}", "keyword": keyword} for item in content_list]
+
+    async def should_skip_content(self, content_item: Dict, keyword: str) -> bool:
+        return False
+
+    async def store_content(self, content_item: Dict) -> None:
+        await asyncio.sleep(0)
+        if source_keyword_var.get() != content_item["keyword"]:
+            self.keyword_mismatch.append(content_item["id"])
+        self.stored.append(f"{content_item['keyword']}:{content_item['id']}")
+
+    async def update_crawl_progress(self, keyword, page, items_count, last_item=None):
+        self.committed.setdefault(keyword, []).append(page)
+
+    async def mark_keyword_completed(self, keyword: str):
+        self.completed.append(keyword)
+
+
+class TestKeywordConcurrency(IsolatedAsyncioTestCase):
+
+    async def run_crawler(self, concurrency: int, pipeline: bool) -> KeywordFakeCrawler:
+        crawler = KeywordFakeCrawler()
+        with mock.patch("config.KEYWORDS", "a,b,c,d"), \
+                mock.patch("config.CRAWLER_MAX_NOTES_COUNT", 100), \
+                mock.patch("config.PAGE_LIMIT", PAGES), \
+                mock.patch("config.ENABLE_CRAWL_PIPELINE", pipeline), \
+                mock.patch("config.KEYWORD_CONCURRENCY", concurrency), \
+                mock.patch("config.KEYWORD_PAGES_PER_TURN", 1):
+            await crawler.search_with_resume()
+        return crawler
+
+    def assert_all_keywords_crawled(self, crawler: KeywordFakeCrawler):
+        expected = sorted(f"{k}:{p}-{i}" for k in "abcd" for p in range(1, PAGES + 1) for i in range(PAGE_SIZE))
+        self.assertEqual(sorted(crawler.stored), expected)
+        self.assertEqual(crawler.keyword_mismatch, [])
+        self.assertEqual(sorted(crawler.completed), list("abcd"))
+        for keyword in "abcd":
+            self.assertEqual(crawler.committed[keyword], list(range(1, PAGES + 1)))
+
+    async def test_concurrent_keywords(self):
+        start = time.perf_counter()
+        crawler = await self.run_crawler(concurrency=2, pipeline=False)
+        elapsed = time.perf_counter() - start
+        self.assert_all_keywords_crawled(crawler)
+        # 每页至少 2 * STAGE_DELAY（翻页 + 评论），串行需要 4 个关键词 * PAGES 页
+        self.assertLess(elapsed, 4 * PAGES * 2 * STAGE_DELAY * 0.75)
+
+    async def test_concurrent_keywords_with_pipeline(self):
+        crawler = await self.run_crawler(concurrency=3, pipeline=True)
+        self.assert_all_keywords_crawled(crawler)
+
+    async def test_deep_keyword_does_not_starve_others(self):
+        crawler = await self.run_crawler(concurrency=2, pipeline=False)
+        # 并发名额只有 2 个，但 d 在 a 爬完之前就拿到了名额
+        self.assertLess(crawler.fetch_order.index("d"), len(crawler.fetch_order) - 1 - crawler.fetch_order[::-1].index("a"))
@@ -0,0 +1,134 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 媒体下载器测试：流式写入、内容去重、Range 续传（校验 Content-Range）、并发上限
+import asyncio
+import hashlib
+import os
+import tempfile
+from typing import Dict
+from unittest import IsolatedAsyncioTestCase
+
+from test.stub_server import StubHttpServer
+from tools.http_transport import HttpTransport
+from tools.media_downloader import MediaDownloader, MediaDownloadJob
+
+CONTENT = bytes(range(256)) * 40
+
+
+class TestMediaDownloader(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.range_headers = []
+        self.server = await StubHttpServer(self.handle).start()
+        self.transport = HttpTransport(timeout=5)
+        self.downloader = MediaDownloader(transport=self.transport, workers=2,
+                                          store_path=self.path("store"), chunk_size=1024, retry_backoff=0)
+
+    async def asyncTearDown(self):
+        await self.downloader.drain()
+        await self.transport.aclose()
+        await self.server.stop()
+        self.tmp_dir.cleanup()
+
+    def path(self, *names: str) -> str:
+        return os.path.join(self.tmp_dir.name, *names)
+
+    async def handle(self, method: str, path: str, headers: Dict[str, str], body: bytes):
+        if path.startswith("/missing"):
+            return 404, {}, b""
+        if path.startswith("/slow"):
+            await asyncio.sleep(0.05)
+        self.range_headers.append(headers.get("range"))
+        if "range" in headers and path.startswith("/bad-range"):
+            # 忽略请求的起始位置，从头返回
+            return 206, {"Content-Range": f"bytes 0-{len(CONTENT) - 1}/{len(CONTENT)}"}, CONTENT
+        if "range" in headers and not path.startswith("/no-range"):
+            offset = int(headers["range"][len("bytes="):-1])
+            return 206, {"Content-Range": f"bytes {offset}-{len(CONTENT) - 1}/{len(CONTENT)}"}, CONTENT[offset:]
+        return 200, {}, CONTENT
+
+    def job(self, url_path: str, save_name: str) -> MediaDownloadJob:
+        return MediaDownloadJob(url=f"{self.server.base_url}{url_path}", save_path=self.path("data", save_name))
+
+    async def test_same_content_stored_once(self):
+        first = await self.downloader.download(self.job("/a.jpg", "note1/0.jpg"))
+        second = await self.downloader.download(self.job("/b.jpg", "note2/0.jpg"))
+        self.assertEqual(first.sha256, hashlib.sha256(CONTENT).hexdigest())
+        self.assertFalse(first.deduplicated)
+        self.assertTrue(second.deduplicated)
+        self.assertEqual(first.blob_path, second.blob_path)
+        self.assertTrue(os.path.samefile(self.path("data", "note1/0.jpg"), self.path("data", "note2/0.jpg")))
+        with open(self.path("data", "note2/0.jpg"), "rb") as f:
+            self.assertEqual(f.read(), CONTENT)
+
+        # 同一个 URL 再次出现时不再请求
+        await self.downloader.download(self.job("/a.jpg", "note3/0.jpg"))
+        self.assertEqual(self.server.requests, 2)
+        self.assertEqual(self.downloader.stats["deduplicated"], 2)
+
+    async def test_resume_with_range(self):
+        job = self.job("/video.mp4", "video/video.mp4")
+        part_path = self.downloader._part_path(job.url)
+        os.makedirs(os.path.dirname(part_path))
+        with open(part_path, "wb") as f:
+            f.write(CONTENT[:3000])
+
+        result = await self.downloader.download(job)
+        self.assertEqual(self.range_headers, ["bytes=3000-"])
+        self.assertEqual((result.resumed_bytes, result.downloaded_bytes), (3000, len(CONTENT) - 3000))
+        self.assertEqual(result.sha256, hashlib.sha256(CONTENT).hexdigest())
+        self.assertFalse(os.path.exists(part_path))
+        with open(job.save_path, "rb") as f:
+            self.assertEqual(f.read(), CONTENT)
+
+    async def test_restart_when_range_not_supported(self):
+        job = self.job("/no-range.mp4", "video/video.mp4")
+        part_path = self.downloader._part_path(job.url)
+        os.makedirs(os.path.dirname(part_path))
+        with open(part_path, "wb") as f:
+            f.write(b"stale")
+
+        result = await self.downloader.download(job)
+        self.assertEqual(result.resumed_bytes, 0)
+        with open(job.save_path, "rb") as f:
+            self.assertEqual(f.read(), CONTENT)
+
+    async def test_restart_when_content_range_mismatch(self):
+        job = self.job("/bad-range.mp4", "video/video.mp4")
+        part_path = self.downloader._part_path(job.url)
+        os.makedirs(os.path.dirname(part_path))
+        with open(part_path, "wb") as f:
+            f.write(CONTENT[:3000])
+
+        result = await self.downloader.download(job)
+        self.assertEqual(self.range_headers, ["bytes=3000-", None])
+        self.assertEqual(result.resumed_bytes, 0)
+        self.assertEqual(result.sha256, hashlib.sha256(CONTENT).hexdigest())
+        with open(job.save_path, "rb") as f:
+            self.assertEqual(f.read(), CONTENT)
+
+    async def test_client_error_not_retried(self):
+        self.assertIsNone(await self.downloader.download(self.job("/missing.jpg", "0.jpg")))
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(self.downloader.stats["failed"], 1)
+        self.assertFalse(os.path.exists(self.path("data", "0.jpg")))
+
+    async def test_submit_bounded_workers(self):
+        for i in range(10):
+            job = self.job(f"/slow/{i}.jpg", f"note/{i}.jpg")
+            await self.downloader.submit(job.url, job.save_path)
+        await self.downloader.drain()
+        self.assertLessEqual(self.server.max_in_flight, 2)
+        self.assertEqual(self.downloader.stats["files"], 10)
+        self.assertEqual(len(os.listdir(self.path("data", "note"))), 10)
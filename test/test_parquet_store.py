@@ -0,0 +1,126 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : Parquet 存储测试，没有安装 pyarrow 时跳过
+import os
+import tempfile
+from unittest import IsolatedAsyncioTestCase, mock, skipIf
+
+from store import parquet_store
+from store.bilibili.bilibili_store_impl import BiliParquetStoreImplement
+from store.parquet_store import ParquetStoreImplement, close_parquet_writers, get_parquet_writer
+from store.xhs.xhs_store_impl import XhsParquetStoreImplement
+from var import crawler_type_var
+
+
+def make_comment(i: int):
+    return {
+        "comment_id": str(i),
+        "create_time": 1700000000 + i,
+        "content": f"评论 {i}",
+        "like_count": "1万+" if i % 2 else i,
+        "ip_location": "上海" if i % 2 else "北京",
+    }
+
+
+@skipIf(parquet_store.pa is None, "pyarrow is not installed")
+class TestParquetStore(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        crawler_type_var.set("search")
+
+        class TmpParquetStore(XhsParquetStoreImplement):
+            parquet_store_path = self.tmp_dir.name
+
+        self.store = TmpParquetStore()
+
+    def tearDown(self):
+        close_parquet_writers()
+        self.tmp_dir.cleanup()
+
+    async def test_row_groups_and_schema(self):
+        with mock.patch("config.PARQUET_ROW_GROUP_SIZE", 4):
+            await self.store.store_comments([make_comment(i) for i in range(6)])
+            await self.store.store_comment(make_comment(6))
+            path = self.store.make_save_file_name("comments")
+            writer = get_parquet_writer(path, self.store.get_schema("comments"))
+            close_parquet_writers()
+
+        parquet_file = parquet_store.pq.ParquetFile(path)
+        self.assertEqual(parquet_file.metadata.num_rows, 7)
+        self.assertEqual(writer.row_groups, 2)
+        schema = parquet_file.schema_arrow
+        self.assertEqual(schema.field("create_time").type, parquet_store.pa.int64())
+        self.assertEqual(schema.field("like_count").type, parquet_store.pa.string())
+
+        table = parquet_file.read()
+        self.assertEqual(table.column("like_count").to_pylist()[:3], ["0", "1万+", "2"])
+        column_chunk = parquet_file.metadata.row_group(0).column(schema.get_field_index("ip_location"))
+        self.assertIn("RLE_DICTIONARY", column_chunk.encodings)
+
+    async def test_values_are_converted_to_declared_schema(self):
+        await self.store.store_content({"note_id": "1", "time": 1, "liked_count": 10})
+        path = self.store.make_save_file_name("contents")
+        writer = get_parquet_writer(path, self.store.get_schema("contents"))
+        writer.flush()
+        await self.store.store_content({"note_id": 2, "time": "2", "liked_count": "3k", "extra": "x"})
+        close_parquet_writers()
+        # 再次运行写入同一天的文件
+        await self.store.store_content({"note_id": "3", "time": None, "liked_count": None})
+        close_parquet_writers()
+
+        self.assertEqual(writer.path, path)
+        self.assertEqual(writer.dropped_columns, {"extra"})
+        files = sorted(os.listdir(self.tmp_dir.name))
+        self.assertEqual(len(files), 2)
+        # 目录下的文件 schema 一致，可以一起读取
+        table = parquet_store.pq.read_table(self.tmp_dir.name).sort_by("note_id")
+        self.assertEqual(table.schema.names, list(XhsParquetStoreImplement.parquet_columns["contents"]))
+        self.assertEqual(table.column("note_id").to_pylist(), ["1", "2", "3"])
+        self.assertEqual(table.column("time").to_pylist(), [1, 2, None])
+        self.assertEqual(table.column("liked_count").to_pylist(), ["10", "3k", None])
+
+    async def test_unknown_store_type(self):
+        with self.assertRaises(ValueError):
+            await self.store.save_data_to_parquet([{"id": "1"}], "unknown")
+
+    async def test_bilibili_contacts_and_dynamics(self):
+        class TmpBiliParquetStore(BiliParquetStoreImplement):
+            parquet_store_path = self.tmp_dir.name
+
+        store = TmpBiliParquetStore()
+        await store.store_contact({"up_id": "1", "fan_id": "2"})
+        await store.store_dynamic({"dynamic_id": "3", "pub_ts": 1})
+        close_parquet_writers()
+        contacts = parquet_store.pq.read_table(store.make_save_file_name("contacts")).to_pylist()
+        self.assertEqual((contacts[0]["up_id"], contacts[0]["fan_id"], contacts[0]["up_name"]), ("1", "2", None))
+        dynamics = parquet_store.pq.read_table(store.make_save_file_name("dynamics"))
+        self.assertEqual(dynamics.schema.field("pub_ts").type, parquet_store.pa.int64())
+        self.assertEqual(dynamics.column("pub_ts").to_pylist(), [1])
+
+    async def test_missing_pyarrow_fails_on_create(self):
+        with mock.patch.object(parquet_store, "pa", None):
+            with self.assertRaises(ImportError):
+                ParquetStoreImplement()
+
+    async def test_existing_file_is_not_overwritten(self):
+        await self.store.store_creator({"user_id": "1"})
+        close_parquet_writers()
+        await self.store.store_creator({"user_id": "2"})
+        close_parquet_writers()
+
+        files = sorted(os.listdir(self.tmp_dir.name))
+        self.assertEqual(len(files), 2)
+        self.assertTrue(files[1].endswith("_1.parquet"))
+        table = parquet_store.pq.read_table(self.tmp_dir.name)
+        self.assertEqual(sorted(table.column("user_id").to_pylist()), ["1", "2"])
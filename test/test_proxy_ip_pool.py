@@ -13,10 +13,15 @@
 # @Author  : relakkes@gmail.com
 # @Time    : 2023/12/2 14:42
 # @Desc    :
-from unittest import IsolatedAsyncioTestCase
+import asyncio
+import time
+from typing import Dict, List
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
 
-from proxy.proxy_ip_pool import create_ip_pool
+from proxy.base_proxy import ProxyProvider
+from proxy.proxy_ip_pool import ProxyHealth, ProxyIpPool, create_ip_pool, proxy_key
 from proxy.types import IpInfoModel
+from test.stub_server import StubHttpServer
 
 
 class TestIpPool(IsolatedAsyncioTestCase):
@@ -28,3 +33,104 @@ class TestIpPool(IsolatedAsyncioTestCase):
             print(ip_proxy_info)
             self.assertIsNotNone(ip_proxy_info.ip, msg="验证 ip 是否获取成功")
 
+
+def make_proxy(port: int, expired_time_ts: int = 3600) -> IpInfoModel:
+    return IpInfoModel(ip="127.0.0.1", port=port, user="u", password="p", expired_time_ts=expired_time_ts)
+
+
+class FakeProvider(ProxyProvider):
+    def __init__(self, proxies: List[IpInfoModel]):
+        self.available = list(proxies)
+        self.calls = 0
+
+    async def get_proxies(self, num: int) -> List[IpInfoModel]:
+        self.calls += 1
+        taken, self.available = self.available[:num], self.available[num:]
+        return taken
+
+
+async def echo_handler(method: str, path: str, headers: Dict[str, str], body: bytes):
+    # 作为 HTTP 代理收到的是完整 URL
+    return 200, {}, {"origin": "127.0.0.1", "path": path}
+
+
+class TestProxyHealth(TestCase):
+
+    def test_lease_deadline(self):
+        now = 1_700_000_000
+        self.assertEqual(ProxyHealth(make_proxy(1, 600), now).expire_at, now + 600)
+        self.assertEqual(ProxyHealth(make_proxy(1, now + 60), now).expire_at, now + 60)
+
+    def test_decay(self):
+        health = ProxyHealth(make_proxy(1))
+        health.observe(False, decay=0.5)
+        health.observe(True, latency=0.2, decay=0.5)
+        health.observe(True, latency=0.4, decay=0.5)
+        self.assertAlmostEqual(health.success_rate, 0.875)
+        self.assertAlmostEqual(health.latency, 0.3)
+
+
+class TestProxyIpPoolLeases(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.servers = [await StubHttpServer(echo_handler).start() for _ in range(3)]
+        self.pools: List[ProxyIpPool] = []
+
+    async def asyncTearDown(self):
+        for pool in self.pools:
+            await pool.close()
+        for server in self.servers:
+            await server.stop()
+
+    def make_pool(self, proxies: List[IpInfoModel], count: int = 2, validate: bool = False) -> ProxyIpPool:
+        pool = ProxyIpPool(count, validate, FakeProvider(proxies), valid_ip_url="http://echo.test/ip")
+        self.pools.append(pool)
+        return pool
+
+    async def test_proxy_leased_until_expiry(self):
+        pool = self.make_pool([make_proxy(self.servers[0].port), make_proxy(self.servers[1].port)])
+        await pool.load_proxies()
+        leased = {proxy_key(await pool.get_proxy()) for _ in range(20)}
+        self.assertEqual(leased, {f"127.0.0.1:{server.port}" for server in self.servers[:2]})
+        self.assertEqual(pool.ip_provider.calls, 1)
+
+    async def test_expired_proxies_are_not_leased(self):
+        alive = make_proxy(self.servers[0].port)
+        pool = self.make_pool([make_proxy(self.servers[1].port, int(time.time()) - 1),
+                               make_proxy(self.servers[2].port, 10), alive], count=3)
+        await pool.load_proxies()
+        self.assertEqual(pool.proxy_list, [alive])
+
+    async def test_validation_runs_in_background(self):
+        dead_port = self.servers[2].port
+        await self.servers[2].stop()
+        pool = self.make_pool([make_proxy(self.servers[0].port), make_proxy(dead_port),
+                               make_proxy(self.servers[1].port)], validate=True)
+        with mock.patch("config.IP_PROXY_MIN_SUCCESS_RATE", 0.5), mock.patch("config.IP_PROXY_VALIDATE_INTERVAL_SEC", 0.01):
+            await pool.load_proxies()
+            await pool.get_proxy()
+            # 取代理不等待验证
+            self.assertEqual(self.servers[0].requests, 0)
+            for _ in range(200):
+                if pool.stats["evicted"] and len(pool.proxies) == 2:
+                    break
+                await asyncio.sleep(0.01)
+        self.assertEqual(pool.stats["evicted"], 1)
+        self.assertNotIn(f"127.0.0.1:{dead_port}", pool.proxies)
+        # 移除失效代理后在后台补充了新的代理
+        self.assertIn(f"127.0.0.1:{self.servers[1].port}", pool.proxies)
+        # 每个代理的验证请求复用同一个连接
+        self.assertGreater(self.servers[0].requests, 1)
+        self.assertEqual(self.servers[0].connections, 1)
+
+    async def test_weighted_selection(self):
+        good, bad = make_proxy(self.servers[0].port), make_proxy(self.servers[1].port)
+        pool = self.make_pool([good, bad])
+        await pool.load_proxies()
+        with mock.patch("config.IP_PROXY_MIN_SUCCESS_RATE", 0):
+            for _ in range(5):
+                pool.report(good, True, 0.1)
+                pool.report(bad, False)
+            pool.report(bad, True, 1.0)
+        picks = [proxy_key(await pool.get_proxy()) for _ in range(500)]
+        self.assertGreater(picks.count(proxy_key(good)), 450)
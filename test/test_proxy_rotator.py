@@ -0,0 +1,121 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 代理轮换测试，本地 StubHttpServer 充当 HTTP 代理
+import time
+from typing import Dict, List
+from unittest import IsolatedAsyncioTestCase, mock
+
+from proxy.proxy_ip_pool import ProxyIpPool, proxy_key
+from proxy.proxy_rotator import ROTATE_PER_REQUEST, ROTATE_STICKY, ProxyRotator
+from test.stub_server import StubHttpServer
+from test.test_proxy_ip_pool import FakeProvider, echo_handler, make_proxy
+from tools.http_transport import PROXY_EXTENSION_KEY, HttpTransport
+
+TARGET_URL = "http://target.test/ping"
+
+
+async def captcha_handler(method: str, path: str, headers: Dict[str, str], body: bytes):
+    return 461, {}, b""
+
+
+class TestProxyRotator(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.good = [await StubHttpServer(echo_handler).start() for _ in range(2)]
+        self.captcha = await StubHttpServer(captcha_handler).start()
+        dead = await StubHttpServer().start()
+        await dead.stop()
+        self.dead_port = dead.port
+        self.transports: List[HttpTransport] = []
+        self.pool = None
+
+    async def asyncTearDown(self):
+        for transport in self.transports:
+            await transport.aclose()
+        await self.pool.close()
+        for server in self.good + [self.captcha]:
+            await server.stop()
+
+    async def make_transport(self, ports: List[int], mode: str, max_retries: int = 2) -> HttpTransport:
+        self.pool = ProxyIpPool(len(ports), False, FakeProvider([make_proxy(port) for port in ports]))
+        await self.pool.load_proxies()
+        self.rotator = ProxyRotator(self.pool, mode=mode, max_retries=max_retries)
+        transport = HttpTransport(timeout=2, rotator=self.rotator)
+        self.transports.append(transport)
+        return transport
+
+    async def test_retry_on_another_proxy(self):
+        transport = await self.make_transport([self.good[0].port, self.dead_port, self.captcha.port],
+                                              ROTATE_PER_REQUEST, max_retries=3)
+        with mock.patch("config.IP_PROXY_MIN_SUCCESS_RATE", 0):
+            for _ in range(20):
+                response = await transport.request("GET", TARGET_URL, proxy="http://ignored:1")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(proxy_key(response.extensions[PROXY_EXTENSION_KEY]), f"127.0.0.1:{self.good[0].port}")
+        # 失效和出验证码的代理各被隔离一次后不再参与选择
+        self.assertEqual(self.rotator.stats["quarantined"], 2)
+        self.assertEqual(self.good[0].requests, 20)
+        self.assertEqual(self.captcha.requests, 1)
+
+    async def test_sticky_session_until_blocked(self):
+        transport = await self.make_transport([self.good[0].port, self.good[1].port], ROTATE_STICKY)
+        first = [await transport.request("GET", TARGET_URL) for _ in range(5)]
+        keys = {proxy_key(response.extensions[PROXY_EXTENSION_KEY]) for response in first}
+        self.assertEqual(len(keys), 1)
+
+        # 平台 client 识别出 IP 被封后换代理
+        transport.report_proxy_blocked(first[-1])
+        response = await transport.request("GET", TARGET_URL)
+        self.assertNotIn(proxy_key(response.extensions[PROXY_EXTENSION_KEY]), keys)
+
+        # 另一个会话（另一个账号）可以使用不同的代理
+        other = await transport.request("GET", TARGET_URL, session_key="account-2")
+        self.assertEqual(other.status_code, 200)
+
+    async def test_quarantine_backoff_and_readmission(self):
+        await self.make_transport([self.good[0].port, self.good[1].port], ROTATE_PER_REQUEST)
+        proxy = self.pool.proxy_list[0]
+        key = proxy_key(proxy)
+        with mock.patch("config.PROXY_QUARANTINE_BASE_SEC", 10), mock.patch("config.PROXY_QUARANTINE_MAX_SEC", 30), \
+                mock.patch("config.IP_PROXY_MIN_SUCCESS_RATE", 0):
+            for expected in (10, 20, 30):
+                self.rotator.quarantine(proxy, "test")
+                self.assertAlmostEqual(self.rotator._quarantine[key][0] - time.time(), expected, delta=1)
+            for _ in range(10):
+                self.assertNotEqual(proxy_key(await self.rotator.acquire()), key)
+
+            # 隔离到期后重新参与选择，成功一次后清除隔离记录
+            self.rotator._quarantine[key] = (time.time() - 1, 3)
+            self.assertIn(key, {proxy_key(await self.rotator.acquire()) for _ in range(50)})
+            self.rotator.report_success(proxy, 0.1)
+            self.assertNotIn(key, self.rotator._quarantine)
+
+    async def test_all_quarantined_falls_back(self):
+        await self.make_transport([self.good[0].port], ROTATE_PER_REQUEST)
+        proxy = self.pool.proxy_list[0]
+        self.rotator.quarantine(proxy, "test")
+        self.assertEqual(proxy_key(await self.rotator.acquire()), proxy_key(proxy))
+
+    async def test_fallback_skips_proxies_removed_by_pool(self):
+        await self.make_transport([self.good[0].port], ROTATE_PER_REQUEST)
+        proxy = self.pool.proxy_list[0]
+        self.rotator.quarantine(proxy, "test")
+
+        async def get_proxy(exclude=None):
+            # 取代理时代理池移除了过期的代理，又没能补充新代理
+            self.pool.proxies.pop(proxy_key(proxy))
+            raise RuntimeError("no proxy available")
+
+        with mock.patch.object(self.pool, "get_proxy", get_proxy):
+            with self.assertRaises(RuntimeError):
+                await self.rotator.acquire()
@@ -0,0 +1,158 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 贴吧、知乎发布时间归一化测试：入库时写入 publish_ts、回填任务可断点续跑、看板回填后在 SQL 中按 publish_ts 筛选
+import unittest
+from datetime import datetime, timedelta
+from unittest import IsolatedAsyncioTestCase, mock
+
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import Session
+
+from analysis_job.publish_ts_backfill import PublishTsBackfill
+from model.m_baidu_tieba import TiebaNote as TiebaNoteModel
+from tools.time_util import normalize_publish_ts, parse_publish_time_str
+from web.database.connection import Base
+from web.database.models import TiebaNote
+from web.database.queries import ContentItem, DataQueryService, SearchFilters
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+
+
+def make_tieba_note(i: int, publish_time: str, add_ts: int = 0) -> TiebaNote:
+    return TiebaNote(note_id=f"t{i}", title=f"贴吧 {i}", desc="", note_url="", user_link="", user_nickname="",
+                     tieba_name="", tieba_link="", total_replay_num=i % 11, add_ts=add_ts, last_modify_ts=0,
+                     publish_time=publish_time)
+
+
+class TestNormalizePublishTs(unittest.TestCase):
+
+    def test_formats(self):
+        self.assertEqual(parse_publish_time_str("2024-05-28 15:33", NOW), datetime(2024, 5, 28, 15, 33))
+        self.assertEqual(parse_publish_time_str("2024年5月1日", NOW), datetime(2024, 5, 1))
+        self.assertEqual(parse_publish_time_str("05-28 15:33", NOW), datetime(2025, 5, 28, 15, 33))
+        # 不带年份且晚于抓取时间的是去年发布的
+        self.assertEqual(parse_publish_time_str("12-30 10:00", NOW), datetime(2024, 12, 30, 10, 0))
+        self.assertEqual(parse_publish_time_str("3天前", NOW), NOW - timedelta(days=3))
+        self.assertEqual(parse_publish_time_str("2个月前", NOW), NOW - timedelta(days=60))
+        self.assertEqual(normalize_publish_ts("1700000000"), 1700000000)
+        self.assertEqual(normalize_publish_ts("1700000000123"), 1700000000)
+        self.assertEqual(normalize_publish_ts(1700000000), 1700000000)
+        for value in ("", None, "未知", "0"):
+            self.assertEqual(normalize_publish_ts(value, NOW), 0)
+
+
+class TestPublishTsIngest(IsolatedAsyncioTestCase):
+
+    async def test_update_tieba_note_writes_publish_ts(self):
+        from store import tieba as tieba_store
+        store = mock.AsyncMock()
+        with mock.patch.object(tieba_store.TieBaStoreFactory, "create_store", return_value=store):
+            await tieba_store.update_tieba_note(TiebaNoteModel(note_id="1", title="t", note_url="", tieba_name="",
+                                                               tieba_link="", publish_time="2024-05-28 15:33"))
+        saved = store.store_content.await_args.args[0]
+        self.assertEqual(saved["publish_ts"], int(datetime(2024, 5, 28, 15, 33).timestamp()))
+
+
+class TestPublishTsBackfill(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine, tables=[TiebaNote.__table__])
+
+    def test_backfill_is_batched_and_resumable(self):
+        add_ts = int(NOW.timestamp() * 1000)
+        with Session(self.engine) as session:
+            for i in range(25):
+                session.add(make_tieba_note(i, (NOW - timedelta(hours=i)).strftime("%Y-%m-%d %H:%M"), add_ts))
+            session.add(make_tieba_note(25, "3天前", add_ts))
+            session.add(make_tieba_note(26, "未知", add_ts))
+            session.commit()
+            # 上一次运行已经回填过的记录
+            session.execute(text("UPDATE tieba_note SET publish_ts = 123 WHERE note_id IN ('t0', 't1')"))
+            session.commit()
+
+        backfill = PublishTsBackfill(self.engine, batch_size=7)
+        self.assertEqual(backfill.remaining("tieba"), 25)
+        self.assertEqual(backfill.backfill("tieba"), {"updated": 25, "unparsed": 1})
+        self.assertEqual(backfill.remaining("tieba"), 0)
+
+        with self.engine.connect() as conn:
+            values = dict(conn.execute(text("SELECT note_id, publish_ts FROM tieba_note")).fetchall())
+        self.assertEqual(values["t0"], 123)
+        self.assertEqual(values["t2"], int((NOW - timedelta(hours=2)).replace(second=0).timestamp()))
+        # 相对时间以抓取时间为基准
+        self.assertEqual(values["t25"], int((NOW - timedelta(days=3)).timestamp()))
+        self.assertEqual(values["t26"], 0)
+        self.assertEqual(backfill.backfill("tieba"), {"updated": 0, "unparsed": 0})
+
+    def test_ensure_column_on_legacy_table(self):
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE tieba_note (id INTEGER PRIMARY KEY, publish_time TEXT, add_ts INTEGER)"))
+            conn.execute(text("INSERT INTO tieba_note (publish_time, add_ts) VALUES ('2024-05-28 15:33', 0)"))
+        backfill = PublishTsBackfill(engine)
+        backfill.ensure_column("tieba")
+        backfill.ensure_column("tieba")
+        self.assertIn("publish_ts", {column["name"] for column in inspect(engine).get_columns("tieba_note")})
+        self.assertEqual([index["column_names"] for index in inspect(engine).get_indexes("tieba_note")], [["publish_ts"]])
+        self.assertEqual(backfill.backfill("tieba")["updated"], 1)
+
+
+class TestDashboardPublishTs(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine, tables=[TiebaNote.__table__])
+        with Session(self.engine) as session:
+            for i in range(200):
+                session.add(make_tieba_note(i, (NOW - timedelta(minutes=7 * i)).strftime("%Y-%m-%d %H:%M")))
+            session.commit()
+        self.loaded = 0
+
+        def count_load(target, context):
+            self.loaded += 1
+
+        event.listen(TiebaNote, "load", count_load)
+        self.addCleanup(event.remove, TiebaNote, "load", count_load)
+
+    def search(self, **kwargs):
+        service = DataQueryService()
+        service.session = Session(self.engine)
+        try:
+            page = service.search_content_page(SearchFilters(platforms=["tieba"], start_time=NOW - timedelta(hours=10),
+                                                             end_time=NOW - timedelta(hours=1), page_size=10, **kwargs))
+            return page, service._uses_publish_ts(TiebaNote, "tieba")
+        finally:
+            service.session.close()
+
+    def test_search_uses_publish_ts_after_backfill(self):
+        expected, uses_publish_ts = self.search(page=3)
+        self.assertFalse(uses_publish_ts)
+
+        PublishTsBackfill(self.engine).backfill("tieba")
+        self.loaded = 0
+        page, uses_publish_ts = self.search(page=3)
+        self.assertTrue(uses_publish_ts)
+        self.assertEqual([item.content_id for item in page.items], [item.content_id for item in expected.items])
+        self.assertEqual([item.publish_time for item in page.items], [item.publish_time for item in expected.items])
+        self.assertEqual(page.total, expected.total)
+        # 不再解析全部记录，只读取前三页
+        self.assertLessEqual(self.loaded, 3 * 10 + 1)
+
+        interaction_page, _ = self.search(sort_by="interaction")
+        self.assertEqual(interaction_page.items[0].publish_time,
+                         ContentItem.from_model(interaction_page.items[0]._model_instance, "tieba").publish_time)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 自适应限速调度器测试，桩服务超过容量时返回 429 模拟平台限流
+import asyncio
+import time
+from unittest import IsolatedAsyncioTestCase, mock
+
+from test.stub_server import StubHttpServer
+from tools.http_transport import HttpTransport
+from tools.rate_limiter import (ENDPOINT_COMMENTS, ENDPOINT_DETAIL, ENDPOINT_MEDIA, ENDPOINT_SEARCH,
+                                RequestScheduler, TokenBucket, classify_endpoint, get_request_scheduler)
+
+SERVER_CAPACITY = 4
+RESPONSE_DELAY = 0.02
+
+
+class TestRateLimiter(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = StubHttpServer(handler=self.throttling_handler)
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.stop()
+
+    async def throttling_handler(self, method, path, headers, body):
+        if path.startswith("/blocked"):
+            return 200, {}, "blocked"
+        if self.server.in_flight > SERVER_CAPACITY:
+            return 429, {}, {"msg": "too many requests"}
+        await asyncio.sleep(RESPONSE_DELAY)
+        return 200, {}, {"ok": 1}
+
+    def test_classify_endpoint(self):
+        self.assertEqual(classify_endpoint("https://edith.xiaohongshu.com/api/sns/web/v1/search/notes"), ENDPOINT_SEARCH)
+        self.assertEqual(classify_endpoint("https://www.douyin.com/aweme/v1/web/comment/list/"), ENDPOINT_COMMENTS)
+        self.assertEqual(classify_endpoint("https://www.douyin.com/aweme/v1/web/aweme/detail/"), ENDPOINT_DETAIL)
+        self.assertEqual(classify_endpoint("https://sns-img.xhscdn.com/a/b.jpg"), ENDPOINT_MEDIA)
+
+    async def test_token_bucket_pacing(self):
+        bucket = TokenBucket(rate=20, burst=1)
+        start = time.perf_counter()
+        for _ in range(6):
+            await bucket.acquire()
+        # 第一个令牌来自桶容量，后面 5 个每个需要等 1/20 秒
+        self.assertGreaterEqual(time.perf_counter() - start, 5 / 20 * 0.9)
+
+    async def test_aimd_converges_to_server_capacity(self):
+        scheduler = RequestScheduler(
+            endpoint_rates={"default": (1000, 1000)}, initial_concurrency=1, max_concurrency=32, latency_target=0
+        )
+        transport = HttpTransport(timeout=5, scheduler=scheduler)
+        successes = 0
+        target = 300
+
+        async def worker():
+            nonlocal successes
+            while successes < target:
+                response = await transport.request("GET", f"{self.server.base_url}/api")
+                if response.status_code == 200:
+                    successes += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(32)])
+        elapsed = time.perf_counter() - start
+        await transport.aclose()
+
+        stats = scheduler.stats()[f"127.0.0.1:{self.server.port}"]
+        # 并发窗口从 1 开始增长，收敛到服务端容量附近，限流比例很低
+        self.assertGreater(self.server.max_in_flight, 1)
+        self.assertLess(stats["throttled"], stats["requests"] * 0.25)
+        self.assertLessEqual(stats["concurrency"], SERVER_CAPACITY * 2)
+        # 吞吐明显高于串行请求
+        self.assertGreater(successes / elapsed, 2 / RESPONSE_DELAY * 0.5)
+
+    async def test_scheduler_per_event_loop(self):
+        with mock.patch("config.ENABLE_ADAPTIVE_RATE_LIMIT", True):
+            scheduler = get_request_scheduler()
+            self.assertIs(get_request_scheduler(), scheduler)
+
+            def other_loop():
+                loop = asyncio.new_event_loop()
+                try:
+                    return loop.run_until_complete(self._current_scheduler())
+                finally:
+                    loop.close()
+
+            self.assertIsNot(await asyncio.get_running_loop().run_in_executor(None, other_loop), scheduler)
+        self.assertIsNone(get_request_scheduler())
+
+    @staticmethod
+    async def _current_scheduler():
+        return get_request_scheduler()
+
+    async def test_blocked_and_reported_signals(self):
+        scheduler = RequestScheduler(endpoint_rates={"default": (1000, 1000)}, initial_concurrency=8)
+        transport = HttpTransport(timeout=5, scheduler=scheduler)
+        host = f"127.0.0.1:{self.server.port}"
+
+        await transport.request("GET", f"{self.server.base_url}/blocked")
+        self.assertEqual(scheduler.stats()[host]["throttled"], 1)
+        self.assertEqual(scheduler.get_limiter(host).limit, 4)
+
+        # 业务层上报的限流（例如 IP 封禁错误码）同样会缩小窗口
+        transport.report_throttled(f"{self.server.base_url}/api")
+        self.assertEqual(scheduler.stats()[host]["throttled"], 2)
+        self.assertEqual(scheduler.get_limiter(host).limit, 2)
+        await transport.aclose()
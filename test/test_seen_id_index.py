@@ -0,0 +1,125 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 已入库 ID 索引测试，使用临时的 SQLite 数据库
+import os
+import tempfile
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+from async_sqlite_db import AsyncSqliteDB
+from store.xhs.xhs_store_impl import XhsDbStoreImplement
+from tools.seen_id_index import (SEEN_MAYBE, SEEN_NEW, SEEN_UNCHANGED, BloomFilter, clear_seen_id_indexes,
+                                 get_seen_id_index)
+from var import media_crawler_db_var
+
+
+def make_comment(i: int, content: str = "c", ts: int = 1):
+    return {"comment_id": str(i), "note_id": "n", "user_id": "u", "content": content, "create_time": 0,
+            "sub_comment_count": 0, "like_count": i, "last_modify_ts": ts}
+
+
+class TestBloomFilter(TestCase):
+
+    def test_no_false_negatives_and_error_rate(self):
+        bloom = BloomFilter(capacity=5000, error_rate=0.01)
+        for i in range(20000):
+            bloom.add(f"id-{i}")
+        self.assertTrue(all(f"id-{i}" in bloom for i in range(20000)))
+        false_positives = sum(f"other-{i}" in bloom for i in range(20000))
+        self.assertLess(false_positives / 20000, 0.02)
+
+
+class TestSeenIdIndex(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "media_crawler.db")
+        self.db = await self.open_db()
+
+    async def asyncTearDown(self):
+        await self.db.close()
+        clear_seen_id_indexes()
+        self.tmp_dir.cleanup()
+
+    async def open_db(self) -> AsyncSqliteDB:
+        db = AsyncSqliteDB(self.db_path)
+        await db.open()
+        media_crawler_db_var.set(db)
+        return db
+
+    async def last_modify_ts(self):
+        rows = await self.db.query("SELECT comment_id, content, last_modify_ts FROM xhs_note_comment ORDER BY id")
+        return {row["comment_id"]: (row["content"], row["last_modify_ts"]) for row in rows}
+
+    async def test_skip_unchanged_within_run(self):
+        store = XhsDbStoreImplement()
+        await store.store_comments([make_comment(i) for i in range(10)])
+        await store.store_comments([make_comment(i, ts=2) for i in range(5)] + [make_comment(5, "changed", ts=2)])
+
+        index = get_seen_id_index(self.db, "xhs_note_comment", "comment_id")
+        self.assertEqual(index.stats, {SEEN_NEW: 10, SEEN_UNCHANGED: 5, SEEN_MAYBE: 1})
+        rows = await self.last_modify_ts()
+        self.assertEqual(rows["0"], ("c", 1))
+        self.assertEqual(rows["5"], ("changed", 2))
+
+    async def test_warm_from_db_in_chunks(self):
+        with mock.patch("config.ENABLE_SEEN_ID_INDEX", False):
+            await XhsDbStoreImplement().store_comments([make_comment(i) for i in range(25)])
+        await self.db.close()
+        clear_seen_id_indexes()
+
+        # 新的一次运行：最近 10 条有内容指纹，更早的只在布隆过滤器中
+        self.db = await self.open_db()
+        with mock.patch("config.SEEN_ID_WARM_CHUNK_SIZE", 4), mock.patch("config.SEEN_ID_RECENT_CAPACITY", 10):
+            await XhsDbStoreImplement().store_comments(
+                [make_comment(i, ts=2) for i in range(30)] + [make_comment(24, "changed", ts=2)]
+            )
+        index = get_seen_id_index(self.db, "xhs_note_comment", "comment_id")
+        self.assertEqual(index.warm_queries, 1 + 7)
+        self.assertEqual(index.stats, {SEEN_NEW: 5, SEEN_UNCHANGED: 9, SEEN_MAYBE: 16})
+
+        rows = await self.last_modify_ts()
+        self.assertEqual(len(rows), 30)
+        self.assertEqual(rows["20"], ("c", 1))
+        self.assertEqual(rows["24"], ("changed", 2))
+        self.assertEqual(rows["0"], ("c", 2))
+
+    async def test_items_with_extra_fields_are_not_unchanged(self):
+        store = XhsDbStoreImplement()
+        await store.store_comments([make_comment(i) for i in range(2)])
+        await store.store_comments([{**make_comment(0, ts=2), "pictures": "p"}, make_comment(1, ts=2)])
+
+        index = get_seen_id_index(self.db, "xhs_note_comment", "comment_id")
+        self.assertEqual(index.stats, {SEEN_NEW: 2, SEEN_UNCHANGED: 1, SEEN_MAYBE: 1})
+        rows = await self.db.query("SELECT pictures FROM xhs_note_comment WHERE comment_id = '0'")
+        self.assertEqual(rows[0]["pictures"], "p")
+
+    async def test_update_table_forgets_fingerprint(self):
+        store = XhsDbStoreImplement()
+        await store.store_comments([make_comment(i) for i in range(2)])
+        await self.db.update_table("xhs_note_comment", {"content": "edited"}, "comment_id", "0")
+        # 库中内容已经改变，同样的记录需要重新写入
+        await store.store_comments([make_comment(i, ts=2) for i in range(2)])
+
+        index = get_seen_id_index(self.db, "xhs_note_comment", "comment_id")
+        self.assertEqual(index.stats, {SEEN_NEW: 2, SEEN_UNCHANGED: 1, SEEN_MAYBE: 1})
+        rows = await self.last_modify_ts()
+        self.assertEqual(rows["0"], ("c", 2))
+
+    async def test_warm_failure_falls_back_to_upsert(self):
+        index = get_seen_id_index(self.db, "no_such_table", "comment_id")
+        self.assertEqual(await index.skip_unchanged(self.db, [{"comment_id": "1"}]), [{"comment_id": "1"}])
+        self.assertEqual(index.stats[SEEN_MAYBE], 1)
+
+    async def test_disabled(self):
+        with mock.patch("config.ENABLE_SEEN_ID_INDEX", False):
+            self.assertIsNone(get_seen_id_index(self.db, "xhs_note_comment", "comment_id"))
@@ -0,0 +1,136 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 签名上下文缓存测试
+import asyncio
+import unittest
+
+from media_platform.xhs.client import XiaoHongShuClient
+from tools.signing_context import SigningContext
+
+
+class FakePage:
+    """记录 evaluate 调用次数的假页面"""
+
+    def __init__(self):
+        self.local_storage = {"b1": "b1-v1"}
+        self.scripts = []
+
+    async def evaluate(self, script, arg=None):
+        self.scripts.append(script)
+        if "_webmsxyw" in script:
+            return {"X-s": "XYW_" + "x" * 60, "X-t": 1700000000000}
+        if "localStorage.getItem" in script:
+            return {key: self.local_storage.get(key) for key in arg}
+        raise AssertionError(f"unexpected script: {script}")
+
+
+class FakeBrowserContext:
+
+    async def cookies(self):
+        return [{"name": "a1", "value": "a1-v2"}]
+
+
+class TestSigningContext(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_ttl_and_invalidate(self):
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return len(calls)
+
+        async def run():
+            ctx = SigningContext(ttl=0.1)
+            self.assertEqual(await ctx.get("k", loader), 1)
+            self.assertEqual(await ctx.get("k", loader), 1)
+            await asyncio.sleep(0.15)
+            self.assertEqual(await ctx.get("k", loader), 2)
+            ctx.invalidate()
+            self.assertEqual(await ctx.get("k", loader), 3)
+
+        self.loop.run_until_complete(run())
+
+    def test_single_flight(self):
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "v"
+
+        async def run():
+            ctx = SigningContext(ttl=60)
+            return await asyncio.gather(*[ctx.get("k", loader) for _ in range(5)])
+
+        self.assertEqual(self.loop.run_until_complete(run()), ["v"] * 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_empty_value_not_cached(self):
+        values = [None, "", "token"]
+
+        async def loader():
+            return values.pop(0)
+
+        async def run():
+            ctx = SigningContext(ttl=60)
+            return [await ctx.get("msToken", loader) for _ in range(4)]
+
+        self.assertEqual(self.loop.run_until_complete(run()), [None, "", "token", "token"])
+
+    def test_invalidate_during_load(self):
+        async def run():
+            ctx = SigningContext(ttl=60)
+
+            async def loader():
+                ctx.invalidate()
+                return "stale"
+
+            self.assertEqual(await ctx.get("k", loader), "stale")
+            return await ctx.get("k", self._async_value("fresh"))
+
+        self.assertEqual(self.loop.run_until_complete(run()), "fresh")
+
+    @staticmethod
+    def _async_value(value):
+        async def loader():
+            return value
+        return loader
+
+    def test_xhs_pre_headers_reads_local_storage_once(self):
+        page = FakePage()
+
+        async def run():
+            client = XiaoHongShuClient(headers={}, playwright_page=page, cookie_dict={"a1": "a1-v1"})
+            for i in range(3):
+                await client._pre_headers(f"/api/sns/web/v1/feed?i={i}")
+            self.assertEqual(sum("localStorage" in script for script in page.scripts), 1)
+            self.assertEqual(sum("_webmsxyw" in script for script in page.scripts), 3)
+
+            page.local_storage["b1"] = "b1-v2"
+            await client.update_cookies(FakeBrowserContext())
+            await client._pre_headers("/api/sns/web/v1/feed")
+            self.assertEqual(sum("localStorage" in script for script in page.scripts), 2)
+            self.assertEqual(await client._get_b1(), "b1-v2")
+            await client.close()
+
+        self.loop.run_until_complete(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 看板统计汇总表测试：SQLite 写入后增量刷新、重建结果与增量一致、看板统计与扫描内容表一致、分析任务刷新情感分布
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from analysis_job.database_orm import DatabaseManager
+from analysis_job.models import AnalysisResult
+from analysis_job.stats_rollup_rebuild import StatsRollupRebuild
+from async_sqlite_db import AsyncSqliteDB
+from tools import stats_rollup
+from web.database.queries import DataQueryService, SearchFilters
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+SENTIMENTS = ["positive", "negative", "neutral", "mixed"]
+KEYWORDS = ["手机", "电脑", None]
+
+
+def make_note(i: int) -> dict:
+    return {"note_id": f"x{i}", "type": "normal", "title": f"笔记 {i}", "desc": "", "user_id": "u", "nickname": "n",
+            "time": int((NOW - timedelta(hours=5 * i)).timestamp() * 1000), "last_update_time": 0,
+            "liked_count": "0", "collected_count": "0", "comment_count": "0", "share_count": "0", "note_url": "",
+            "source_keyword": KEYWORDS[i % 3], "add_ts": 0, "last_modify_ts": 0}
+
+
+def make_comment(i: int, note: int) -> dict:
+    return {"comment_id": f"c{i}", "note_id": f"x{note}", "content": "评论", "user_id": "u", "nickname": "n",
+            "create_time": 0, "sub_comment_count": 0, "add_ts": 0, "last_modify_ts": 0}
+
+
+def analysis(i: int) -> str:
+    return json.dumps({"sentiment": SENTIMENTS[i % 4], "sentiment_score": 0.5, "relevance_score": 0.8})
+
+
+async def write_database(path: str):
+    db = AsyncSqliteDB(path, text_index=False)
+    await db.open()
+    try:
+        await db.batch_upsert("xhs_note", [make_note(i) for i in range(30)], key_field="note_id")
+        # 重复写入不会重复计数
+        await db.batch_upsert("xhs_note", [make_note(i) for i in range(10)], key_field="note_id")
+        await db.batch_upsert("xhs_note_comment", [make_comment(i, i % 7) for i in range(20)], key_field="comment_id")
+        await db.item_to_table("xhs_note_comment", make_comment(100, 3))
+        for i in range(24):
+            await db.update_table("xhs_note", {"analysis_info": analysis(i)}, "note_id", f"x{i}")
+    finally:
+        await db.close()
+
+
+def expected_rows():
+    rows = {}
+    for i in range(30):
+        note = make_note(i)
+        key = (datetime.fromtimestamp(note["time"] / 1000).date().isoformat(), note["source_keyword"] or "")
+        row = rows.setdefault(key, {"content_count": 0, "comment_count": 0, "positive_count": 0,
+                                    "negative_count": 0, "neutral_count": 0, "unknown_count": 0})
+        row["content_count"] += 1
+        row["comment_count"] += sum(1 for c in range(20) if c % 7 == i) + (1 if i == 3 else 0)
+        if i < 24:
+            sentiment = SENTIMENTS[i % 4]
+            row[f"{sentiment if sentiment != 'mixed' else 'unknown'}_count"] += 1
+    return rows
+
+
+def rollup_rows(path: str):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return {(row["stat_date"], row["source_keyword"]): {
+            key: row[key] for key in ("content_count", "comment_count", "positive_count", "negative_count",
+                                      "neutral_count", "unknown_count")}
+            for row in conn.execute("SELECT * FROM content_daily_stats WHERE platform = 'xhs'")}
+    finally:
+        conn.close()
+
+
+class TestStatsRollup(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.db_path = os.path.join(cls.tmp_dir.name, "media_crawler.db")
+        asyncio.run(write_database(cls.db_path))
+        cls.engine = create_engine(f"sqlite:///{cls.db_path}")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.engine.dispose()
+        cls.tmp_dir.cleanup()
+
+    def service(self, use_rollup: bool = True) -> DataQueryService:
+        service = DataQueryService()
+        service.session = Session(self.engine)
+        self.addCleanup(service.session.close)
+        if not use_rollup:
+            service._stats_rollup_platforms = set()
+        return service
+
+    def test_incremental_refresh(self):
+        self.assertEqual(rollup_rows(self.db_path), expected_rows())
+
+    def test_rebuild_matches_incremental(self):
+        incremental = rollup_rows(self.db_path)
+        rebuild = StatsRollupRebuild(self.engine)
+        rebuild.ensure_tables()
+        self.assertEqual(rebuild.rebuild("xhs"), len({day for day, _ in incremental}))
+        self.assertEqual(rollup_rows(self.db_path), incremental)
+        self.assertEqual(rebuild.rebuild("douyin"), 0)
+
+    def test_dashboard_reads_rollup(self):
+        StatsRollupRebuild(self.engine).rebuild("xhs")
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", capture)
+        self.addCleanup(event.remove, self.engine, "before_cursor_execute", capture)
+
+        stats = self.service().get_platform_stats()
+        self.assertEqual(stats["xhs"], 30)
+        self.assertEqual(stats["xhs"], self.service(use_rollup=False).get_platform_stats()["xhs"])
+        ranges = [(NOW - timedelta(days=5, hours=3), NOW), (datetime(2025, 5, 29), NOW),
+                  (datetime(2025, 5, 27), datetime(2025, 5, 31)), (NOW - timedelta(hours=20), NOW)]
+        for start_time, end_time in ranges:
+            filters = SearchFilters(platforms=["xhs"], start_time=start_time, end_time=end_time)
+            self.assertEqual(self.service().get_sentiment_distribution(filters),
+                             self.service(use_rollup=False).get_sentiment_distribution(filters), start_time)
+        self.assertTrue(any(stats_rollup.STATS_ROLLUP_TABLE in statement for statement in statements))
+
+    def test_failed_flush_drops_rollup_state(self):
+        path = os.path.join(self.tmp_dir.name, "failed.db")
+        asyncio.run(write_database(path))
+
+        async def write_after_failure():
+            db = AsyncSqliteDB(path, text_index=False)
+            await db.open()
+            try:
+                tracker = stats_rollup.get_stats_rollup(db)
+                await db.execute(f"INSERT INTO `{stats_rollup.STATS_ROLLUP_STATE_TABLE}` (`platform`, `built_ts`) "
+                                 f"VALUES ('xhs', 0)")
+                # 汇总表缺失（例如 MySQL 没有执行建表脚本）时刷新失败
+                await db.execute(f"DROP TABLE `{stats_rollup.STATS_ROLLUP_TABLE}`")
+                await db.batch_upsert("xhs_note", [make_note(40)], key_field="note_id")
+                await tracker.flush()
+                self.assertFalse(tracker.enabled)
+                # 停止维护后才写入的平台同样删除汇总状态
+                await db.execute(f"INSERT INTO `{stats_rollup.STATS_ROLLUP_STATE_TABLE}` (`platform`, `built_ts`) "
+                                 f"VALUES ('douyin', 0)")
+                await stats_rollup.mark_written(db, "douyin_aweme", [{"aweme_id": "a1"}])
+                await tracker.flush()
+            finally:
+                await db.close()
+
+        asyncio.run(write_after_failure())
+        conn = sqlite3.connect(path)
+        self.addCleanup(conn.close)
+        self.assertEqual(conn.execute(f"SELECT COUNT(*) FROM {stats_rollup.STATS_ROLLUP_STATE_TABLE}").fetchone()[0], 0)
+
+    def test_analysis_job_refreshes_rollup(self):
+        path = os.path.join(self.tmp_dir.name, "analysis.db")
+        asyncio.run(write_database(path))
+        manager = DatabaseManager({"sqlite_path": path})
+        self.addCleanup(manager.engine.dispose)
+        result = AnalysisResult(content_id="x28", sentiment="positive", sentiment_score=0.9, summary="", keywords=[],
+                                category="", relevance_score=0.9, key_comment_ids=[], analysis_timestamp=0,
+                                model_version="test", content_length=0, comment_count=0)
+        self.assertEqual(manager.batch_update_analysis_results("xhs", [result]), 1)
+        note = make_note(28)
+        key = (datetime.fromtimestamp(note["time"] / 1000).date().isoformat(), note["source_keyword"] or "")
+        expected = expected_rows()[key]
+        self.assertEqual(rollup_rows(path)[key]["positive_count"], expected["positive_count"] + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 全文索引测试：SQLite 写入时增量更新 FTS5 表、已有数据建立索引、看板关键词搜索的结果和 LIKE 一致
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import IsolatedAsyncioTestCase
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from async_sqlite_db import AsyncSqliteDB
+from tools import text_index
+from web.database.connection import Base
+from web.database.models import XhsNote
+from web.database.queries import DataQueryService, SearchFilters
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+TITLES = ["华为手机评测", "小米手机降价了", "苹果电脑真好用", "华为平板上市", "今天天气不错", "手机壳推荐", "智能手机市场报告"]
+
+
+def make_note(i: int, title: str, desc: str = "") -> dict:
+    return {"note_id": f"n{i}", "type": "normal", "title": title, "desc": desc,
+            "time": int((NOW - timedelta(minutes=i)).timestamp() * 1000), "last_update_time": 0, "user_id": "u",
+            "nickname": "n", "liked_count": str(i), "collected_count": "0", "comment_count": "0", "share_count": "0",
+            "note_url": "", "add_ts": 0, "last_modify_ts": 0}
+
+
+def match_ids(conn: sqlite3.Connection, query: str):
+    return sorted(row[0] for row in conn.execute(
+        "SELECT n.note_id FROM xhs_note_fts f JOIN xhs_note n ON n.id = f.rowid WHERE f.tokens MATCH ?", (query,)))
+
+
+class TestTextIndexQuery(unittest.TestCase):
+
+    def test_tokenize_and_queries(self):
+        self.assertEqual(text_index.tokenize("华为手机，真好用！"), ["华为", "手机", "真好", "用"])
+        self.assertIn("智能手机", text_index.tokenize("智能手机"))
+        self.assertEqual(text_index.split_keywords("华为, 小米，苹果  手机"), ["华为", "小米", "苹果", "手机"])
+        self.assertEqual(text_index.build_fts_query(["华为手机", "小米"], "or"), '("华为" AND "手机") OR ("小米")')
+        self.assertEqual(text_index.build_fts_query(["华为", "！"], "and"), '("华为")')
+        self.assertEqual(text_index.build_boolean_query(["华为", 'a"b'], "and"), '+"华为" +"a b"')
+        self.assertEqual(text_index.build_boolean_query(["华为", "小米"]), '"华为" "小米"')
+
+
+class TestSqliteTextIndex(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "media_crawler.db")
+
+    async def asyncTearDown(self):
+        self.tmp_dir.cleanup()
+
+    async def test_writes_keep_index_in_sync(self):
+        db = AsyncSqliteDB(self.db_path)
+        await db.open()
+        try:
+            rows = await db.batch_upsert("xhs_note", [make_note(i, title) for i, title in enumerate(TITLES)])
+            self.assertEqual(rows, len(TITLES))
+            await db.batch_upsert("xhs_note", [make_note(0, "荣耀平板评测")])
+            await db.item_to_table("xhs_note", make_note(10, "华为耳机"))
+            await db.update_table("xhs_note", {"desc": "手机配件"}, "note_id", "n10")
+        finally:
+            await db.close()
+
+        conn = sqlite3.connect(self.db_path)
+        self.assertEqual(match_ids(conn, '"华为"'), ["n10", "n3"])
+        self.assertEqual(match_ids(conn, '"手机"'), ["n1", "n10", "n5", "n6"])
+        self.assertEqual(match_ids(conn, '"评测"'), ["n0"])
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM xhs_note_fts").fetchone()[0], len(TITLES) + 1)
+        conn.close()
+
+    async def test_rebuild_existing_rows(self):
+        db = AsyncSqliteDB(self.db_path, text_index=False)
+        await db.open()
+        await db.batch_upsert("xhs_note", [make_note(i, title) for i, title in enumerate(TITLES)])
+        await db.close()
+
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        self.assertEqual(text_index.ensure_text_index_tables(conn), ["xhs_note"])
+        self.assertEqual(text_index.rebuild_text_index(conn, "xhs_note", batch_size=3), len(TITLES))
+        self.assertEqual(text_index.ensure_text_index_tables(conn), [])
+        self.assertEqual(match_ids(conn, '"手机"'), ["n0", "n1", "n5", "n6"])
+        conn.close()
+
+
+class TestDashboardKeywordSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        path = os.path.join(self.tmp_dir.name, "dashboard.db")
+        self.engine = create_engine(f"sqlite:///{path}")
+        self.addCleanup(self.engine.dispose)
+        Base.metadata.create_all(self.engine, tables=[XhsNote.__table__])
+        with Session(self.engine) as session:
+            for i, title in enumerate(TITLES * 3):
+                session.add(XhsNote(**make_note(i, title, "华为" if i % 4 == 0 else "")))
+            session.commit()
+        conn = sqlite3.connect(path, isolation_level=None)
+        text_index.ensure_text_index_tables(conn)
+        text_index.rebuild_text_index(conn, "xhs_note")
+        conn.close()
+
+    def search(self, backend=None, **kwargs):
+        service = DataQueryService()
+        service.session = Session(self.engine)
+        if backend:
+            service._keyword_backends["xhs_note"] = backend
+        try:
+            items, total = service.search_content(SearchFilters(
+                platforms=["xhs"], start_time=NOW - timedelta(days=1), end_time=NOW, page_size=100, **kwargs))
+            return [item.content_id for item in items], total, service._keyword_backend(XhsNote, "xhs")
+        finally:
+            service.session.close()
+
+    def test_fts_matches_like(self):
+        for keywords, mode in (("手机", "or"), ("华为 手机", "and"), ("华为，电脑", "or"), ("华为手机", "or")):
+            ids, total, backend = self.search(keywords=keywords, keyword_mode=mode)
+            like_ids, like_total, _ = self.search(backend="like", keywords=keywords, keyword_mode=mode)
+            self.assertEqual(backend, "fts")
+            self.assertEqual(ids, like_ids, keywords)
+            self.assertEqual(total, like_total)
+            self.assertGreater(total, 0)
+
+    def test_relevance_sort(self):
+        ids, total, _ = self.search(keywords="华为", sort_by="relevance")
+        # 标题和正文都包含关键词的记录排在前面
+        both = {f"n{i}" for i, title in enumerate(TITLES * 3) if i % 4 == 0 and "华为" in title}
+        self.assertEqual(set(ids[:len(both)]), both)
+        self.assertEqual(len(ids), total)
+
+    def test_falls_back_to_like_without_index(self):
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(f"DELETE FROM {text_index.TEXT_INDEX_STATE_TABLE}")
+        ids, total, backend = self.search(keywords="手机")
+        self.assertEqual(backend, "like")
+        self.assertEqual(total, 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
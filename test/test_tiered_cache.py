@@ -0,0 +1,132 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 二级缓存测试：single-flight 加载、“不存在”结果缓存、Redis 共享与故障退化
+import asyncio
+from typing import Dict
+from unittest import IsolatedAsyncioTestCase, mock
+
+from cache.async_redis_cache import AsyncRedisCache
+from cache.local_cache import ExpiringLocalCache
+from cache.tiered_cache import TieredCache, close_tiered_cache, tiered_cached
+from test.fake_redis_server import FakeRedisServer
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = 0
+
+    @tiered_cached("test:creator:{user_id}", "CREATOR_INFO_CACHE_TTL_SEC")
+    async def get_creator_info(self, user_id: str) -> Dict:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return {"user_id": user_id}
+
+
+class TestTieredCache(IsolatedAsyncioTestCase):
+
+    async def asyncTearDown(self):
+        await close_tiered_cache()
+
+    def make_cache(self, remote=None, negative_ttl: int = 30) -> TieredCache:
+        return TieredCache(local=ExpiringLocalCache(max_size=0), remote=remote, negative_ttl=negative_ttl)
+
+    async def test_single_flight(self):
+        client = FakeClient()
+        results = await asyncio.gather(*[client.get_creator_info("u1") for _ in range(20)])
+        self.assertEqual(client.calls, 1)
+        self.assertTrue(all(result == {"user_id": "u1"} for result in results))
+        # 返回的是拷贝，修改不影响缓存
+        results[0]["user_id"] = "changed"
+        self.assertEqual(await client.get_creator_info("u1"), {"user_id": "u1"})
+        self.assertEqual(client.calls, 1)
+
+    async def test_negative_cache(self):
+        cache = self.make_cache(negative_ttl=30)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return None
+
+        self.assertIsNone(await cache.get_or_load("missing", loader, 3600))
+        self.assertIsNone(await cache.get_or_load("missing", loader, 3600))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats["negative_hits"], 1)
+
+        # negative_ttl=0：空结果可能只是被限流，不缓存
+        self.assertIsNone(await cache.get_or_load("throttled", loader, 3600, negative_ttl=0))
+        self.assertIsNone(await cache.get_or_load("throttled", loader, 3600, negative_ttl=0))
+        self.assertEqual(len(calls), 3)
+
+    async def test_loader_error_shared_and_not_cached(self):
+        cache = self.make_cache()
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(*[cache.get_or_load("k", failing, 60) for _ in range(5)],
+                                       return_exceptions=True)
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+        async def ok():
+            return {"v": 1}
+
+        self.assertEqual(await cache.get_or_load("k", ok, 60), {"v": 1})
+
+    async def test_cancelled_leader_hands_over(self):
+        cache = self.make_cache()
+
+        async def slow():
+            await asyncio.sleep(10)
+
+        async def fast():
+            return "value"
+
+        leader = asyncio.ensure_future(cache.get_or_load("k", slow, 60))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.get_or_load("k", fast, 60))
+        await asyncio.sleep(0)
+        leader.cancel()
+        self.assertEqual(await waiter, "value")
+
+    async def test_shared_through_redis(self):
+        server = await FakeRedisServer().start()
+        self.addAsyncCleanup(server.stop)
+        remotes = [AsyncRedisCache(host="127.0.0.1", port=server.port, password="") for _ in range(2)]
+        first, second = self.make_cache(remotes[0]), self.make_cache(remotes[1])
+        self.addAsyncCleanup(first.close)
+        self.addAsyncCleanup(second.close)
+
+        async def loader():
+            return {"nickname": "程序员阿江"}
+
+        await first.get_or_load("creator:1", loader, 3600)
+        # 另一个进程（这里是另一个实例）直接从 Redis 读到
+        self.assertEqual(await second.get_or_load("creator:1", mock.AsyncMock(), 3600), {"nickname": "程序员阿江"})
+        self.assertEqual(second.stats["remote_hits"], 1)
+
+    async def test_remote_failure_falls_back_to_local(self):
+        remote = AsyncRedisCache(host="127.0.0.1", port=1, password="")
+        cache = self.make_cache(remote)
+
+        async def loader():
+            return [1, 2]
+
+        self.assertEqual(await cache.get_or_load("k", loader, 60), [1, 2])
+        self.assertEqual(await cache.get("k"), [1, 2])
+        self.assertGreater(cache.stats["remote_errors"], 0)
+        await cache.close()
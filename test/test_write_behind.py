@@ -0,0 +1,158 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 写缓冲存储测试，被包装的存储写在内存里，可以模拟写入延迟和失败
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List
+from unittest import IsolatedAsyncioTestCase, mock
+
+from base.base_crawler import AbstractStore
+from store import write_behind
+from store.write_behind import WriteBehindStore, get_write_behind_store
+
+WRITE_DELAY = 0.05
+
+
+class MemoryStore(AbstractStore):
+
+    def __init__(self, delay: float = 0, failures: int = 0):
+        self.delay = delay
+        self.failures = failures
+        self.contents: List[Dict] = []
+        self.comments: List[Dict] = []
+        self.creators: List[Dict] = []
+        self.batches: List[int] = []
+
+    async def _write(self, target: List[Dict], items: List[Dict]):
+        await asyncio.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("db gone away")
+        target.extend(items)
+        self.batches.append(len(items))
+
+    async def store_content(self, content_item: Dict):
+        await self._write(self.contents, [content_item])
+
+    async def store_contents(self, content_items: List[Dict]):
+        await self._write(self.contents, content_items)
+
+    async def store_comment(self, comment_item: Dict):
+        await self._write(self.comments, [comment_item])
+
+    async def store_comments(self, comment_items: List[Dict]):
+        await self._write(self.comments, comment_items)
+
+    async def store_creator(self, creator: Dict):
+        await self._write(self.creators, [creator])
+
+
+class TestWriteBehindStore(IsolatedAsyncioTestCase):
+
+    async def test_writes_do_not_wait_for_storage(self):
+        memory_store = MemoryStore(delay=WRITE_DELAY)
+        store = WriteBehindStore(memory_store, batch_size=10, flush_interval=10)
+        start = time.perf_counter()
+        for i in range(100):
+            await store.store_content({"id": i})
+        # 直接写入需要 100 * WRITE_DELAY
+        self.assertLess(time.perf_counter() - start, WRITE_DELAY)
+
+        await store.drain()
+        self.assertEqual([item["id"] for item in memory_store.contents], list(range(100)))
+
+    async def test_flush_on_size_and_drain(self):
+        memory_store = MemoryStore()
+        store = WriteBehindStore(memory_store, batch_size=10, flush_interval=10)
+        await store.store_comments([{"id": i} for i in range(25)])
+        await asyncio.sleep(0.01)
+        self.assertEqual(memory_store.batches, [10, 10])
+
+        await store.drain()
+        self.assertEqual(memory_store.batches, [10, 10, 5])
+        metrics = store.metrics()["comments"]
+        self.assertEqual(metrics["flushes"], 3)
+        self.assertEqual(metrics["max_batch_size"], 10)
+        self.assertEqual(metrics["pending"], 0)
+
+    async def test_flush_on_interval(self):
+        memory_store = MemoryStore()
+        store = WriteBehindStore(memory_store, batch_size=100, flush_interval=0.05)
+        await store.store_creator({"id": 1})
+        await store.store_creator({"id": 2})
+        await asyncio.sleep(0.15)
+        self.assertEqual(len(memory_store.creators), 2)
+        self.assertGreaterEqual(store.metrics()["creators"]["last_lag"], 0.04)
+        await store.drain()
+
+    async def test_retry_failed_flush(self):
+        memory_store = MemoryStore(failures=2)
+        dead_letter_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(dead_letter_dir.cleanup)
+        store = WriteBehindStore(memory_store, name="memory", batch_size=5, flush_interval=10, max_retries=3,
+                                 retry_backoff=0.01, dead_letter_dir=dead_letter_dir.name)
+        await store.store_contents([{"id": i} for i in range(5)])
+        await store.drain()
+        self.assertEqual(len(memory_store.contents), 5)
+        self.assertEqual(store.metrics()["contents"]["retries"], 2)
+        self.assertEqual(store.metrics()["contents"]["failed_items"], 0)
+
+        memory_store.failures = 10
+        await store.store_contents([{"id": i} for i in range(5)])
+        await store.drain()
+        self.assertEqual(len(memory_store.contents), 5)
+        self.assertEqual(store.metrics()["contents"]["failed_items"], 5)
+        # 重试仍失败的批次进入死信列表和死信文件
+        self.assertEqual(store.dead_letters, [("contents", [{"id": i} for i in range(5)])])
+        with open(os.path.join(dead_letter_dir.name, "memory_contents.jsonl"), encoding="utf-8") as f:
+            self.assertEqual([json.loads(line) for line in f], [{"id": i} for i in range(5)])
+
+    async def test_drain_all_reports_failures(self):
+        dead_letter_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(dead_letter_dir.cleanup)
+        with mock.patch("config.ENABLE_WRITE_BEHIND_STORE", True), \
+                mock.patch("config.WRITE_BEHIND_MAX_RETRIES", 0), \
+                mock.patch("config.WRITE_BEHIND_DEAD_LETTER_DIR", dead_letter_dir.name):
+            store = get_write_behind_store("test_failing", MemoryStore)
+            store.store.failures = 1
+            await store.store_comments([{"id": 1}, {"id": 2}])
+            self.assertEqual(await write_behind.drain_all(), {"test_failing": 2})
+            self.assertTrue(os.path.exists(os.path.join(dead_letter_dir.name, "test_failing_comments.jsonl")))
+            self.assertEqual(await write_behind.drain_all(), {})
+
+    async def test_back_pressure(self):
+        memory_store = MemoryStore(delay=0.01)
+        store = WriteBehindStore(memory_store, batch_size=5, flush_interval=10, max_pending=10)
+        max_pending = 0
+        for i in range(50):
+            await store.store_content({"id": i})
+            max_pending = max(max_pending, store._pending)
+        self.assertLessEqual(max_pending, 10)
+        await store.drain()
+        self.assertEqual(len(memory_store.contents), 50)
+
+    async def test_factory_shares_store_until_drained(self):
+        with mock.patch("config.ENABLE_WRITE_BEHIND_STORE", True):
+            store = get_write_behind_store("test_memory", MemoryStore)
+            self.assertIs(get_write_behind_store("test_memory", MemoryStore), store)
+            await store.store_content({"id": 1})
+            self.assertEqual(await write_behind.drain_all(), {})
+            self.assertEqual(store.store.contents, [{"id": 1}])
+            self.assertIsNot(get_write_behind_store("test_memory", MemoryStore), store)
+            await write_behind.drain_all()
+
+        with mock.patch("config.ENABLE_WRITE_BEHIND_STORE", False):
+            self.assertIsInstance(get_write_behind_store("test_memory", MemoryStore), MemoryStore)
@@ -0,0 +1,221 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 分阶段的生产者/消费者抓取流水线
+#            搜索翻页、详情、存储、媒体、评论各阶段之间用有界 asyncio.Queue 连接，各阶段独立设置 worker 数，
+#            阶段之间可以重叠执行；下游处理不过来时队列写满，上游自然被阻塞（背压），内存占用有上限。
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from tools import utils
+
+# handler(item) -> 传给下一阶段的 item，返回 None 表示丢弃（例如去重命中）
+StageHandler = Callable[[Any], Awaitable[Any]]
+# on_finished(meta, error)：item 离开流水线（处理完成、被丢弃或失败）时回调
+FinishedCallback = Callable[[Any, Optional[BaseException]], Awaitable[None]]
+
+_STOP = object()
+
+
+class _Envelope:
+    __slots__ = ("payload", "meta")
+
+    def __init__(self, payload: Any, meta: Any):
+        self.payload = payload
+        self.meta = meta
+
+
+class PipelineStage:
+    """
+    流水线中的一个阶段
+    """
+
+    def __init__(self, name: str, handler: StageHandler, workers: int = 1, queue_size: Optional[int] = None):
+        """
+        Args:
+            name: 阶段名称，用于日志和指标
+            handler: 处理函数
+            workers: 并发 worker 数量
+            queue_size: 输入队列容量，默认是 worker 数量的 2 倍
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or self.workers * 2)
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+
+    def metrics(self, elapsed: float) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "throughput": round(self.processed / elapsed, 2) if elapsed > 0 else 0.0,
+            "utilization": round(self.busy_seconds / (elapsed * self.workers), 2) if elapsed > 0 else 0.0,
+        }
+
+
+class CrawlPipeline:
+    """
+    用法：
+        pipeline = CrawlPipeline([
+            PipelineStage("detail", fetch_detail, workers=4),
+            PipelineStage("store", store, workers=1),
+        ], on_finished=on_finished)
+        async with pipeline:
+            for item in page_items:
+                await pipeline.put(item, meta=page)  # 第一个阶段的队列写满时阻塞
+        print(pipeline.metrics())
+    """
+
+    def __init__(
+        self,
+        stages: List[PipelineStage],
+        on_finished: Optional[FinishedCallback] = None,
+        name: str = "CrawlPipeline",
+        metrics_interval: Optional[float] = None,
+    ):
+        """
+        Args:
+            stages: 按顺序排列的阶段
+            on_finished: item 离开流水线时的回调
+            name: 流水线名称，用于日志
+            metrics_interval: 定期打印指标的间隔（秒），None 表示不打印
+        """
+        if not stages:
+            raise ValueError("CrawlPipeline needs at least one stage")
+        self.stages = stages
+        self.on_finished = on_finished
+        self.name = name
+        self.metrics_interval = metrics_interval
+        self._tasks: List[asyncio.Task] = []
+        self._metrics_task: Optional[asyncio.Task] = None
+        self._started_at = 0.0
+        self._finished_at: Optional[float] = None
+
+    async def start(self):
+        self._started_at = time.monotonic()
+        for index, stage in enumerate(self.stages):
+            for _ in range(stage.workers):
+                self._tasks.append(asyncio.create_task(self._worker(index)))
+        if self.metrics_interval:
+            self._metrics_task = asyncio.create_task(self._report_metrics())
+
+    async def put(self, payload: Any, meta: Any = None):
+        """
+        向第一个阶段投递 item，队列满时等待（背压）
+        """
+        await self._put(0, _Envelope(payload, meta))
+
+    async def _put(self, index: int, envelope: _Envelope):
+        stage = self.stages[index]
+        await stage.queue.put(envelope)
+        stage.max_queue_depth = max(stage.max_queue_depth, stage.queue.qsize())
+
+    async def _finish(self, envelope: _Envelope, error: Optional[BaseException] = None):
+        if self.on_finished is not None:
+            try:
+                await self.on_finished(envelope.meta, error)
+            except Exception as e:
+                utils.logger.error(f"[{self.name}] on_finished callback error: {e}")
+
+    async def _worker(self, index: int):
+        stage = self.stages[index]
+        is_last = index == len(self.stages) - 1
+        while True:
+            envelope = await stage.queue.get()
+            try:
+                if envelope is _STOP:
+                    return
+                start = time.monotonic()
+                try:
+                    result = await stage.handler(envelope.payload)
+                except Exception as e:
+                    stage.failed += 1
+                    utils.logger.error(f"[{self.name}] stage {stage.name} error: {e}")
+                    await self._finish(envelope, e)
+                    continue
+                finally:
+                    stage.busy_seconds += time.monotonic() - start
+                if result is None:
+                    stage.dropped += 1
+                    await self._finish(envelope)
+                    continue
+                stage.processed += 1
+                envelope.payload = result
+                if is_last:
+                    await self._finish(envelope)
+                else:
+                    await self._put(index + 1, envelope)
+            finally:
+                stage.queue.task_done()
+
+    async def join(self):
+        """
+        等待所有已投递的 item 处理完毕并停止 worker，阶段按顺序排空
+        """
+        for stage in self.stages:
+            await stage.queue.join()
+            for _ in range(stage.workers):
+                stage.queue.put_nowait(_STOP)
+        await asyncio.gather(*self._tasks)
+        self._tasks = []
+        await self._stop_metrics()
+        self._finished_at = time.monotonic()
+
+    async def cancel(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._stop_metrics()
+        self._finished_at = time.monotonic()
+
+    async def _stop_metrics(self):
+        if self._metrics_task is not None:
+            self._metrics_task.cancel()
+            await asyncio.gather(self._metrics_task, return_exceptions=True)
+            self._metrics_task = None
+
+    async def _report_metrics(self):
+        while True:
+            await asyncio.sleep(self.metrics_interval)
+            self.log_metrics()
+
+    async def __aenter__(self) -> "CrawlPipeline":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            await self.join()
+        else:
+            await self.cancel()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        各阶段的吞吐（processed/s）、利用率、队列深度等指标
+        """
+        elapsed = (self._finished_at or time.monotonic()) - self._started_at
+        return {stage.name: stage.metrics(elapsed) for stage in self.stages}
+
+    def log_metrics(self):
+        for stage_name, stage_metrics in self.metrics().items():
+            utils.logger.info(f"[{self.name}] stage {stage_name}: {stage_metrics}")
@@ -0,0 +1,273 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 长连接复用的 HTTP 传输层，供各平台 API client 共享使用
+#            传入代理轮换器（proxy/proxy_rotator.py）时每次请求由轮换器选择代理，代理出错或被限流时隔离该代理并换代理重试
+
+import inspect
+import time
+from contextlib import asynccontextmanager
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Optional, Set, Union
+
+import httpx
+
+import config
+from tools import utils
+from tools.rate_limiter import THROTTLE_STATUS_CODES, RequestScheduler
+
+if TYPE_CHECKING:
+    from proxy.proxy_rotator import ProxyRotator
+
+# httpx 0.26 之后用 proxy 参数替代了 proxies
+_PROXY_KWARG = "proxy" if "proxy" in inspect.signature(httpx.AsyncClient.__init__).parameters else "proxies"
+
+_NO_PROXY_KEY = "__direct__"
+
+# 开启代理轮换时，请求使用的代理（IpInfoModel）记录在 response.extensions 中
+PROXY_EXTENSION_KEY = "media_crawler_proxy"
+
+# 换代理重试的错误：连接不上代理、代理返回错误、超时
+_PROXY_ERRORS = (httpx.ProxyError, httpx.ConnectError, httpx.TimeoutException)
+
+
+def format_httpx_proxy(proxies: Union[str, Dict[str, str], None]) -> Optional[str]:
+    """
+    将各平台 client 中的 proxies 参数（dict 或 str）统一转换为代理 URL
+    Args:
+        proxies: {"https://": "http://user:pwd@ip:port"} 或 "http://user:pwd@ip:port"
+
+    Returns:
+
+    """
+    if not proxies:
+        return None
+    if isinstance(proxies, dict):
+        return list(proxies.values())[0]
+    return proxies
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HttpTransport:
+    """
+    每个 API client 持有一个 HttpTransport，内部按代理维护长连接的 httpx.AsyncClient，
+    请求之间复用 TCP/TLS 连接（keep-alive），避免每次请求都重新握手。
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10,
+        http2: Optional[bool] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        rotator: Optional["ProxyRotator"] = None,
+        **client_kwargs: Any,
+    ):
+        """
+        Args:
+            timeout: 默认超时时间
+            http2: 是否启用 HTTP/2，默认读取 config.ENABLE_HTTP2
+            max_connections: 连接池最大连接数
+            max_keepalive_connections: 连接池最大空闲长连接数
+            keepalive_expiry: 空闲长连接的过期时间（秒）
+            scheduler: 请求调度器（限速/并发控制），平台 client 传入 get_request_scheduler()，None 表示不限速
+            rotator: 代理轮换器，平台 client 传入 get_proxy_rotator()，不为 None 时忽略 request 的 proxy 参数
+            client_kwargs: 透传给 httpx.AsyncClient 的其他参数，例如 follow_redirects、cookies
+        """
+        self.timeout = timeout
+        self.http2 = config.ENABLE_HTTP2 if http2 is None else http2
+        if self.http2 and not _http2_available():
+            utils.logger.warning("[HttpTransport] HTTP/2 需要安装 h2 依赖（pip install httpx[http2]），已回退到 HTTP/1.1")
+            self.http2 = False
+        self.limits = httpx.Limits(
+            max_connections=max_connections or config.HTTP_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=max_keepalive_connections or config.HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=keepalive_expiry or config.HTTP_POOL_KEEPALIVE_EXPIRY,
+        )
+        self.scheduler = scheduler
+        self.rotator = rotator
+        # sticky 轮换模式下默认每个 transport（即每个平台 client / 账号）一个会话
+        self.session_key = f"transport-{id(self)}"
+        self._client_kwargs = client_kwargs
+        # 代理 -> client，按最近使用排序，超过 config.HTTP_POOL_MAX_PROXY_CLIENTS 时淘汰最久未使用的
+        self._clients: "OrderedDict[str, httpx.AsyncClient]" = OrderedDict()
+        # client -> 正在使用它的请求数
+        self._in_flight: Dict[httpx.AsyncClient, int] = {}
+        # 已经移出 _clients、等上面的请求结束后再关闭的 client，直接关闭会让其他协程的请求报 ReadError
+        self._retired: Set[httpx.AsyncClient] = set()
+
+    def get_client(self, proxy: Optional[str] = None) -> httpx.AsyncClient:
+        """
+        获取指定代理对应的长连接 client，不存在则创建
+        Args:
+            proxy: 代理 URL，None 表示直连
+
+        Returns:
+
+        """
+        key = proxy or _NO_PROXY_KEY
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            kwargs = dict(self._client_kwargs)
+            if proxy:
+                kwargs[_PROXY_KWARG] = proxy
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                **kwargs,
+            )
+            self._clients[key] = client
+            while len(self._clients) > config.HTTP_POOL_MAX_PROXY_CLIENTS:
+                _, evicted = self._clients.popitem(last=False)
+                self._retired.add(evicted)
+        self._clients.move_to_end(key)
+        return client
+
+    @asynccontextmanager
+    async def _use_client(self, proxy: Optional[str]) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        在一次请求期间占用代理对应的 client，请求结束后关闭已经淘汰且没有其他请求在用的 client
+        """
+        client = self.get_client(proxy)
+        self._in_flight[client] = self._in_flight.get(client, 0) + 1
+        try:
+            yield client
+        finally:
+            count = self._in_flight.pop(client) - 1
+            if count:
+                self._in_flight[client] = count
+            await self._close_retired()
+
+    async def _close_retired(self):
+        idle = [client for client in self._retired if client not in self._in_flight]
+        for client in idle:
+            self._retired.discard(client)
+            await client.aclose()
+
+    async def request(
+        self, method: str, url: str, proxy: Optional[str] = None, endpoint: Optional[str] = None,
+        session_key: Optional[str] = None, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        发起请求，连接由对应代理的连接池复用
+        Args:
+            method: 请求方法
+            url: 请求 URL
+            proxy: 代理 URL，None 表示直连
+            endpoint: 接口类型（search/detail/comments/media），用于限速，默认根据 URL 判断
+            session_key: sticky 轮换模式下的会话标识，默认每个 transport 一个会话
+            **kwargs: 透传给 httpx.AsyncClient.request 的参数
+
+        Returns:
+
+        """
+        if self.rotator is not None:
+            return await self._rotating_request(method, url, endpoint, session_key or self.session_key, **kwargs)
+        return await self._request(method, url, proxy, endpoint, **kwargs)
+
+    async def _rotating_request(
+        self, method: str, url: str, endpoint: Optional[str], session_key: str, **kwargs: Any
+    ) -> httpx.Response:
+        for attempt in range(self.rotator.max_retries + 1):
+            last_attempt = attempt >= self.rotator.max_retries
+            ip_info = await self.rotator.acquire(session_key)
+            proxy = self.rotator.proxy_url(ip_info)
+            start = time.monotonic()
+            try:
+                response = await self._request(method, url, proxy, endpoint, **kwargs)
+            except _PROXY_ERRORS as e:
+                self.rotator.quarantine(ip_info, f"{type(e).__name__}: {e}")
+                await self.close_proxy(proxy)
+                if last_attempt:
+                    raise
+                self.rotator.stats["retries"] += 1
+                continue
+            response.extensions[PROXY_EXTENSION_KEY] = ip_info
+            if response.status_code in THROTTLE_STATUS_CODES:
+                self.rotator.quarantine(ip_info, f"status code {response.status_code}")
+                if not last_attempt:
+                    self.rotator.stats["retries"] += 1
+                    continue
+                return response
+            self.rotator.report_success(ip_info, time.monotonic() - start)
+            return response
+
+    async def _request(
+        self, method: str, url: str, proxy: Optional[str], endpoint: Optional[str], **kwargs: Any
+    ) -> httpx.Response:
+        if self.scheduler is None:
+            async with self._use_client(proxy) as client:
+                return await client.request(method, url, **kwargs)
+        async with self.scheduler.slot(url, endpoint) as slot:
+            async with self._use_client(proxy) as client:
+                response = await client.request(method, url, **kwargs)
+            slot.observe(response)
+            return response
+
+    @asynccontextmanager
+    async def stream(
+        self, method: str, url: str, proxy: Optional[str] = None, endpoint: Optional[str] = None, **kwargs: Any
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        流式请求，用法：async with transport.stream("GET", url) as response: ...
+        """
+        if self.scheduler is None:
+            async with self._use_client(proxy) as client, client.stream(method, url, **kwargs) as response:
+                yield response
+            return
+        async with self.scheduler.slot(url, endpoint) as slot:
+            async with self._use_client(proxy) as client, client.stream(method, url, **kwargs) as response:
+                slot.observe(response, check_body=False)
+                yield response
+
+    def report_throttled(self, url: str):
+        """
+        上报业务层识别出的限流信号（例如接口返回 IP 封禁错误码）
+        """
+        if self.scheduler is not None:
+            self.scheduler.report_throttled(url)
+
+    def report_proxy_blocked(self, response: httpx.Response, reason: str = "ip blocked"):
+        """
+        业务层识别出 IP 被封（例如平台 client 抛出 IPBlockError 前）时调用，隔离该响应使用的代理，下次请求换代理
+        """
+        ip_info = response.extensions.get(PROXY_EXTENSION_KEY)
+        if self.rotator is not None and ip_info is not None:
+            self.rotator.quarantine(ip_info, reason)
+
+    async def close_proxy(self, proxy: Optional[str]):
+        """
+        关闭某个代理对应的连接池（例如代理失效后），还有请求在使用时等这些请求结束后再关闭
+        """
+        client = self._clients.pop(proxy or _NO_PROXY_KEY, None)
+        if client is not None:
+            self._retired.add(client)
+            await self._close_retired()
+
+    async def aclose(self):
+        """
+        关闭所有连接池
+        """
+        clients = list(self._clients.values()) + list(self._retired)
+        self._clients, self._retired = OrderedDict(), set()
+        for client in clients:
+            await client.aclose()
@@ -0,0 +1,283 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 常驻 JS 签名进程池
+#            PyExecJS 的 Node 运行时每次 call 都会新起一个 node 进程，单次签名需要几十到上百毫秒。
+#            这里为每个签名脚本维护若干常驻 node 进程（libs/sign_worker.js），通过 stdin/stdout 传输 JSON，
+#            并提供异步包装，签名计算不再占用事件循环线程。
+
+import asyncio
+import atexit
+import json
+import os
+import queue
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import execjs
+
+import config
+from tools import utils
+
+SIGN_WORKER_JS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "libs", "sign_worker.js")
+
+
+class JsSignError(Exception):
+    """js sign error"""
+
+
+class JsSignTimeoutError(JsSignError):
+    """js sign timeout"""
+
+
+class _NodeSignWorker:
+    """
+    一个常驻 node 进程，同一时间只处理一个请求（由 JsSignPool 保证）
+    """
+
+    def __init__(self, node_path: str, script_path: str, timeout: Optional[float] = None):
+        """
+        Args:
+            node_path: node 可执行文件路径
+            script_path: 签名脚本路径
+            timeout: 等待一次响应的最长时间（秒），默认读取 config.JS_SIGN_TIMEOUT_SEC
+        """
+        self.node_path = node_path
+        self.script_path = script_path
+        self.timeout = config.JS_SIGN_TIMEOUT_SEC if timeout is None else timeout
+        self._seq = 0
+        self._proc: Optional[subprocess.Popen] = None
+        self._timed_out = False
+        self._start()
+
+    def _start(self):
+        self._timed_out = False
+        self._proc = subprocess.Popen(
+            [self.node_path, SIGN_WORKER_JS, self.script_path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        ready = self._read()
+        if ready.get("result") != "ready":
+            raise JsSignError(f"[JsSignWorker] start sign worker for {self.script_path} failed: {ready}")
+
+    def _kill_hung(self, proc: subprocess.Popen):
+        self._timed_out = True
+        proc.kill()
+
+    def _read(self) -> Dict:
+        # readline 在签名线程中阻塞执行，无法被取消；超时后杀掉卡住的 node 进程，readline 随即返回
+        timer = threading.Timer(self.timeout, self._kill_hung, args=(self._proc,))
+        timer.daemon = True
+        timer.start()
+        try:
+            line = self._proc.stdout.readline()
+        finally:
+            timer.cancel()
+        if self._timed_out:
+            raise JsSignTimeoutError(f"[JsSignWorker] sign worker for {self.script_path} "
+                                     f"no response in {self.timeout}s")
+        if not line:
+            raise JsSignError(f"[JsSignWorker] sign worker for {self.script_path} exited")
+        return json.loads(line)
+
+    def _send(self, payload: Dict) -> Any:
+        self._seq += 1
+        payload["id"] = self._seq
+        self._proc.stdin.write(json.dumps(payload, ensure_ascii=False) + "\n")
+        self._proc.stdin.flush()
+        response = self._read()
+        if response.get("error"):
+            raise JsSignError(response["error"])
+        return response.get("result")
+
+    def send(self, payload: Dict) -> Any:
+        """
+        发送一次请求，进程意外退出时自动重启并重试一次
+        """
+        if self._proc.poll() is not None or self._timed_out:
+            self._start()
+        try:
+            return self._send(payload)
+        except JsSignTimeoutError:
+            # 卡住的请求重试大概率同样卡住，重启进程后直接报错，下一次请求使用新进程
+            utils.logger.warning(f"[JsSignWorker] sign worker for {self.script_path} timed out, restart it")
+            self._proc.wait()
+            self._start()
+            raise
+        except (BrokenPipeError, JsSignError) as e:
+            if self._proc.poll() is None:
+                raise
+            utils.logger.warning(f"[JsSignWorker] sign worker exited, restart it: {e}")
+            self._start()
+            return self._send(payload)
+
+    def close(self):
+        if self._proc and self._proc.poll() is None:
+            self._proc.stdin.close()
+            self._proc.terminate()
+            self._proc.wait(timeout=5)
+
+
+class _ExecJsSignWorker:
+    """
+    没有安装 node 时的兜底实现，沿用 PyExecJS 的默认运行时
+    """
+
+    def __init__(self, script_path: str):
+        with open(script_path, mode="r", encoding="utf-8-sig") as f:
+            self._ctx = execjs.compile(f.read())
+
+    def send(self, payload: Dict) -> Any:
+        if "batch" in payload:
+            return [self._ctx.call(payload["fn"], *args) for args in payload["batch"]]
+        return self._ctx.call(payload["fn"], *payload.get("args", []))
+
+    def close(self):
+        pass
+
+
+class JsSignPool:
+    """
+    签名进程池，线程安全
+    用法：
+        pool = get_js_sign_pool("libs/douyin.js")
+        pool.call("sign_datail", params, user_agent)
+        await pool.async_call("sign_datail", params, user_agent)
+        pool.sign_many("sign_reply", [(params1, ua), (params2, ua)])
+    """
+
+    def __init__(self, script_path: str, size: Optional[int] = None, node_path: Optional[str] = None):
+        """
+        Args:
+            script_path: 签名脚本路径，例如 libs/douyin.js
+            size: 常驻进程数量，默认读取 config.JS_SIGN_POOL_SIZE
+            node_path: node 可执行文件路径，默认从 PATH 中查找
+        """
+        self.script_path = os.path.abspath(script_path)
+        self.size = max(1, size or config.JS_SIGN_POOL_SIZE)
+        self.node_path = node_path or shutil.which("node")
+        self._idle: "queue.Queue" = queue.Queue()
+        self._workers: List = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="js_sign")
+        if not self.node_path:
+            utils.logger.warning("[JsSignPool] node not found, fall back to PyExecJS runtime")
+
+    def _new_worker(self):
+        if self.node_path:
+            return _NodeSignWorker(self.node_path, self.script_path)
+        return _ExecJsSignWorker(self.script_path)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            # 按需启动进程，最多 size 个
+            if len(self._workers) < self.size:
+                worker = self._new_worker()
+                self._workers.append(worker)
+                return worker
+        return self._idle.get()
+
+    def _execute(self, payload: Dict) -> Any:
+        worker = self._acquire()
+        try:
+            return worker.send(payload)
+        finally:
+            self._idle.put(worker)
+
+    def call(self, fn: str, *args: Any) -> Any:
+        """
+        同步调用签名函数
+        """
+        return self._execute({"fn": fn, "args": list(args)})
+
+    def sign_many(self, fn: str, args_list: Sequence[Sequence[Any]]) -> List[Any]:
+        """
+        批量签名，按进程数切分后并行计算，结果顺序与 args_list 一致
+        """
+        args_list = [list(args) for args in args_list]
+        if not args_list:
+            return []
+        chunk_size = (len(args_list) + self.size - 1) // self.size
+        chunks = [args_list[i:i + chunk_size] for i in range(0, len(args_list), chunk_size)]
+        futures = [self._executor.submit(self._execute, {"fn": fn, "batch": chunk}) for chunk in chunks]
+        results: List[Any] = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    async def async_call(self, fn: str, *args: Any) -> Any:
+        """
+        异步调用签名函数，签名在线程池中执行，不阻塞事件循环
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.call, fn, *args)
+
+    async def async_sign_many(self, fn: str, args_list: Sequence[Sequence[Any]]) -> List[Any]:
+        """
+        异步批量签名
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.sign_many, fn, args_list)
+
+    def close(self):
+        with self._lock:
+            workers, self._workers = self._workers, []
+        self._idle = queue.Queue()
+        for worker in workers:
+            worker.close()
+        self._executor.shutdown(wait=False)
+
+
+_sign_pools: Dict[str, JsSignPool] = {}
+_sign_pools_lock = threading.Lock()
+
+
+def get_js_sign_pool(script_path: str) -> JsSignPool:
+    """
+    获取签名脚本对应的全局进程池（进程按需启动）
+    Args:
+        script_path: 签名脚本路径
+
+    Returns:
+
+    """
+    key = os.path.abspath(script_path)
+    with _sign_pools_lock:
+        pool = _sign_pools.get(key)
+        if pool is None:
+            pool = JsSignPool(key)
+            _sign_pools[key] = pool
+        return pool
+
+
+@atexit.register
+def close_all_sign_pools():
+    """
+    关闭所有签名进程
+    """
+    with _sign_pools_lock:
+        pools = list(_sign_pools.values())
+        _sign_pools.clear()
+    for pool in pools:
+        pool.close()
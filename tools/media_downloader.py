@@ -0,0 +1,364 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 媒体文件（图片、视频）下载，xhs、weibo、douyin、bilibili 共用
+#            - 下载任务进入有界队列，由 MEDIA_DOWNLOAD_WORKERS 个后台 worker 执行，队列满时提交方等待（背压）
+#            - 响应体按块流式写入临时文件（.part），不在内存中保存完整文件；中断后重试时用 HTTP Range 从已下载的位置续传
+#            - 下载完成后按 SHA-256 存入 MEDIA_STORE_PATH/ab/abcd....jpg，再硬链接到各平台原来的保存路径，
+#              不同笔记中相同的图片只保存一份（不支持硬链接的文件系统回退为复制）
+#            - 记录每个文件的大小、耗时和吞吐量，退出前调用 drain_media_downloader 等待队列中的任务完成
+
+import asyncio
+import hashlib
+import os
+import re
+import shutil
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import httpx
+
+import config
+from tools import utils
+from tools.http_transport import HttpTransport
+from tools.rate_limiter import ENDPOINT_MEDIA, get_request_scheduler
+
+
+class MediaDownloadError(Exception):
+    """
+    下载失败，retryable 为 False 时（例如 404）不再重试
+    """
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+@dataclass
+class MediaDownloadJob:
+    url: str
+    save_path: str
+    headers: Optional[Dict[str, str]] = None
+    proxy: Optional[str] = None
+
+
+@dataclass
+class MediaDownloadResult:
+    url: str
+    save_path: str
+    blob_path: str
+    sha256: str
+    size: int
+    # 本次从网络下载的字节数，不包括续传前已下载的部分
+    downloaded_bytes: int
+    resumed_bytes: int
+    seconds: float
+    deduplicated: bool
+
+    @property
+    def throughput(self) -> float:
+        """
+        下载速度（字节/秒）
+        """
+        return self.downloaded_bytes / self.seconds if self.seconds > 0 else 0.0
+
+
+_CONTENT_RANGE_START = re.compile(r"bytes\s+(\d+)-")
+
+
+def _content_range_start(response: httpx.Response) -> Optional[int]:
+    """
+    206 响应 Content-Range 中的起始位置，缺失或格式不对时返回 None
+    """
+    match = _CONTENT_RANGE_START.match(response.headers.get("Content-Range", ""))
+    return int(match.group(1)) if match else None
+
+
+def _write_chunk(f, hasher: "hashlib._Hash", chunk: bytes):
+    f.write(chunk)
+    hasher.update(chunk)
+
+
+def _sha256_file(path: str, chunk_size: int) -> "hashlib._Hash":
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher
+
+
+class MediaDownloader:
+    """
+    媒体文件下载器，使用独立的 HttpTransport（与 API client 的连接池分开，下载大文件不占用 API 请求的连接）
+    """
+
+    def __init__(
+        self,
+        transport: Optional[HttpTransport] = None,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        store_path: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff: float = 1.0,
+    ):
+        """
+        Args:
+            transport: HTTP 传输层，默认新建一个使用全局请求调度器的 HttpTransport
+            workers: 同时下载的文件数，默认读取 config.MEDIA_DOWNLOAD_WORKERS
+            queue_size: 等待下载的任务上限，默认读取 config.MEDIA_DOWNLOAD_QUEUE_SIZE
+            store_path: 内容寻址存储目录，默认读取 config.MEDIA_STORE_PATH
+            chunk_size: 每次读取的字节数，默认读取 config.MEDIA_DOWNLOAD_CHUNK_SIZE
+            max_retries: 重试次数，默认读取 config.MEDIA_DOWNLOAD_MAX_RETRIES
+            retry_backoff: 第一次重试前的等待时间（秒），之后每次翻倍
+        """
+        self._own_transport = transport is None
+        self.transport = transport or HttpTransport(
+            timeout=config.MEDIA_DOWNLOAD_TIMEOUT, scheduler=get_request_scheduler(), follow_redirects=True
+        )
+        self.workers = workers or config.MEDIA_DOWNLOAD_WORKERS
+        self.queue_size = queue_size or config.MEDIA_DOWNLOAD_QUEUE_SIZE
+        self.store_path = store_path or config.MEDIA_STORE_PATH
+        self.chunk_size = chunk_size or config.MEDIA_DOWNLOAD_CHUNK_SIZE
+        self.max_retries = config.MEDIA_DOWNLOAD_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_backoff = retry_backoff
+        self.stats = {"files": 0, "failed": 0, "deduplicated": 0, "resumed": 0, "bytes": 0, "seconds": 0.0}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        # 已下载过的 URL -> 内容文件，同一个 URL 再次出现时直接链接，不再请求
+        self._url_blobs: Dict[str, str] = {}
+        # 同一个 URL 同时只有一个任务在下载（共用一个临时文件）：URL -> (锁, 使用该锁的任务数)
+        self._url_locks: Dict[str, List] = {}
+
+    def _ensure_started(self):
+        if self._worker_tasks and not all(task.done() for task in self._worker_tasks):
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def submit(self, url: str, save_path: str, headers: Optional[Dict[str, str]] = None,
+                     proxy: Optional[str] = None):
+        """
+        提交下载任务后立即返回，队列已满时等待
+        Args:
+            url: 文件 URL
+            save_path: 保存路径，例如 data/xhs/images/{note_id}/0.jpg
+            headers: 请求头（部分平台的 CDN 校验 Referer）
+            proxy: 代理 URL
+
+        Returns:
+
+        """
+        if not url:
+            return
+        self._ensure_started()
+        await self._queue.put(MediaDownloadJob(url=url, save_path=save_path, headers=headers, proxy=proxy))
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self.download(job)
+            except Exception as e:
+                utils.logger.error(f"[MediaDownloader._worker] download {job.url} error: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _part_path(self, url: str) -> str:
+        return os.path.join(self.store_path, "tmp", hashlib.sha256(url.encode("utf-8")).hexdigest() + ".part")
+
+    async def download(self, job: MediaDownloadJob) -> Optional[MediaDownloadResult]:
+        """
+        下载一个文件，失败时重试（从已下载的位置续传），重试仍失败返回 None
+        """
+        entry = self._url_locks.setdefault(job.url, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                blob_path = self._url_blobs.get(job.url)
+                if blob_path and os.path.exists(blob_path):
+                    self._link(blob_path, job.save_path)
+                    self.stats["deduplicated"] += 1
+                    return None
+                return await self._download_with_retry(job)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._url_locks.pop(job.url, None)
+
+    async def _download_with_retry(self, job: MediaDownloadJob) -> Optional[MediaDownloadResult]:
+        part_path = self._part_path(job.url)
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = await self._download_once(job, part_path)
+            except (MediaDownloadError, httpx.HTTPError, OSError) as e:
+                retryable = getattr(e, "retryable", True)
+                if not retryable or attempt >= self.max_retries:
+                    self.stats["failed"] += 1
+                    utils.logger.error(
+                        f"[MediaDownloader.download] {job.url} failed after {attempt + 1} attempts: {e}"
+                    )
+                    if not retryable and os.path.exists(part_path):
+                        os.remove(part_path)
+                    return None
+                utils.logger.warning(
+                    f"[MediaDownloader.download] {job.url} error, retry {attempt + 1}/{self.max_retries}: {e}"
+                )
+                await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+                continue
+            self._record(result)
+            return result
+        return None
+
+    async def _download_once(self, job: MediaDownloadJob, part_path: str) -> MediaDownloadResult:
+        os.makedirs(os.path.dirname(part_path), exist_ok=True)
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = dict(job.headers or {})
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+        start = time.monotonic()
+        async with self.transport.stream("GET", job.url, proxy=job.proxy, endpoint=ENDPOINT_MEDIA,
+                                         headers=headers) as response:
+            if response.status_code == 416 and offset:
+                # 临时文件与服务端文件不一致（例如文件已更新），删除后重新下载
+                os.remove(part_path)
+                raise MediaDownloadError(f"range {offset}- not satisfiable, restart download")
+            if response.status_code not in (200, 206):
+                raise MediaDownloadError(
+                    f"status code {response.status_code}",
+                    retryable=response.status_code >= 500 or response.status_code == 429,
+                )
+            if response.status_code == 200:
+                # 服务端不支持 Range 时返回完整文件，从头写入
+                offset = 0
+            elif _content_range_start(response) != offset:
+                # 返回的片段不是从临时文件末尾开始，接上去文件会损坏，删除后从头下载
+                os.remove(part_path)
+                raise MediaDownloadError(
+                    f"content range {response.headers.get('Content-Range')} does not start at {offset}, restart download")
+            # 文件读写、续传时重新计算已下载部分的哈希放到线程池中执行，不阻塞事件循环
+            if offset:
+                hasher = await asyncio.to_thread(_sha256_file, part_path, self.chunk_size)
+            else:
+                hasher = hashlib.sha256()
+            downloaded = 0
+            f = await asyncio.to_thread(open, part_path, "ab" if offset else "wb")
+            try:
+                async for chunk in response.aiter_bytes(self.chunk_size):
+                    await asyncio.to_thread(_write_chunk, f, hasher, chunk)
+                    downloaded += len(chunk)
+            finally:
+                await asyncio.to_thread(f.close)
+        seconds = time.monotonic() - start
+
+        digest = hasher.hexdigest()
+        blob_path, deduplicated = await asyncio.to_thread(self._commit, part_path, digest, job.save_path)
+        self._url_blobs[job.url] = blob_path
+        return MediaDownloadResult(
+            url=job.url,
+            save_path=job.save_path,
+            blob_path=blob_path,
+            sha256=digest,
+            size=offset + downloaded,
+            downloaded_bytes=downloaded,
+            resumed_bytes=offset,
+            seconds=seconds,
+            deduplicated=deduplicated,
+        )
+
+    def _commit(self, part_path: str, digest: str, save_path: str):
+        """
+        临时文件按内容哈希移动到存储目录（已存在相同内容时删除临时文件），再链接到保存路径
+        """
+        blob_path = os.path.join(self.store_path, digest[:2], digest + os.path.splitext(save_path)[1])
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        deduplicated = os.path.exists(blob_path)
+        if deduplicated:
+            os.remove(part_path)
+        else:
+            os.replace(part_path, blob_path)
+        self._link(blob_path, save_path)
+        return blob_path, deduplicated
+
+    @staticmethod
+    def _link(blob_path: str, save_path: str):
+        save_dir = os.path.dirname(save_path)
+        if save_dir:
+            os.makedirs(save_dir, exist_ok=True)
+        if os.path.exists(save_path) and os.path.samefile(blob_path, save_path):
+            return
+        # 先链接到临时文件名再替换，保存路径上不会出现写了一半的文件
+        tmp_path = save_path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        try:
+            os.link(blob_path, tmp_path)
+        except OSError:
+            shutil.copyfile(blob_path, tmp_path)
+        os.replace(tmp_path, save_path)
+
+    def _record(self, result: MediaDownloadResult):
+        self.stats["files"] += 1
+        self.stats["bytes"] += result.downloaded_bytes
+        self.stats["seconds"] += result.seconds
+        self.stats["deduplicated"] += int(result.deduplicated)
+        self.stats["resumed"] += int(result.resumed_bytes > 0)
+        utils.logger.info(
+            f"[MediaDownloader.download] {result.save_path}: {result.size / 1024:.1f}KB in {result.seconds:.2f}s "
+            f"({result.throughput / 1024:.1f}KB/s)"
+            + (f", resumed from {result.resumed_bytes} bytes" if result.resumed_bytes else "")
+            + (", same content already stored" if result.deduplicated else "")
+        )
+
+    async def drain(self):
+        """
+        等待队列中的任务下载完成，停止 worker 并关闭连接池
+        """
+        if self._queue is not None and any(not task.done() for task in self._worker_tasks):
+            await self._queue.join()
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._queue = None
+        if self._own_transport:
+            await self.transport.aclose()
+        if self.stats["files"] or self.stats["failed"]:
+            utils.logger.info(f"[MediaDownloader] {self.stats}")
+
+
+_media_downloader: Optional[MediaDownloader] = None
+
+
+def get_media_downloader() -> MediaDownloader:
+    """
+    获取全局媒体下载器
+    """
+    global _media_downloader
+    if _media_downloader is None:
+        _media_downloader = MediaDownloader()
+    return _media_downloader
+
+
+async def drain_media_downloader():
+    """
+    等待全部媒体文件下载完成，程序退出时调用
+    """
+    global _media_downloader
+    downloader, _media_downloader = _media_downloader, None
+    if downloader is None:
+        return
+    try:
+        await downloader.drain()
+    except Exception as e:
+        utils.logger.error(f"[media_downloader.drain_media_downloader] drain error: {e}")
@@ -0,0 +1,351 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 自适应限速调度器
+#            - 按 (域名, 接口类型) 维护令牌桶，控制请求速率
+#            - 按域名维护 AIMD（加性增、乘性减）并发窗口，根据延迟和限流信号（429/461/471、blocked、IP 封禁）调整
+#            - 每个事件循环一个实例，同一循环中所有平台 client 的 HttpTransport 都从这里申请请求许可
+
+import asyncio
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+import config
+from tools import utils
+
+ENDPOINT_SEARCH = "search"
+ENDPOINT_DETAIL = "detail"
+ENDPOINT_COMMENTS = "comments"
+ENDPOINT_MEDIA = "media"
+ENDPOINT_DEFAULT = "default"
+
+# 限流/验证码状态码：429 Too Many Requests，小红书 461/471 验证码
+THROTTLE_STATUS_CODES = {429, 461, 471}
+
+_MEDIA_SUFFIXES = (".jpg", ".jpeg", ".png", ".webp", ".gif", ".mp4", ".m3u8", ".flv", ".m4s", ".mp3")
+
+
+def classify_endpoint(url: str) -> str:
+    """
+    根据 URL 粗略判断接口类型，调用方也可以在请求时显式指定 endpoint
+    Args:
+        url: 请求 URL
+
+    Returns:
+
+    """
+    path = urlparse(url).path.lower()
+    if path.endswith(_MEDIA_SUFFIXES):
+        return ENDPOINT_MEDIA
+    if "comment" in path or "reply" in path:
+        return ENDPOINT_COMMENTS
+    if "search" in path:
+        return ENDPOINT_SEARCH
+    if any(word in path for word in ("detail", "feed", "info", "view", "note", "aweme", "status")):
+        return ENDPOINT_DETAIL
+    return ENDPOINT_DEFAULT
+
+
+class TokenBucket:
+    """
+    令牌桶，按预约方式扣减令牌：令牌不足时计算需要等待的时间，而不是轮询
+    """
+
+    def __init__(self, rate: float, burst: float):
+        """
+        Args:
+            rate: 每秒生成的令牌数（即每秒请求数）
+            burst: 桶容量，允许的突发请求数
+        """
+        self.max_rate = rate
+        self.min_rate = rate * 0.1
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        self._refill()
+        self.tokens -= 1
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+    def decrease(self, factor: float = 0.5):
+        self._refill()
+        self.rate = max(self.min_rate, self.rate * factor)
+
+    def increase(self, ratio: float = 0.05):
+        self._refill()
+        self.rate = min(self.max_rate, self.rate + self.max_rate * ratio)
+
+
+class AimdLimiter:
+    """
+    AIMD 并发窗口：
+    - 请求成功且延迟低于目标时，窗口加 increase / limit（每轮约加 increase）
+    - 延迟超过目标时，窗口乘以 latency_decrease
+    - 出现限流信号时，窗口乘以 decrease_factor；上次缩小之前就已发出的请求再报限流时忽略，
+      避免同一批在途请求把窗口压到底
+    """
+
+    def __init__(
+        self,
+        initial: float = 2,
+        min_limit: float = 1,
+        max_limit: float = 8,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_target: Optional[float] = None,
+        latency_decrease: float = 0.9,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max(min_limit, max_limit)
+        self.limit = float(min(self.max_limit, max(min_limit, initial)))
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.latency_decrease = latency_decrease
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self):
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                self._wake()
+                raise
+        self.in_flight += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def on_success(self, latency: float):
+        if self.latency_target and latency > self.latency_target:
+            self.limit = max(self.min_limit, self.limit * self.latency_decrease)
+        else:
+            self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+        self._wake()
+
+    def on_throttle(self, started_at: Optional[float] = None) -> bool:
+        """
+        Args:
+            started_at: 被限流的请求的发出时间（time.monotonic()），None 表示总是缩小窗口
+
+        Returns: 本次是否真正缩小了窗口
+        """
+        if started_at is not None and started_at < self._last_decrease:
+            return False
+        self._last_decrease = time.monotonic()
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        return True
+
+
+class RequestSlot:
+    """
+    一次请求的许可，请求结束后通过 observe 上报响应，供调度器判断是否被限流
+    """
+
+    def __init__(self, host: str, endpoint: str):
+        self.host = host
+        self.endpoint = endpoint
+        self.throttled = False
+
+    def observe(self, response: httpx.Response, check_body: bool = True):
+        """
+        Args:
+            response: 响应
+            check_body: 是否检查响应体（流式响应未读取响应体时传 False）
+        """
+        if response.status_code in THROTTLE_STATUS_CODES or response.status_code == 503:
+            self.throttled = True
+        elif check_body and len(response.content) < 32 and response.text.strip() == "blocked":
+            self.throttled = True
+
+
+class RequestScheduler:
+    """
+    全局请求调度器
+    用法：
+        async with scheduler.slot(url) as slot:
+            response = await client.request(...)
+            slot.observe(response)
+    """
+
+    def __init__(
+        self,
+        endpoint_rates: Optional[Dict[str, Tuple[float, float]]] = None,
+        initial_concurrency: Optional[float] = None,
+        max_concurrency: Optional[float] = None,
+        latency_target: Optional[float] = None,
+    ):
+        """
+        Args:
+            endpoint_rates: 各接口类型的 (每秒请求数, 突发数)，默认读取 config.RATE_LIMIT_ENDPOINT_RATES
+            initial_concurrency: 每个域名的初始并发窗口
+            max_concurrency: 每个域名的最大并发窗口
+            latency_target: 延迟目标（秒），超过后缓慢缩小并发窗口
+        """
+        self.endpoint_rates = endpoint_rates or config.RATE_LIMIT_ENDPOINT_RATES
+        self.initial_concurrency = initial_concurrency or config.RATE_LIMIT_INITIAL_CONCURRENCY
+        self.max_concurrency = max_concurrency or config.RATE_LIMIT_MAX_CONCURRENCY
+        self.latency_target = config.RATE_LIMIT_LATENCY_TARGET_SEC if latency_target is None else latency_target
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._limiters: Dict[str, AimdLimiter] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def get_bucket(self, host: str, endpoint: str) -> TokenBucket:
+        bucket = self._buckets.get((host, endpoint))
+        if bucket is None:
+            rate, burst = self.endpoint_rates.get(endpoint) or self.endpoint_rates[ENDPOINT_DEFAULT]
+            bucket = TokenBucket(rate, burst)
+            self._buckets[(host, endpoint)] = bucket
+        return bucket
+
+    def get_limiter(self, host: str) -> AimdLimiter:
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = AimdLimiter(
+                initial=self.initial_concurrency,
+                max_limit=self.max_concurrency,
+                latency_target=self.latency_target,
+            )
+            self._limiters[host] = limiter
+        return limiter
+
+    def _count(self, host: str, name: str):
+        stats = self._stats.setdefault(host, {"requests": 0, "throttled": 0, "errors": 0})
+        stats[name] += 1
+
+    @asynccontextmanager
+    async def slot(self, url: str, endpoint: Optional[str] = None) -> AsyncIterator[RequestSlot]:
+        """
+        申请一次请求许可：先从令牌桶取令牌，再进入并发窗口
+        Args:
+            url: 请求 URL
+            endpoint: 接口类型，默认根据 URL 判断
+
+        Returns:
+
+        """
+        host = urlparse(url).netloc
+        endpoint = endpoint or classify_endpoint(url)
+        await self.get_bucket(host, endpoint).acquire()
+        limiter = self.get_limiter(host)
+        await limiter.acquire()
+        request_slot = RequestSlot(host, endpoint)
+        start = time.monotonic()
+        self._count(host, "requests")
+        try:
+            yield request_slot
+        except httpx.TransportError:
+            # 超时、连接被重置等也视为拥塞信号
+            self._count(host, "errors")
+            self._on_throttle(host, endpoint, start)
+            raise
+        else:
+            if request_slot.throttled:
+                self._on_throttle(host, endpoint, start)
+            else:
+                limiter.on_success(time.monotonic() - start)
+                self.get_bucket(host, endpoint).increase()
+        finally:
+            limiter.release()
+
+    def _on_throttle(self, host: str, endpoint: str, started_at: Optional[float] = None):
+        self._count(host, "throttled")
+        if self.get_limiter(host).on_throttle(started_at):
+            self.get_bucket(host, endpoint).decrease()
+            utils.logger.warning(
+                f"[RequestScheduler] {host} {endpoint} throttled, "
+                f"concurrency -> {self.get_limiter(host).limit:.2f}, rate -> {self.get_bucket(host, endpoint).rate:.2f}/s"
+            )
+
+    def report_throttled(self, url: str, endpoint: Optional[str] = None):
+        """
+        上报业务层识别出的限流信号（例如接口返回 IP 封禁错误码）
+        """
+        self._on_throttle(urlparse(url).netloc, endpoint or classify_endpoint(url))
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        各域名的请求统计和当前并发窗口
+        """
+        return {
+            host: dict(stats, concurrency=round(self.get_limiter(host).limit, 2))
+            for host, stats in self._stats.items()
+        }
+
+
+# 并发窗口中等待的 future 绑定创建它的事件循环，调度器按事件循环分别创建
+_request_schedulers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, RequestScheduler]" = \
+    weakref.WeakKeyDictionary()
+
+
+def get_request_scheduler() -> Optional[RequestScheduler]:
+    """
+    获取当前事件循环的请求调度器，未开启自适应限速时返回 None
+    """
+    if not config.ENABLE_ADAPTIVE_RATE_LIMIT:
+        return None
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = asyncio.get_event_loop()
+    scheduler = _request_schedulers.get(loop)
+    if scheduler is None:
+        scheduler = RequestScheduler()
+        _request_schedulers[loop] = scheduler
+    return scheduler
+
+
+async def crawl_sleep(seconds: float):
+    """
+    替代各平台翻页之间固定的 asyncio.sleep(crawl_interval)，开启自适应限速后由调度器控制节奏
+    """
+    if config.ENABLE_ADAPTIVE_RATE_LIMIT:
+        return
+    await asyncio.sleep(seconds)
+
+
+def crawl_semaphore() -> asyncio.Semaphore:
+    """
+    详情/评论等批量任务的并发上限，开启自适应限速后实际并发由调度器的 AIMD 窗口决定
+    """
+    if config.ENABLE_ADAPTIVE_RATE_LIMIT:
+        return asyncio.Semaphore(config.RATE_LIMIT_MAX_CONCURRENCY)
+    return asyncio.Semaphore(config.MAX_CONCURRENCY_NUM)
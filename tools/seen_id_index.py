@@ -0,0 +1,284 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 已入库 ID 索引，db/sqlite 存储批量写入前跳过库中已有且内容没有变化的记录
+#            - 每张表一个索引，第一次写入该表时从库中分块读取已有记录预热（按自增 id 从新到旧，不做全表加载）
+#            - 布隆过滤器保存表中全部 ID：判断为不存在的记录一定是新记录
+#            - 最近 SEEN_ID_RECENT_CAPACITY 条记录额外保存内容指纹（ID 哈希 -> 内容哈希，各 64 位）：指纹相同的记录跳过写入
+#            - 其余记录（布隆过滤器命中但没有指纹、或者内容有变化）照常 upsert
+#            内存占用（每百万个 ID）：布隆过滤器约 1.3MB（误判率 1%）；最近记录指纹约 155MB，
+#            由 SEEN_ID_RECENT_CAPACITY 控制上限（默认 20 万条约 31MB），见 benchmarks/bench_seen_id_index.py
+
+import asyncio
+import hashlib
+import math
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import config
+from tools import utils
+
+# 计算内容指纹时忽略的字段：每次写入都会变化的时间戳
+FINGERPRINT_IGNORE_FIELDS = ("add_ts", "last_modify_ts")
+
+SEEN_NEW = "new"
+SEEN_UNCHANGED = "unchanged"
+SEEN_MAYBE = "maybe"
+
+
+def _hash128(value: str) -> Tuple[int, int]:
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+
+def fingerprint(values: Iterable[Any]) -> int:
+    """
+    计算一条记录的内容指纹，None 与空字符串视为相同，数字与其字符串形式视为相同（库中读出的类型可能与写入时不同）
+    """
+    text = "\x1f".join("" if value is None else str(value) for value in values)
+    return _hash128(text)[0]
+
+
+class BloomFilter:
+    """
+    可扩容的布隆过滤器：当前层写满后追加一层容量翻倍的新层，整体误判率保持在 error_rate 附近
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.error_rate = error_rate
+        self.count = 0
+        self._layers: List[Tuple[bytearray, int, int, int]] = []
+        self._add_layer(max(capacity, 1024))
+
+    def _add_layer(self, capacity: int):
+        # 新层使用更低的误判率，所有层误判率之和收敛于 error_rate
+        error_rate = self.error_rate / (2 ** (len(self._layers) + 1))
+        bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        self._layers.append((bytearray((bits + 7) // 8), bits, hashes, capacity))
+
+    @staticmethod
+    def _positions(h1: int, h2: int, bits: int, hashes: int):
+        for i in range(hashes):
+            yield (h1 + i * h2) % bits
+
+    def add(self, key: str):
+        layer, bits, hashes, capacity = self._layers[-1]
+        if self.count >= sum(layer_capacity for *_, layer_capacity in self._layers):
+            self._add_layer(capacity * 2)
+            layer, bits, hashes, capacity = self._layers[-1]
+        h1, h2 = _hash128(key)
+        for position in self._positions(h1, h2, bits, hashes):
+            layer[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        h1, h2 = _hash128(key)
+        for layer, bits, hashes, _ in self._layers:
+            if all(layer[position >> 3] & (1 << (position & 7)) for position in self._positions(h1, h2, bits, hashes)):
+                return True
+        return False
+
+    def memory_bytes(self) -> int:
+        return sum(len(layer) for layer, *_ in self._layers)
+
+
+class SeenIdIndex:
+    """
+    一张表的已入库 ID 索引
+    """
+
+    def __init__(self, table_name: str, key_field: str, recent_capacity: Optional[int] = None):
+        self.table_name = table_name
+        self.key_field = key_field
+        self.recent_capacity = config.SEEN_ID_RECENT_CAPACITY if recent_capacity is None else recent_capacity
+        self.bloom: Optional[BloomFilter] = None
+        # ID 哈希 -> 内容指纹（预热时没能读出内容的记录为 None），按最近写入排序
+        self.recent: "OrderedDict[int, Optional[int]]" = OrderedDict()
+        # 预热时从库中读取的列
+        self.fields: Tuple[str, ...] = ()
+        self.warm_queries = 0
+        self.stats = {SEEN_NEW: 0, SEEN_UNCHANGED: 0, SEEN_MAYBE: 0}
+        # 预热失败时布隆过滤器不包含库中已有的 ID，不能据此判断记录是新记录
+        self._unsafe_new = False
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _fingerprint(item: Dict, fields: Optional[Sequence[str]] = None) -> int:
+        """
+        内容指纹包含字段名和值，默认取记录自己的字段（去掉时间戳），字段不同的记录指纹一定不同
+        """
+        if fields is None:
+            fields = sorted(field for field in item.keys() if field not in FINGERPRINT_IGNORE_FIELDS)
+        return fingerprint(part for field in fields for part in (field, item.get(field)))
+
+    def _remember(self, key: str, item_fingerprint: Optional[int]):
+        key_hash = _hash128(key)[0]
+        self.recent[key_hash] = item_fingerprint
+        self.recent.move_to_end(key_hash)
+        if len(self.recent) > self.recent_capacity:
+            self.recent.popitem(last=False)
+
+    async def ensure_warm(self, db, item: Dict):
+        """
+        第一次写入时从库中预热，按这条记录的字段（去掉时间戳）读取最近记录的内容计算指纹，
+        之后字段不同的记录与预热的指纹不相等，照常 upsert
+        Args:
+            db: AsyncMysqlDB 或 AsyncSqliteDB
+            item: 一条待写入的记录
+        """
+        if self.bloom is not None:
+            return
+        async with self._lock:
+            if self.bloom is not None:
+                return
+            self.fields = tuple(sorted(field for field in item.keys() if field not in FINGERPRINT_IGNORE_FIELDS))
+            try:
+                await self._warm(db)
+            except Exception as e:
+                # 预热失败时从空索引开始，布隆过滤器判断为“新记录”也只是照常 upsert，不影响数据正确性
+                utils.logger.error(f"[SeenIdIndex.ensure_warm] warm {self.table_name} error: {e}")
+                self.recent.clear()
+                self.bloom = BloomFilter(config.SEEN_ID_BLOOM_MIN_CAPACITY, config.SEEN_ID_BLOOM_ERROR_RATE)
+                self._unsafe_new = True
+
+    async def _warm(self, db):
+        chunk_size = config.SEEN_ID_WARM_CHUNK_SIZE
+        rows = await db.query(f"SELECT COUNT(*) AS total FROM {self.table_name}")
+        self.warm_queries += 1
+        total = int(rows[0]["total"]) if rows else 0
+        bloom = BloomFilter(max(total * 2, config.SEEN_ID_BLOOM_MIN_CAPACITY), config.SEEN_ID_BLOOM_ERROR_RATE)
+        recent: List[Tuple[int, Optional[int]]] = []
+
+        content_columns = ",".join(f"`{field}`" for field in self.fields)
+        max_id = None
+        while True:
+            # 从新到旧分块读取，最近的记录连同内容一起读出计算指纹，更早的记录只读 ID
+            with_content = len(recent) < self.recent_capacity
+            columns = f"`id`,`{self.key_field}`" + (f",{content_columns}" if with_content and content_columns else "")
+            where = "" if max_id is None else "WHERE `id` < %s "
+            sql = f"SELECT {columns} FROM {self.table_name} {where}ORDER BY `id` DESC LIMIT {chunk_size}"
+            rows = await (db.query(sql) if max_id is None else db.query(sql, max_id))
+            self.warm_queries += 1
+            for row in rows:
+                key = str(row[self.key_field])
+                bloom.add(key)
+                if len(recent) < self.recent_capacity:
+                    recent.append((_hash128(key)[0], self._fingerprint(row, self.fields) if with_content else None))
+            if len(rows) < chunk_size:
+                break
+            max_id = rows[-1]["id"]
+
+        # recent 按从旧到新排列，淘汰时先淘汰最早的
+        self.recent = OrderedDict(reversed(recent))
+        self.bloom = bloom
+        self._unsafe_new = False
+        utils.logger.info(
+            f"[SeenIdIndex._warm] {self.table_name}: {bloom.count} ids, {len(self.recent)} fingerprints, "
+            f"{self.warm_queries} queries, bloom {bloom.memory_bytes() / 1024 / 1024:.2f}MB"
+        )
+
+    def classify(self, item: Dict) -> str:
+        """
+        判断一条记录：new（库中一定没有）、unchanged（库中已有且内容相同）、maybe（需要照常 upsert）
+        """
+        key = str(item.get(self.key_field))
+        if key not in self.bloom:
+            return SEEN_MAYBE if self._unsafe_new else SEEN_NEW
+        item_fingerprint = self.recent.get(_hash128(key)[0])
+        if item_fingerprint is not None and item_fingerprint == self._fingerprint(item):
+            return SEEN_UNCHANGED
+        return SEEN_MAYBE
+
+    async def skip_unchanged(self, db, items: List[Dict]) -> List[Dict]:
+        """
+        去掉库中已有且内容没有变化的记录，同一批中重复的 ID 只保留最后一条
+        """
+        if not items:
+            return items
+        await self.ensure_warm(db, items[0])
+        latest: Dict[str, Dict] = {}
+        for item in items:
+            latest[str(item.get(self.key_field))] = item
+        if len(latest) != len(items):
+            items = list(latest.values())
+        result = []
+        for item in items:
+            kind = self.classify(item)
+            self.stats[kind] += 1
+            if kind != SEEN_UNCHANGED:
+                result.append(item)
+        return result
+
+    def mark_written(self, items: Sequence[Dict]):
+        """
+        写入成功后把记录加入索引
+        """
+        for item in items:
+            key = str(item.get(self.key_field))
+            if key not in self.bloom:
+                self.bloom.add(key)
+            self._remember(key, self._fingerprint(item))
+
+    def forget(self, key: str):
+        """
+        去掉一条记录的内容指纹，库中记录被 update_table 等其他途径修改后调用，之后照常 upsert
+        """
+        self.recent.pop(_hash128(key)[0], None)
+
+
+_indexes: Dict[Tuple[int, str], SeenIdIndex] = {}
+
+
+def get_seen_id_index(db, table_name: str, key_field: str) -> Optional[SeenIdIndex]:
+    """
+    获取数据库对象上某张表的索引，未开启 ENABLE_SEEN_ID_INDEX 时返回 None
+    """
+    if not config.ENABLE_SEEN_ID_INDEX:
+        return None
+    index_key = (id(db), table_name)
+    index = _indexes.get(index_key)
+    if index is None:
+        index = SeenIdIndex(table_name, key_field)
+        _indexes[index_key] = index
+    return index
+
+
+def invalidate_seen_ids(db, table_name: str, field: str, values: Iterable[Any]):
+    """
+    库中记录被批量写入以外的途径修改（update_table）后，去掉索引中对应的内容指纹
+    Args:
+        db: AsyncMysqlDB 或 AsyncSqliteDB
+        table_name: 表名
+        field: update 语句 where 条件中的字段名，不是索引的 ID 字段时无法确定修改了哪些记录，清空全部指纹
+        values: where 条件中的字段值
+    """
+    index = _indexes.get((id(db), table_name))
+    if index is None:
+        return
+    if field != index.key_field:
+        index.recent.clear()
+        return
+    for value in values:
+        index.forget(str(value))
+
+
+def log_seen_id_stats():
+    """
+    输出各表跳过的记录数，程序退出时调用
+    """
+    for index in _indexes.values():
+        utils.logger.info(f"[seen_id_index] {index.table_name}: {index.stats}, warm queries: {index.warm_queries}")
+
+
+def clear_seen_id_indexes():
+    _indexes.clear()
@@ -0,0 +1,108 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 签名上下文缓存
+#            小红书 b1、B站 wbi key、抖音 msToken 这类签名参数来自浏览器 localStorage，变化频率很低，
+#            没必要每次请求都通过 CDP 读取一遍 localStorage。这里按名称缓存，带 TTL 和版本号，
+#            update_cookies 时调用 invalidate() 让缓存失效，下次使用时重新从浏览器读取。
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from playwright.async_api import Page
+
+import config
+
+
+async def read_local_storage(page: Page, keys: Iterable[str]) -> Dict[str, Optional[str]]:
+    """
+    只读取 localStorage 中指定的几个 key，避免把整个 localStorage 传回来
+    Args:
+        page: playwright 页面对象
+        keys: 需要读取的 key 列表
+
+    Returns:
+
+    """
+    return await page.evaluate(
+        "(keys) => Object.fromEntries(keys.map((k) => [k, window.localStorage.getItem(k)]))", list(keys)
+    )
+
+
+class SigningContext:
+    """
+    签名上下文缓存，每个 API client 持有一个
+    用法：
+        b1 = await self.sign_context.get("b1", loader)
+        self.sign_context.invalidate()  # cookie 更新后
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        """
+        Args:
+            ttl: 缓存时间（秒），默认读取 config.SIGN_CONTEXT_TTL_SEC
+        """
+        self.ttl = config.SIGN_CONTEXT_TTL_SEC if ttl is None else ttl
+        self.version = 0
+        self._values: Dict[str, Tuple[Any, float, int]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _get_valid(self, name: str) -> Tuple[bool, Any]:
+        cached = self._values.get(name)
+        if cached is None:
+            return False, None
+        value, expire_at, version = cached
+        if version != self.version or expire_at <= time.monotonic():
+            return False, None
+        return True, value
+
+    async def get(self, name: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        获取缓存值，不存在或已过期时调用 loader 加载，并发调用时只会加载一次；
+        加载结果为空（例如页面还没有写入 localStorage 时的 msToken 为 None）时不缓存，下次重新加载
+        Args:
+            name: 缓存名称，例如 b1、wbi_keys
+            loader: 异步加载函数
+
+        Returns:
+
+        """
+        hit, value = self._get_valid(name)
+        if hit:
+            return value
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            hit, value = self._get_valid(name)
+            if hit:
+                return value
+            version = self.version
+            value = await loader()
+            # 加载期间缓存被 invalidate 的话，这次的结果只用一次，不写入缓存
+            if value and version == self.version:
+                self._values[name] = (value, time.monotonic() + self.ttl, version)
+            return value
+
+    def invalidate(self, name: Optional[str] = None):
+        """
+        让缓存失效，不传 name 时全部失效（版本号加一）
+        Args:
+            name: 缓存名称
+
+        Returns:
+
+        """
+        if name is None:
+            self.version += 1
+            self._values.clear()
+        else:
+            self._values.pop(name, None)
@@ -0,0 +1,328 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : web 看板统计汇总表 content_daily_stats：按平台、发布日期（本地时间）、来源关键词汇总内容数、评论数和情感分布，
+#            看板的平台数据量、情感分布按天读取汇总行，不再扫描内容表
+#            - 某一天的汇总行总是整体重新计算：删除后按发布时间索引从内容表聚合，重复写入、重新分析都不会重复计数
+#            - db/sqlite 存储写入内容、评论后记录受影响的内容 ID，每隔 STATS_ROLLUP_FLUSH_INTERVAL 秒（以及关闭数据库时）
+#              查出这些内容的发布日期，刷新这些天的汇总行；分析任务写入分析结果后刷新对应日期
+#            - 已有数据执行 python -m analysis_job.stats_rollup_rebuild 重建，重建完成的平台记录在 content_daily_stats_state 中，
+#              看板只对这些平台使用汇总表
+#            情感分布依赖 sentiment 列（SQLite 打开时自动添加，MySQL 见 schema/analysis_columns.sql）
+
+import asyncio
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import config
+from tools.time_util import get_current_timestamp
+
+# 与 tools.utils.logger 是同一个日志对象；不导入 tools.utils，看板和分析任务使用本模块时不需要安装爬虫依赖
+logger = logging.getLogger("MediaCrawler")
+
+STATS_ROLLUP_TABLE = "content_daily_stats"
+STATS_ROLLUP_STATE_TABLE = "content_daily_stats_state"
+# 情感分布的分桶，其他非空的情感值计入 unknown_count，没有分析结果的内容不计入情感分布
+SENTIMENT_BUCKETS = ("positive", "negative", "neutral")
+# 按内容 ID 查询发布时间时每条语句携带的 ID 数
+KEY_CHUNK_SIZE = 500
+
+
+class RollupSource(NamedTuple):
+    """一个看板平台的汇总数据来源"""
+    table: str
+    key_field: str
+    time_field: str
+    # 时间字段每秒的单位数：毫秒时间戳 1000、秒级时间戳 1；None 为日期时间类型
+    time_unit: Optional[int]
+    comment_table: Optional[str]
+    comment_key_field: Optional[str]
+
+
+# 看板平台 -> 汇总的数据来源，发布时间字段与看板的时间筛选一致（贴吧、知乎使用 publish_ts）
+ROLLUP_SOURCES: Dict[str, RollupSource] = {
+    "xhs": RollupSource("xhs_note", "note_id", "time", 1000, "xhs_note_comment", "note_id"),
+    "douyin": RollupSource("douyin_aweme", "aweme_id", "create_time", 1, "douyin_aweme_comment", "aweme_id"),
+    "kuaishou": RollupSource("kuaishou_video", "video_id", "create_time", 1, "kuaishou_video_comment", "video_id"),
+    "bilibili": RollupSource("bilibili_video", "video_id", "create_time", 1, "bilibili_video_comment", "video_id"),
+    "weibo": RollupSource("weibo_note", "note_id", "create_time", 1, "weibo_note_comment", "note_id"),
+    "tieba": RollupSource("tieba_note", "note_id", "publish_ts", 1, "tieba_comment", "note_id"),
+    "zhihu": RollupSource("zhihu_content", "content_id", "publish_ts", 1, "zhihu_comment", "content_id"),
+    "news": RollupSource("news_article", "article_id", "publish_date", None, None, None),
+}
+
+# 内容表、评论表 -> (看板平台, 记录中内容 ID 的字段)
+ROLLUP_TABLES: Dict[str, Tuple[str, str]] = {}
+for _platform, _source in ROLLUP_SOURCES.items():
+    ROLLUP_TABLES[_source.table] = (_platform, _source.key_field)
+    if _source.comment_table:
+        ROLLUP_TABLES[_source.comment_table] = (_platform, _source.comment_key_field)
+
+_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def day_start(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time())
+
+
+def day_bounds(platform: str, day: date) -> Tuple[Any, Any]:
+    """
+    一天在发布时间字段中的范围 [开始, 结束)，单位与字段一致
+    """
+    start = day_start(day)
+    end = start + timedelta(days=1)
+    time_unit = ROLLUP_SOURCES[platform].time_unit
+    if time_unit is None:
+        return start.strftime(_DATETIME_FORMAT), end.strftime(_DATETIME_FORMAT)
+    return int(start.timestamp()) * time_unit, int(end.timestamp()) * time_unit
+
+
+def to_day(platform: str, value: Any) -> Optional[date]:
+    """
+    发布时间字段的值所在的日期，无法解析时返回 None
+    """
+    if value is None or value == "":
+        return None
+    time_unit = ROLLUP_SOURCES[platform].time_unit
+    try:
+        if time_unit is None:
+            if isinstance(value, datetime):
+                return value.date()
+            return datetime.strptime(str(value)[:19], _DATETIME_FORMAT).date()
+        return datetime.fromtimestamp(int(value) / time_unit).date()
+    except (ValueError, TypeError, OverflowError, OSError):
+        return None
+
+
+def build_day_queries(platform: str, keys: Iterable[str]) -> List[Tuple[str, List[Any]]]:
+    """
+    查询一批内容的发布时间（去重），每条语句最多 KEY_CHUNK_SIZE 个 ID，结果列名为 publish_time
+    """
+    source = ROLLUP_SOURCES[platform]
+    keys = sorted(keys)
+    queries = []
+    for start in range(0, len(keys), KEY_CHUNK_SIZE):
+        chunk = keys[start:start + KEY_CHUNK_SIZE]
+        queries.append((
+            f"SELECT DISTINCT `{source.time_field}` AS publish_time FROM `{source.table}` "
+            f"WHERE `{source.key_field}` IN ({','.join(['%s'] * len(chunk))})",
+            chunk,
+        ))
+    return queries
+
+
+def build_refresh_statements(platform: str, day: date) -> List[Tuple[str, List[Any]]]:
+    """
+    重新计算一个平台一天的汇总行，返回的语句需要在同一个事务中执行
+    内容数和情感分布按（发布时间, sentiment）联合索引聚合，评论数按评论表的内容 ID 索引关联
+    """
+    source = ROLLUP_SOURCES[platform]
+    start, end = day_bounds(platform, day)
+    stat_date = day.isoformat()
+    keyword = "COALESCE(`source_keyword`, '')"
+    bucket_counts = ", ".join(
+        f"SUM(CASE WHEN `sentiment` = '{sentiment}' THEN 1 ELSE 0 END)" for sentiment in SENTIMENT_BUCKETS
+    )
+    unknown_count = (f"SUM(CASE WHEN `sentiment` IS NOT NULL AND `sentiment` NOT IN "
+                     f"({', '.join(repr(sentiment) for sentiment in SENTIMENT_BUCKETS)}) THEN 1 ELSE 0 END)")
+    statements = [
+        (f"DELETE FROM `{STATS_ROLLUP_TABLE}` WHERE `platform` = %s AND `stat_date` = %s", [platform, stat_date]),
+        (f"INSERT INTO `{STATS_ROLLUP_TABLE}` (`platform`, `stat_date`, `source_keyword`, `content_count`, "
+         f"`positive_count`, `negative_count`, `neutral_count`, `unknown_count`, `comment_count`, `last_modify_ts`) "
+         f"SELECT %s, %s, {keyword}, COUNT(*), {bucket_counts}, {unknown_count}, 0, %s FROM `{source.table}` "
+         f"WHERE `{source.time_field}` >= %s AND `{source.time_field}` < %s GROUP BY {keyword}",
+         [platform, stat_date, get_current_timestamp(), start, end]),
+    ]
+    if source.comment_table:
+        statements.append((
+            f"UPDATE `{STATS_ROLLUP_TABLE}` SET `comment_count` = ("
+            f"SELECT COUNT(*) FROM `{source.comment_table}` c JOIN `{source.table}` n "
+            f"ON c.`{source.comment_key_field}` = n.`{source.key_field}` "
+            f"WHERE n.`{source.time_field}` >= %s AND n.`{source.time_field}` < %s "
+            f"AND COALESCE(n.`source_keyword`, '') = `{STATS_ROLLUP_TABLE}`.`source_keyword`) "
+            f"WHERE `platform` = %s AND `stat_date` = %s",
+            [start, end, platform, stat_date],
+        ))
+    return statements
+
+
+def build_state_statements(platform: str) -> List[Tuple[str, List[Any]]]:
+    """
+    标记一个平台的汇总行已经建立，看板开始使用汇总表
+    """
+    return [
+        (f"DELETE FROM `{STATS_ROLLUP_STATE_TABLE}` WHERE `platform` = %s", [platform]),
+        (f"INSERT INTO `{STATS_ROLLUP_STATE_TABLE}` (`platform`, `built_ts`) VALUES (%s, %s)",
+         [platform, get_current_timestamp()]),
+    ]
+
+
+def driver_sql(connection, sql: str) -> str:
+    """
+    SQLAlchemy 连接上执行 %s 占位符的语句（exec_driver_sql），SQLite 驱动使用 ? 占位符
+    """
+    return sql.replace("%s", "?") if connection.dialect.paramstyle == "qmark" else sql
+
+
+def refresh_days_sync(connection, platform: str, days: Iterable[date]) -> int:
+    """
+    在 SQLAlchemy 连接（调用方的事务）中刷新一个平台若干天的汇总行，供分析任务、重建任务使用
+    :return: 刷新的天数
+    """
+    refreshed = 0
+    for day in sorted(set(days)):
+        for sql, args in build_refresh_statements(platform, day):
+            connection.exec_driver_sql(driver_sql(connection, sql), tuple(args))
+        refreshed += 1
+    return refreshed
+
+
+def find_days_sync(connection, platform: str, keys: Iterable[str]) -> Set[date]:
+    """
+    在 SQLAlchemy 连接中查询一批内容的发布日期
+    """
+    days = set()
+    for sql, args in build_day_queries(platform, keys):
+        for (publish_time,) in connection.exec_driver_sql(driver_sql(connection, sql), tuple(args)):
+            day = to_day(platform, publish_time)
+            if day is not None:
+                days.add(day)
+    return days
+
+
+class StatsRollupTracker:
+    """
+    一个数据库对象上待刷新的汇总数据：记录写入过的内容 ID，定期查出它们的发布日期并刷新这些天
+    """
+
+    def __init__(self, db, flush_interval: Optional[float] = None):
+        self.db = db
+        self.flush_interval = config.STATS_ROLLUP_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        # 看板平台 -> 待刷新的内容 ID
+        self.dirty: Dict[str, Set[str]] = {}
+        self.last_flush = time.monotonic()
+        self.refreshed_days = 0
+        self.enabled = True
+        # 本进程写入过的平台，停止维护后这些平台的汇总行不再准确
+        self.platforms: Set[str] = set()
+        # 停止维护后待从汇总状态表中删除的平台，删除后看板回退到扫描内容表
+        self.stale: Set[str] = set()
+        self._lock = asyncio.Lock()
+
+    def mark_written(self, table_name: str, items: Sequence[Dict]):
+        """
+        记录写入的内容（评论记录的是所属内容），写入成功后调用
+        """
+        if table_name not in ROLLUP_TABLES:
+            return
+        platform, key_field = ROLLUP_TABLES[table_name]
+        if not self.enabled:
+            if platform not in self.platforms:
+                self.platforms.add(platform)
+                self.stale.add(platform)
+            return
+        self.platforms.add(platform)
+        keys = {str(item[key_field]) for item in items if item.get(key_field) not in (None, "")}
+        if keys:
+            self.dirty.setdefault(platform, set()).update(keys)
+
+    async def maybe_flush(self):
+        """
+        距离上次刷新超过 flush_interval 秒时刷新
+        """
+        if (self.dirty or self.stale) and time.monotonic() - self.last_flush >= self.flush_interval:
+            self.last_flush = time.monotonic()
+            await self.flush()
+
+    async def flush(self):
+        """
+        刷新所有待刷新内容所在日期的汇总行，每天一个事务
+        出错时（例如 MySQL 还没有执行 schema/content_daily_stats.sql、缺少 sentiment 列）停止维护，
+        并删除写入过的平台的汇总状态，看板回退到扫描内容表，之后需要重建
+        """
+        async with self._lock:
+            dirty, self.dirty = self.dirty, {}
+            self.last_flush = time.monotonic()
+            if not self.enabled:
+                await self._drop_stale_state()
+                return
+            for platform, keys in dirty.items():
+                try:
+                    days = set()
+                    for sql, args in build_day_queries(platform, keys):
+                        for row in await self.db.query(sql, *args):
+                            day = to_day(platform, row["publish_time"])
+                            if day is not None:
+                                days.add(day)
+                    for day in sorted(days):
+                        await self.db.execute_in_transaction(build_refresh_statements(platform, day))
+                    self.refreshed_days += len(days)
+                except Exception as e:
+                    self.enabled = False
+                    self.stale.update(self.platforms)
+                    logger.error(f"[StatsRollupTracker.flush] refresh {platform} stats rollup error: {e}, "
+                                 f"stats rollup disabled for this run, dashboard falls back to content tables "
+                                 f"for {sorted(self.stale)}, rebuild with `python -m analysis_job.stats_rollup_rebuild`")
+                    await self._drop_stale_state()
+                    return
+
+    async def _drop_stale_state(self):
+        """
+        从汇总状态表中删除停止维护后汇总行不再准确的平台
+        """
+        stale, self.stale = self.stale, set()
+        for platform in sorted(stale):
+            try:
+                await self.db.execute(f"DELETE FROM `{STATS_ROLLUP_STATE_TABLE}` WHERE `platform` = %s", platform)
+            except Exception as e:
+                # 状态表不存在时看板本来就不使用汇总表
+                logger.error(f"[StatsRollupTracker._drop_stale_state] delete {platform} stats rollup state error: {e}")
+
+
+_trackers: Dict[int, StatsRollupTracker] = {}
+
+
+def get_stats_rollup(db) -> Optional[StatsRollupTracker]:
+    """
+    获取数据库对象上的汇总数据跟踪器，未开启 ENABLE_STATS_ROLLUP 时返回 None
+    """
+    if not config.ENABLE_STATS_ROLLUP:
+        return None
+    tracker = _trackers.get(id(db))
+    if tracker is None:
+        tracker = StatsRollupTracker(db)
+        _trackers[id(db)] = tracker
+    return tracker
+
+
+async def mark_written(db, table_name: str, items: Sequence[Dict]):
+    """
+    db/sqlite 存储写入内容表、评论表后调用：记录受影响的内容，到期时刷新汇总行
+    """
+    if table_name not in ROLLUP_TABLES:
+        return
+    tracker = get_stats_rollup(db)
+    if tracker is not None:
+        tracker.mark_written(table_name, items)
+        await tracker.maybe_flush()
+
+
+async def flush_stats_rollup(db):
+    """
+    关闭数据库前刷新剩余的汇总数据
+    """
+    tracker = _trackers.pop(id(db), None)
+    if tracker is not None:
+        await tracker.flush()
+        logger.info(f"[stats_rollup] refreshed {tracker.refreshed_days} days of dashboard stats")
@@ -0,0 +1,192 @@
+# 声明：本代码仅供学习和研究目的使用。使用者应遵守以下原则：
+# 1. 不得用于任何商业用途。
+# 2. 使用时应遵守目标平台的使用条款和robots.txt规则。
+# 3. 不得进行大规模爬取或对平台造成运营干扰。
+# 4. 应合理控制请求频率，避免给目标平台带来不必要的负担。
+# 5. 不得用于任何非法或不当的用途。
+#
+# 详细许可条款请参阅项目根目录下的LICENSE文件。
+# 使用本代码即表示您同意遵守上述原则和LICENSE中的所有条款。
+
+
+# -*- coding: utf-8 -*-
+# @Desc    : 内容表的全文索引，供 web 看板关键词搜索使用，代替对标题、正文的 LIKE '%kw%' 全表扫描
+#            MySQL：标题、正文上的 FULLTEXT 索引（ngram 分词，见 schema/fulltext_index.sql），查询用 MATCH ... AGAINST；
+#            SQLite：每个内容表对应一张 FTS5 表 `<表名>_fts`，rowid 为内容表的 id，内容是 jieba 搜索引擎模式分词后用空格连接的词，
+#            AsyncSqliteDB 写入内容后用注册到写连接上的 SQL 函数 index_text 分词并更新，已有数据执行 python -m tools.text_index 建立索引。
+import re
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import jieba
+
+# 内容表 -> (唯一ID字段, 建立索引的文本字段)
+TEXT_INDEX_TABLES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "xhs_note": ("note_id", ("title", "desc")),
+    "douyin_aweme": ("aweme_id", ("title", "desc")),
+    "kuaishou_video": ("video_id", ("title", "desc")),
+    "bilibili_video": ("video_id", ("title", "desc")),
+    "weibo_note": ("note_id", ("content",)),
+    "tieba_note": ("note_id", ("title", "desc")),
+    "zhihu_content": ("content_id", ("title", "desc")),
+}
+
+# 记录哪些表的 FTS 索引已经包含全部数据：(table_name, indexed_ts)
+TEXT_INDEX_STATE_TABLE = "text_index_state"
+
+# 建立索引时每批读取的记录数
+TEXT_INDEX_BATCH_SIZE = 2000
+
+_WORD_PATTERN = re.compile(r"\w")
+
+
+def fts_table_name(table: str) -> str:
+    return f"{table}_fts"
+
+
+def tokenize(*texts: Optional[str]) -> List[str]:
+    """
+    jieba 搜索引擎模式分词（长词会再切出其中的短词，例如 '智能手机' -> '智能' '手机' '智能手机'），去掉标点和空白
+    :param texts:
+    :return:
+    """
+    tokens = []
+    for text in texts:
+        if not text:
+            continue
+        for token in jieba.cut_for_search(str(text).lower()):
+            token = token.strip()
+            if token and _WORD_PATTERN.search(token):
+                tokens.append(token)
+    return tokens
+
+
+def index_text(*texts: Optional[str]) -> str:
+    """写入 FTS5 表的内容：分词结果用空格连接，FTS5 的 unicode61 分词器按空格切分，和 jieba 的分词一致"""
+    return " ".join(tokenize(*texts))
+
+
+def split_keywords(keywords: str) -> List[str]:
+    """搜索框中的关键词，逗号和空格分隔"""
+    return [part.strip() for part in keywords.replace(',', ' ').replace('，', ' ').split() if part.strip()]
+
+
+def _quote(token: str) -> str:
+    return '"' + token.replace('"', '""') + '"'
+
+
+def build_fts_query(keywords: Sequence[str], mode: str = "or") -> str:
+    """
+    生成 FTS5 MATCH 查询：关键词按精确模式分词，一个关键词的所有词都出现才算命中；
+    mode 为 'or' 时命中任一关键词即可，为 'and' 时需要命中全部关键词
+    :return: 关键词分词后为空时返回空字符串
+    """
+    clauses = []
+    for keyword in keywords:
+        tokens = [token.strip() for token in jieba.cut(keyword.lower())]
+        tokens = [_quote(token) for token in tokens if token and _WORD_PATTERN.search(token)]
+        if tokens:
+            clauses.append("(" + " AND ".join(tokens) + ")")
+    return f" {mode.upper()} ".join(clauses) if mode in ("or", "and") else ""
+
+
+def build_boolean_query(keywords: Sequence[str], mode: str = "or") -> str:
+    """
+    生成 MySQL MATCH ... AGAINST 的 BOOLEAN MODE 查询：每个关键词作为短语（ngram 分词后连续出现），
+    mode 为 'and' 时每个短语前加 '+'
+    """
+    prefix = "+" if mode == "and" else ""
+    return " ".join(f'{prefix}"{keyword.replace(chr(34), " ")}"' for keyword in keywords)
+
+
+def ensure_text_index_tables(conn: sqlite3.Connection) -> List[str]:
+    """
+    创建 FTS5 表和索引状态表；内容表为空时直接记为已建立（之后由写入时的增量更新维护）
+    :param conn: isolation_level=None 的连接
+    :return: 有数据但还没有建立索引的内容表
+    """
+    conn.execute(f"CREATE TABLE IF NOT EXISTS `{TEXT_INDEX_STATE_TABLE}` "
+                 f"(`table_name` TEXT PRIMARY KEY, `indexed_ts` INTEGER NOT NULL)")
+    indexed = {row[0] for row in conn.execute(f"SELECT `table_name` FROM `{TEXT_INDEX_STATE_TABLE}`")}
+    pending = []
+    for table in TEXT_INDEX_TABLES:
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone():
+            continue
+        conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS `{fts_table_name(table)}` USING fts5(`tokens`)")
+        if table in indexed:
+            continue
+        if conn.execute(f"SELECT 1 FROM `{table}` LIMIT 1").fetchone():
+            pending.append(table)
+        else:
+            _mark_indexed(conn, table)
+    return pending
+
+
+def _mark_indexed(conn: sqlite3.Connection, table: str):
+    conn.execute(f"INSERT OR REPLACE INTO `{TEXT_INDEX_STATE_TABLE}` (`table_name`, `indexed_ts`) VALUES (?, ?)",
+                 (table, int(time.time())))
+
+
+def register_functions(conn: sqlite3.Connection):
+    """在连接上注册 SQL 函数 index_text(...)，build_index_statement 生成的语句依赖它"""
+    conn.create_function("index_text", -1, index_text, deterministic=True)
+
+
+def build_index_statement(table: str, field: str, values: Iterable[Any]) -> Optional[Tuple[str, List[List[Any]]]]:
+    """
+    写入内容后更新 FTS5 表的语句：按 field 找到已写入的记录，从表中读出文本字段分词，以内容表的 id 作为 rowid，已有的 rowid 会被替换
+    :param table: 内容表
+    :param field: 定位记录的字段，一般是唯一ID字段
+    :param values: 写入记录的 field 值
+    :return: (sql, 每条记录的参数)，不需要建立索引的表返回 None
+    """
+    if table not in TEXT_INDEX_TABLES:
+        return None
+    rows = [[value] for value in values if value is not None]
+    if not rows:
+        return None
+    _, text_fields = TEXT_INDEX_TABLES[table]
+    columns = ", ".join(f"`{text_field}`" for text_field in text_fields)
+    sql = (f"INSERT OR REPLACE INTO `{fts_table_name(table)}` (rowid, `tokens`) "
+           f"SELECT `id`, index_text({columns}) FROM `{table}` WHERE `{field}` = %s")
+    return sql, rows
+
+
+def rebuild_text_index(conn: sqlite3.Connection, table: str, batch_size: int = TEXT_INDEX_BATCH_SIZE) -> int:
+    """
+    为已有数据建立 FTS5 索引：按 id 分批读取、分词、写入，每批一个事务，完成后记为已建立
+    :param conn: isolation_level=None 的连接
+    :return: 建立索引的记录数
+    """
+    _, text_fields = TEXT_INDEX_TABLES[table]
+    columns = ", ".join(f"`{field}`" for field in text_fields)
+    fts_table = fts_table_name(table)
+    conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS `{fts_table}` USING fts5(`tokens`)")
+    indexed, last_id = 0, 0
+    while True:
+        rows = conn.execute(f"SELECT `id`, {columns} FROM `{table}` WHERE `id` > ? ORDER BY `id` LIMIT ?",
+                            (last_id, batch_size)).fetchall()
+        if not rows:
+            break
+        conn.execute("BEGIN")
+        conn.executemany(f"INSERT OR REPLACE INTO `{fts_table}` (rowid, `tokens`) VALUES (?, ?)",
+                         [(row[0], index_text(*row[1:])) for row in rows])
+        conn.execute("COMMIT")
+        last_id = rows[-1][0]
+        indexed += len(rows)
+    _mark_indexed(conn, table)
+    return indexed
+
+
+if __name__ == '__main__':
+    import config
+
+    jieba.setLogLevel("WARNING")
+    _conn = sqlite3.connect(config.SQLITE_DB_PATH, isolation_level=None)
+    _conn.execute("PRAGMA busy_timeout=5000")
+    ensure_text_index_tables(_conn)
+    for _table in TEXT_INDEX_TABLES:
+        if _conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (_table,)).fetchone():
+            print(f"{_table}: {rebuild_text_index(_conn, _table)} rows indexed")
+    _conn.close()
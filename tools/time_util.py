@@ -14,8 +14,10 @@
 # @Time    : 2023/12/2 12:52
 # @Desc    : 时间相关的工具函数
 
+import re
 import time
 from datetime import datetime, timedelta, timezone
+from typing import Optional, Union
 
 
 def get_current_timestamp() -> int:
@@ -149,6 +151,104 @@ def rfc2822_to_timestamp(rfc2822_time):
             return int(time.time())
 
 
+# 贴吧、知乎等平台字符串发布时间的常见格式，不带年份的格式使用当前年份
+PUBLISH_TIME_FORMATS = (
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%d',
+    '%m-%d %H:%M',
+    '%Y年%m月%d日 %H:%M:%S',
+    '%Y年%m月%d日 %H:%M',
+    '%Y年%m月%d日',
+    '%m月%d日 %H:%M',
+    '%m月%d日',
+)
+
+# 相对时间：数字 + 时间单位 + "前"
+_RELATIVE_TIME_PATTERN = re.compile(r'(\d+)\s*(年|个月|月|天|小时|分钟|秒)前')
+_RELATIVE_TIME_UNITS = {
+    '年': timedelta(days=365),
+    '个月': timedelta(days=30),
+    '月': timedelta(days=30),
+    '天': timedelta(days=1),
+    '小时': timedelta(hours=1),
+    '分钟': timedelta(minutes=1),
+    '秒': timedelta(seconds=1),
+}
+
+
+def parse_relative_time(time_str: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    解析相对时间字符串，如 '3天前'、'2小时前'、'刚刚'、'昨天 12:30'
+    :param time_str:
+    :param now: 相对时间的基准时间，默认为当前时间；回填历史数据时应传入抓取时间
+    :return: 无法解析时返回 None
+    """
+    if not time_str:
+        return None
+    time_str = time_str.strip()
+    now = now or datetime.now()
+
+    match = _RELATIVE_TIME_PATTERN.search(time_str)
+    if match:
+        return now - int(match.group(1)) * _RELATIVE_TIME_UNITS[match.group(2)]
+
+    if '刚刚' in time_str or '刚才' in time_str:
+        return now - timedelta(minutes=1)
+    elif '昨天' in time_str:
+        return now - timedelta(days=1)
+    elif '前天' in time_str:
+        return now - timedelta(days=2)
+    return None
+
+
+def parse_publish_time_str(value: Union[str, int, float, None], now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    解析平台返回的发布时间：10 位（秒）或 13 位（毫秒）时间戳、PUBLISH_TIME_FORMATS 中的日期格式、相对时间
+    :param value:
+    :param now: 不带年份的日期和相对时间的基准时间，默认为当前时间
+    :return: 无法解析时返回 None
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    time_str = str(value).strip()
+    if not time_str:
+        return None
+    now = now or datetime.now()
+
+    if time_str.isdigit() and len(time_str) in (10, 13):
+        timestamp = int(time_str)
+        try:
+            return datetime.fromtimestamp(timestamp / 1000 if len(time_str) == 13 else timestamp)
+        except (OverflowError, OSError, ValueError):
+            return None
+
+    for time_format in PUBLISH_TIME_FORMATS:
+        try:
+            publish_time = datetime.strptime(time_str, time_format)
+        except ValueError:
+            continue
+        if '%Y' not in time_format:
+            publish_time = publish_time.replace(year=now.year)
+            # 年初抓到的 '12-30 10:00' 是去年发布的
+            if publish_time > now + timedelta(days=1):
+                publish_time = publish_time.replace(year=now.year - 1)
+        return publish_time
+
+    return parse_relative_time(time_str, now)
+
+
+def normalize_publish_ts(value: Union[str, int, float, None], now: Optional[datetime] = None) -> int:
+    """
+    把贴吧、知乎等平台的字符串发布时间归一化为秒级时间戳，写入 publish_ts 列
+    :param value:
+    :param now: 相对时间的基准时间，入库时为当前时间，回填历史数据时为记录的抓取时间（add_ts）
+    :return: 无法解析时返回 0
+    """
+    publish_time = parse_publish_time_str(value, now)
+    return int(publish_time.timestamp()) if publish_time else 0
+
+
 if __name__ == '__main__':
     # 示例用法
     _rfc2822_time = "Sat Dec 23 17:12:54 +0800 2023"
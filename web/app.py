@@ -363,6 +363,7 @@ def main():
             # 添加搜索关键词
             if search_keywords:
                 filters.keywords = search_keywords
+                filters.keyword_mode = st.session_state.get("keyword_mode", "or")
                 save_search_to_history(search_keywords)
         
         with filter_col2:
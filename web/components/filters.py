@@ -180,8 +180,8 @@ def render_search_options() -> Tuple[str, str]:
     with col1:
         sort_by = st.selectbox(
             "排序方式",
-            options=["time", "interaction"],
-            format_func=lambda x: {"time": "时间", "interaction": "互动量"}[x],
+            options=["time", "interaction", "relevance"],
+            format_func=lambda x: {"time": "时间", "interaction": "互动量", "relevance": "相关度"}[x],
             key="sort_by_select"
         )
     
@@ -419,8 +419,8 @@ def create_search_filters() -> SearchFilters:
         st.caption("📊 **排序**")
         sort_by = st.selectbox(
             "排序方式",
-            options=["time", "interaction"],
-            format_func=lambda x: {"time": "时间", "interaction": "互动"}[x],
+            options=["time", "interaction", "relevance"],
+            format_func=lambda x: {"time": "时间", "interaction": "互动", "relevance": "相关度"}[x],
             key="sort_by_select",
             label_visibility="collapsed"
         )
@@ -59,6 +59,18 @@ def render_search_box() -> str:
         key="search_type"
     )
     
+    # 多个关键词的组合方式
+    st.radio(
+        "关键词组合",
+        options=["or", "and"],
+        format_func=lambda x: {
+            "or": "包含任一关键词",
+            "and": "包含全部关键词"
+        }[x],
+        horizontal=True,
+        key="keyword_mode"
+    )
+    
     # 搜索范围
     search_scope = st.multiselect(
         "搜索范围",
@@ -17,6 +17,8 @@ RELATION_DB_PORT = int(os.getenv("RELATION_DB_PORT", 3306))
 RELATION_DB_USER = os.getenv("RELATION_DB_USER", "root")
 RELATION_DB_PWD = os.getenv("RELATION_DB_PWD", "")
 RELATION_DB_NAME = os.getenv("RELATION_DB_NAME", "media_crawler")
+# 设置后改为读取爬虫 SAVE_DATA_OPTION = "sqlite" 生成的 SQLite 数据库文件
+SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "")
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +36,17 @@ class DatabaseManager:
     def _initialize_database(self):
         """初始化数据库连接"""
         try:
+            if SQLITE_DB_PATH:
+                # SQLite 不支持 READ_COMMITTED 隔离级别，WAL 模式下读取不会阻塞爬虫写入
+                self.engine = create_engine(
+                    f"sqlite:///{SQLITE_DB_PATH}",
+                    connect_args={"check_same_thread": False, "timeout": 30},
+                    echo=False
+                )
+                self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+                logger.info(f"数据库连接初始化成功: sqlite {SQLITE_DB_PATH}")
+                return
+
             # 构建数据库URL
             database_url = f"mysql+pymysql://{RELATION_DB_USER}:{RELATION_DB_PWD}@{RELATION_DB_HOST}:{RELATION_DB_PORT}/{RELATION_DB_NAME}?charset=utf8mb4"
             
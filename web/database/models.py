@@ -2,12 +2,20 @@
 数据库模型定义
 """
 
-from sqlalchemy import Column, Integer, String, Text, BigInteger, DateTime, JSON
+from sqlalchemy import Column, Computed, Float, Integer, String, Text, BigInteger, DateTime, JSON
+from sqlalchemy.orm import deferred
 from .connection import Base
 from datetime import datetime
 from typing import Dict, Any, Optional
 import json
 
+def analysis_column(column_type, path: str):
+    """
+    从 analysis_info 生成的列（MySQL 见 schema/analysis_columns.sql，SQLite 由 AsyncSqliteDB 打开时添加），
+    和发布时间有联合索引；延迟加载，迁移之前的数据库中查询整个模型不会读取这些列
+    """
+    return deferred(Column(column_type, Computed(f"json_extract(analysis_info, '{path}')")))
+
 class BaseModel:
     """所有模型的基类"""
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -73,6 +81,9 @@ class XhsNote(Base, BaseModel):
     note_url = Column(String(512), nullable=False)
     source_keyword = Column(String(255))
     analysis_info = Column(JSON)
+    sentiment = analysis_column(String(16), '$.sentiment')
+    sentiment_score = analysis_column(Float, '$.sentiment_score')
+    relevance_score = analysis_column(Float, '$.relevance_score')
 
 class DouyinAweme(Base, BaseModel):
     """抖音视频模型"""
@@ -97,6 +108,9 @@ class DouyinAweme(Base, BaseModel):
     aweme_url = Column(String(255), nullable=True)
     source_keyword = Column(String(255))
     analysis_info = Column(JSON)
+    sentiment = analysis_column(String(16), '$.sentiment')
+    sentiment_score = analysis_column(Float, '$.sentiment_score')
+    relevance_score = analysis_column(Float, '$.relevance_score')
 
 class KuaishousVideo(Base, BaseModel):
     """快手视频模型"""
@@ -117,6 +131,9 @@ class KuaishousVideo(Base, BaseModel):
     video_play_url = Column(String(512), nullable=True)  # 新增实际表中的字段
     source_keyword = Column(String(255))
     analysis_info = Column(JSON)
+    sentiment = analysis_column(String(16), '$.sentiment')
+    sentiment_score = analysis_column(Float, '$.sentiment_score')
+    relevance_score = analysis_column(Float, '$.relevance_score')
 
 class BilibiliVideo(Base, BaseModel):
     """哔哩哔哩视频模型"""
@@ -138,6 +155,9 @@ class BilibiliVideo(Base, BaseModel):
     video_cover_url = Column(Text)
     source_keyword = Column(String(255))
     analysis_info = Column(JSON)
+    sentiment = analysis_column(String(16), '$.sentiment')
+    sentiment_score = analysis_column(Float, '$.sentiment_score')
+    relevance_score = analysis_column(Float, '$.relevance_score')
 
 class WeiboNote(Base, BaseModel):
     """微博内容模型"""
@@ -159,6 +179,9 @@ class WeiboNote(Base, BaseModel):
     note_url = Column(String(512), nullable=True)
     source_keyword = Column(String(255))
     analysis_info = Column(JSON)
+    sentiment = analysis_column(String(16), '$.sentiment')
+    sentiment_score = analysis_column(Float, '$.sentiment_score')
+    relevance_score = analysis_column(Float, '$.relevance_score')
 
 class TiebaNote(Base, BaseModel):
     """贴吧内容模型"""
@@ -169,6 +192,8 @@ class TiebaNote(Base, BaseModel):
     desc = Column(Text)
     note_url = Column(String(255), nullable=False)
     publish_time = Column(String(255), nullable=False)  # 实际表中是varchar类型
+    # 归一化的发布时间（秒级时间戳），延迟加载，未执行迁移的数据库也能查询
+    publish_ts = deferred(Column(BigInteger, index=True))
     user_link = Column(String(255), nullable=False)
     user_nickname = Column(String(64), nullable=False)
     user_avatar = Column(Text)
@@ -177,6 +202,9 @@ class TiebaNote(Base, BaseModel):
     total_replay_num = Column(Integer, default=0)  # 使用实际表中的字段名
     source_keyword = Column(String(255))
     analysis_info = Column(JSON)
+    sentiment = analysis_column(String(16), '$.sentiment')
+    sentiment_score = analysis_column(Float, '$.sentiment_score')
+    relevance_score = analysis_column(Float, '$.relevance_score')
 
 class ZhihuContent(Base, BaseModel):
     """知乎内容模型"""
@@ -188,6 +216,8 @@ class ZhihuContent(Base, BaseModel):
     title = Column(String(500), nullable=False)
     desc = Column(Text)
     created_time = Column(String(32), nullable=False)  # 使用实际表中的字段名和类型
+    # 归一化的发布时间（秒级时间戳），延迟加载，未执行迁移的数据库也能查询
+    publish_ts = deferred(Column(BigInteger, index=True))
     user_id = Column(String(64), nullable=False, index=True)
     user_link = Column(String(255), nullable=False)  # 使用实际表中的字段名
     user_nickname = Column(String(64), nullable=False)  # 使用实际表中的字段名
@@ -196,6 +226,9 @@ class ZhihuContent(Base, BaseModel):
     voteup_count = Column(Integer, nullable=False, default=0)  # 使用实际表中的字段名
     source_keyword = Column(String(255))
     analysis_info = Column(JSON)
+    sentiment = analysis_column(String(16), '$.sentiment')
+    sentiment_score = analysis_column(Float, '$.sentiment_score')
+    relevance_score = analysis_column(Float, '$.relevance_score')
 
 class NewsArticle(Base, BaseModel):
     """新闻文章模型"""
@@ -217,6 +250,9 @@ class NewsArticle(Base, BaseModel):
     article_metadata = Column('metadata', JSON)  # 使用column别名映射到metadata字段
     source_keyword = Column(String(255))  # 添加source_keyword字段
     analysis_info = Column(JSON)
+    sentiment = analysis_column(String(16), '$.sentiment')
+    sentiment_score = analysis_column(Float, '$.sentiment_score')
+    relevance_score = analysis_column(Float, '$.relevance_score')
 
 # 平台模型映射
 PLATFORM_MODELS = {
@@ -2,64 +2,68 @@
 数据查询逻辑
 """
 
+import base64
+import heapq
+import json
 import logging
-import re
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
-from sqlalchemy import func, text, or_, and_
-from sqlalchemy.orm import Session
-from dataclasses import dataclass
+from decimal import Decimal
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from sqlalchemy import func, text, or_, and_, cast, inspect, literal, select, Column, DateTime, Float, Integer, MetaData, Numeric, Table, Text
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session, undefer
+from dataclasses import dataclass, field, replace
 
 from .connection import get_db_session, close_db_session
 from .models import PLATFORM_MODELS, PLATFORM_NAMES, get_model_by_platform
+from tools.stats_rollup import ROLLUP_SOURCES, STATS_ROLLUP_STATE_TABLE, STATS_ROLLUP_TABLE, day_start
+from tools.text_index import TEXT_INDEX_STATE_TABLE, TEXT_INDEX_TABLES, build_boolean_query, build_fts_query, fts_table_name, split_keywords
+from tools.time_util import parse_publish_time_str
 
 logger = logging.getLogger(__name__)
 
-def parse_relative_time(time_str: str) -> Optional[datetime]:
-    """解析相对时间字符串，如'3天前', '2小时前'等"""
-    if not time_str:
-        return None
-        
-    time_str = time_str.strip()
-    now = datetime.now()
-    
-    # 匹配模式：数字 + 时间单位 + "前"
-    patterns = [
-        (r'(\d+)年前', 'years'),
-        (r'(\d+)个月前', 'months'), 
-        (r'(\d+)月前', 'months'),
-        (r'(\d+)天前', 'days'),
-        (r'(\d+)小时前', 'hours'),
-        (r'(\d+)分钟前', 'minutes'),
-        (r'(\d+)秒前', 'seconds'),
-    ]
-    
-    for pattern, unit in patterns:
-        match = re.search(pattern, time_str)
-        if match:
-            num = int(match.group(1))
-            if unit == 'years':
-                return now - timedelta(days=num * 365)
-            elif unit == 'months':
-                return now - timedelta(days=num * 30)
-            elif unit == 'days':
-                return now - timedelta(days=num)
-            elif unit == 'hours':
-                return now - timedelta(hours=num)
-            elif unit == 'minutes':
-                return now - timedelta(minutes=num)
-            elif unit == 'seconds':
-                return now - timedelta(seconds=num)
-    
-    # 特殊情况
-    if '刚刚' in time_str or '刚才' in time_str:
-        return now - timedelta(minutes=1)
-    elif '昨天' in time_str:
-        return now - timedelta(days=1)
-    elif '前天' in time_str:
-        return now - timedelta(days=2)
-    
-    return None
+# 无法解析的字符串发布时间统一显示为这个时间
+UNKNOWN_PUBLISH_TIME = datetime(2020, 1, 1)
+
+# 按发布时间排序时 NULL 的 datetime 字段按这个时间排序（数字时间戳字段按0），SQL 排序和翻页游标中都使用替换后的值
+NULL_SORT_DATETIME = datetime(1970, 1, 1)
+
+def parse_publish_time(platform: str, publish_time_value: Any, publish_ts: Optional[int] = None) -> datetime:
+    """
+    把各平台的发布时间字段统一转换为datetime
+    publish_ts 为贴吧、知乎入库时归一化的秒级时间戳（见 tools/time_util.normalize_publish_ts），有值时直接使用
+    """
+    if platform in APP_TIME_FILTER_PLATFORMS:
+        # 贴吧、知乎的时间字段是字符串格式：时间戳、日期或相对时间
+        if publish_ts:
+            return datetime.fromtimestamp(publish_ts)
+        try:
+            publish_time = parse_publish_time_str(publish_time_value)
+        except Exception:
+            publish_time = None
+        return publish_time or UNKNOWN_PUBLISH_TIME
+    if platform == 'news':
+        # 新闻的时间字段是datetime格式
+        try:
+            if publish_time_value:
+                publish_time = publish_time_value
+            else:
+                publish_time = datetime.now()
+        except:
+            publish_time = datetime.now()
+    elif platform == 'xhs':
+        # 小红书使用毫秒级时间戳
+        try:
+            publish_time = datetime.fromtimestamp(publish_time_value / 1000)
+        except:
+            publish_time = datetime.now()
+    else:
+        # 其他平台（抖音、B站、微博等）使用秒级时间戳
+        try:
+            publish_time = datetime.fromtimestamp(publish_time_value)
+        except:
+            publish_time = datetime.now()
+    return publish_time
 
 @dataclass
 class SearchFilters:
@@ -68,12 +72,14 @@ class SearchFilters:
     start_time: datetime = None
     end_time: datetime = None
     keywords: str = None
+    keyword_mode: str = 'or'  # 多个关键词的组合方式: or（命中任一）, and（命中全部）
     sentiment: str = None
     page: int = 1
     page_size: int = 20
-    sort_by: str = 'time'
+    sort_by: str = 'time'  # time, interaction, relevance（按关键词相关度，需要全文索引）
     sort_order: str = 'desc'
     noise_filter: str = 'all'  # 噪音过滤: all, filter_noise, only_noise
+    cursor: Optional[str] = None  # 上一页返回的 next_cursor，设置后忽略 page，按游标（keyset）翻页
     
     def __post_init__(self):
         if self.platforms is None:
@@ -83,6 +89,13 @@ class SearchFilters:
         if self.end_time is None:
             self.end_time = datetime.now()
 
+@dataclass
+class SearchPage:
+    """一页搜索结果"""
+    items: List['ContentItem'] = field(default_factory=list)
+    total: int = 0
+    next_cursor: Optional[str] = None  # 传给下一次搜索的 SearchFilters.cursor，没有下一页时为 None
+
 @dataclass
 class ContentItem:
     """内容项目数据结构"""
@@ -108,112 +121,9 @@ class ContentItem:
         
         # 处理发布时间字段
         publish_time_value = getattr(model_instance, field_mapping['publish_time'])
-        if platform == 'tieba':
-            # 贴吧的时间字段是字符串格式，需要特殊处理
-            try:
-                if isinstance(publish_time_value, str) and publish_time_value.strip():
-                    # 尝试多种时间格式
-                    time_formats = [
-                        '%Y-%m-%d %H:%M:%S',
-                        '%Y-%m-%d %H:%M',
-                        '%Y-%m-%d',
-                        '%m-%d %H:%M',
-                        '%Y年%m月%d日 %H:%M:%S',
-                        '%Y年%m月%d日 %H:%M',
-                        '%Y年%m月%d日',
-                        '%m月%d日 %H:%M',
-                        '%m月%d日',
-                    ]
-                    
-                    parsed = False
-                    for time_format in time_formats:
-                        try:
-                            publish_time = datetime.strptime(publish_time_value.strip(), time_format)
-                            # 如果没有年份，添加当前年份
-                            if 'Y' not in time_format:
-                                current_year = datetime.now().year
-                                publish_time = publish_time.replace(year=current_year)
-                            parsed = True
-                            break
-                        except:
-                            continue
-                    
-                    if not parsed:
-                        # 尝试解析相对时间
-                        publish_time = parse_relative_time(publish_time_value)
-                        if publish_time is None:
-                            # 如果都解析失败，返回一个较早的默认时间
-                            publish_time = datetime(2020, 1, 1)
-                else:
-                    publish_time = datetime(2020, 1, 1)
-            except:
-                publish_time = datetime(2020, 1, 1)
-        elif platform == 'zhihu':
-            # 知乎的时间字段是Unix时间戳字符串格式
-            try:
-                if isinstance(publish_time_value, str) and publish_time_value.strip():
-                    # 首先尝试Unix时间戳
-                    try:
-                        timestamp = int(publish_time_value.strip())
-                        # 知乎使用10位时间戳（秒级）
-                        if len(str(timestamp)) == 10:
-                            publish_time = datetime.fromtimestamp(timestamp)
-                        # 如果是13位时间戳（毫秒级）
-                        elif len(str(timestamp)) == 13:
-                            publish_time = datetime.fromtimestamp(timestamp / 1000)
-                        else:
-                            # 尝试其他格式
-                            raise ValueError("不是标准时间戳格式")
-                    except (ValueError, OSError):
-                        # 如果不是时间戳，尝试其他时间格式
-                        time_formats = [
-                            '%Y-%m-%d %H:%M:%S',
-                            '%Y-%m-%d',
-                            '%Y-%m-%d %H:%M',
-                            '%m-%d %H:%M',
-                            '%Y年%m月%d日 %H:%M',
-                            '%Y年%m月%d日',
-                        ]
-                        
-                        parsed = False
-                        for time_format in time_formats:
-                            try:
-                                publish_time = datetime.strptime(publish_time_value.strip(), time_format)
-                                parsed = True
-                                break
-                            except:
-                                continue
-                        
-                        if not parsed:
-                            # 尝试解析相对时间
-                            publish_time = parse_relative_time(publish_time_value)
-                            if publish_time is None:
-                                publish_time = datetime(2020, 1, 1)
-                else:
-                    publish_time = datetime(2020, 1, 1)
-            except:
-                publish_time = datetime(2020, 1, 1)
-        elif platform == 'news':
-            # 新闻的时间字段是datetime格式
-            try:
-                if publish_time_value:
-                    publish_time = publish_time_value
-                else:
-                    publish_time = datetime.now()
-            except:
-                publish_time = datetime.now()
-        elif platform == 'xhs':
-            # 小红书使用毫秒级时间戳
-            try:
-                publish_time = datetime.fromtimestamp(publish_time_value / 1000)
-            except:
-                publish_time = datetime.now()
-        else:
-            # 其他平台（抖音、B站、微博等）使用秒级时间戳
-            try:
-                publish_time = datetime.fromtimestamp(publish_time_value)
-            except:
-                publish_time = datetime.now()
+        # publish_ts 是延迟加载的列，只在查询时显式加载过才使用，避免逐条查询
+        publish_ts = model_instance.__dict__.get('publish_ts')
+        publish_time = parse_publish_time(platform, publish_time_value, publish_ts)
         
         content_item = cls(
             id=model_instance.id,
@@ -345,11 +255,148 @@ def get_interaction_count(model_instance, platform: str) -> int:
         return 0
     return 0
 
+# 贴吧、知乎的发布时间是字符串，无法在 SQL 中筛选和排序；
+# publish_ts 列迁移并回填完成后（见 analysis_job/publish_ts_backfill.py）改用 publish_ts
+APP_TIME_FILTER_PLATFORMS = ('tieba', 'zhihu')
+
+# 分块读取时每块的最大记录数
+SEARCH_CHUNK_SIZE = 1000
+
+# 噪音过滤的相关性评分阈值
+NOISE_RELEVANCE_THRESHOLD = 0.6
+
+# (数据库, 表名, 列名) -> 该列是否有唯一索引
+_unique_index_cache: Dict[Tuple[str, str, str], bool] = {}
+
+# MySQL ngram 全文索引默认按2个字切分（ngram_token_size=2），更短的关键词无法命中，回退到 LIKE
+FULLTEXT_MIN_KEYWORD_LENGTH = 2
+
+_fts_metadata = MetaData()
+
+def get_fts_table(table_name: str) -> Table:
+    """SQLite 内容表对应的 FTS5 表（见 tools/text_index.py），rank 是 FTS5 的隐藏列，默认为 bm25 评分，越小越相关"""
+    fts_name = fts_table_name(table_name)
+    if fts_name not in _fts_metadata.tables:
+        Table(fts_name, _fts_metadata, Column('rowid', Integer, primary_key=True), Column('tokens', Text), Column('rank', Float))
+    return _fts_metadata.tables[fts_name]
+
+def get_text_columns(model, platform: str) -> list:
+    """关键词搜索的字段：标题和正文（微博的标题就是正文）"""
+    field_mapping = get_field_mapping(platform)
+    columns = []
+    for field_name in dict.fromkeys((field_mapping.get('title'), field_mapping.get('content'))):
+        if field_name and hasattr(model, field_name):
+            columns.append(getattr(model, field_name))
+    return columns
+def _as_int(column):
+    """互动数字段大多是字符串，转换为整数，空值按0计算"""
+    return func.coalesce(cast(column, Integer), 0)
+
+def get_interaction_expression(model, platform: str):
+    """与 get_interaction_count 对应的 SQL 表达式，用于在数据库中按互动数排序"""
+    if platform == 'xhs':
+        return _as_int(model.liked_count) + _as_int(model.collected_count) + _as_int(model.comment_count)
+    elif platform == 'douyin':
+        return _as_int(model.liked_count) + _as_int(model.comment_count) + _as_int(model.share_count)
+    elif platform == 'kuaishou':
+        # 与 get_interaction_count 一样整除（MySQL 中为 FLOOR(x / 100)），否则两边的排序不一致，跨平台归并会出错
+        return _as_int(model.liked_count) + _as_int(model.viewd_count) // 100
+    elif platform == 'bilibili':
+        return _as_int(model.liked_count) + _as_int(model.video_comment) + _as_int(model.video_play_count) // 100
+    elif platform == 'weibo':
+        return _as_int(model.liked_count) + _as_int(model.comments_count) + _as_int(model.shared_count)
+    elif platform == 'tieba':
+        return _as_int(model.total_replay_num)
+    elif platform == 'zhihu':
+        return _as_int(model.comment_count) + _as_int(model.voteup_count)
+    elif platform == 'news':
+        return _as_int(model.word_count) // 100
+    return _as_int(None)
+
+def get_sort_expression(model, platform: str, sort_by: str, time_column=None, relevance=None):
+    """
+    排序字段：按互动数排序时为互动数表达式，按相关度排序时为 relevance（没有全文索引时为常量0），
+    否则为发布时间字段（time_column 不为空时使用 time_column）；
+    可为 NULL 的发布时间字段，NULL 时 keyset 分页的比较条件总是不成立，用 COALESCE 替换为最小值；
+    NOT NULL 的字段不包装，排序仍然可以使用时间索引
+    """
+    if sort_by == 'interaction':
+        return get_interaction_expression(model, platform)
+    if sort_by == 'relevance':
+        return relevance if relevance is not None else literal(0.0)
+    if time_column is None:
+        time_column = getattr(model, get_field_mapping(platform)['publish_time'])
+    if not time_column.nullable:
+        return time_column
+    if isinstance(time_column.type, DateTime):
+        return func.coalesce(time_column, literal(NULL_SORT_DATETIME, DateTime))
+    return func.coalesce(time_column, 0)
+
+def sort_value_to_datetime(platform: str, value: Any) -> datetime:
+    """按发布时间排序时，把 SQL 返回的排序值（datetime、秒级或小红书的毫秒级时间戳）转换为跨平台归并使用的 datetime"""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return datetime.fromtimestamp((value or 0) / 1000 if platform == 'xhs' else (value or 0))
+
+class _ReversedKey:
+    """升序排序时堆需要按相反的顺序比较"""
+    __slots__ = ('key',)
+    
+    def __init__(self, key):
+        self.key = key
+    
+    def __lt__(self, other: '_ReversedKey') -> bool:
+        return self.key > other.key
+    
+    def __gt__(self, other: '_ReversedKey') -> bool:
+        return self.key < other.key
+
+def _encode_cursor_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+def _decode_cursor_value(value: Any) -> Any:
+    if isinstance(value, dict) and 'dt' in value:
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+def encode_search_cursor(positions: Dict[str, Tuple[Any, int]], filters: SearchFilters) -> str:
+    """把各平台已经读到的位置编码为翻页游标"""
+    payload = {
+        'sort': f"{filters.sort_by}_{filters.sort_order}",
+        'pos': {platform: [_encode_cursor_value(value), row_id] for platform, (value, row_id) in positions.items()},
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+
+def decode_search_cursor(cursor: str, filters: SearchFilters) -> Dict[str, Tuple[Any, int]]:
+    """解析翻页游标，游标无效或排序方式已经变化时从第一页开始"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if payload.get('sort') != f"{filters.sort_by}_{filters.sort_order}":
+            return {}
+        return {platform: (_decode_cursor_value(value), row_id) for platform, (value, row_id) in payload['pos'].items()}
+    except Exception as e:
+        logger.warning(f"翻页游标无效: {e}")
+        return {}
+
 class DataQueryService:
     """数据查询服务"""
     
     def __init__(self):
         self.session: Optional[Session] = None
+        # 平台 -> 是否使用 publish_ts 列，每个会话检查一次
+        self._publish_ts_ready: Dict[str, bool] = {}
+        # 表名 -> 关键词搜索使用的索引，每个会话检查一次
+        self._keyword_backends: Dict[str, str] = {}
+        # 表名 -> 是否有从 analysis_info 生成的列，每个会话检查一次
+        self._analysis_columns_ready: Dict[str, bool] = {}
+        # 统计汇总表已经重建完成的平台，每个会话检查一次
+        self._stats_rollup_platforms: Optional[set] = None
     
     def __enter__(self):
         self.session = get_db_session()
@@ -360,181 +407,344 @@ class DataQueryService:
             close_db_session(self.session)
     
     def search_content(self, filters: SearchFilters) -> Tuple[List[ContentItem], int]:
-        """搜索内容"""
+        """搜索内容，返回当前页的内容和去重后的总数"""
+        page = self.search_content_page(filters)
+        return page.items, page.total
+    
+    def search_content_page(self, filters: SearchFilters) -> SearchPage:
+        """
+        搜索内容
+        每个平台在 SQL 中完成筛选和排序，只按需分块读取（keyset 分页，每块不超过 SEARCH_CHUNK_SIZE 条），
+        再把各平台的有序结果归并（k 路堆归并），只转换当前页及之前需要跳过的记录；总数来自 COUNT 查询。
+        贴吧、知乎的 publish_ts 列回填完成后和其他平台一样在 SQL 中按 publish_ts 筛选排序；
+        否则时间是字符串，只能在应用层解析：只读取 id 和时间两列，保留排在前面的记录，再按 id 读取完整记录。
+        翻很深的页时使用 filters.cursor（上一页返回的 next_cursor），每页只需要读取 page_size 条。
+        """
         if not self.session:
             raise RuntimeError("数据库会话未初始化")
         
-        all_results = []
-        total_count = 0
-        
         # 如果没有指定平台，查询所有平台
         platforms = filters.platforms if filters.platforms else list(PLATFORM_MODELS.keys())
+        descending = filters.sort_order == 'desc'
+        positions = decode_search_cursor(filters.cursor, filters) if filters.cursor else {}
+        skip = 0 if filters.cursor else (filters.page - 1) * filters.page_size
+        need = skip + filters.page_size
         
+        streams = []
+        total_count = 0
         for platform in platforms:
             model = get_model_by_platform(platform)
             if not model:
                 continue
-            
             try:
-                # 构建查询
-                query = self.session.query(model)
-                
-                # 时间筛选
-                time_field = get_field_mapping(platform)['publish_time']
-                if platform == 'tieba':
-                    # 贴吧时间筛选：尝试解析字符串时间进行筛选
-                    if filters.start_time or filters.end_time:
-                        # 获取所有记录，然后在应用层进行时间筛选
-                        # 这样虽然效率较低，但能正确处理各种时间格式
-                        pass  # 在后续处理中进行时间筛选
-                elif platform == 'zhihu':
-                    # 知乎时间筛选：类似处理
-                    if filters.start_time or filters.end_time:
-                        pass  # 在后续处理中进行时间筛选
-                elif platform == 'news':
-                    # news平台使用datetime字段
-                    if filters.start_time:
-                        query = query.filter(getattr(model, time_field) >= filters.start_time)
-                    if filters.end_time:
-                        query = query.filter(getattr(model, time_field) <= filters.end_time)
-                elif platform == 'xhs':
-                    # 小红书使用毫秒级时间戳
-                    if filters.start_time:
-                        start_ts = int(filters.start_time.timestamp() * 1000)
-                        query = query.filter(getattr(model, time_field) >= start_ts)
-                    
-                    if filters.end_time:
-                        end_ts = int(filters.end_time.timestamp() * 1000)
-                        query = query.filter(getattr(model, time_field) <= end_ts)
+                if platform in APP_TIME_FILTER_PLATFORMS and not self._uses_publish_ts(model, platform):
+                    rows, platform_count = self._scan_platform(model, platform, filters, positions.get(platform), need)
+                    stream = iter(rows)
                 else:
-                    # 其他平台（抖音、B站、微博等）使用秒级时间戳
-                    if filters.start_time:
-                        start_ts = int(filters.start_time.timestamp())
-                        query = query.filter(getattr(model, time_field) >= start_ts)
-                    
-                    if filters.end_time:
-                        end_ts = int(filters.end_time.timestamp())
-                        query = query.filter(getattr(model, time_field) <= end_ts)
-                
-                # 关键词搜索
-                if filters.keywords:
-                    field_mapping = get_field_mapping(platform)
-                    title_field = field_mapping.get('title')
-                    content_field = field_mapping.get('content')
-                    
-                    # 支持逗号和空格分割的关键词
-                    keywords = []
-                    for part in filters.keywords.replace(',', ' ').split():
-                        keyword = part.strip()
-                        if keyword:
-                            keywords.append(keyword)
-                    
-                    # 为每个关键词创建搜索条件
-                    keyword_conditions = []
-                    for keyword in keywords:
-                        search_conditions = []
-                        if title_field and hasattr(model, title_field):
-                            search_conditions.append(getattr(model, title_field).contains(keyword))
-                        if content_field and hasattr(model, content_field):
-                            search_conditions.append(getattr(model, content_field).contains(keyword))
-                        
-                        if search_conditions:
-                            keyword_conditions.append(or_(*search_conditions))
-                    
-                    if keyword_conditions:
-                        # 使用OR条件，只要包含任一关键词即可
-                        query = query.filter(or_(*keyword_conditions))
-                
-                # 情感筛选
-                if filters.sentiment and filters.sentiment != 'all':
-                    if hasattr(model, 'analysis_info'):
-                        query = query.filter(
-                            func.json_extract(model.analysis_info, '$.sentiment') == filters.sentiment
-                        )
-                
-                # 获取总数
-                platform_count = query.count()
+                    platform_count = self._count_platform(model, platform, filters)
+                    stream = self._iter_platform(model, platform, filters, positions.get(platform), need)
                 total_count += platform_count
-                
-                # 排序
-                time_field_obj = getattr(model, time_field)
-                if filters.sort_order == 'desc':
-                    query = query.order_by(time_field_obj.desc())
-                else:
-                    query = query.order_by(time_field_obj.asc())
-                
-                # 分页（暂时获取所有数据，后续在内存中分页）
-                results = query.all()
-                
-                # 转换为ContentItem
-                for result in results:
-                    try:
-                        content_item = ContentItem.from_model(result, platform)
-                        
-                        # 对贴吧和知乎进行应用层时间筛选
-                        if platform in ['tieba', 'zhihu'] and (filters.start_time or filters.end_time):
-                            if filters.start_time and content_item.publish_time < filters.start_time:
-                                continue
-                            if filters.end_time and content_item.publish_time > filters.end_time:
-                                continue
-                        
-                        # 噪音过滤逻辑 - 基于analysis_info中的相关性评分
-                        if filters.noise_filter != 'all':
-                            relevance_score = None
-                            if hasattr(content_item, '_model_instance') and content_item._model_instance:
-                                analysis_info = content_item._model_instance.get_analysis_info()
-                                if analysis_info and 'relevance_score' in analysis_info:
-                                    try:
-                                        relevance_score = float(analysis_info['relevance_score'])
-                                    except (ValueError, TypeError):
-                                        relevance_score = None
-                            
-                            # 根据过滤选项决定是否包含此条结果
-                            if filters.noise_filter == 'filter_noise':
-                                # 过滤噪音：只保留相关性评分 > 0.6 的内容
-                                if relevance_score is None or relevance_score <= 0.6:
-                                    continue
-                            elif filters.noise_filter == 'only_noise':
-                                # 仅显示噪音：只保留相关性评分 <= 0.6 的内容或无评分的内容
-                                if relevance_score is not None and relevance_score > 0.6:
-                                    continue
-                        
-                        all_results.append(content_item)
-                    except Exception as e:
-                        logger.warning(f"转换数据失败: {e}")
-                        continue
-                        
+                streams.append(self._to_merge_entries(stream, platform, filters))
             except Exception as e:
                 logger.error(f"查询平台 {platform} 数据失败: {e}")
                 continue
         
-        # 去重逻辑 - 基于content_id去除重复数据
+        # 各平台内部已经有序，归并时只比较每个平台当前的第一条
+        merged = heapq.merge(*streams, key=lambda entry: entry[0], reverse=descending)
         seen_content_ids = set()
-        unique_results = []
-        for result in all_results:
-            content_key = f"{result.platform}_{result.content_id}"
-            if content_key not in seen_content_ids:
-                seen_content_ids.add(content_key)
-                unique_results.append(result)
+        results = []
+        for _, item, platform, position in merged:
+            positions[platform] = position
+            # 去重逻辑 - 基于content_id去除重复数据
+            content_key = f"{platform}_{item.content_id}"
+            if content_key in seen_content_ids:
+                continue
+            seen_content_ids.add(content_key)
+            if skip:
+                skip -= 1
+                continue
+            results.append(item)
+            if len(results) >= filters.page_size:
+                break
+        
+        next_cursor = None
+        if len(results) >= filters.page_size:
+            next_cursor = encode_search_cursor(positions, filters)
+        return SearchPage(items=results, total=total_count, next_cursor=next_cursor)
+    
+    def _filtered_query(self, model, platform: str, filters: SearchFilters, *entities):
+        """构建带筛选条件的查询（未回填 publish_ts 的贴吧、知乎除外），entities 为空时查询整个模型"""
+        query = self.session.query(*entities) if entities else self.session.query(model)
+        field_mapping = get_field_mapping(platform)
+        
+        # 时间筛选
+        time_column = getattr(model, field_mapping['publish_time'])
+        if platform in APP_TIME_FILTER_PLATFORMS:
+            # publish_ts 为秒级时间戳；否则在应用层解析字符串时间后筛选
+            if self._uses_publish_ts(model, platform):
+                if filters.start_time:
+                    query = query.filter(model.publish_ts >= int(filters.start_time.timestamp()))
+                if filters.end_time:
+                    query = query.filter(model.publish_ts <= int(filters.end_time.timestamp()))
+        elif platform == 'news':
+            # news平台使用datetime字段
+            if filters.start_time:
+                query = query.filter(time_column >= filters.start_time)
+            if filters.end_time:
+                query = query.filter(time_column <= filters.end_time)
+        else:
+            # 小红书使用毫秒级时间戳，其他平台（抖音、B站、微博等）使用秒级时间戳
+            scale = 1000 if platform == 'xhs' else 1
+            if filters.start_time:
+                query = query.filter(time_column >= int(filters.start_time.timestamp() * scale))
+            if filters.end_time:
+                query = query.filter(time_column <= int(filters.end_time.timestamp() * scale))
+        
+        # 关键词搜索，有全文索引时使用全文索引
+        keyword_condition, _ = self._keyword_filter(model, platform, filters)
+        if keyword_condition is not None:
+            query = query.filter(keyword_condition)
+        
+        # 情感筛选
+        if filters.sentiment and filters.sentiment != 'all':
+            if hasattr(model, 'analysis_info'):
+                sentiment, _ = self._analysis_columns(model)
+                query = query.filter(sentiment == filters.sentiment)
+        
+        # 噪音过滤 - 基于analysis_info中的相关性评分
+        if filters.noise_filter != 'all' and hasattr(model, 'analysis_info'):
+            _, relevance_score = self._analysis_columns(model)
+            if filters.noise_filter == 'filter_noise':
+                # 过滤噪音：只保留相关性评分 > 0.6 的内容
+                query = query.filter(relevance_score > NOISE_RELEVANCE_THRESHOLD)
+            elif filters.noise_filter == 'only_noise':
+                # 仅显示噪音：只保留相关性评分 <= 0.6 的内容或无评分的内容
+                query = query.filter(or_(relevance_score.is_(None), relevance_score <= NOISE_RELEVANCE_THRESHOLD))
+        
+        return query
+    
+    def _count_platform(self, model, platform: str, filters: SearchFilters) -> int:
+        """
+        按 content_id 去重后的总数
+        content_id 有唯一索引时（见 schema/batch_upsert_unique_keys.sql）不会有重复记录，COUNT(*) 只需要扫描时间索引；
+        否则使用 COUNT(DISTINCT)，需要回表读取 content_id
+        """
+        content_id_field = get_field_mapping(platform)['content_id']
+        if self._has_unique_index(model, content_id_field):
+            count_column = func.count()
+        else:
+            count_column = func.count(func.distinct(getattr(model, content_id_field)))
+        return self._filtered_query(model, platform, filters, count_column).scalar() or 0
+    
+    def _has_unique_index(self, model, column_name: str) -> bool:
+        """数据库中该列是否有唯一索引，按数据库和表缓存"""
+        bind = self.session.get_bind()
+        cache_key = (str(bind.url), model.__tablename__, column_name)
+        if cache_key not in _unique_index_cache:
+            try:
+                inspector = inspect(bind)
+                unique_columns = [index['column_names'] for index in inspector.get_indexes(model.__tablename__)
+                                  if index.get('unique')]
+                unique_columns += [constraint['column_names']
+                                   for constraint in inspector.get_unique_constraints(model.__tablename__)]
+                _unique_index_cache[cache_key] = [column_name] in unique_columns
+            except Exception as e:
+                logger.warning(f"读取表 {model.__tablename__} 的索引失败: {e}")
+                _unique_index_cache[cache_key] = False
+        return _unique_index_cache[cache_key]
+    
+    def _keyword_backend(self, model, platform: str) -> str:
+        """
+        关键词搜索使用的索引：'fulltext'（MySQL 标题、正文上的 FULLTEXT 索引，见 schema/fulltext_index.sql）、
+        'fts'（SQLite FTS5 表，已经为全部数据建立索引）或 'like'（没有全文索引，LIKE 全表扫描）
+        """
+        table = model.__tablename__
+        if table not in self._keyword_backends:
+            backend = 'like'
+            try:
+                bind = self.session.get_bind()
+                if bind.dialect.name == 'mysql':
+                    columns = {column.name for column in get_text_columns(model, platform)}
+                    for index in inspect(bind).get_indexes(table):
+                        if (index.get('dialect_options', {}).get('mysql_prefix') == 'FULLTEXT'
+                                and set(index['column_names']) == columns):
+                            backend = 'fulltext'
+                elif bind.dialect.name == 'sqlite' and table in TEXT_INDEX_TABLES:
+                    indexed = self.session.execute(
+                        text(f"SELECT 1 FROM `{TEXT_INDEX_STATE_TABLE}` WHERE `table_name` = :table"), {'table': table}
+                    ).first()
+                    if indexed:
+                        backend = 'fts'
+            except Exception as e:
+                logger.warning(f"检查表 {table} 的全文索引失败: {e}")
+            self._keyword_backends[table] = backend
+        return self._keyword_backends[table]
+    
+    def _keyword_filter(self, model, platform: str, filters: SearchFilters):
+        """
+        关键词筛选条件和相关度表达式（越大越相关）
+        filters.keyword_mode 为 'and' 时需要命中全部关键词，否则命中任一关键词即可
+        Returns: (条件, 相关度表达式)，没有关键词时都为 None，没有全文索引时相关度为 None
+        """
+        keywords = split_keywords(filters.keywords or '')
+        columns = get_text_columns(model, platform)
+        if not keywords or not columns:
+            return None, None
+        mode = 'and' if filters.keyword_mode == 'and' else 'or'
+        backend = self._keyword_backend(model, platform)
         
-        # 统一排序
-        if filters.sort_by == 'time':
-            unique_results.sort(
-                key=lambda x: x.publish_time,
-                reverse=(filters.sort_order == 'desc')
-            )
-        elif filters.sort_by == 'interaction':
-            unique_results.sort(
-                key=lambda x: x.interaction_count,
-                reverse=(filters.sort_order == 'desc')
-            )
+        if backend == 'fulltext' and min(len(keyword) for keyword in keywords) >= FULLTEXT_MIN_KEYWORD_LENGTH:
+            relevance = match(*columns, against=build_boolean_query(keywords, mode)).in_boolean_mode()
+            return relevance, relevance
+        
+        # 标题、正文 LIKE '%关键词%'
+        keyword_conditions = [or_(*(column.contains(keyword) for column in columns)) for keyword in keywords]
+        like_condition = (and_ if mode == 'and' else or_)(*keyword_conditions)
+        if backend == 'fts' and all(build_fts_query([keyword]) for keyword in keywords):
+            # FTS5 按词匹配（一个关键词的各个词都出现即可），先用它找出候选记录，再对候选记录用 LIKE 复核，结果和 LIKE 一致
+            fts = get_fts_table(model.__tablename__)
+            matched = fts.c.tokens.op('MATCH')(build_fts_query(keywords, mode))
+            relevance = select(-fts.c.rank).where(matched, fts.c.rowid == model.id).scalar_subquery()
+            return and_(model.id.in_(select(fts.c.rowid).where(matched)), like_condition), relevance
+        return like_condition, None
+    
+    def _analysis_columns(self, model):
+        """
+        情感、相关性评分的表达式：表中已有从 analysis_info 生成的列（见 schema/analysis_columns.sql）时使用生成列，
+        筛选和统计可以只扫描（发布时间, 生成列）联合索引；否则逐行解析 analysis_info
+        Returns: (sentiment, relevance_score)
+        """
+        table = model.__tablename__
+        if table not in self._analysis_columns_ready:
+            ready = False
+            if hasattr(model, 'sentiment'):
+                try:
+                    columns = {column['name'] for column in inspect(self.session.get_bind()).get_columns(table)}
+                    ready = {'sentiment', 'relevance_score'} <= columns
+                except Exception as e:
+                    logger.warning(f"检查表 {table} 的分析结果列失败: {e}")
+            self._analysis_columns_ready[table] = ready
+        if self._analysis_columns_ready[table]:
+            return model.sentiment, model.relevance_score
+        return (func.json_extract(model.analysis_info, '$.sentiment'),
+                cast(func.json_extract(model.analysis_info, '$.relevance_score'), Numeric(10, 4)))
+    
+    def _uses_publish_ts(self, model, platform: str) -> bool:
+        """
+        贴吧、知乎是否可以用 publish_ts 列在 SQL 中筛选、排序：表中已经有这一列，并且没有未回填（NULL）的记录
+        无法解析的时间回填为0，publish_ts 有索引，检查 NULL 只需要一次索引查找
+        """
+        if platform not in self._publish_ts_ready:
+            ready = False
+            if platform in APP_TIME_FILTER_PLATFORMS and hasattr(model, 'publish_ts'):
+                try:
+                    columns = inspect(self.session.get_bind()).get_columns(model.__tablename__)
+                    if any(column['name'] == 'publish_ts' for column in columns):
+                        ready = self.session.query(model.id).filter(model.publish_ts.is_(None)).first() is None
+                except Exception as e:
+                    logger.warning(f"检查表 {model.__tablename__} 的 publish_ts 失败: {e}")
+            self._publish_ts_ready[platform] = ready
+        return self._publish_ts_ready[platform]
+    
+    def _iter_platform(self, model, platform: str, filters: SearchFilters,
+                       after: Optional[Tuple[Any, int]], need: int) -> Iterator[Tuple[Any, Tuple[Any, int]]]:
+        """
+        按排序字段和 id 有序地分块读取一个平台的记录
+        Returns: 迭代 (模型实例, 游标位置 (排序值, id))
+        """
+        uses_publish_ts = self._uses_publish_ts(model, platform)
+        _, relevance = self._keyword_filter(model, platform, filters)
+        sort_column = get_sort_expression(model, platform, filters.sort_by,
+                                          model.publish_ts if uses_publish_ts else None, relevance)
+        descending = filters.sort_order == 'desc'
+        base_query = self._filtered_query(model, platform, filters).add_columns(sort_column.label('_sort_value'))
+        if uses_publish_ts:
+            base_query = base_query.options(undefer(model.publish_ts))
+        if descending:
+            order_by = (sort_column.desc(), model.id.desc())
+        else:
+            order_by = (sort_column.asc(), model.id.asc())
+        chunk_size = max(1, min(need, SEARCH_CHUNK_SIZE))
+        try:
+            while True:
+                query = base_query
+                if after is not None:
+                    value, row_id = after
+                    if descending:
+                        query = query.filter(or_(sort_column < value, and_(sort_column == value, model.id < row_id)))
+                    else:
+                        query = query.filter(or_(sort_column > value, and_(sort_column == value, model.id > row_id)))
+                rows = query.order_by(*order_by).limit(chunk_size).all()
+                for instance, sort_value in rows:
+                    after = (sort_value, instance.id)
+                    yield instance, after
+                if len(rows) < chunk_size:
+                    return
+        except Exception as e:
+            logger.error(f"查询平台 {platform} 数据失败: {e}")
+    
+    def _scan_platform(self, model, platform: str, filters: SearchFilters,
+                       after: Optional[Tuple[Any, int]], need: int) -> Tuple[List[Tuple[Any, Tuple[Any, int]]], int]:
+        """
+        贴吧、知乎：只读取 id、content_id、时间（和互动数或相关度）列，在应用层解析时间、筛选，用大小为 need 的堆保留排在前面的记录，
+        最后按 id 读取这些记录的完整内容
+        Returns: ([(模型实例, 游标位置 (排序值, id))], 去重后的总数)
+        """
+        field_mapping = get_field_mapping(platform)
+        descending = filters.sort_order == 'desc'
+        by_time = filters.sort_by not in ('interaction', 'relevance')
+        content_id_column = getattr(model, field_mapping['content_id'])
+        time_column = getattr(model, field_mapping['publish_time'])
+        _, relevance = self._keyword_filter(model, platform, filters)
+        sort_column = get_sort_expression(model, platform, filters.sort_by, relevance=relevance)
+        query = self._filtered_query(model, platform, filters, model.id, content_id_column, time_column, sort_column)
         
-        # 内存分页
-        start_idx = (filters.page - 1) * filters.page_size
-        end_idx = start_idx + filters.page_size
-        paginated_results = unique_results[start_idx:end_idx]
+        seen_content_ids = set()
+        top: List[Tuple[Any, int]] = []
+        for row_id, content_id, time_value, sort_value in query.yield_per(SEARCH_CHUNK_SIZE):
+            publish_time = parse_publish_time(platform, time_value)
+            if filters.start_time and publish_time < filters.start_time:
+                continue
+            if filters.end_time and publish_time > filters.end_time:
+                continue
+            if content_id in seen_content_ids:
+                continue
+            seen_content_ids.add(content_id)
+            position = (publish_time if by_time else sort_value, row_id)
+            if after is not None and not (position < after if descending else position > after):
+                continue
+            # 堆顶是当前保留的记录中排在最后的一条
+            entry = _ReversedKey(position) if not descending else position
+            if len(top) < need:
+                heapq.heappush(top, entry)
+            elif entry > top[0]:
+                heapq.heapreplace(top, entry)
         
-        return paginated_results, len(unique_results)
+        positions = sorted((entry.key if isinstance(entry, _ReversedKey) else entry for entry in top), reverse=descending)
+        instances = {}
+        ids = [row_id for _, row_id in positions]
+        for start in range(0, len(ids), SEARCH_CHUNK_SIZE):
+            for instance in self.session.query(model).filter(model.id.in_(ids[start:start + SEARCH_CHUNK_SIZE])):
+                instances[instance.id] = instance
+        rows = [(instances[position[1]], position) for position in positions if position[1] in instances]
+        return rows, len(seen_content_ids)
+    
+    @staticmethod
+    def _to_merge_entries(stream: Iterator[Tuple[Any, Tuple[Any, int]]], platform: str,
+                          filters: SearchFilters) -> Iterator[Tuple[Tuple, ContentItem, str, Tuple[Any, int]]]:
+        """转换为 ContentItem，附上跨平台归并使用的排序键：(发布时间、互动数或相关度, 平台, id)"""
+        for instance, position in stream:
+            try:
+                item = ContentItem.from_model(instance, platform)
+            except Exception as e:
+                logger.warning(f"转换数据失败: {e}")
+                continue
+            if filters.sort_by in ('interaction', 'relevance'):
+                primary = position[0] or 0
+            else:
+                # 使用与 SQL 排序相同的值（NULL 已替换为最小值），而不是展示用的 publish_time
+                primary = sort_value_to_datetime(platform, position[0])
+            yield (primary, platform, instance.id), item, platform, position
     
     def get_platform_stats(self) -> Dict[str, int]:
         """获取平台统计"""
@@ -560,8 +770,11 @@ class DataQueryService:
                     continue
                 
                 if table_exists:
-                    # 查询数据量
-                    count = self.session.query(model).count()
+                    # 查询数据量：有汇总表时按天累加，否则 COUNT 整张表
+                    if self._uses_stats_rollup(model, platform):
+                        count = self._rollup_content_count(model, platform)
+                    else:
+                        count = self.session.query(model).count()
                     stats[platform] = count
                     platform_status[platform] = f"查询成功: {count} 条记录"
                     logger.info(f"平台 {platform} 统计: {count} 条记录")
@@ -604,63 +817,20 @@ class DataQueryService:
                 continue
             
             try:
-                # 使用MySQL兼容的JSON语法
-                query = self.session.query(
-                    func.JSON_EXTRACT(model.analysis_info, '$.sentiment').label('sentiment'),
-                    func.count().label('count')
-                )
-                
-                # 关键词筛选
-                if filters.keywords:
-                    field_mapping = get_field_mapping(platform)
-                    # 支持逗号和空格分割的关键词
-                    keywords = []
-                    for part in filters.keywords.replace(',', ' ').split():
-                        keywords.append(part.strip())
-                    
-                    keyword_conditions = []
-                    for keyword in keywords:
-                        keyword = keyword.strip()
-                        if keyword:
-                            # 在标题和内容中搜索关键词
-                            title_field = field_mapping.get('title')
-                            content_field = field_mapping.get('content')
-                            
-                            conditions = []
-                            if title_field and hasattr(model, title_field):
-                                conditions.append(getattr(model, title_field).like(f'%{keyword}%'))
-                            if content_field and hasattr(model, content_field):
-                                conditions.append(getattr(model, content_field).like(f'%{keyword}%'))
-                            
-                            if conditions:
-                                keyword_conditions.append(or_(*conditions))
-                    
-                    if keyword_conditions:
-                        query = query.filter(or_(*keyword_conditions))
-                
-                # 时间筛选
-                time_field = get_field_mapping(platform)['publish_time']
-                if filters.start_time:
-                    start_ts = int(filters.start_time.timestamp() * 1000)
-                    query = query.filter(getattr(model, time_field) >= start_ts)
-                
-                if filters.end_time:
-                    end_ts = int(filters.end_time.timestamp() * 1000)
-                    query = query.filter(getattr(model, time_field) <= end_ts)
-                
-                # 过滤掉analysis_info为NULL的记录
-                query = query.filter(model.analysis_info.isnot(None))
+                # 完整的自然日从汇总表读取，时间范围两端不足一天的部分仍然查询内容表
+                live_ranges = [filters]
+                whole_days = self._rollup_whole_days(model, platform, filters)
+                if whole_days:
+                    first_day, last_day = whole_days
+                    self._add_rollup_sentiments(platform, first_day, last_day, sentiment_stats)
+                    live_ranges = []
+                    if filters.start_time < day_start(first_day):
+                        live_ranges.append(replace(filters, end_time=day_start(first_day) - timedelta(microseconds=1)))
+                    if day_start(last_day + timedelta(days=1)) <= filters.end_time:
+                        live_ranges.append(replace(filters, start_time=day_start(last_day + timedelta(days=1))))
                 
-                # 分组统计
-                results = query.group_by(
-                    func.JSON_EXTRACT(model.analysis_info, '$.sentiment')
-                ).all()
-                
-                for sentiment, count in results:
-                    if sentiment in sentiment_stats:
-                        sentiment_stats[sentiment] += count
-                    else:
-                        sentiment_stats['unknown'] += count
+                for range_filters in live_ranges:
+                    self._count_sentiments(model, platform, range_filters, sentiment_stats)
                         
             except Exception as e:
                 logger.error(f"获取平台 {platform} 情感分布失败: {e}")
@@ -668,6 +838,90 @@ class DataQueryService:
         
         return sentiment_stats
     
+    def _count_sentiments(self, model, platform: str, filters: SearchFilters, sentiment_stats: Dict[str, int]):
+        """从内容表按情感分组统计，累加到 sentiment_stats"""
+        sentiment, _ = self._analysis_columns(model)
+        # 时间、关键词筛选与搜索结果一致（各平台时间字段的单位不同），不按情感和相关性筛选
+        query = self._filtered_query(
+            model, platform, replace(filters, sentiment=None, noise_filter='all'),
+            sentiment.label('sentiment'), func.count().label('count')
+        )
+        
+        # 过滤掉没有分析结果的记录；有生成列时只需要扫描（发布时间, sentiment）联合索引
+        if self._analysis_columns_ready[model.__tablename__]:
+            query = query.filter(model.sentiment.isnot(None))
+        else:
+            query = query.filter(model.analysis_info.isnot(None))
+        
+        # 分组统计
+        results = query.group_by(sentiment).all()
+        
+        for sentiment, count in results:
+            if sentiment in sentiment_stats:
+                sentiment_stats[sentiment] += count
+            else:
+                sentiment_stats['unknown'] += count
+    
+    def _uses_stats_rollup(self, model, platform: str) -> bool:
+        """
+        是否可以从统计汇总表 content_daily_stats（见 tools/stats_rollup.py）读取该平台的统计：
+        已经执行过 analysis_job.stats_rollup_rebuild；贴吧、知乎还需要 publish_ts 已回填（汇总按 publish_ts 分天）
+        """
+        if self._stats_rollup_platforms is None:
+            platforms = set()
+            try:
+                if inspect(self.session.get_bind()).has_table(STATS_ROLLUP_STATE_TABLE):
+                    platforms = {row[0] for row in self.session.execute(
+                        text(f"SELECT `platform` FROM `{STATS_ROLLUP_STATE_TABLE}`"))}
+            except Exception as e:
+                logger.warning(f"检查统计汇总表失败: {e}")
+            self._stats_rollup_platforms = platforms
+        if platform not in self._stats_rollup_platforms or platform not in ROLLUP_SOURCES:
+            return False
+        return platform not in APP_TIME_FILTER_PLATFORMS or self._uses_publish_ts(model, platform)
+    
+    def _rollup_content_count(self, model, platform: str) -> int:
+        """汇总表中该平台的内容数，加上没有发布时间（不计入任何一天）的记录数"""
+        total = self.session.execute(
+            text(f"SELECT SUM(`content_count`) FROM `{STATS_ROLLUP_TABLE}` WHERE `platform` = :platform"),
+            {'platform': platform}
+        ).scalar() or 0
+        time_column = getattr(model, ROLLUP_SOURCES[platform].time_field)
+        undated = self.session.query(func.count()).select_from(model).filter(time_column.is_(None)).scalar() or 0
+        return int(total) + undated
+    
+    def _rollup_whole_days(self, model, platform: str, filters: SearchFilters) -> Optional[Tuple[Any, Any]]:
+        """
+        情感分布可以从汇总表读取的日期范围：时间范围内完整的自然日（第一天, 最后一天），没有时返回 None
+        汇总表没有关键词维度（来源关键词不是搜索关键词），有搜索关键词时只查询内容表
+        """
+        if split_keywords(filters.keywords or '') or not filters.start_time or not filters.end_time:
+            return None
+        if not self._uses_stats_rollup(model, platform):
+            return None
+        # 汇总表的情感来自 sentiment 列，和内容表只在有生成列时一致
+        self._analysis_columns(model)
+        if not self._analysis_columns_ready[model.__tablename__]:
+            return None
+        first_day = filters.start_time.date()
+        if day_start(first_day) < filters.start_time:
+            first_day += timedelta(days=1)
+        last_day = filters.end_time.date() - timedelta(days=1)
+        if last_day < first_day:
+            return None
+        return first_day, last_day
+    
+    def _add_rollup_sentiments(self, platform: str, first_day, last_day, sentiment_stats: Dict[str, int]):
+        """从汇总表累加 [first_day, last_day] 的情感分布，每天每个来源关键词一行"""
+        row = self.session.execute(
+            text(f"SELECT SUM(`positive_count`), SUM(`negative_count`), SUM(`neutral_count`), SUM(`unknown_count`) "
+                 f"FROM `{STATS_ROLLUP_TABLE}` WHERE `platform` = :platform "
+                 f"AND `stat_date` >= :first_day AND `stat_date` <= :last_day"),
+            {'platform': platform, 'first_day': first_day.isoformat(), 'last_day': last_day.isoformat()}
+        ).first()
+        for key, count in zip(('positive', 'negative', 'neutral', 'unknown'), row or ()):
+            sentiment_stats[key] += int(count or 0)
+    
     def get_recent_keywords(self, limit: int = 10) -> List[str]:
         """获取最近的搜索关键词"""
         if not self.session:
@@ -174,10 +174,13 @@ class WebDataProcessor:
             f"start:{filters.start_time.isoformat() if filters.start_time else 'none'}",
             f"end:{filters.end_time.isoformat() if filters.end_time else 'none'}",
             f"keywords:{filters.keywords or 'none'}",
+            f"keyword_mode:{filters.keyword_mode}",
             f"sentiment:{filters.sentiment or 'all'}",
             f"page:{filters.page}",
             f"size:{filters.page_size}",
-            f"sort:{filters.sort_by}_{filters.sort_order}"
+            f"sort:{filters.sort_by}_{filters.sort_order}",
+            f"noise:{filters.noise_filter}",
+            f"cursor:{filters.cursor or 'none'}"
         ]
         return "|".join(key_parts)
     